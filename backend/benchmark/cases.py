@@ -0,0 +1,193 @@
+import asyncio
+from contextlib import AsyncExitStack
+import copy
+from datetime import date, timedelta
+import statistics
+import time
+from typing import Callable, Tuple
+from fastapi import Request
+from fastapi.dependencies.models import Dependant
+from fastapi.dependencies.utils import get_dependant, solve_dependencies
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
+from starlette.routing import Match
+from sqlalchemy_utils import create_database, drop_database
+from src.app.model.enums import AcctType, EntityType
+from benchmark.context import BenchContext
+from benchmark.generator import LedgerScale
+
+class CaseResult(BaseModel):
+    name: str
+    repeat: int
+    min_ms: float
+    mean_ms: float
+    median_ms: float
+    p95_ms: float
+    max_ms: float
+
+class BenchReport(BaseModel):
+    timestamp: str
+    python: str
+    dialect: str
+    scale_name: str
+    scale: LedgerScale
+    counts: dict[str, int]
+    generate_s: float = Field(description='Time spent generating the tenant')
+    results: list[CaseResult]
+
+def time_case(
+    name: str,
+    func: Callable[[], object],
+    repeat: int,
+    warmup: int = 1,
+    setup: Callable[[], object] | None = None
+) -> CaseResult:
+    # setup (if any) runs before every iteration and is not timed
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        func()
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return CaseResult(
+        name=name,
+        repeat=repeat,
+        min_ms=timings[0],
+        mean_ms=statistics.fmean(timings),
+        median_ms=statistics.median(timings),
+        p95_ms=timings[min(len(timings) - 1, round(0.95 * (len(timings) - 1)))],
+        max_ms=timings[-1],
+    )
+
+def _clear_user_db(ctx: BenchContext):
+    # restore only works on an empty database, recreate the user database first
+    user_engine = ctx.dao_access.user_engine
+    ctx.dao_access.user_session.close()
+    user_engine.dispose()
+    drop_database(user_engine.url)
+    create_database(user_engine.url)
+
+def _override_dependant(dependant: Dependant, overrides: dict[Callable, Callable]) -> Dependant:
+    # copy of the dependency tree with some nodes replaced, resolved once here instead of on every call
+    # (fastapi rebuilds the whole tree per request whenever app.dependency_overrides is not empty)
+    dependant = copy.copy(dependant)
+    dependant.dependencies = [
+        get_dependant(path=sub.path, call=overrides[sub.call], name=sub.name, security_scopes=sub.security_scopes) # type: ignore
+        if sub.call in overrides else _override_dependant(sub, overrides)
+        for sub in dependant.dependencies
+    ]
+    return dependant
+
+def _resolve_route(ctx: BenchContext, method: str, path: str, query: str = '') -> Callable[[], object]:
+    # per request framework overhead: build the dependency graph of one api route as fastapi does
+    # before calling the endpoint, auth and dao access are the bench tenant so no db/network involved
+    from src.web.main import app
+    from src.web.dependency.auth import get_current_user
+    from src.web.dependency.dao import get_common_dao_access, get_user_dao_access
+
+    scope = {
+        'type': 'http',
+        'app': app,
+        'method': method,
+        'path': f'/api/v1{path}',
+        'query_string': query.encode(),
+        'headers': [],
+    }
+    route, child_scope = next(
+        (r, child)
+        for r in app.router.routes if isinstance(r, APIRoute)
+        for match, child in [r.matches(scope)] if match == Match.FULL
+    )
+    dependant = _override_dependant(route.dependant, {
+        get_current_user: lambda: ctx.dao_access.user,
+        get_user_dao_access: lambda: ctx.dao_access,
+        get_common_dao_access: lambda: ctx.dao_access,
+    })
+    loop = asyncio.new_event_loop()
+
+    async def solve():
+        async with AsyncExitStack() as stack:
+            solved = await solve_dependencies(
+                request=Request({**scope, **child_scope}),
+                dependant=dependant,
+                async_exit_stack=stack,
+                embed_body_fields=route._embed_body_fields,
+            )
+        assert not solved.errors, solved.errors
+        return solved.values
+
+    return lambda: loop.run_until_complete(solve())
+
+def get_cases(ctx: BenchContext, scale: LedgerScale) -> dict[str, Tuple[Callable[[], object], Callable[[], object] | None]]:
+    # hot paths to track, each case is (no-arg callable, untimed setup callable or None)
+    # restore goes last as it rebuilds the tenant
+    journal_dao = ctx.journal_dao
+    end_dt = scale.start_dt + timedelta(days=scale.num_days)
+    # pick a journal and the busiest (base currency) bank account as fixed targets
+    jrns, _ = journal_dao.list_journal(limit=1)
+    journal_id = jrns[0].journal_id
+    invoice_id = ctx.invoice_dao.list_invoice(limit=1, entity_type=EntityType.CUSTOMER)[0].invoice_id
+
+    return {
+        'journal_dao.get': (lambda: journal_dao.get(journal_id), None),
+        'journal_dao.list_journal': (lambda: journal_dao.list_journal(limit=50), None),
+        'journal_dao.list_journal[acct_filter]': (lambda: journal_dao.list_journal(
+            limit=50, acct_ids=['acct-bank']
+        ), None),
+        'journal_dao.agg_accts_flow[inc]': (lambda: journal_dao.agg_accts_flow(
+            start_dt=scale.start_dt, end_dt=end_dt, acct_type=AcctType.INC
+        ), None),
+        'journal_dao.agg_accts_flow[ast]': (lambda: journal_dao.agg_accts_flow(
+            start_dt=date(1900, 1, 1), end_dt=end_dt, acct_type=AcctType.AST
+        ), None),
+        'journal_dao.list_entry_by_acct': (lambda: journal_dao.list_entry_by_acct('acct-bank'), None),
+        'journal_dao.agg_acct_flow_by_period[day]': (lambda: journal_dao.agg_acct_flow_by_period(
+            'acct-bank', start_dt=scale.start_dt, end_dt=end_dt, freq='day'
+        ), None),
+        'reporting_service.get_balance_sheet_tree': (
+            lambda: ctx.reporting_service.get_balance_sheet_tree(end_dt), None
+        ),
+        'reporting_service.get_income_statment_tree': (
+            lambda: ctx.reporting_service.get_income_statment_tree(scale.start_dt, end_dt), None
+        ),
+        'reporting_service.get_income_statement_matrix[month]': (
+            lambda: ctx.reporting_service.get_income_statement_matrix(scale.start_dt, end_dt, freq='month'), None
+        ),
+        'invoice_dao.list_invoice[customer]': (lambda: ctx.invoice_dao.list_invoice(
+            limit=50, entity_type=EntityType.CUSTOMER
+        ), None),
+        'invoice_dao.list_invoice[supplier]': (lambda: ctx.invoice_dao.list_invoice(
+            limit=50, entity_type=EntityType.SUPPLIER
+        ), None),
+        'web.dependency[settings/get_base_currency]': (
+            _resolve_route(ctx, 'GET', '/settings/get_base_currency'), None
+        ),
+        'web.dependency[sales/invoice/get_balance]': (_resolve_route(
+            ctx, 'GET', f'/sales/invoice/{invoice_id}/get_balance', query=f'bal_dt={end_dt.isoformat()}'
+        ), None),
+        'backup_dao.backup_database': (lambda: ctx.backup_dao.backup_database('bench'), None),
+        'backup_dao.restore_database': (
+            lambda: ctx.backup_dao.restore_database('bench'), lambda: _clear_user_db(ctx)
+        ),
+    }
+
+def compare_reports(baseline: BenchReport, current: BenchReport, threshold: float = 0.2) -> list[str]:
+    # list regression messages, case is regressed if median is slower by more than threshold
+    base = {r.name: r for r in baseline.results}
+    regressions = []
+    for r in current.results:
+        b = base.get(r.name)
+        if b is None or b.median_ms == 0:
+            continue
+        change = r.median_ms / b.median_ms - 1
+        if change > threshold:
+            regressions.append(
+                f'{r.name}: median {b.median_ms:.2f}ms -> {r.median_ms:.2f}ms (+{change:.0%})'
+            )
+    return regressions
@@ -0,0 +1,369 @@
+from datetime import date, timedelta
+import random
+from pydantic import BaseModel, Field
+from sqlmodel import select, func as f
+from src.app.dao.orm import AcctORM, EntryORM, ExpenseORM, InvoiceORM, JournalORM, PaymentORM
+from src.app.model.const import SystemChartOfAcctNumber
+from src.app.model.accounts import Account, Chart
+from src.app.model.entity import Address, Contact, Customer, Supplier
+from src.app.model.enums import AcctType, CurType, EntityType, EntryType, ItemType, JournalSrc, UnitType
+from src.app.model.expense import ExpInfo, Expense, ExpenseItem, Merchant
+from src.app.model.invoice import Invoice, InvoiceItem, Item
+from src.app.model.journal import Entry, Journal
+from src.app.model.payment import Payment, PaymentItem
+from benchmark.context import BenchContext
+
+# rough fx level (local currency per 100 EUR), randomly walked per day
+FX_LEVELS = {
+    CurType.USD: 108, CurType.CAD: 148, CurType.CNY: 780, CurType.GBP: 85,
+    CurType.AUD: 165, CurType.JPY: 16000, CurType.EUR: 100, CurType.MOP: 870,
+    CurType.HKD: 845, CurType.CHF: 95, CurType.TWD: 3500, CurType.THB: 3800,
+    CurType.MXN: 1850, CurType.CUP: 2600, CurType.RUB: 9800,
+}
+
+class LedgerScale(BaseModel):
+    num_accounts: int = Field(20, description='Extra inc/exp/bank accounts on top of sample ones')
+    chart_depth: int = Field(2, description='Depth of extra charts under total income/expense')
+    num_journals: int = Field(500, description='Manual journals')
+    entries_per_journal: int = Field(4, ge=2)
+    num_entities: int = Field(10, description='Customers and suppliers (each)')
+    num_invoices: int = Field(100, description='Sales and purchase invoices (each)')
+    payment_ratio: float = Field(0.6, ge=0, le=1, description='Fraction of invoices get paid')
+    num_expenses: int = Field(200)
+    currencies: list[CurType] = Field([CurType.CAD, CurType.USD, CurType.EUR, CurType.JPY])
+    start_dt: date = Field(date(2024, 1, 1))
+    num_days: int = Field(365)
+    seed: int = Field(42)
+
+SCALES = {
+    'tiny': LedgerScale(
+        num_accounts=6, chart_depth=1, num_journals=20, entries_per_journal=3,
+        num_entities=2, num_invoices=5, num_expenses=5, num_days=30
+    ),
+    'small': LedgerScale(),
+    'medium': LedgerScale(
+        num_accounts=60, chart_depth=3, num_journals=5000, entries_per_journal=5,
+        num_entities=50, num_invoices=1000, num_expenses=2000,
+        currencies=[CurType.CAD, CurType.USD, CurType.EUR, CurType.JPY, CurType.GBP, CurType.CNY],
+        num_days=730
+    ),
+    'large': LedgerScale(
+        num_accounts=200, chart_depth=4, num_journals=50000, entries_per_journal=6,
+        num_entities=200, num_invoices=10000, num_expenses=20000,
+        currencies=[CurType.CAD, CurType.USD, CurType.EUR, CurType.JPY, CurType.GBP, CurType.CNY, CurType.AUD, CurType.HKD],
+        num_days=1825
+    ),
+}
+
+class LedgerGenerator:
+    # populate one tenant with realistic (balanced, fx consistent) data through the service layer
+
+    BATCH_SIZE = 500 # journals committed per unit of work
+
+    def __init__(self, ctx: BenchContext, scale: LedgerScale):
+        self.ctx = ctx
+        self.scale = scale
+        self.rnd = random.Random(scale.seed)
+        self.base_cur = CurType.CAD
+
+        self.inc_accts: list[Account] = []
+        self.exp_accts: list[Account] = []
+        self.blsh_accts: list[Account] = []
+        self.bank_accts: dict[CurType, Account] = {}
+        self.customers: list[Customer] = []
+        self.suppliers: list[Supplier] = []
+        self.sales_items: dict[CurType, Item] = {}
+        self.purchase_items: dict[CurType, Item] = {}
+
+    def _random_dt(self) -> date:
+        return self.scale.start_dt + timedelta(days=self.rnd.randrange(self.scale.num_days))
+
+    def _amount(self, low: float = 10, high: float = 5000) -> float:
+        return round(self.rnd.uniform(low, high), 2)
+
+    def setup_settings(self):
+        setting_service = self.ctx.setting_service
+        setting_service.set_base_currency(self.base_cur)
+        setting_service.set_default_tax_rate(0.13)
+        setting_service.set_par_share_price(0.01)
+
+    def seed_fx(self):
+        # offline synthetic rates, so fx service never goes to network
+        levels = {cur: float(lvl) for cur, lvl in FX_LEVELS.items()}
+        for d in range(self.scale.num_days + 31):
+            cur_dt = self.scale.start_dt + timedelta(days=d)
+            for cur in levels:
+                if cur != CurType.EUR:
+                    levels[cur] *= 1 + self.rnd.gauss(0, 0.003)
+            self.ctx.fx_dao.adds(
+                currencies=list(levels.keys()),
+                cur_dt=cur_dt,
+                rates=[round(v, 4) for v in levels.values()]
+            )
+
+    def setup_accounts(self):
+        acct_service = self.ctx.acct_service
+        acct_service.init()
+        acct_service.create_sample()
+
+        # nested charts under total income/expense
+        leaf_charts: dict[AcctType, list[Chart]] = {}
+        for acct_type, root_id in (
+            (AcctType.INC, SystemChartOfAcctNumber.TOTAL_INC),
+            (AcctType.EXP, SystemChartOfAcctNumber.TOTAL_EXP),
+        ):
+            parent = acct_service.get_chart(root_id)
+            leaf_charts[acct_type] = [parent]
+            for depth in range(self.scale.chart_depth):
+                for branch in range(2):
+                    chart = Chart(
+                        name=f'{acct_type.name} L{depth + 1}-{branch}',
+                        acct_type=acct_type
+                    )
+                    acct_service.add_chart(chart, parent.chart_id)
+                    leaf_charts[acct_type].append(chart)
+                parent = chart
+
+        # bank account per currency
+        bank_chart = acct_service.get_chart(SystemChartOfAcctNumber.BANK_ASSET)
+        self.bank_accts[self.base_cur] = acct_service.get_account('acct-bank')
+        self.bank_accts[CurType.USD] = acct_service.get_account('acct-fbank2')
+        self.bank_accts[CurType.JPY] = acct_service.get_account('acct-fbank')
+        for cur in self.scale.currencies:
+            if cur not in self.bank_accts:
+                acct = Account(
+                    acct_name=f'Bank Acct ({cur.name})',
+                    acct_type=AcctType.AST,
+                    currency=cur,
+                    chart=bank_chart
+                )
+                acct_service.add_account(acct)
+                self.bank_accts[cur] = acct
+
+        # extra inc/exp accounts spread over the nested charts
+        for i in range(self.scale.num_accounts):
+            acct_type = AcctType.INC if i % 3 == 0 else AcctType.EXP
+            acct = Account(
+                acct_name=f'{acct_type.name} Account {i}',
+                acct_type=acct_type,
+                chart=self.rnd.choice(leaf_charts[acct_type])
+            )
+            acct_service.add_account(acct)
+
+        self.inc_accts = [
+            a for c in acct_service.get_charts(AcctType.INC)
+            for a in acct_service.get_accounts_by_chart(c)
+            if not a.is_system
+        ]
+        self.exp_accts = [
+            a for c in acct_service.get_charts(AcctType.EXP)
+            for a in acct_service.get_accounts_by_chart(c)
+            if not a.is_system
+        ]
+        self.blsh_accts = list(self.bank_accts.values()) + [
+            acct_service.get_account('acct-credit'),
+            acct_service.get_account('acct-shareloan'),
+        ]
+
+    def setup_entities(self):
+        entity_service = self.ctx.entity_service
+        item_service = self.ctx.item_service
+        for i in range(self.scale.num_entities):
+            contact = Contact(
+                name=f'Entity {i}',
+                email=f'entity{i}@example.com',
+                phone='+1(416)555-0100',
+                address=Address(
+                    address1=f'{i + 1} King St W',
+                    city='Toronto',
+                    state='Ontario',
+                    country='Canada',
+                    postal_code='M5H1A1'
+                )
+            )
+            customer = Customer(customer_name=f'Customer {i}', bill_contact=contact)
+            supplier = Supplier(supplier_name=f'Supplier {i}', bill_contact=contact)
+            entity_service.add_customer(customer)
+            entity_service.add_supplier(supplier)
+            self.customers.append(customer)
+            self.suppliers.append(supplier)
+
+        for cur in self.scale.currencies:
+            sales_item = Item(
+                name=f'Consulting ({cur.name})',
+                item_type=ItemType.SERVICE,
+                entity_type=EntityType.CUSTOMER,
+                unit=UnitType.HOUR,
+                unit_price=self._amount(50, 300),
+                currency=cur,
+                default_acct_id=self.rnd.choice(self.inc_accts).acct_id
+            )
+            purchase_item = Item(
+                name=f'Material ({cur.name})',
+                item_type=ItemType.GOOD,
+                entity_type=EntityType.SUPPLIER,
+                unit=UnitType.PIECE,
+                unit_price=self._amount(5, 100),
+                currency=cur,
+                default_acct_id=self.rnd.choice(self.exp_accts).acct_id
+            )
+            item_service.add_item(sales_item)
+            item_service.add_item(purchase_item)
+            self.sales_items[cur] = sales_item
+            self.purchase_items[cur] = purchase_item
+
+    def _make_entry(self, acct: Account, entry_type: EntryType, amount_base: float, jrn_dt: date) -> Entry:
+        fx_service = self.ctx.fx_service
+        if acct.is_balance_sheet:
+            return Entry(
+                entry_type=entry_type,
+                acct=acct,
+                cur_incexp=None,
+                amount=fx_service.convert_from_base(amount_base, acct.currency, jrn_dt), # type: ignore
+                amount_base=amount_base
+            )
+        cur = self.rnd.choice(self.scale.currencies)
+        return Entry(
+            entry_type=entry_type,
+            acct=acct,
+            cur_incexp=cur,
+            amount=amount_base if cur == self.base_cur else fx_service.convert_from_base(amount_base, cur, jrn_dt),
+            amount_base=amount_base
+        )
+
+    def make_journal(self) -> Journal:
+        jrn_dt = self._random_dt()
+        accts = self.inc_accts + self.exp_accts + self.blsh_accts
+        entries = []
+        net = 0.0 # debit - credit in base amount
+        for _ in range(self.scale.entries_per_journal - 1):
+            acct = self.rnd.choice(accts)
+            entry_type = self.rnd.choice((EntryType.DEBIT, EntryType.CREDIT))
+            amount_base = self._amount()
+            net += amount_base if entry_type == EntryType.DEBIT else -amount_base
+            entries.append(self._make_entry(acct, entry_type, amount_base, jrn_dt))
+        # last entry in base currency bank to balance the journal
+        entries.append(
+            self._make_entry(
+                self.bank_accts[self.base_cur],
+                EntryType.CREDIT if net >= 0 else EntryType.DEBIT,
+                abs(net),
+                jrn_dt
+            )
+        )
+        return Journal(
+            jrn_date=jrn_dt,
+            entries=entries,
+            jrn_src=JournalSrc.MANUAL,
+            note='benchmark journal'
+        )
+
+    def add_journals(self):
+        journal_service = self.ctx.journal_service
+        for start in range(0, self.scale.num_journals, self.BATCH_SIZE):
+            with self.ctx.dao_access.unit_of_work():
+                for _ in range(start, min(start + self.BATCH_SIZE, self.scale.num_journals)):
+                    journal_service.add_journal(self.make_journal())
+
+    def add_invoices(self):
+        fx_service = self.ctx.fx_service
+        for entity_type, service, entities, items in (
+            (EntityType.CUSTOMER, self.ctx.sales_service, self.customers, self.sales_items),
+            (EntityType.SUPPLIER, self.ctx.purchase_service, self.suppliers, self.purchase_items),
+        ):
+            for i in range(self.scale.num_invoices):
+                cur = self.rnd.choice(self.scale.currencies)
+                entity = self.rnd.choice(entities)
+                invoice_dt = self._random_dt()
+                invoice = Invoice(
+                    entity_type=entity_type,
+                    entity_id=entity.cust_id if entity_type == EntityType.CUSTOMER else entity.supplier_id, # type: ignore
+                    invoice_num=f'{entity_type.name[:4]}-{i:06d}',
+                    invoice_dt=invoice_dt,
+                    due_dt=invoice_dt + timedelta(days=30),
+                    subject=f'Benchmark invoice {i}',
+                    currency=cur,
+                    invoice_items=[
+                        InvoiceItem(
+                            item=items[cur],
+                            quantity=self.rnd.randint(1, 40),
+                            tax_rate=0.13,
+                            discount_rate=self.rnd.choice((0, 0, 0.05, 0.1))
+                        )
+                        for _ in range(self.rnd.randint(1, 3))
+                    ]
+                )
+                service.add_invoice(invoice)
+
+                if self.rnd.random() >= self.scale.payment_ratio:
+                    continue
+                payment_dt = invoice_dt + timedelta(days=self.rnd.randint(0, 30))
+                # pay from same currency bank if any, otherwise base currency bank
+                bank = self.bank_accts.get(cur, self.bank_accts[self.base_cur])
+                payment = Payment(
+                    payment_num=f'PMT-{entity_type.name[:4]}-{i:06d}',
+                    payment_dt=payment_dt,
+                    entity_type=entity_type,
+                    payment_items=[
+                        PaymentItem(
+                            invoice_id=invoice.invoice_id,
+                            payment_amount=fx_service.convert(
+                                invoice.total, # type: ignore
+                                src_currency=cur,
+                                tgt_currency=bank.currency, # type: ignore
+                                cur_dt=payment_dt
+                            ) if bank.currency != cur else invoice.total, # type: ignore
+                            payment_amount_raw=invoice.total, # type: ignore
+                        )
+                    ],
+                    payment_acct_id=bank.acct_id,
+                    payment_fee=self.rnd.choice((0, 0, 5, 15))
+                )
+                service.add_payment(payment)
+
+    def add_expenses(self):
+        fx_service = self.ctx.fx_service
+        for i in range(self.scale.num_expenses):
+            cur = self.rnd.choice(self.scale.currencies)
+            expense_dt = self._random_dt()
+            bank = self.rnd.choice(list(self.bank_accts.values()))
+            expense = Expense(
+                expense_dt=expense_dt,
+                currency=cur,
+                expense_items=[
+                    ExpenseItem(
+                        expense_acct_id=self.rnd.choice(self.exp_accts).acct_id,
+                        amount_pre_tax=self._amount(5, 500),
+                        tax_rate=self.rnd.choice((0, 0.13))
+                    )
+                    for _ in range(self.rnd.randint(1, 3))
+                ],
+                payment_acct_id=bank.acct_id,
+                payment_amount=0,
+                exp_info=ExpInfo(merchant=Merchant(merchant=f'Merchant {i % 50}'))
+            )
+            expense.payment_amount = expense.total if bank.currency == cur else fx_service.convert( # type: ignore
+                expense.total, # type: ignore
+                src_currency=cur,
+                tgt_currency=bank.currency, # type: ignore
+                cur_dt=expense_dt
+            )
+            self.ctx.expense_service.add_expense(expense)
+
+    def generate(self) -> dict[str, int]:
+        self.setup_settings()
+        self.seed_fx()
+        self.setup_accounts()
+        self.setup_entities()
+        self.add_journals()
+        self.add_invoices()
+        self.add_expenses()
+        return self.counts()
+
+    def counts(self) -> dict[str, int]:
+        # row counts of the generated tenant, recorded along with timings
+        session = self.ctx.dao_access.user_session
+        return {
+            orm.__tablename__: session.exec(select(f.count()).select_from(orm)).one() # type: ignore
+            for orm in (AcctORM, JournalORM, EntryORM, InvoiceORM, PaymentORM, ExpenseORM)
+        }
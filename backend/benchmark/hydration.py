@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+import statistics
+import time
+from pydantic import BaseModel
+from src.app.dao.journal import journalDao
+from src.app.dao.orm import EntryORM, JournalORM
+from src.app.model.accounts import Account, Chart
+from src.app.model.enums import AcctType, CurType, EntryType, JournalSrc
+
+# objects/sec of dao converters on in-memory rows, no db involved so only model building is timed
+
+class HydrationStat(BaseModel):
+    median_s: float
+    objects_per_s: float
+
+class HydrationReport(BaseModel):
+    num_journals: int
+    num_entries: int
+    repeat: int
+    validated: HydrationStat
+    trusted: HydrationStat
+
+    @property
+    def speedup(self) -> float:
+        return self.trusted.objects_per_s / self.validated.objects_per_s
+
+def _make_rows(num_entries: int, entries_per_journal: int) -> tuple[list[tuple[JournalORM, list[EntryORM]]], dict[str, Account]]:
+    accts = {
+        'acct-bank': Account(
+            acct_id='acct-bank',
+            acct_name='Bank',
+            acct_type=AcctType.AST,
+            currency=CurType.CAD,
+            chart=Chart(name='Bank', acct_type=AcctType.AST)
+        ),
+        'acct-sales': Account(
+            acct_id='acct-sales',
+            acct_name='Sales',
+            acct_type=AcctType.INC,
+            chart=Chart(name='Sales', acct_type=AcctType.INC)
+        ),
+    }
+    rows = []
+    for j in range(num_entries // entries_per_journal):
+        journal_id = f'jrn-bench{j:08d}'
+        entry_orms = []
+        for e in range(entries_per_journal):
+            debit = e % 2 == 0
+            entry_orms.append(EntryORM(
+                entry_id=f'entr-b{j:08d}{e:02d}',
+                journal_id=journal_id,
+                entry_type=EntryType.DEBIT if debit else EntryType.CREDIT,
+                acct_id='acct-bank' if debit else 'acct-sales',
+                cur_incexp=None if debit else CurType.CAD,
+                amount=100.0,
+                amount_base=100.0,
+                description=None
+            ))
+        rows.append((
+            JournalORM(
+                journal_id=journal_id,
+                jrn_date=date(2024, 1, 1) + timedelta(days=j % 365),
+                jrn_src=JournalSrc.MANUAL,
+                note=None
+            ),
+            entry_orms
+        ))
+    return rows, accts
+
+def measure_hydration(num_entries: int = 10000, entries_per_journal: int = 2, repeat: int = 5) -> HydrationReport:
+    rows, accts = _make_rows(num_entries, entries_per_journal)
+    dao = journalDao(dao_access=None) # type: ignore # converters never touch db with preloaded accounts
+    num_objects = len(rows) + sum(len(entry_orms) for _, entry_orms in rows)
+
+    stats = {}
+    for validate in (True, False):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for journal_orm, entry_orms in rows:
+                dao.toJournal(journal_orm, entry_orms, accts=accts, validate=validate)
+            timings.append(time.perf_counter() - start)
+        median_s = statistics.median(timings)
+        stats[validate] = HydrationStat(
+            median_s=median_s,
+            objects_per_s=num_objects / median_s
+        )
+    return HydrationReport(
+        num_journals=len(rows),
+        num_entries=num_objects - len(rows),
+        repeat=repeat,
+        validated=stats[True],
+        trusted=stats[False],
+    )
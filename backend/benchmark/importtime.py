@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+from pydantic import BaseModel
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent.as_posix()
+ENTRY_MODULE = 'src.web.main'
+IMPORT_BUDGET_S = 10.0 # cold import of the api process on CI runner, tighten as it improves
+# heavy dependencies that must only be imported when actually used
+DEFERRED_MODULES = ('hvac', 'currency_converter', 's3fs', 'aiobotocore', 'requests')
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {deferred!r} if m in sys.modules]}}))
+'''
+
+class ImportStat(BaseModel):
+    module: str
+    self_ms: float
+    cumulative_ms: float
+
+class ImportTimeReport(BaseModel):
+    module: str
+    repeat: int
+    median_s: float
+    min_s: float
+    budget_s: float
+    eager_modules: list[str] # deferred modules that still got imported
+    top_imports: list[ImportStat]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.median_s > self.budget_s
+
+def _run_probe(module: str) -> dict:
+    # fresh interpreter each time, so nothing is cached in sys.modules
+    result = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(module=module, deferred=DEFERRED_MODULES)],
+        cwd=BACKEND_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def parse_importtime(stderr: str, max_depth: int = 1) -> list[ImportStat]:
+    # lines look like: "import time:      1234 |       5678 |   package.module" (microseconds)
+    # name is indented 2 spaces per nesting level, nested cumulative time is already in its parent
+    stats = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        name = parts[2][1:] # one space after separator
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        if depth > max_depth:
+            continue
+        stats.append(ImportStat(
+            module=name.strip(),
+            self_ms=int(parts[0]) / 1000,
+            cumulative_ms=int(parts[1]) / 1000,
+        ))
+    return stats
+
+def top_imports(module: str = ENTRY_MODULE, limit: int = 15) -> list[ImportStat]:
+    # slowest direct imports of the entry module
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_ROOT, capture_output=True, text=True, check=True
+    )
+    stats = [s for s in parse_importtime(result.stderr) if s.module != module]
+    return sorted(stats, key=lambda s: s.cumulative_ms, reverse=True)[:limit]
+
+def measure_import(
+    module: str = ENTRY_MODULE,
+    repeat: int = 5,
+    budget_s: float = IMPORT_BUDGET_S,
+    limit: int = 15
+) -> ImportTimeReport:
+    probes = [_run_probe(module) for _ in range(repeat)]
+    timings = sorted(p['elapsed'] for p in probes)
+    return ImportTimeReport(
+        module=module,
+        repeat=repeat,
+        median_s=statistics.median(timings),
+        min_s=timings[0],
+        budget_s=budget_s,
+        eager_modules=probes[-1]['loaded'],
+        top_imports=top_imports(module, limit=limit),
+    )
@@ -8,6 +8,7 @@ from src.app.model.enums import AcctType
 from src.app.model.accounts import Account, Chart, ChartNode
 from src.app.dao.orm import ChartOfAccountORM, AcctORM, infer_integrity_error
 from src.app.dao.connection import UserDaoAccess
+from src.app.utils.base import VALIDATE_DB_READS
 
 class chartOfAcctDao:
     
@@ -167,8 +168,9 @@ class chartOfAcctDao:
                     raise FKNoDeleteUpdateError(details=str(e))
             
     
-    def toChart(self, chart_orm: ChartOfAccountORM) -> Chart:
-        return Chart(
+    def toChart(self, chart_orm: ChartOfAccountORM, validate: bool = VALIDATE_DB_READS) -> Chart:
+        return Chart.hydrate(
+            validate=validate,
             chart_id=chart_orm.chart_id,
             name=chart_orm.node_name,
             acct_type=chart_orm.acct_type,
@@ -235,8 +237,9 @@ class acctDao:
             chart_id=acct.chart.chart_id,
         )
         
-    def toAcct(self, acct_orm: AcctORM, chart: Chart) -> Account:
-        return Account(
+    def toAcct(self, acct_orm: AcctORM, chart: Chart, validate: bool = VALIDATE_DB_READS) -> Account:
+        return Account.hydrate(
+            validate=validate,
             acct_id=acct_orm.acct_id,
             acct_name=acct_orm.acct_name,
             acct_type=acct_orm.acct_type,
@@ -249,7 +252,7 @@ class acctDao:
         self.dao_access.user_session.add(acct_orm)
         
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -263,7 +266,7 @@ class acctDao:
         
         try:
             self.dao_access.user_session.delete(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(details=str(e))
@@ -286,7 +289,7 @@ class acctDao:
 
             try:
                 self.dao_access.user_session.add(p)
-                self.dao_access.user_session.commit()
+                self.dao_access.commit()
             except IntegrityError as e:
                 # if integrity error happened here, must certainly it is because
                 # updated chart_id does not exist
@@ -323,4 +326,29 @@ class acctDao:
         except NoResultFound as e:
             raise NotExistError(details=str(e))
             
-        return [self.toAcct(acct_orm, chart) for acct_orm in acct_orms]
\ No newline at end of file
+        return [self.toAcct(acct_orm, chart) for acct_orm in acct_orms]
+    
+    def get_accts_by_charts(self, charts: list[Chart]) -> list[Account]:
+        # accounts under any of the charts in one query
+        chart_map = {chart.chart_id: chart for chart in charts}
+        sql = select(AcctORM).where(
+            AcctORM.chart_id.in_(chart_map.keys()) # type: ignore
+        )
+        acct_orms = self.dao_access.user_session.exec(sql).all()
+        return [self.toAcct(acct_orm, chart_map[acct_orm.chart_id]) for acct_orm in acct_orms]
+    
+    def get_accts_by_ids(self, acct_ids: list[str]) -> dict[str, Account]:
+        # accounts together with their charts in one query, keyed by acct id
+        sql = (
+            select(AcctORM, ChartOfAccountORM)
+            .join(ChartOfAccountORM, onclause=AcctORM.chart_id == ChartOfAccountORM.chart_id)
+            .where(AcctORM.acct_id.in_(set(acct_ids))) # type: ignore
+        )
+        rows = self.dao_access.user_session.exec(sql).all()
+        charts = {}
+        accts = {}
+        for acct_orm, chart_orm in rows:
+            if chart_orm.chart_id not in charts:
+                charts[chart_orm.chart_id] = chartOfAcctDao(self.dao_access).toChart(chart_orm)
+            accts[acct_orm.acct_id] = self.toAcct(acct_orm, charts[chart_orm.chart_id])
+        return accts
@@ -57,6 +57,9 @@ def migrate_database(src_engine: Engine, tgt_engine: Engine, collection: str):
         for table in tgt_metadata.sorted_tables:
             stmt = table.insert()
             # read objects from file system
+            if table.name not in src_metadata.tables:
+                # table added after the backup was taken
+                continue
             with Session(src_engine) as e:            
                 src_table = src_metadata.tables[table.name]
                 
@@ -1,7 +1,10 @@
 from pathlib import Path
 from typing import Any
 import json
+from sqlmodel import select
+from src.app.utils.metrics import record_cache
 from src.app.utils.tools import LocalCacheKVStore
+from src.app.dao.orm import DATA_VERSION_DOMAINS, DataVersionORM
 from src.app.dao.connection import UserDaoAccess
 from src.app.utils.tools import get_files_bucket
 
@@ -35,12 +38,15 @@ class configDao:
                 key=key
             )
         except (TimeoutError, KeyError) as e:
+            record_cache('config', hit=False)
             v = self.get_config().get(key)
             self.LOCAL_CACHE.put(
                 space=self.dao_access.user.user_id,
                 key=key,
                 value=v
             )
+        else:
+            record_cache('config', hit=True)
         return v
     
     def set_config_value(self, key: str, value: Any):
@@ -57,4 +63,16 @@ class configDao:
         filepath = self.getConfigPath()
         fs = self.dao_access.file_fs
         with fs.open(filepath, 'w') as obj:
-            json.dump(config, obj, indent=4)
\ No newline at end of file
+            json.dump(config, obj, indent=4)
+            
+    def get_data_versions(self) -> dict[str, str]:
+        # domain -> version token, domain never written gets initial version
+        sql = select(DataVersionORM)
+        versions = {
+            p.domain: p.version 
+            for p in self.dao_access.user_session.exec(sql).all()
+        }
+        return {
+            domain: versions.get(domain, 'v-0')
+            for domain in DATA_VERSION_DOMAINS
+        }
@@ -1,12 +1,17 @@
+from contextlib import contextmanager
+import logging
 from pathlib import Path
-from typing import Generator, Literal
+from typing import Callable, Generator, Literal
 from fsspec import AbstractFileSystem
-from pydantic import BaseModel
+from sqlalchemy import event
 from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState
 from sqlmodel import Session, create_engine
 from functools import lru_cache
 from src.app.model.user import User
-from src.app.utils.tools import get_secret
+from src.app.dao.orm import DATA_VERSION_DOMAINS, DataVersionORM
+from src.app.utils.metrics import register_engine
+from src.app.utils.tools import get_secret, id_generator
 
 def get_db_url(db: str) -> str:
     config = get_secret()['database']
@@ -19,6 +24,7 @@ def get_engine(db: str = 'common') -> Engine:
 
     db_url = get_db_url(db)
     engine = create_engine(db_url, pool_size=10)
+    register_engine('common' if db == 'common' else 'user', engine)
     return engine
 
 @lru_cache
@@ -62,23 +68,160 @@ def get_storage_fs(type_: Literal['files', 'backup'] = 'files') -> AbstractFileS
     return s3a
 
 
-class CommonDaoAccess(BaseModel):
+class CommonDaoAccess:
     # all access needed for common operation
-     
-    class Config:
-        arbitrary_types_allowed = True
+    # plain slotted object, built on every request so no validation/copy overhead
+    __slots__ = ('common_engine', 'common_session', 'file_fs', 'backup_fs')
     
-    common_engine: Engine
-    common_session: Session
-    file_fs: AbstractFileSystem # TODO: move user specific?
-    backup_fs: AbstractFileSystem
+    def __init__(
+        self, 
+        *, 
+        common_engine: Engine, 
+        common_session: Session, 
+        file_fs: AbstractFileSystem, # TODO: move user specific?
+        backup_fs: AbstractFileSystem
+    ):
+        self.common_engine = common_engine
+        self.common_session = common_session
+        self.file_fs = file_fs
+        self.backup_fs = backup_fs
 
 class UserDaoAccess(CommonDaoAccess):
     # all access needed for user specific operation
+    __slots__ = ('user', 'user_engine', 'user_session')
     
-    user: User
+    def __init__(
+        self, 
+        *, 
+        user: User, 
+        common_engine: Engine, 
+        user_engine: Engine, 
+        common_session: Session, 
+        user_session: Session, 
+        file_fs: AbstractFileSystem, 
+        backup_fs: AbstractFileSystem
+    ):
+        super().__init__(
+            common_engine=common_engine,
+            common_session=common_session,
+            file_fs=file_fs,
+            backup_fs=backup_fs
+        )
+        self.user = user
+        self.user_engine = user_engine
+        self.user_session = user_session
+    
+    @property
+    def in_unit_of_work(self) -> bool:
+        # state is kept on session so all daos sharing the session see the same scope
+        return self.user_session.info.get('unit_of_work', False)
+    
+    @contextmanager
+    def unit_of_work(self) -> Generator[Session, None, None]:
+        # one transaction spanning multiple dao writes, commit once on exit or rollback on error
+        # nested scope joins the outermost one
+        if self.in_unit_of_work:
+            yield self.user_session
+            return
+        
+        self.user_session.info['unit_of_work'] = True
+        try:
+            yield self.user_session
+            self.user_session.commit()
+        except Exception:
+            self.user_session.rollback()
+            raise
+        finally:
+            self.user_session.info['unit_of_work'] = False
+            
+    def commit(self):
+        # dao only flush within unit of work, the scope will commit
+        if self.in_unit_of_work:
+            self.user_session.flush()
+        else:
+            self.user_session.commit()
+            
+    def on_commit(self, func: Callable[[], None]):
+        # side effect outside db (e.g., delete object from storage) to run only once the transaction is committed
+        # within unit of work this is when the scope exits, dropped if rolled back
+        self.user_session.info.setdefault('on_commit', []).append(func)
+
+@contextmanager
+def open_common_dao_access() -> Generator[CommonDaoAccess, None, None]:
+    # for work outside of a request (e.g., background jobs), session is closed on exit
+    common_engine = get_engine('common')
+    with Session(common_engine) as common_session:
+        yield CommonDaoAccess(
+            common_engine=common_engine,
+            common_session=common_session,
+            file_fs=get_storage_fs('files'),
+            backup_fs=get_storage_fs('backup')
+        )
 
-    common_engine: Engine
-    user_engine: Engine
-    common_session: Session
-    user_session: Session
\ No newline at end of file
+@contextmanager
+def open_user_dao_access(user: User) -> Generator[UserDaoAccess, None, None]:
+    common_engine = get_engine('common')
+    user_engine = get_engine(user.user_id)
+    with (
+        Session(common_engine) as common_session,
+        Session(user_engine) as user_session
+    ):
+        yield UserDaoAccess(
+            user=user,
+            file_fs=get_storage_fs('files'),
+            backup_fs=get_storage_fs('backup'),
+            common_engine=common_engine,
+            user_engine=user_engine,
+            common_session=common_session,
+            user_session=user_session
+        )
+
+@event.listens_for(Session, 'after_flush')
+def track_flushed_tables(session: Session, flush_context):
+    # record tables written by this transaction, used to bump data versions on commit
+    touched = session.info.setdefault('touched_tables', set())
+    for obj in list(session.new) + list(session.deleted):
+        touched.add(getattr(obj, '__tablename__', None))
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            touched.add(getattr(obj, '__tablename__', None))
+            
+@event.listens_for(Session, 'do_orm_execute')
+def track_executed_tables(orm_execute_state: ORMExecuteState):
+    # bulk insert/update/delete statements bypass flush
+    if orm_execute_state.is_select or orm_execute_state.bind_mapper is None:
+        return
+    touched = orm_execute_state.session.info.setdefault('touched_tables', set())
+    touched.add(orm_execute_state.bind_mapper.local_table.name) # type: ignore
+    
+@event.listens_for(Session, 'before_commit')
+def bump_data_versions(session: Session):
+    session.flush() # make sure pending writes are tracked
+    touched = session.info.pop('touched_tables', set())
+    for domain, tables in DATA_VERSION_DOMAINS.items():
+        if touched.intersection(tables):
+            # random token instead of counter so a restored db never reuses a seen version
+            session.merge(
+                DataVersionORM(
+                    domain=domain,
+                    version=id_generator(prefix='v-', length=11)
+                )
+            )
+            
+@event.listens_for(Session, 'after_rollback')
+def reset_transaction_state(session: Session):
+    if session.in_nested_transaction():
+        return # only savepoint rolled back, outer transaction goes on
+    session.info.pop('touched_tables', None)
+    session.info.pop('on_commit', None) # side effects of the rolled back transaction are dropped
+    
+@event.listens_for(Session, 'after_commit')
+def run_on_commit(session: Session):
+    if session.in_nested_transaction():
+        return # savepoint released, outer transaction can still roll back
+    for func in session.info.pop('on_commit', []):
+        try:
+            func()
+        except Exception:
+            # db is already settled, leftover on storage is harmless
+            logging.exception("Post commit callback failed")
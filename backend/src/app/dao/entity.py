@@ -1,6 +1,7 @@
 import logging
 from sqlmodel import Session, select
 from sqlalchemy.exc import NoResultFound, IntegrityError
+from sqlalchemy.orm import aliased
 from src.app.model.enums import EntityType
 from src.app.dao.orm import ContactORM, EntityORM, EntityORM, infer_integrity_error
 from src.app.model.entity import _ContactBrief, _CustomerBrief, _SupplierBrief, Address, Contact, Customer, Supplier
@@ -36,7 +37,7 @@ class contactDao:
         contact_orm = self.fromContact(contact)
         self.dao_access.user_session.add(contact_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise AlreadyExistError(details=str(e))
@@ -51,7 +52,7 @@ class contactDao:
         
         try:
             self.dao_access.user_session.delete(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(details=str(e))
@@ -75,7 +76,7 @@ class contactDao:
             p.address = contact_orm.address
             
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
             self.dao_access.user_session.refresh(p) # update p to instantly have new values
                 
 
@@ -96,6 +97,18 @@ class contactDao:
         return [_ContactBrief(contact_id=c.contact_id, name=c.name) for c in contacts]
     
 
+def entity_with_contacts_sql(entity_type: EntityType):
+    # entity together with its bill and ship contact, one row per entity
+    bill_contact = aliased(ContactORM, name='bill_contact')
+    ship_contact = aliased(ContactORM, name='ship_contact')
+    return (
+        select(EntityORM, bill_contact, ship_contact)
+        .join(bill_contact, onclause=EntityORM.bill_contact_id == bill_contact.contact_id)
+        .join(ship_contact, onclause=EntityORM.ship_contact_id == ship_contact.contact_id, isouter=True)
+        .where(EntityORM.entity_type == entity_type)
+    )
+    
+
 class customerDao:
     
     def __init__(self, dao_access: UserDaoAccess):
@@ -126,7 +139,7 @@ class customerDao:
         customer_orm = self.fromCustomer(customer)
         self.dao_access.user_session.add(customer_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -143,7 +156,7 @@ class customerDao:
 
         try:
             self.dao_access.user_session.delete(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(details=str(e))
@@ -169,20 +182,41 @@ class customerDao:
             p.ship_contact_id = customer_orm.ship_contact_id
             
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
             self.dao_access.user_session.refresh(p) # update p to instantly have new values
             
-    def get(self, cust_id: str, bill_contact: Contact, ship_contact: Contact | None) -> Customer:
-        sql = select(EntityORM).where(
-            EntityORM.entity_id == cust_id,
-            EntityORM.entity_type == EntityType.CUSTOMER
+    def get(self, cust_id: str) -> Customer:
+        # customer with its contacts in one query
+        sql = entity_with_contacts_sql(EntityType.CUSTOMER).where(
+            EntityORM.entity_id == cust_id
         )
         try:
-            p = self.dao_access.user_session.exec(sql).one() # get the customer
+            p, bill_contact, ship_contact = self.dao_access.user_session.exec(sql).one() # get the customer
         except NoResultFound as e:
             raise NotExistError(details=str(e))
-            
-        return self.toCustomer(p, bill_contact, ship_contact)
+        
+        contact_dao = contactDao(self.dao_access)
+        return self.toCustomer(
+            p, 
+            contact_dao.toContact(bill_contact), 
+            contact_dao.toContact(ship_contact) if ship_contact else None
+        )
+    
+    def get_many(self, cust_ids: list[str]) -> list[Customer]:
+        # bulk version of get, in the order of given ids, non-existing ids are skipped
+        sql = entity_with_contacts_sql(EntityType.CUSTOMER).where(
+            EntityORM.entity_id.in_(set(cust_ids)) # type: ignore
+        )
+        contact_dao = contactDao(self.dao_access)
+        customers = {
+            p.entity_id: self.toCustomer(
+                p, 
+                contact_dao.toContact(bill_contact), 
+                contact_dao.toContact(ship_contact) if ship_contact else None
+            )
+            for p, bill_contact, ship_contact in self.dao_access.user_session.exec(sql).all()
+        }
+        return [customers[i] for i in dict.fromkeys(cust_ids) if i in customers]
     
     def get_bill_ship_contact_ids(self, cust_id: str) -> tuple[str, str | None]:
         # return bill_contact_id, ship_contact_id
@@ -247,7 +281,7 @@ class supplierDao:
         supplier_orm = self.fromSupplier(supplier)
         self.dao_access.user_session.add(supplier_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -264,7 +298,7 @@ class supplierDao:
     
         try:
             self.dao_access.user_session.delete(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(details=str(e))
@@ -289,20 +323,41 @@ class supplierDao:
             p.ship_contact_id = supplier_orm.ship_contact_id
             
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
             self.dao_access.user_session.refresh(p) # update p to instantly have new values
             
-    def get(self, supplier_id: str, bill_contact: Contact, ship_contact: Contact | None) -> Supplier:
-        sql = select(EntityORM).where(
-            EntityORM.entity_id == supplier_id,
-            EntityORM.entity_type == EntityType.SUPPLIER
+    def get(self, supplier_id: str) -> Supplier:
+        # supplier with its contacts in one query
+        sql = entity_with_contacts_sql(EntityType.SUPPLIER).where(
+            EntityORM.entity_id == supplier_id
         )
         try:
-            p = self.dao_access.user_session.exec(sql).one() # get the supplier
+            p, bill_contact, ship_contact = self.dao_access.user_session.exec(sql).one() # get the supplier
         except NoResultFound as e:
             raise NotExistError(details=str(e))
-            
-        return self.toSupplier(p, bill_contact, ship_contact)
+        
+        contact_dao = contactDao(self.dao_access)
+        return self.toSupplier(
+            p, 
+            contact_dao.toContact(bill_contact), 
+            contact_dao.toContact(ship_contact) if ship_contact else None
+        )
+    
+    def get_many(self, supplier_ids: list[str]) -> list[Supplier]:
+        # bulk version of get, in the order of given ids, non-existing ids are skipped
+        sql = entity_with_contacts_sql(EntityType.SUPPLIER).where(
+            EntityORM.entity_id.in_(set(supplier_ids)) # type: ignore
+        )
+        contact_dao = contactDao(self.dao_access)
+        suppliers = {
+            p.entity_id: self.toSupplier(
+                p, 
+                contact_dao.toContact(bill_contact), 
+                contact_dao.toContact(ship_contact) if ship_contact else None
+            )
+            for p, bill_contact, ship_contact in self.dao_access.user_session.exec(sql).all()
+        }
+        return [suppliers[i] for i in dict.fromkeys(supplier_ids) if i in suppliers]
     
     def get_bill_ship_contact_ids(self, supplier_id: str) -> tuple[str, str | None]:
         # return bill_contact_id, ship_contact_id
@@ -9,6 +9,7 @@ from src.app.model.expense import _ExpenseBrief, _ExpenseSummaryBrief, ExpenseIt
 from src.app.dao.orm import AcctORM, EntryORM, ExpenseItemORM, ExpenseORM, infer_integrity_error
 from src.app.model.exceptions import AlreadyExistError, FKNotExistError, NotExistError, FKNoDeleteUpdateError
 from src.app.dao.connection import UserDaoAccess
+from src.app.utils.base import VALIDATE_DB_READS
 
 
 class expenseDao:
@@ -27,8 +28,9 @@ class expenseDao:
         )
         
     
-    def toExpenseItem(self, expense_item_orm: ExpenseItemORM) -> ExpenseItem:
-        return ExpenseItem(
+    def toExpenseItem(self, expense_item_orm: ExpenseItemORM, validate: bool = VALIDATE_DB_READS) -> ExpenseItem:
+        return ExpenseItem.hydrate(
+            validate=validate,
             expense_item_id=expense_item_orm.expense_item_id,
             expense_acct_id=expense_item_orm.expense_acct_id,
             amount_pre_tax=expense_item_orm.amount_pre_tax,
@@ -51,49 +53,50 @@ class expenseDao:
         )
         
     
-    def toExpense(self, expense_orm: ExpenseORM, expense_item_orms: list[ExpenseItemORM]) -> Expense:
+    def toExpense(
+        self, 
+        expense_orm: ExpenseORM, 
+        expense_item_orms: list[ExpenseItemORM], 
+        validate: bool = VALIDATE_DB_READS
+    ) -> Expense:
         # receipts should be list or None
         if expense_orm.receipts == 'null':
             expense_orm.receipts = None
         
-        return Expense(
+        return Expense.hydrate(
+            validate=validate,
             expense_id=expense_orm.expense_id,
             expense_dt=expense_orm.expense_dt,
             currency=expense_orm.currency,
             expense_items=[
-                self.toExpenseItem(expense_item_orm) 
+                self.toExpenseItem(expense_item_orm, validate=validate) 
                 for expense_item_orm in expense_item_orms
             ],
             payment_acct_id=expense_orm.payment_acct_id,
             payment_amount=expense_orm.payment_amount,
-            exp_info=ExpInfo.model_validate(expense_orm.exp_info),
+            exp_info=ExpInfo.model_validate(expense_orm.exp_info), # json column, nested models need parsing
             receipts=expense_orm.receipts,
             note=expense_orm.note,
         )
         
     
     def add(self, journal_id: str, expense: Expense):
-        # add expense first
-        expense_orm = self.fromExpense(journal_id, expense)
-        
-        self.dao_access.user_session.add(expense_orm)
         try:
-            self.dao_access.user_session.commit()
-        except IntegrityError as e:
-            self.dao_access.user_session.rollback()
-            raise infer_integrity_error(e, during_creation=True)
-        
-        # add expense items
-        for expense_item in expense.expense_items:
-            expense_item_orm = self.fromExpenseItem(
-                expense_id=expense.expense_id,
-                expense_item=expense_item
-            )
-            self.dao_access.user_session.add(expense_item_orm)
-        
-        # commit all items
-        try:
-            self.dao_access.user_session.commit()
+            # add expense first, flush so it is inserted before items
+            expense_orm = self.fromExpense(journal_id, expense)
+            self.dao_access.user_session.add(expense_orm)
+            self.dao_access.user_session.flush()
+            
+            # add expense items
+            for expense_item in expense.expense_items:
+                expense_item_orm = self.fromExpenseItem(
+                    expense_id=expense.expense_id,
+                    expense_item=expense_item
+                )
+                self.dao_access.user_session.add(expense_item_orm)
+            
+            # commit expense and all items at same time
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -113,7 +116,7 @@ class expenseDao:
             )
             self.dao_access.user_session.exec(sql) # type: ignore
             
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(details=str(e))
@@ -176,7 +179,7 @@ class expenseDao:
         
         try:
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNotExistError(
@@ -200,7 +203,7 @@ class expenseDao:
             )
             self.dao_access.user_session.add(expense_item_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback() # will rollback both item removal and new item add
             raise FKNotExistError(
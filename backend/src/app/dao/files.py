@@ -1,82 +1,281 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+import hashlib
+import io
+import os
 from pathlib import Path
+import tempfile
+import time
+from typing import BinaryIO, Generator, Tuple
 from sqlalchemy.exc import NoResultFound, IntegrityError
-from sqlmodel import Session, select, delete, case, func as f
-from src.app.utils.tools import get_files_bucket
-from src.app.model.misc import FileWrapper
-from src.app.dao.orm import FileORM, infer_integrity_error
+from sqlmodel import Session, select, update, delete, case, func as f
+from src.app.utils.tools import get_files_bucket, id_generator
+from src.app.model.misc import FileWrapper, _FileInfo
+from src.app.dao.orm import FileBlobORM, FileORM, infer_integrity_error
 from src.app.model.exceptions import AlreadyExistError, FKNoDeleteUpdateError, FKNotExistError, NotExistError
 from src.app.dao.connection import UserDaoAccess
 
+CHUNK_SIZE = 1024 * 1024 # 1MB per read/write to storage
+FILE_META_WORKERS = int(os.environ.get('FILE_META_WORKERS', 8)) # concurrent listing calls to object store
+IN_BATCH_SIZE = 500 # max number of values in one IN clause
+SPOOL_MAX_MEMORY = 8 * CHUNK_SIZE # non-seekable upload is kept in memory up to this size, then in local temp file
+FILE_GC_GRACE = float(os.environ.get('FILE_GC_GRACE', 3600)) # seconds, younger unreferenced blobs may belong to an upload not committed yet
+
+def _modified_ts(info: dict) -> float | None:
+    # last write time of object, key differs by file system (s3/local/memory)
+    modified = info.get('LastModified') or info.get('mtime') or info.get('created')
+    if isinstance(modified, datetime):
+        return modified.timestamp()
+    return modified
+
 class fileDao:
+    # content addressed storage:
+    # blob (content) is stored once under its sha256 @ files/blobs/ab/abcdef..., FileORM maps filename -> blob
+    # blob no longer referenced is left on storage for collect_garbage, as a concurrent upload of same content
+    # may recreate it at the same path right after
+    # files registered from storage (filehash is None) stay under files/<filename>
     
     def __init__(self, dao_access: UserDaoAccess):
         self.dao_access = dao_access
     
     def getFilePath(self, filename: str) -> str:
         return (Path(get_files_bucket()) / self.dao_access.user.user_id / 'files' / filename).as_posix() # type: ignore
-
-    @classmethod
-    def fromFile(cls, file: FileWrapper) -> FileORM:
-        return FileORM(
-            file_id=file.file_id,
-            filename=file.filename,
-            filehash=file.filehash # type: ignore
-        )
-        
+    
+    def getBlobPath(self, filehash: str) -> str:
+        return self.getFilePath(f'blobs/{filehash[:2]}/{filehash}')
+    
+    def resolvePath(self, filename: str, filehash: str | None) -> str:
+        return self.getFilePath(filename) if filehash is None else self.getBlobPath(filehash)
+    
     @classmethod
     def toFile(cls, content: str, file_orm: FileORM) -> FileWrapper:
         return FileWrapper(
             file_id=file_orm.file_id,
             filename=file_orm.filename,
-            content=content
+            content=content,
+            filehash=file_orm.filehash
         )
-        
+    
     def register(self, filename: str) -> str:
         # if the file already exist on storage, but just want to register back to DB
         # return the file id
         fs = self.dao_access.file_fs
         filepath = self.getFilePath(filename)
-        if fs.exists(filepath):
-            with fs.open(filepath, 'rb') as obj:
-                content = obj.read().decode(encoding='latin-1') # type: ignore
-                file = FileWrapper(
+        if not fs.exists(filepath):
+            raise NotExistError(f"File ({filename}) not exist @ {filepath}")
+        
+        # register to DB, content stays where it is
+        file_orm = FileORM(
+            file_id=id_generator(prefix='file-', length=12),
+            filename=filename,
+            filehash=None
+        )
+        self.dao_access.user_session.add(file_orm)
+        try:
+            self.dao_access.commit()
+        except IntegrityError as e:
+            self.dao_access.user_session.rollback()
+            raise infer_integrity_error(e, during_creation=True)
+        
+        return file_orm.file_id
+    
+    def list_existing_on_storage(self, filenames: list[str]) -> set[str]:
+        # which filenames exist on storage, one listing per folder instead of one call per file
+        fs = self.dao_access.file_fs
+        folders: dict[str, list[str]] = {}
+        for filename in set(filenames):
+            filepath = self.getFilePath(filename)
+            folders.setdefault(Path(filepath).parent.as_posix(), []).append(filename)
+        
+        def _ls(folder: str) -> set[str]:
+            fs.invalidate_cache(folder) # files may be uploaded from outside
+            try:
+                objs = fs.ls(folder, detail=True)
+            except FileNotFoundError:
+                return set()
+            return {Path(o['name']).name for o in objs if o['type'] == 'file'} # type: ignore
+        
+        with ThreadPoolExecutor(max_workers=FILE_META_WORKERS) as executor:
+            listed = dict(zip(folders.keys(), executor.map(_ls, folders.keys())))
+        return {
+            filename
+            for folder, names in folders.items()
+            for filename in names
+            if Path(self.getFilePath(filename)).name in listed[folder]
+        }
+    
+    def get_file_ids_by_names(self, filenames: list[str]) -> dict[str, str]:
+        # {filename: file_id} of registered ones
+        result = {}
+        filenames = list(set(filenames))
+        for i in range(0, len(filenames), IN_BATCH_SIZE):
+            sql = select(FileORM.filename, FileORM.file_id).where(
+                FileORM.filename.in_(filenames[i: i + IN_BATCH_SIZE]) # type: ignore
+            )
+            result.update(dict(self.dao_access.user_session.exec(sql).all())) # type: ignore
+        return result
+    
+    def register_many(self, filenames: list[str]) -> Tuple[dict[str, str], list[str]]:
+        # bulk version of register, content is never read
+        # return {filename: file_id} (both newly and already registered) and filenames missing on storage
+        maps = self.get_file_ids_by_names(filenames)
+        new_names = [fn for fn in dict.fromkeys(filenames) if fn not in maps]
+        on_storage = self.list_existing_on_storage(new_names)
+        
+        # all new rows in one transaction
+        new_maps = {
+            filename: id_generator(prefix='file-', length=12)
+            for filename in new_names
+            if filename in on_storage
+        }
+        if len(new_maps) > 0:
+            self.dao_access.user_session.add_all([
+                FileORM(
+                    file_id=file_id,
                     filename=filename,
-                    content=content
+                    filehash=None
                 )
-            
-            # register to DB
-            file_orm = self.fromFile(file)
-            
-            self.dao_access.user_session.add(file_orm)
+                for filename, file_id in new_maps.items()
+            ])
             try:
-                self.dao_access.user_session.commit()
+                self.dao_access.commit()
             except IntegrityError as e:
                 self.dao_access.user_session.rollback()
                 raise infer_integrity_error(e, during_creation=True)
-                
-            return file.file_id
-            
-        else:
-            raise NotExistError(f"File ({filename}) not exist @ {filepath}")
         
+        maps.update(new_maps)
+        missing = [fn for fn in new_names if fn not in on_storage]
+        return maps, missing
         
     def add(self, file: FileWrapper):
-        # save file to file system
-        filepath = self.getFilePath(file.filename)
+        # compatibility for string content (latin-1 encoded bytes)
+        self.add_stream(
+            file_id=file.file_id,
+            filename=file.filename,
+            stream=io.BytesIO(file.content.encode('latin-1'))
+        )
+    
+    @contextmanager
+    def _hashed(self, stream: BinaryIO, chunk_size: int) -> Generator[Tuple[BinaryIO, str, int], None, None]:
+        # hash in a first pass so the blob is only uploaded when content is new
+        # yield (source rewound for upload, content hash, size), non-seekable stream is spooled locally
+        hasher = hashlib.sha256()
+        size = 0
+        if stream.seekable():
+            offset = stream.tell()
+            while chunk := stream.read(chunk_size):
+                hasher.update(chunk)
+                size += len(chunk)
+            stream.seek(offset)
+            yield stream, hasher.hexdigest(), size
+            return
+        
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as spool:
+            while chunk := stream.read(chunk_size):
+                hasher.update(chunk)
+                spool.write(chunk)
+                size += len(chunk)
+            spool.seek(0)
+            yield spool, hasher.hexdigest(), size # type: ignore
+            
+    def _incr_blob_ref(self, filehash: str) -> bool:
+        # return whether blob row exists (and is now referenced once more)
+        result = self.dao_access.user_session.exec(
+            update(FileBlobORM)
+            .where(FileBlobORM.filehash == filehash)
+            .values(ref_count=FileBlobORM.ref_count + 1)
+        ) # type: ignore
+        return result.rowcount > 0
+            
+    def _add_blob_ref(self, source: BinaryIO, filehash: str, size: int, chunk_size: int):
+        # same content already stored -> only add a reference, otherwise write the blob
+        session = self.dao_access.user_session
+        if self._incr_blob_ref(filehash):
+            return
+        try:
+            # savepoint so losing the race to a concurrent identical upload does not abort the transaction
+            with session.begin_nested():
+                session.add(FileBlobORM(filehash=filehash, size=size, ref_count=1))
+        except IntegrityError:
+            if self._incr_blob_ref(filehash):
+                return
+            raise
+        
+        # this transaction owns the new blob row, so it writes the content (straight to final path)
         fs = self.dao_access.file_fs
-        with fs.open(filepath, 'wb') as obj:
-            obj.write(file.content.encode('latin-1')) # type: ignore
+        blobpath = self.getBlobPath(filehash)
+        fs.makedirs(Path(blobpath).parent.as_posix(), exist_ok=True)
+        with fs.open(blobpath, 'wb') as obj:
+            while chunk := source.read(chunk_size):
+                obj.write(chunk) # type: ignore
         
-        # save metadata to db
-        file_orm = self.fromFile(file)
+    def _release_blob_ref(self, filehash: str):
+        # blob row goes with last reference, content is left for collect_garbage
+        session = self.dao_access.user_session
+        session.flush() # file row must go (or point away) before blob row
+        session.exec(
+            update(FileBlobORM)
+            .where(FileBlobORM.filehash == filehash)
+            .values(ref_count=FileBlobORM.ref_count - 1)
+        ) # type: ignore
+        session.exec(
+            delete(FileBlobORM)
+            .where(FileBlobORM.filehash == filehash, FileBlobORM.ref_count <= 0) # type: ignore
+        ) # type: ignore
         
-        self.dao_access.user_session.add(file_orm)
+    def _remove_on_commit(self, filepath: str):
+        # file registered in place (not a blob) is deleted from storage only when db change is really committed
+        fs = self.dao_access.file_fs
+        self.dao_access.on_commit(lambda: fs.rm(filepath, recursive=False) if fs.exists(filepath) else None)
+    
+    def add_stream(self, file_id: str, filename: str, stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> str:
+        # copy to storage chunk by chunk while hashing, never hold the whole file in memory
+        # return the content hash
+        with self._hashed(stream, chunk_size) as (source, filehash, size):
+            try:
+                self._add_blob_ref(source, filehash, size, chunk_size)
+                self.dao_access.user_session.add(
+                    FileORM(
+                        file_id=file_id,
+                        filename=filename,
+                        filehash=filehash
+                    )
+                )
+                self.dao_access.commit()
+            except IntegrityError as e:
+                self.dao_access.user_session.rollback()
+                raise infer_integrity_error(e, during_creation=True)
+        return filehash
+    
+    def replace_stream(self, file_id: str, stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> str:
+        # point existing file to new content, previous blob is released
+        # return the content hash
+        sql = select(FileORM).where(FileORM.file_id == file_id)
         try:
-            self.dao_access.user_session.commit()
-        except IntegrityError as e:
-            self.dao_access.user_session.rollback()
-            raise infer_integrity_error(e, during_creation=True)
+            p = self.dao_access.user_session.exec(sql).one()
+        except NoResultFound as e:
+            raise NotExistError(details=str(e))
+        
+        with self._hashed(stream, chunk_size) as (source, filehash, size):
+            if filehash == p.filehash:
+                return filehash
             
+            old_filepath, old_filehash = self.resolvePath(p.filename, p.filehash), p.filehash
+            try:
+                self._add_blob_ref(source, filehash, size, chunk_size)
+                p.filehash = filehash
+                self.dao_access.user_session.add(p)
+                if old_filehash is None:
+                    self._remove_on_commit(old_filepath)
+                else:
+                    self._release_blob_ref(old_filehash)
+                self.dao_access.commit()
+            except IntegrityError as e:
+                self.dao_access.user_session.rollback()
+                raise infer_integrity_error(e, during_creation=False)
+        return filehash
+    
     def get(self, file_id: str) -> FileWrapper:
         fs = self.dao_access.file_fs
         sql = select(FileORM).where(
@@ -86,17 +285,76 @@ class fileDao:
             p = self.dao_access.user_session.exec(sql).one() # get the file meta data
         except NoResultFound as e:
             raise NotExistError(details=str(e))
-        else:
-            # load file from file system
-            filepath = self.getFilePath(p.filename)
-            if fs.exists(filepath):
-                with fs.open(filepath, 'rb') as obj:
-                    content = obj.read().decode(encoding='latin-1') # type: ignore
-                    file = self.toFile(content, p)
-            else:
-                raise NotExistError(f"File ({file_id}) not exist @ {filepath}")
-            
-        return file
+        
+        # load file from file system
+        filepath = self.resolvePath(p.filename, p.filehash)
+        try:
+            content = fs.cat_file(filepath).decode(encoding='latin-1') # type: ignore
+        except FileNotFoundError:
+            raise NotExistError(f"File ({file_id}) not exist @ {filepath}")
+        return self.toFile(content, p)
+    
+    def get_info(self, file_id: str) -> _FileInfo:
+        # metadata only, no content read
+        sql = (
+            select(FileORM, FileBlobORM.size)
+            .join(
+                FileBlobORM,
+                onclause=FileORM.filehash == FileBlobORM.filehash,
+                isouter=True # legacy file has no blob
+            )
+            .where(FileORM.file_id == file_id)
+        )
+        try:
+            p, size = self.dao_access.user_session.exec(sql).one()
+        except NoResultFound as e:
+            raise NotExistError(details=str(e))
+        
+        if p.filehash is not None:
+            # content hash is the version
+            return _FileInfo(
+                file_id=p.file_id,
+                filename=p.filename,
+                filehash=p.filehash,
+                size=size,
+                etag=p.filehash
+            )
+        
+        filepath = self.getFilePath(p.filename)
+        try:
+            info = self.dao_access.file_fs.info(filepath)
+        except FileNotFoundError:
+            raise NotExistError(f"File ({file_id}) not exist @ {filepath}")
+        # object store gives etag, local/memory fs only give modified time
+        version = info.get('ETag') or info.get('mtime') or info.get('created') or ''
+        return _FileInfo(
+            file_id=p.file_id,
+            filename=p.filename,
+            filehash=None,
+            size=info['size'],
+            etag=hashlib.md5(f"{p.filename}-{info['size']}-{version}".encode()).hexdigest()
+        )
+    
+    def iter_content(
+        self,
+        file: _FileInfo,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Generator[bytes, None, None]:
+        # yield bytes [start, end] (inclusive, end None means till eof) chunk by chunk
+        filepath = self.resolvePath(file.filename, file.filehash)
+        fs = self.dao_access.file_fs
+        with fs.open(filepath, 'rb') as obj:
+            obj.seek(start) # type: ignore
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = obj.read(chunk_size if remaining is None else min(chunk_size, remaining)) # type: ignore
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
     
     def get_file_id_by_name(self, filename: str) -> str:
         sql = select(FileORM.file_id).where(
@@ -107,27 +365,61 @@ class fileDao:
         except NoResultFound as e:
             raise NotExistError(details=str(e))
         else:
-            return p.file_id
+            return p
     
     def remove(self, file_id: str):
-        fs = self.dao_access.file_fs
-        
+        # blob is only released, content removed by collect_garbage once no file refers to it
         sql = select(FileORM).where(FileORM.file_id == file_id)
         try:
             p = self.dao_access.user_session.exec(sql).one() # get the file meta
         except NoResultFound as e:
             raise NotExistError(details=str(e))
-        else:
-            # delete file from file system
-            filepath = self.getFilePath(p.filename)
-            
-            if fs.exists(filepath):
-                fs.rm(filepath, recursive=False)
         
+        filepath, filehash = self.resolvePath(p.filename, p.filehash), p.filehash
         try:
             self.dao_access.user_session.delete(p)
-            self.dao_access.user_session.commit()
+            if filehash is None:
+                self._remove_on_commit(filepath)
+            else:
+                self._release_blob_ref(filehash)
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(details=str(e))
-    
\ No newline at end of file
+            
+    def collect_garbage(self, grace: float | None = None) -> int:
+        # delete blob objects without blob row, return number deleted
+        # objects written within grace (default FILE_GC_GRACE) are kept, their upload may not be committed yet
+        grace = FILE_GC_GRACE if grace is None else grace
+        fs = self.dao_access.file_fs
+        blobroot = self.getFilePath('blobs')
+        fs.invalidate_cache(blobroot)
+        cutoff = time.time() - grace
+        candidates = {
+            Path(name).name: name
+            for name, info in fs.find(blobroot, detail=True).items() # type: ignore
+            if (_modified_ts(info) or cutoff) < cutoff # unknown write time is kept
+        }
+        
+        # rows are read after listing, so a blob referenced in between is seen
+        filehashes = list(candidates.keys())
+        referenced = set()
+        for i in range(0, len(filehashes), IN_BATCH_SIZE):
+            sql = select(FileBlobORM.filehash).where(
+                FileBlobORM.filehash.in_(filehashes[i: i + IN_BATCH_SIZE]) # type: ignore
+            )
+            referenced.update(self.dao_access.user_session.exec(sql).all())
+        
+        num_removed = 0
+        for filehash, blobpath in candidates.items():
+            if filehash in referenced:
+                continue
+            try:
+                info = fs.info(blobpath) # rewritten by an upload since listing?
+            except FileNotFoundError:
+                continue
+            if (_modified_ts(info) or cutoff) >= cutoff:
+                continue
+            fs.rm(blobpath)
+            num_removed += 1
+        return num_removed
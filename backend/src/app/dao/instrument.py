@@ -0,0 +1,92 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import re
+import time
+from typing import Any, Generator, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# flag a request if same statement template runs more than this many times, 0 to disable
+SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', 20))
+SQL_TOP_STATEMENTS = 3
+
+_WHITESPACE = re.compile(r'\s+')
+# expanded IN (...) lists and literal placeholders of any dialect
+_IN_LIST = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)')
+
+def normalize_statement(statement: str) -> str:
+    # collapse whitespace and IN lists, so same query shape share one template
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    return _IN_LIST.sub('(?)', statement)
+
+class QueryStats:
+    # sql statements issued within one request (all engines)
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0 # seconds
+        self.templates: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.templates[normalize_statement(statement)] += 1
+
+    def top(self, n: int = SQL_TOP_STATEMENTS) -> list[Tuple[str, int]]:
+        return self.templates.most_common(n)
+
+    def repeated(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> list[Tuple[str, int]]:
+        # templates executed more than threshold times, likely N+1 pattern
+        if threshold <= 0:
+            return []
+        return [(t, c) for t, c in self.templates.most_common() if c > threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'query_count': self.count,
+            'db_ms': round(self.duration * 1000, 1),
+            'unique_statements': len(self.templates),
+            'top_statements': [{'statement': t, 'count': c} for t, c in self.top()],
+        }
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar('query_stats', default=None)
+
+@contextmanager
+def track_queries() -> Generator[QueryStats, None, None]:
+    # collect statements executed in current context (e.g., one request)
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+def get_query_stats() -> QueryStats | None:
+    return _query_stats.get()
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # listen at engine class level so both common and per-user engines are covered
+    if _query_stats.get() is None:
+        return
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    starts = conn.info.get('query_start')
+    if stats is None or not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop())
+    
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(exception_context):
+    # failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('query_start'):
+        conn.info['query_start'].pop()
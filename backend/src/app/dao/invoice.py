@@ -8,6 +8,7 @@ from src.app.dao.orm import EntityORM, InvoiceItemORM, GeneralInvoiceItemORM, In
     PaymentItemORM, PaymentORM, infer_integrity_error
 from src.app.model.exceptions import AlreadyExistError, FKNotExistError, NotExistError, FKNoDeleteUpdateError
 from src.app.dao.connection import UserDaoAccess
+from src.app.utils.base import VALIDATE_DB_READS
 
 
 class itemDao:
@@ -20,16 +21,17 @@ class itemDao:
             item.model_dump()
         )
         
-    def toItem(self, item_orm: ItemORM) -> Item:
-        return Item.model_validate(
-            item_orm.model_dump()   
+    def toItem(self, item_orm: ItemORM, validate: bool = VALIDATE_DB_READS) -> Item:
+        return Item.hydrate(
+            validate=validate,
+            **item_orm.model_dump()
         )
         
     def add(self, item: Item):
         item_orm = self.fromItem(item)
         self.dao_access.user_session.add(item_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise AlreadyExistError(details=str(e))
@@ -44,7 +46,7 @@ class itemDao:
         
         try:
             self.dao_access.user_session.delete(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(details=str(e))
@@ -70,7 +72,7 @@ class itemDao:
         p.default_acct_id = item_orm.default_acct_id # TODO: only income/expense account
         
         self.dao_access.user_session.add(p)
-        self.dao_access.user_session.commit()
+        self.dao_access.commit()
         self.dao_access.user_session.refresh(p) # update p to instantly have new values
 
 
@@ -123,10 +125,21 @@ class invoiceDao:
             description=general_invoice_item.description,
         )
         
-    def toInvoiceItem(self, invoice_item_orm: InvoiceItemORM) -> InvoiceItem:
-        return InvoiceItem(
+    def toInvoiceItem(
+        self, 
+        invoice_item_orm: InvoiceItemORM, 
+        item_orm: ItemORM | None = None, 
+        validate: bool = VALIDATE_DB_READS
+    ) -> InvoiceItem:
+        # use preloaded item if given, otherwise look it up
+        if item_orm is not None:
+            item = itemDao(self.dao_access).toItem(item_orm, validate=validate)
+        else:
+            item = itemDao(self.dao_access).get(item_id=invoice_item_orm.item_id)
+        return InvoiceItem.hydrate(
+            validate=validate,
             invoice_item_id=invoice_item_orm.invoice_item_id,
-            item=itemDao(self.dao_access).get(item_id=invoice_item_orm.item_id),
+            item=item,
             quantity=invoice_item_orm.quantity,
             acct_id=invoice_item_orm.acct_id,
             tax_rate=invoice_item_orm.tax_rate,
@@ -134,8 +147,13 @@ class invoiceDao:
             description=invoice_item_orm.description,
         )
         
-    def toGeneralInvoiceItem(self, general_invoice_item_orm: GeneralInvoiceItemORM) -> GeneralInvoiceItem:
-        return GeneralInvoiceItem(
+    def toGeneralInvoiceItem(
+        self, 
+        general_invoice_item_orm: GeneralInvoiceItemORM, 
+        validate: bool = VALIDATE_DB_READS
+    ) -> GeneralInvoiceItem:
+        return GeneralInvoiceItem.hydrate(
+            validate=validate,
             ginv_item_id=general_invoice_item_orm.ginv_item_id,
             incur_dt=general_invoice_item_orm.incur_dt,
             acct_id=general_invoice_item_orm.acct_id,
@@ -165,9 +183,14 @@ class invoiceDao:
         self, 
         invoice_orm: InvoiceORM, 
         invoice_item_orms: list[InvoiceItemORM],
-        ginvoice_item_orms: list[GeneralInvoiceItemORM]
+        ginvoice_item_orms: list[GeneralInvoiceItemORM],
+        item_orms: dict[str, ItemORM] | None = None,
+        validate: bool = VALIDATE_DB_READS
     ) -> Invoice:
-        return Invoice(
+        # item_orms is optional preloaded items, keyed by item id
+        item_orms = item_orms or {}
+        return Invoice.hydrate(
+            validate=validate,
             invoice_id=invoice_orm.invoice_id,
             invoice_num=invoice_orm.invoice_num,
             invoice_dt=invoice_orm.invoice_dt,
@@ -177,11 +200,15 @@ class invoiceDao:
             subject=invoice_orm.subject,
             currency=invoice_orm.currency,
             invoice_items=[
-                self.toInvoiceItem(invoice_item_orm) 
+                self.toInvoiceItem(
+                    invoice_item_orm, 
+                    item_orm=item_orms.get(invoice_item_orm.item_id),
+                    validate=validate
+                ) 
                 for invoice_item_orm in invoice_item_orms  
             ],
             ginvoice_items=[
-                self.toGeneralInvoiceItem(ginvoice_item_orm) 
+                self.toGeneralInvoiceItem(ginvoice_item_orm, validate=validate) 
                 for ginvoice_item_orm in ginvoice_item_orms  
             ],
             shipping=invoice_orm.shipping,
@@ -189,35 +216,30 @@ class invoiceDao:
         )
     
     def add(self, journal_id: str, invoice: Invoice):
-        # add invoice first
-        invoice_orm = self.fromInvoice(journal_id, invoice)
-            
-        self.dao_access.user_session.add(invoice_orm)
         try:
-            self.dao_access.user_session.commit()
-        except IntegrityError as e:
-            self.dao_access.user_session.rollback()
-            raise infer_integrity_error(e, during_creation=True)
-        
-        # add invoice items
-        for invoice_item in invoice.invoice_items:
-            invoice_item_orm = self.fromInvoiceItem(
-                invoice_id=invoice.invoice_id,
-                invoice_item=invoice_item
-            )
-            self.dao_access.user_session.add(invoice_item_orm)
+            # add invoice first, flush so it is inserted before items
+            invoice_orm = self.fromInvoice(journal_id, invoice)
+            self.dao_access.user_session.add(invoice_orm)
+            self.dao_access.user_session.flush()
             
-        # add general invoice items
-        for ginvoice_item in invoice.ginvoice_items:
-            general_invoice_item_orm = self.fromGeneralInvoiceItem(
-                invoice_id=invoice.invoice_id,
-                general_invoice_item=ginvoice_item
-            )
-            self.dao_access.user_session.add(general_invoice_item_orm)
-        
-        # commit all items
-        try:
-            self.dao_access.user_session.commit()
+            # add invoice items
+            for invoice_item in invoice.invoice_items:
+                invoice_item_orm = self.fromInvoiceItem(
+                    invoice_id=invoice.invoice_id,
+                    invoice_item=invoice_item
+                )
+                self.dao_access.user_session.add(invoice_item_orm)
+                
+            # add general invoice items
+            for ginvoice_item in invoice.ginvoice_items:
+                general_invoice_item_orm = self.fromGeneralInvoiceItem(
+                    invoice_id=invoice.invoice_id,
+                    general_invoice_item=ginvoice_item
+                )
+                self.dao_access.user_session.add(general_invoice_item_orm)
+            
+            # commit invoice and all items at same time
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -243,7 +265,7 @@ class invoiceDao:
             self.dao_access.user_session.exec(sql) # type: ignore
             
             # commit at same time
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=False)
@@ -279,7 +301,7 @@ class invoiceDao:
         
         try:
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNotExistError(
@@ -303,7 +325,7 @@ class invoiceDao:
             )
             self.dao_access.user_session.add(invoice_item_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback() # will rollback both item removal and new item add
             raise FKNotExistError(
@@ -324,7 +346,7 @@ class invoiceDao:
             )
             self.dao_access.user_session.add(general_invoice_item_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback() # will rollback both item removal and new item add
             raise FKNotExistError(
@@ -369,6 +391,58 @@ class invoiceDao:
         
         return invoice, jrn_id
     
+    def get_many(self, invoice_ids: list[str]) -> dict[str, Tuple[Invoice, str]]:
+        # return both invoice and journal id for each found invoice, keyed by invoice id
+        # use 3 queries in total regardless of number of invoices, missing ids are not included
+        invoice_ids = list(set(invoice_ids))
+        if len(invoice_ids) == 0:
+            return {}
+        
+        # get invoice items, together with their items
+        sql = (
+            select(InvoiceItemORM, ItemORM)
+            .join(
+                ItemORM,
+                onclause=InvoiceItemORM.item_id == ItemORM.item_id,
+                isouter=False # inner join
+            )
+            .where(
+                InvoiceItemORM.invoice_id.in_(invoice_ids) # type: ignore
+            )
+        )
+        invoice_item_orms: dict[str, list[InvoiceItemORM]] = {}
+        item_orms: dict[str, ItemORM] = {}
+        for invoice_item_orm, item_orm in self.dao_access.user_session.exec(sql).all():
+            invoice_item_orms.setdefault(invoice_item_orm.invoice_id, []).append(invoice_item_orm)
+            item_orms[item_orm.item_id] = item_orm
+        
+        # get general invoice items
+        sql = select(GeneralInvoiceItemORM).where(
+            GeneralInvoiceItemORM.invoice_id.in_(invoice_ids) # type: ignore
+        )
+        ginvoice_item_orms: dict[str, list[GeneralInvoiceItemORM]] = {}
+        for ginvoice_item_orm in self.dao_access.user_session.exec(sql).all():
+            ginvoice_item_orms.setdefault(ginvoice_item_orm.invoice_id, []).append(ginvoice_item_orm)
+        
+        # get invoices
+        sql = select(InvoiceORM).where(
+            InvoiceORM.invoice_id.in_(invoice_ids) # type: ignore
+        )
+        invoice_orms = self.dao_access.user_session.exec(sql).all()
+        
+        return {
+            invoice_orm.invoice_id: (
+                self.toInvoice(
+                    invoice_orm=invoice_orm,
+                    invoice_item_orms=invoice_item_orms.get(invoice_orm.invoice_id, []),
+                    ginvoice_item_orms=ginvoice_item_orms.get(invoice_orm.invoice_id, []),
+                    item_orms=item_orms
+                ),
+                invoice_orm.journal_id
+            )
+            for invoice_orm in invoice_orms
+        }
+    
     def list_invoice(
         self,
         limit: int = 50,
@@ -0,0 +1,176 @@
+from datetime import datetime
+from sqlmodel import select, update, func as f
+from sqlalchemy.exc import NoResultFound, IntegrityError
+from src.app.dao.orm import JobORM, infer_integrity_error
+from src.app.model.enums import JobStatus, JobType
+from src.app.model.exceptions import NotExistError
+from src.app.model.job import Job
+from src.app.dao.connection import CommonDaoAccess
+
+
+class jobDao:
+
+    def __init__(self, dao_access: CommonDaoAccess):
+        self.dao_access = dao_access
+
+    def fromJob(self, job: Job) -> JobORM:
+        return JobORM(
+            job_id=job.job_id,
+            user_id=job.user_id,
+            job_type=job.job_type,
+            status=job.status,
+            params=job.params,
+            progress=job.progress,
+            message=job.message,
+            result=job.result,
+            cancel_requested=job.cancel_requested,
+            created=job.created,
+            started=job.started,
+            finished=job.finished
+        )
+
+    def toJob(self, job_orm: JobORM) -> Job:
+        return Job(
+            job_id=job_orm.job_id,
+            user_id=job_orm.user_id,
+            job_type=job_orm.job_type,
+            status=job_orm.status,
+            params=job_orm.params,
+            progress=job_orm.progress,
+            message=job_orm.message,
+            result=job_orm.result,
+            cancel_requested=job_orm.cancel_requested,
+            created=job_orm.created,
+            started=job_orm.started,
+            finished=job_orm.finished
+        )
+
+    def add(self, job: Job):
+        job_orm = self.fromJob(job)
+        self.dao_access.common_session.add(job_orm)
+        try:
+            self.dao_access.common_session.commit()
+        except IntegrityError as e:
+            self.dao_access.common_session.rollback()
+            raise infer_integrity_error(e, during_creation=True)
+
+    def get(self, job_id: str) -> Job:
+        sql = select(JobORM).where(JobORM.job_id == job_id)
+        try:
+            p = self.dao_access.common_session.exec(sql).one()
+        except NoResultFound as e:
+            raise NotExistError(f"Job {job_id} not found", details=str(e))
+        self.dao_access.common_session.refresh(p) # worker threads update the row from other sessions
+        return self.toJob(p)
+
+    def list_job(
+        self,
+        user_id: str | None = None,
+        job_type: JobType | None = None,
+        status: JobStatus | None = None,
+        limit: int = 50
+    ) -> list[Job]:
+        # latest first
+        sql = select(JobORM)
+        if user_id is not None:
+            sql = sql.where(JobORM.user_id == user_id)
+        if job_type is not None:
+            sql = sql.where(JobORM.job_type == job_type)
+        if status is not None:
+            sql = sql.where(JobORM.status == status)
+        sql = sql.order_by(JobORM.created.desc()).limit(limit) # type: ignore
+        self.dao_access.common_session.expire_all() # always read latest progress
+        jobs = self.dao_access.common_session.exec(sql).all()
+        return [self.toJob(j) for j in jobs]
+
+    def list_pending(self, limit: int = 100) -> list[Job]:
+        # first come first serve
+        sql = (
+            select(JobORM)
+            .where(JobORM.status == JobStatus.PENDING)
+            .order_by(JobORM.created) # type: ignore
+            .limit(limit)
+        )
+        jobs = self.dao_access.common_session.exec(sql).all()
+        return [self.toJob(j) for j in jobs]
+
+    def count_running_by_user(self) -> dict[str, int]:
+        sql = (
+            select(JobORM.user_id, f.count(JobORM.job_id))
+            .where(JobORM.status == JobStatus.RUNNING)
+            .group_by(JobORM.user_id)
+        )
+        return dict(self.dao_access.common_session.exec(sql).all()) # type: ignore
+
+    def claim(self, job_id: str) -> bool:
+        # atomically move pending -> running, false if another worker (or cancel) got it first
+        sql = (
+            update(JobORM)
+            .where(JobORM.job_id == job_id, JobORM.status == JobStatus.PENDING) # type: ignore
+            .values(status=JobStatus.RUNNING, started=datetime.now())
+        )
+        result = self.dao_access.common_session.exec(sql) # type: ignore
+        self.dao_access.common_session.commit()
+        return result.rowcount == 1
+
+    def update_progress(self, job_id: str, progress: float, message: str | None = None) -> bool:
+        # return whether cancel is requested, so the worker can stop at this checkpoint
+        values = {'progress': min(max(progress, 0), 1)}
+        if message is not None:
+            values['message'] = message # type: ignore
+        sql = update(JobORM).where(JobORM.job_id == job_id).values(**values) # type: ignore
+        self.dao_access.common_session.exec(sql) # type: ignore
+        self.dao_access.common_session.commit()
+
+        sql = select(JobORM.cancel_requested).where(JobORM.job_id == job_id)
+        return bool(self.dao_access.common_session.exec(sql).one_or_none())
+
+    def request_cancel(self, job_id: str):
+        # pending job is cancelled right away, running job is flagged and stops at next checkpoint
+        sql = (
+            update(JobORM)
+            .where(JobORM.job_id == job_id, JobORM.status == JobStatus.PENDING) # type: ignore
+            .values(status=JobStatus.CANCELLED, finished=datetime.now(), message='Cancelled before start')
+        )
+        result = self.dao_access.common_session.exec(sql) # type: ignore
+        if result.rowcount == 0:
+            sql = (
+                update(JobORM)
+                .where(JobORM.job_id == job_id, JobORM.status == JobStatus.RUNNING) # type: ignore
+                .values(cancel_requested=True)
+            )
+            self.dao_access.common_session.exec(sql) # type: ignore
+        self.dao_access.common_session.commit()
+        
+    def fail_stale(self, started_before: datetime) -> int:
+        # running jobs whose worker died never finish, free up their tenant slot
+        sql = (
+            update(JobORM)
+            .where(JobORM.status == JobStatus.RUNNING, JobORM.started < started_before) # type: ignore
+            .values(status=JobStatus.FAILED, finished=datetime.now(), message='Timed out or worker lost')
+        )
+        result = self.dao_access.common_session.exec(sql) # type: ignore
+        self.dao_access.common_session.commit()
+        return result.rowcount
+
+    def finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        message: str | None = None,
+        result: dict | None = None
+    ):
+        values = {
+            'status': status,
+            'finished': datetime.now(),
+            'result': result,
+        }
+        if status == JobStatus.SUCCEEDED:
+            values['progress'] = 1
+        if message is not None:
+            values['message'] = message
+        sql = update(JobORM).where(JobORM.job_id == job_id).values(**values) # type: ignore
+        result_ = self.dao_access.common_session.exec(sql) # type: ignore
+        self.dao_access.common_session.commit()
+        if result_.rowcount == 0:
+            raise NotExistError(f"Job {job_id} not found")
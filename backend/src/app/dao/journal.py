@@ -1,15 +1,17 @@
 from datetime import date
 import logging
-from typing import Tuple
+from typing import Generator, Literal, Tuple
 from sqlalchemy.engine import Engine
-from sqlmodel import Session, select, delete, distinct, case, func as f, and_, or_
+from sqlmodel import Session, select, delete, distinct, case, extract, func as f, and_, or_
 from sqlalchemy.exc import NoResultFound, IntegrityError
-from src.app.model.enums import EntryType, JournalSrc, AcctType
-from src.app.dao.orm import AcctORM, EntryORM, JournalORM, infer_integrity_error
-from src.app.model.journal import _AcctFlowAGG, _EntryBrief, _JournalBrief, Entry, Journal
+from src.app.model.enums import CurType, EntryType, JournalSrc, AcctType
+from src.app.dao.orm import AcctORM, ChartOfAccountORM, EntryORM, JournalORM, infer_integrity_error
+from src.app.model.accounts import Account
+from src.app.model.journal import _AcctFlowAGG, _AcctPeriodFlowAGG, _EntryBrief, _EntryExport, _JournalBrief, Entry, Journal
 from src.app.dao.accounts import acctDao, chartOfAcctDao
 from src.app.model.exceptions import AlreadyExistError, OpNotPermittedError, NotExistError
 from src.app.dao.connection import UserDaoAccess
+from src.app.utils.base import VALIDATE_DB_READS
 
 class journalDao:
         
@@ -28,13 +30,14 @@ class journalDao:
             description=entry.description,
         )
         
-    def toEntry(self, entry_orm: EntryORM) -> Entry:
-        
-        # TODO: optimize it to not use acctDao
-        chart_id = acctDao(self.dao_access).get_chart_id_by_acct(entry_orm.acct_id)
-        chart = chartOfAcctDao(self.dao_access).get_chart(chart_id)
-        acct = acctDao(self.dao_access).get(entry_orm.acct_id, chart)
-        return Entry(
+    def toEntry(self, entry_orm: EntryORM, acct: Account | None = None, validate: bool = VALIDATE_DB_READS) -> Entry:
+        # use preloaded account if given, otherwise look it up
+        if acct is None:
+            chart_id = acctDao(self.dao_access).get_chart_id_by_acct(entry_orm.acct_id)
+            chart = chartOfAcctDao(self.dao_access).get_chart(chart_id)
+            acct = acctDao(self.dao_access).get(entry_orm.acct_id, chart)
+        return Entry.hydrate(
+            validate=validate,
             entry_id=entry_orm.entry_id,
             entry_type=entry_orm.entry_type,
             acct=acct,
@@ -52,41 +55,71 @@ class journalDao:
             note=journal.note
         )
         
-    def toJournal(self, journal_orm: JournalORM, entry_orms: list[EntryORM]) -> Journal:
-        return Journal(
+    def toJournal(
+        self, 
+        journal_orm: JournalORM, 
+        entry_orms: list[EntryORM], 
+        accts: dict[str, Account] | None = None,
+        validate: bool = VALIDATE_DB_READS
+    ) -> Journal:
+        # accts is optional preloaded accounts, keyed by acct id
+        accts = accts or {}
+        return Journal.hydrate(
+            validate=validate,
             journal_id=journal_orm.journal_id,
             jrn_date=journal_orm.jrn_date,
             entries=[
-                self.toEntry(entry_orm) for entry_orm in entry_orms
+                self.toEntry(
+                    entry_orm, 
+                    acct=accts.get(entry_orm.acct_id), 
+                    validate=validate
+                ) 
+                for entry_orm in entry_orms
             ],
             jrn_src=journal_orm.jrn_src,
             note=journal_orm.note,
         )
         
     def add(self, journal: Journal):
-        # add journal first
-        journal_orm = self.fromJournal(journal)
-        self.dao_access.user_session.add(journal_orm)
         try:
-            self.dao_access.user_session.commit()
+            # add journal first, flush so it is inserted before entries
+            journal_orm = self.fromJournal(journal)
+            self.dao_access.user_session.add(journal_orm)
+            self.dao_access.user_session.flush()
+            
+            # add individual entries
+            for entry in journal.entries:
+                entry_orm = self.fromEntry(
+                    journal_id=journal.journal_id,
+                    entry=entry
+                )
+                self.dao_access.user_session.add(entry_orm)
+            
+            # commit journal and entries at same time
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
-            raise AlreadyExistError(details=str(e))
-        
-        # add individual entries
-        for entry in journal.entries:
-            entry_orm = self.fromEntry(
-                journal_id=journal.journal_id,
-                entry=entry
-            )
-            self.dao_access.user_session.add(entry_orm)
+            raise infer_integrity_error(e, during_creation=True)
+    
+    def adds(self, journals: list[Journal]):
+        # bulk version of add, all journals then all entries in one flush each
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.user_session.add_all([
+                self.fromJournal(journal) for journal in journals
+            ])
+            self.dao_access.user_session.flush()
+            
+            self.dao_access.user_session.add_all([
+                self.fromEntry(
+                    journal_id=journal.journal_id,
+                    entry=entry
+                )
+                for journal in journals
+                for entry in journal.entries
+            ])
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
-            # remove journal as well
-            self.dao_access.user_session.delete(journal_orm)
-            self.dao_access.user_session.commit()
             raise infer_integrity_error(e, during_creation=True)
     
     def get(self, journal_id: str) -> Journal:
@@ -110,7 +143,8 @@ class journalDao:
         
         journal = self.toJournal(
             journal_orm=journal_orm,
-            entry_orms=entry_orms
+            entry_orms=entry_orms,
+            accts=acctDao(self.dao_access).get_accts_by_ids([e.acct_id for e in entry_orms])
         )
         return journal
     
@@ -132,17 +166,152 @@ class journalDao:
         # commit at same time
         try:
             self.dao_access.user_session.delete(j)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=False)
             
     def update(self, journal: Journal):
-        # delete the given journal and create new one
-        self.remove(journal_id = journal.journal_id)
-        # add the new one
-        self.add(journal)
-        logging.info(f"updated {journal} by removing existing one and added new one")
+        # update journal in place, only issue necessary update/insert/delete on entries
+        # entries are matched by entry id first, then by (acct, entry type, currency)
+        # so journals regenerated from documents keep their existing entry ids
+        sql = select(JournalORM).where(
+            JournalORM.journal_id == journal.journal_id
+        )
+        try:
+            j = self.dao_access.user_session.exec(sql).one()
+        except NoResultFound as e:
+            raise NotExistError(details=str(e))
+        
+        sql = select(EntryORM).where(
+            EntryORM.journal_id == journal.journal_id
+        )
+        unmatched = {
+            entry_orm.entry_id: entry_orm
+            for entry_orm in self.dao_access.user_session.exec(sql).all()
+        }
+        
+        # update journal
+        j.jrn_date = journal.jrn_date
+        j.jrn_src = journal.jrn_src
+        j.note = journal.note
+        self.dao_access.user_session.add(j)
+        
+        # match by entry id
+        matched: list[Tuple[EntryORM, Entry]] = []
+        remaining: list[Entry] = []
+        for entry in journal.entries:
+            if entry.entry_id in unmatched:
+                matched.append((unmatched.pop(entry.entry_id), entry))
+            else:
+                remaining.append(entry)
+        
+        # match the rest by (acct, entry type, currency)
+        by_key: dict[Tuple[str, EntryType, CurType | None], list[EntryORM]] = {}
+        for entry_orm in unmatched.values():
+            key = (entry_orm.acct_id, entry_orm.entry_type, entry_orm.cur_incexp)
+            by_key.setdefault(key, []).append(entry_orm)
+        for entry in remaining:
+            candidates = by_key.get((entry.acct.acct_id, entry.entry_type, entry.cur_incexp))
+            if candidates:
+                entry_orm = candidates.pop(0)
+                unmatched.pop(entry_orm.entry_id)
+                matched.append((entry_orm, entry))
+            else:
+                # insert new entry
+                self.dao_access.user_session.add(
+                    self.fromEntry(
+                        journal_id=journal.journal_id,
+                        entry=entry
+                    )
+                )
+        
+        # update matched entries, session will only issue update for changed fields
+        for entry_orm, entry in matched:
+            entry_orm.entry_type = entry.entry_type
+            entry_orm.acct_id = entry.acct.acct_id
+            entry_orm.cur_incexp = entry.cur_incexp
+            entry_orm.amount = entry.amount
+            entry_orm.amount_base = entry.amount_base
+            entry_orm.description = entry.description
+            self.dao_access.user_session.add(entry_orm)
+        
+        # delete entries no longer exist
+        for entry_orm in unmatched.values():
+            self.dao_access.user_session.delete(entry_orm)
+        
+        # commit at same time
+        try:
+            self.dao_access.commit()
+        except IntegrityError as e:
+            self.dao_access.user_session.rollback()
+            raise infer_integrity_error(e, during_creation=True)
+        logging.info(f"updated {journal} in place")
+        
+    def export_entries(
+        self,
+        min_dt: date = date(1970, 1, 1), 
+        max_dt: date = date(2099, 12, 31),
+        acct_ids: list[str] | None = None,
+        jrn_src: JournalSrc | None = None,
+        batch_size: int = 1000
+    ) -> Generator[_EntryExport, None, None]:
+        # stream entries joined with journal/account/chart, ordered by date and journal
+        # server side cursor (yield_per) keeps memory constant regardless of date range
+        filters = [
+            JournalORM.jrn_date.between(min_dt, max_dt), # type: ignore
+        ]
+        if acct_ids is not None:
+            filters.append(EntryORM.acct_id.in_(acct_ids)) # type: ignore
+        if jrn_src is not None:
+            filters.append(JournalORM.jrn_src == jrn_src)
+        
+        sql = (
+            select(
+                JournalORM.journal_id,
+                JournalORM.jrn_date,
+                JournalORM.jrn_src,
+                JournalORM.note,
+                EntryORM.entry_id,
+                EntryORM.entry_type,
+                EntryORM.acct_id,
+                AcctORM.acct_name,
+                AcctORM.acct_type,
+                AcctORM.chart_id,
+                ChartOfAccountORM.node_name.label('chart_name'), # type: ignore
+                EntryORM.cur_incexp,
+                EntryORM.amount,
+                EntryORM.amount_base,
+                EntryORM.description
+            )
+            .join(JournalORM, onclause=EntryORM.journal_id == JournalORM.journal_id)
+            .join(AcctORM, onclause=EntryORM.acct_id == AcctORM.acct_id)
+            .join(ChartOfAccountORM, onclause=AcctORM.chart_id == ChartOfAccountORM.chart_id)
+            .where(*filters)
+            .order_by(JournalORM.jrn_date, JournalORM.journal_id, EntryORM.entry_id)
+            .execution_options(yield_per=batch_size)
+        )
+        
+        # dedicated session, the stream may outlive the request scoped one
+        with Session(self.dao_access.user_engine) as s:
+            for row in s.exec(sql): # type: ignore
+                yield _EntryExport(
+                    journal_id=row.journal_id,
+                    jrn_date=row.jrn_date,
+                    jrn_src=row.jrn_src,
+                    note=row.note,
+                    entry_id=row.entry_id,
+                    entry_type=row.entry_type,
+                    acct_id=row.acct_id,
+                    acct_name=row.acct_name,
+                    acct_type=row.acct_type,
+                    chart_id=row.chart_id,
+                    chart_name=row.chart_name,
+                    cur_incexp=row.cur_incexp,
+                    amount=row.amount,
+                    amount_base=row.amount_base,
+                    description=row.description
+                )
         
     def list_journal(
         self,
@@ -455,8 +624,220 @@ class journalDao:
             for flow in flows
         }
         
-    def list_entry_by_acct(self, acct_id: str) -> list[_EntryBrief]:
+    def agg_accts_flow_by_period(
+        self, 
+        periods: list[Tuple[date, date]], 
+        acct_types: list[AcctType] | None = None
+    ) -> dict[str, list[_AcctFlowAGG]]:
+        # same aggregates as agg_accts_flow, but one vector per account (one item per period)
+        # periods need to be consecutive and non-overlapping, grouped in one query by period index
+        period_idx = case(
+            *[
+                (JournalORM.jrn_date.between(start_dt, end_dt), i) # type: ignore
+                for i, (start_dt, end_dt) in enumerate(periods)
+            ],
+            else_ = -1
+        ).label('period_idx')
+        
+        filters = [JournalORM.jrn_date.between(periods[0][0], periods[-1][1])] # type: ignore
+        if acct_types is not None:
+            filters.append(AcctORM.acct_type.in_(acct_types)) # type: ignore
+        sql = (
+            select(
+                EntryORM.acct_id,
+                AcctORM.acct_type,
+                period_idx,
+                f.count(JournalORM.journal_id.distinct()).label('num_journal'), # type: ignore
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.DEBIT, 1), 
+                    else_ = 0
+                )).label('num_debit_entry'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.CREDIT, 1), 
+                    else_ = 0
+                )).label('num_credit_entry'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.DEBIT, EntryORM.amount), 
+                    else_ = 0
+                )).label('debit_amount_raw'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.CREDIT, EntryORM.amount), 
+                    else_ = 0
+                )).label('credit_amount_raw'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.DEBIT, EntryORM.amount_base), 
+                    else_ = 0
+                )).label('debit_amount_base'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.CREDIT, EntryORM.amount_base), 
+                    else_ = 0
+                )).label('credit_amount_base'),
+            )
+            .join(
+                JournalORM,
+                onclause=JournalORM.journal_id == EntryORM.journal_id,
+                isouter=False # inner join
+            )
+            .join(
+                AcctORM,
+                onclause=AcctORM.acct_id == EntryORM.acct_id,
+                isouter=False # inner join
+            )
+            .where(*filters)
+            .group_by(
+                EntryORM.acct_id,
+                AcctORM.acct_type,
+                period_idx
+            )
+        )
+        flows = self.dao_access.user_session.exec(sql).all()
+        
+        # accounts without any entry in the range are left out, caller fills with zero
+        result: dict[str, list[_AcctFlowAGG]] = {}
+        for flow in flows:
+            if flow.period_idx < 0:
+                continue # gap between periods
+            if flow.acct_id not in result:
+                result[flow.acct_id] = [_AcctFlowAGG(acct_type=flow.acct_type) for _ in periods]
+            result[flow.acct_id][flow.period_idx] = _AcctFlowAGG(
+                acct_type=flow.acct_type,
+                num_journal=flow.num_journal,
+                num_debit_entry=flow.num_debit_entry,
+                num_credit_entry=flow.num_credit_entry,
+                debit_amount_raw=flow.debit_amount_raw,
+                credit_amount_raw=flow.credit_amount_raw,
+                debit_amount_base=flow.debit_amount_base,
+                credit_amount_base=flow.credit_amount_base
+            )
+        return result
+        
+    def agg_acct_flow_by_period(
+        self,
+        acct_id: str,
+        start_dt: date,
+        end_dt: date,
+        freq: Literal['day', 'month'] = 'month'
+    ) -> list[_AcctPeriodFlowAGG]:
+        # flow of one account grouped by day/month, plus running balance at each period end
+        # only periods having entries are returned, balance carries over the gaps
+        try:
+            acct_type = self.dao_access.user_session.exec(
+                select(AcctORM.acct_type).where(AcctORM.acct_id == acct_id)
+            ).one()
+        except NoResultFound as e:
+            raise NotExistError(details=str(e))
+        
+        # signed the same way as net_raw/net_base
+        sign = 1 if acct_type in (AcctType.AST, AcctType.EXP) else -1
+        direction = case((EntryORM.entry_type == EntryType.DEBIT, sign), else_ = -sign)
+        if freq == 'day':
+            period_key = JournalORM.jrn_date
+        else:
+            period_key = extract('year', JournalORM.jrn_date) * 100 + extract('month', JournalORM.jrn_date)
+        
+        def _opening(amount_col):
+            # balance carried in from before the range
+            return (
+                select(f.coalesce(f.sum(amount_col * direction), 0))
+                .join(
+                    JournalORM,
+                    onclause=JournalORM.journal_id == EntryORM.journal_id,
+                    isouter=False # inner join
+                )
+                .where(
+                    EntryORM.acct_id == acct_id,
+                    JournalORM.jrn_date < start_dt
+                )
+                .scalar_subquery()
+            )
+        
+        period_summary = (
+            select(
+                period_key.label('period_key'),
+                f.count(JournalORM.journal_id.distinct()).label('num_journal'), # type: ignore
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.DEBIT, 1), 
+                    else_ = 0
+                )).label('num_debit_entry'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.CREDIT, 1), 
+                    else_ = 0
+                )).label('num_credit_entry'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.DEBIT, EntryORM.amount), 
+                    else_ = 0
+                )).label('debit_amount_raw'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.CREDIT, EntryORM.amount), 
+                    else_ = 0
+                )).label('credit_amount_raw'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.DEBIT, EntryORM.amount_base), 
+                    else_ = 0
+                )).label('debit_amount_base'),
+                f.sum(case(
+                    (EntryORM.entry_type == EntryType.CREDIT, EntryORM.amount_base), 
+                    else_ = 0
+                )).label('credit_amount_base'),
+                f.sum(EntryORM.amount * direction).label('net_raw'), # type: ignore
+                f.sum(EntryORM.amount_base * direction).label('net_base'), # type: ignore
+            )
+            .join(
+                JournalORM,
+                onclause=JournalORM.journal_id == EntryORM.journal_id,
+                isouter=False # inner join
+            )
+            .where(
+                EntryORM.acct_id == acct_id,
+                JournalORM.jrn_date.between(start_dt, end_dt) # type: ignore
+            )
+            .group_by(period_key)
+            .subquery()
+        )
+        sql = (
+            select(
+                period_summary,
+                (
+                    _opening(EntryORM.amount)
+                    + f.sum(period_summary.c.net_raw).over(order_by=period_summary.c.period_key)
+                ).label('closing_raw'),
+                (
+                    _opening(EntryORM.amount_base)
+                    + f.sum(period_summary.c.net_base).over(order_by=period_summary.c.period_key)
+                ).label('closing_base'),
+            )
+            .order_by(period_summary.c.period_key)
+        )
+        flows = self.dao_access.user_session.exec(sql).all()
+        
+        return [
+            _AcctPeriodFlowAGG(
+                acct_type=acct_type,
+                period_start=(
+                    flow.period_key if freq == 'day' 
+                    else date(int(flow.period_key) // 100, int(flow.period_key) % 100, 1)
+                ),
+                num_journal=flow.num_journal,
+                num_debit_entry=flow.num_debit_entry,
+                num_credit_entry=flow.num_credit_entry,
+                debit_amount_raw=flow.debit_amount_raw,
+                credit_amount_raw=flow.credit_amount_raw,
+                debit_amount_base=flow.debit_amount_base,
+                credit_amount_base=flow.credit_amount_base,
+                closing_raw=flow.closing_raw,
+                closing_base=flow.closing_base
+            )
+            for flow in flows
+        ]
+        
+    def list_entry_by_acct(
+        self, 
+        acct_id: str,
+        min_dt: date | None = None,
+        max_dt: date | None = None
+    ) -> list[_EntryBrief]:
         # cumulative numbers is debit - credit
+        # cumulated over full history first, date range only limits rows returned
         sql = (
             select(
                 EntryORM.entry_id,
@@ -499,9 +880,18 @@ class journalDao:
                 isouter=False # inner join
             )
             .where(EntryORM.acct_id == acct_id)
-            .order_by(JournalORM.jrn_date.desc(), EntryORM.entry_id.desc()) # type: ignore
+            .subquery()
         )
         
-        entries = self.dao_access.user_session.exec(sql).all()
+        filters = []
+        if min_dt is not None:
+            filters.append(sql.c.jrn_date >= min_dt)
+        if max_dt is not None:
+            filters.append(sql.c.jrn_date <= max_dt)
+        entries = self.dao_access.user_session.exec(
+            select(*sql.c)
+            .where(*filters)
+            .order_by(sql.c.jrn_date.desc(), sql.c.entry_id.desc())
+        ).all()
             
         return [_EntryBrief.model_validate(entry._mapping) for entry in entries]
\ No newline at end of file
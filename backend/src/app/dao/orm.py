@@ -1,13 +1,13 @@
 from sqlalchemy.engine import Engine
 from sqlmodel import Field, SQLModel, Column, create_engine
-from sqlalchemy import ForeignKey, Boolean, JSON, ARRAY, Integer, String, Text, Date, DECIMAL
+from sqlalchemy import ForeignKey, Boolean, JSON, ARRAY, Integer, String, Text, Date, DateTime, DECIMAL, Float
 from sqlalchemy_utils import EmailType, PasswordType, PhoneNumberType, ChoiceType
 from sqlalchemy.exc import NoResultFound, IntegrityError
-from datetime import date
+from datetime import date, datetime
 
 from src.app.model.exceptions import FKNoDeleteUpdateError, FKNotExistError, AlreadyExistError
 from src.app.model.enums import AcctType, BankAcctType, CurType, EntityType, EntryType, ItemType, \
-    JournalSrc, PropertyTransactionType, PropertyType, UnitType
+    JobStatus, JobType, JournalSrc, PropertyTransactionType, PropertyType, UnitType
 
 def infer_integrity_error(e: IntegrityError, during_creation: bool = True) ->  FKNoDeleteUpdateError | FKNotExistError | AlreadyExistError | IntegrityError:
     # TODO: enhance this when use other backend engine
@@ -95,7 +95,66 @@ class FxORM(SQLModelWithSort, table=True):
         sa_column=Column(DECIMAL(15, 5, asdecimal=False), nullable = False)
     )
     
+class JobORM(SQLModelWithSort, table=True):
+    __collection__: str = 'common'
+    __tablename__: str = "jobs"
+    
+    job_id: str = Field(
+        sa_column=Column(
+            String(length = 17), 
+            primary_key = True, 
+            nullable = False)
+    )
+    user_id: str = Field(
+        sa_column=Column(
+            String(length = 15), 
+            ForeignKey(
+                'users.user_id', 
+                onupdate = 'CASCADE', 
+                ondelete = 'CASCADE'
+            ),
+            nullable = False,
+            index = True
+        )
+    )
+    job_type: JobType = Field(
+        sa_column=Column(ChoiceType(JobType, impl = Integer()), nullable = False)
+    )
+    status: JobStatus = Field(
+        sa_column=Column(ChoiceType(JobStatus, impl = Integer()), nullable = False, index = True)
+    )
+    params: dict = Field(sa_column=Column(JSON(), nullable = False))
+    progress: float = Field(sa_column=Column(Float(), nullable = False, default = 0))
+    message: str | None = Field(sa_column=Column(Text(), nullable = True))
+    result: dict | None = Field(sa_column=Column(JSON(), nullable = True))
+    cancel_requested: bool = Field(
+        sa_column=Column(Boolean(create_constraint=True), default = False, nullable = False)
+    )
+    created: datetime = Field(sa_column=Column(DateTime(), nullable = False))
+    started: datetime | None = Field(sa_column=Column(DateTime(), nullable = True))
+    finished: datetime | None = Field(sa_column=Column(DateTime(), nullable = True))
+    
+    @classmethod
+    def sort_for_backup(cls, rows):
+        # job queue is transient state, restoring it would resurrect stale running jobs
+        return []
+    
+class FileBlobORM(SQLModelWithSort, table=True):
+    # stored content, addressed by its sha256, shared by all files with same content
+    __collection__: str = 'user_specific'
+    __tablename__: str = 'file_blob'
+    
+    filehash: str = Field(
+        sa_column=Column(
+            String(length = 64), 
+            primary_key = True, 
+            nullable = False)
+    )
+    size: int = Field(sa_column=Column(Integer(), nullable = False))
+    ref_count: int = Field(sa_column=Column(Integer(), nullable = False, default = 0))
+    
 class FileORM(SQLModelWithSort, table=True):
+    # filename -> blob mapping
     __collection__: str = 'user_specific'
     __tablename__: str = 'file'
     
@@ -106,7 +165,18 @@ class FileORM(SQLModelWithSort, table=True):
             nullable = False)
     )
     filename: str = Field(sa_column=Column(String(length = 200), nullable = False, primary_key = False, unique=True))
-    filehash: str = Field(sa_column=Column(String(length = 64), nullable = False, primary_key = False, unique=True))
+    filehash: str | None = Field(
+        sa_column=Column(
+            String(length = 64), 
+            ForeignKey(
+                'file_blob.filehash', 
+                onupdate = 'CASCADE', 
+                ondelete = 'RESTRICT'
+            ),
+            nullable = True, # legacy file stored under its filename, not content addressed
+            index = True
+        )
+    )
     
     
 class ContactORM(SQLModelWithSort, table=True):
@@ -864,4 +934,21 @@ class DividendORM(SQLModelWithSort, table=True):
             nullable = False
         )
     )
-    note: str | None = Field(sa_column=Column(Text(), nullable = True))
\ No newline at end of file
+    note: str | None = Field(sa_column=Column(Text(), nullable = True))    
+    
+class DataVersionORM(SQLModelWithSort, table=True):
+    __collection__: str = 'user_specific'
+    __tablename__: str = "data_versions"
+    
+    domain: str = Field(
+        sa_column=Column(String(length = 20), primary_key = True, nullable = False)
+    )
+    version: str = Field(sa_column=Column(String(length = 13), nullable = False))
+    
+# data version domain -> tables, any committed write to these tables bumps the domain version
+DATA_VERSION_DOMAINS: dict[str, tuple[str, ...]] = {
+    'accounts': ('chart_of_account', 'accounts'),
+    'journals': ('journals', 'entries'),
+    'items': ('item', ),
+    'entities': ('contact', 'entity'),
+}
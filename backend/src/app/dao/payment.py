@@ -8,6 +8,7 @@ from src.app.model.exceptions import AlreadyExistError, FKNotExistError, NotExis
 from src.app.dao.orm import AcctORM, EntryORM, InvoiceORM, PaymentItemORM, PaymentORM, infer_integrity_error
 from src.app.model.payment import Payment, PaymentItem, _PaymentBrief
 from src.app.dao.connection import UserDaoAccess
+from src.app.utils.base import VALIDATE_DB_READS
 
 
 class paymentDao:
@@ -24,8 +25,9 @@ class paymentDao:
             payment_amount_raw=payment_item.payment_amount_raw,
         )
         
-    def toPaymentItem(self, payment_item_orm: PaymentItemORM) -> PaymentItem:
-        return PaymentItem(
+    def toPaymentItem(self, payment_item_orm: PaymentItemORM, validate: bool = VALIDATE_DB_READS) -> PaymentItem:
+        return PaymentItem.hydrate(
+            validate=validate,
             payment_item_id=payment_item_orm.payment_item_id,
             invoice_id=payment_item_orm.invoice_id,
             payment_amount=payment_item_orm.payment_amount,
@@ -45,14 +47,20 @@ class paymentDao:
             note=payment.note
         )
         
-    def toPayment(self, payment_orm: PaymentORM, payment_item_orms: list[PaymentItemORM]) -> Payment:
-        return Payment(
+    def toPayment(
+        self, 
+        payment_orm: PaymentORM, 
+        payment_item_orms: list[PaymentItemORM], 
+        validate: bool = VALIDATE_DB_READS
+    ) -> Payment:
+        return Payment.hydrate(
+            validate=validate,
             payment_id=payment_orm.payment_id,
             payment_num=payment_orm.payment_num,
             payment_dt=payment_orm.payment_dt,
             entity_type=payment_orm.entity_type,
             payment_items=[
-                self.toPaymentItem(payment_item_orm) 
+                self.toPaymentItem(payment_item_orm, validate=validate) 
                 for payment_item_orm in payment_item_orms
             ],
             payment_acct_id=payment_orm.payment_acct_id,
@@ -62,29 +70,28 @@ class paymentDao:
         )
     
     def add(self, journal_id: str, payment: Payment):
-        # add payment first
-        payment_orm = self.fromPayment(journal_id=journal_id, payment=payment)
-        self.dao_access.user_session.add(payment_orm)
         try:
-            self.dao_access.user_session.commit()
+            # add payment first, flush so it is inserted before items
+            payment_orm = self.fromPayment(journal_id=journal_id, payment=payment)
+            self.dao_access.user_session.add(payment_orm)
+            self.dao_access.user_session.flush()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise AlreadyExistError(details=str(e))
         
-        # add individual payment items
-        for payment_item in payment.payment_items:
-            payment_item_orm = self.fromPaymentItem(
-                payment_id=payment.payment_id,
-                payment_item=payment_item
-            )
-            self.dao_access.user_session.add(payment_item_orm)
         try:
-            self.dao_access.user_session.commit()
+            # add individual payment items
+            for payment_item in payment.payment_items:
+                payment_item_orm = self.fromPaymentItem(
+                    payment_id=payment.payment_id,
+                    payment_item=payment_item
+                )
+                self.dao_access.user_session.add(payment_item_orm)
+            
+            # commit payment and items at same time
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
-            # remove payment as well
-            self.dao_access.user_session.delete(payment_orm)
-            self.dao_access.user_session.commit()
             raise infer_integrity_error(e, during_creation=True)
 
         
@@ -133,7 +140,7 @@ class paymentDao:
         # commit at same time
         try:
             self.dao_access.user_session.delete(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=False)
@@ -165,7 +172,7 @@ class paymentDao:
             
             try:
                 self.dao_access.user_session.add(p)
-                self.dao_access.user_session.commit()
+                self.dao_access.commit()
             except IntegrityError as e:
                 self.dao_access.user_session.rollback()
                 raise FKNotExistError(
@@ -189,7 +196,7 @@ class paymentDao:
             )
             self.dao_access.user_session.add(payment_item_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback() # will rollback both item removal and new item add
             raise FKNotExistError(
@@ -5,8 +5,8 @@ from typing import Tuple
 from sqlmodel import Session, select, delete, case, func as f
 from sqlalchemy.exc import NoResultFound, IntegrityError
 from src.app.model.enums import PropertyTransactionType, PropertyType
-from src.app.dao.orm import PropertyORM, PropertyTransactionORM, infer_integrity_error
-from src.app.model.property import Property, PropertyTransaction, _PropertyPriceBrief
+from src.app.dao.orm import AcctORM, PropertyORM, PropertyTransactionORM, infer_integrity_error
+from src.app.model.property import Property, PropertyTransaction, _PropertyPriceBrief, _PropertyTypeValuation, _PropertyValuation
 from src.app.model.exceptions import AlreadyExistError, FKNotExistError, NotExistError, FKNoDeleteUpdateError
 from src.app.dao.connection import UserDaoAccess
 
@@ -47,7 +47,7 @@ class propertyDao:
         property_orm = self.fromProperty(journal_id, property)
         self.dao_access.user_session.add(property_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -61,7 +61,7 @@ class propertyDao:
         # commit at same time
         try:
             self.dao_access.user_session.exec(sql) # type: ignore
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(str(e))
@@ -110,7 +110,7 @@ class propertyDao:
         
         try:
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNotExistError(
@@ -162,7 +162,19 @@ class propertyTransactionDao:
             
         self.dao_access.user_session.add(property_trans_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
+        except IntegrityError as e:
+            self.dao_access.user_session.rollback()
+            raise infer_integrity_error(e, during_creation=True)
+        
+    def adds(self, journal_ids: list[str], property_trans: list[PropertyTransaction]):
+        # bulk version of add, journal ids are matched by position
+        self.dao_access.user_session.add_all([
+            self.fromPropertyTrans(journal_id, trans)
+            for journal_id, trans in zip(journal_ids, property_trans)
+        ])
+        try:
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -176,7 +188,7 @@ class propertyTransactionDao:
             # commit at same time
             try:
                 self.dao_access.user_session.exec(sql) # type: ignore
-                self.dao_access.user_session.commit()
+                self.dao_access.commit()
             except IntegrityError as e:
                 self.dao_access.user_session.rollback()
                 raise FKNoDeleteUpdateError(str(e))
@@ -222,7 +234,7 @@ class propertyTransactionDao:
         
         try:
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNotExistError(
@@ -268,8 +280,8 @@ class propertyTransactionDao:
         p = _PropertyPriceBrief(pur_cost=prop.pur_cost) # type: ignore
         if len(result) > 0:
             attr_mapping = {
-                PropertyTransactionType.APPRECIATION: 'acc_depreciation',
-                PropertyTransactionType.DEPRECIATION: 'acc_appreciation',
+                PropertyTransactionType.DEPRECIATION: 'acc_depreciation',
+                PropertyTransactionType.APPRECIATION: 'acc_appreciation',
                 PropertyTransactionType.IMPAIRMENT: 'acc_impairment',
             }
             for r in result:
@@ -278,6 +290,119 @@ class propertyTransactionDao:
         return p
                 
     
+    def _acc_flow_by_property(self, rep_dt: date):
+        # accumulated amount of each transaction type per property, as of rep_dt
+        def _acc(trans_type: PropertyTransactionType):
+            return f.sum(
+                case(
+                    (PropertyTransactionORM.trans_type == trans_type, PropertyTransactionORM.trans_amount), # type: ignore
+                    else_=0
+                )
+            )
+        
+        return (
+            select(
+                PropertyTransactionORM.property_id,
+                _acc(PropertyTransactionType.DEPRECIATION).label('acc_depreciation'),
+                _acc(PropertyTransactionType.APPRECIATION).label('acc_appreciation'),
+                _acc(PropertyTransactionType.IMPAIRMENT).label('acc_impairment'),
+            )
+            .where(PropertyTransactionORM.trans_dt <= rep_dt)
+            .group_by(PropertyTransactionORM.property_id)
+            .subquery()
+        )
+    
+    def get_acc_stats(self, rep_dt: date) -> list[_PropertyValuation]:
+        # get_acc_stat of all properties purchased on or before rep_dt, in one query
+        flows = self._acc_flow_by_property(rep_dt)
+        sql = (
+            select(
+                PropertyORM.property_id,
+                PropertyORM.property_name,
+                PropertyORM.property_type,
+                PropertyORM.pur_dt,
+                AcctORM.currency,
+                (PropertyORM.pur_price - PropertyORM.tax).label('pur_cost'),
+                f.coalesce(flows.c.acc_depreciation, 0).label('acc_depreciation'),
+                f.coalesce(flows.c.acc_appreciation, 0).label('acc_appreciation'),
+                f.coalesce(flows.c.acc_impairment, 0).label('acc_impairment'),
+            )
+            .join(AcctORM, onclause=PropertyORM.pur_acct_id == AcctORM.acct_id)
+            .join(flows, onclause=PropertyORM.property_id == flows.c.property_id, isouter=True)
+            .where(PropertyORM.pur_dt <= rep_dt)
+            .order_by(PropertyORM.pur_dt, PropertyORM.property_id)
+        )
+        return [
+            _PropertyValuation(
+                property_id=r.property_id,
+                property_name=r.property_name,
+                property_type=r.property_type,
+                pur_dt=r.pur_dt,
+                currency=r.currency,
+                pur_cost=r.pur_cost,
+                acc_depreciation=r.acc_depreciation,
+                acc_appreciation=r.acc_appreciation,
+                acc_impairment=r.acc_impairment,
+            )
+            for r in self.dao_access.user_session.exec(sql).all()
+        ]
+    
+    def get_acc_stats_by_type(self, rep_dt: date) -> list[_PropertyTypeValuation]:
+        # same as get_acc_stats, summed by property type and purchase currency
+        # transactions are summed per property first so cost is not multiplied by the join
+        flows = self._acc_flow_by_property(rep_dt)
+        sql = (
+            select(
+                PropertyORM.property_type,
+                AcctORM.currency,
+                f.count(PropertyORM.property_id).label('num_properties'),
+                f.sum(PropertyORM.pur_price - PropertyORM.tax).label('pur_cost'),
+                f.sum(f.coalesce(flows.c.acc_depreciation, 0)).label('acc_depreciation'),
+                f.sum(f.coalesce(flows.c.acc_appreciation, 0)).label('acc_appreciation'),
+                f.sum(f.coalesce(flows.c.acc_impairment, 0)).label('acc_impairment'),
+            )
+            .join(AcctORM, onclause=PropertyORM.pur_acct_id == AcctORM.acct_id)
+            .join(flows, onclause=PropertyORM.property_id == flows.c.property_id, isouter=True)
+            .where(PropertyORM.pur_dt <= rep_dt)
+            .group_by(PropertyORM.property_type, AcctORM.currency)
+            .order_by(PropertyORM.property_type, AcctORM.currency)
+        )
+        return [
+            _PropertyTypeValuation(
+                property_type=r.property_type,
+                currency=r.currency,
+                num_properties=r.num_properties,
+                pur_cost=r.pur_cost,
+                acc_depreciation=r.acc_depreciation,
+                acc_appreciation=r.acc_appreciation,
+                acc_impairment=r.acc_impairment,
+            )
+            for r in self.dao_access.user_session.exec(sql).all()
+        ]
+    
+    def list_write_downs(self, property_ids: list[str]) -> dict[str, list[Tuple[date, PropertyTransactionType, float]]]:
+        # {property_id: [(date, type, amount)] sorted by date} of depreciation and impairment, for many properties in one query
+        sql = (
+            select(
+                PropertyTransactionORM.property_id,
+                PropertyTransactionORM.trans_dt,
+                PropertyTransactionORM.trans_type,
+                PropertyTransactionORM.trans_amount
+            )
+            .where(
+                PropertyTransactionORM.property_id.in_(set(property_ids)), # type: ignore
+                PropertyTransactionORM.trans_type.in_([ # type: ignore
+                    PropertyTransactionType.DEPRECIATION,
+                    PropertyTransactionType.IMPAIRMENT
+                ]),
+            )
+            .order_by(PropertyTransactionORM.trans_dt)
+        )
+        result = {}
+        for property_id, trans_dt, trans_type, trans_amount in self.dao_access.user_session.exec(sql).all():
+            result.setdefault(property_id, []).append((trans_dt, trans_type, trans_amount))
+        return result
+    
     def list_transactions(self, property_id: str) -> list[PropertyTransaction]:
         # get property transactions
         sql = select(PropertyTransactionORM).where(
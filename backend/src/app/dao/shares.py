@@ -4,8 +4,8 @@ from typing import Tuple
 from sqlmodel import Session, select, delete, case, func as f
 from sqlalchemy.exc import NoResultFound, IntegrityError
 from src.app.model.exceptions import FKNoDeleteUpdateError, FKNotExistError, NotExistError
-from src.app.dao.orm import DividendORM, StockIssueORM, StockRepurchaseORM
-from src.app.model.shares import Dividend, StockIssue, StockRepurchase
+from src.app.dao.orm import AcctORM, DividendORM, StockIssueORM, StockRepurchaseORM
+from src.app.model.shares import _DividendAGG, _TreasuryBatchBrief, Dividend, StockIssue, StockRepurchase
 from src.app.dao.orm import infer_integrity_error
 from src.app.dao.connection import UserDaoAccess
 
@@ -45,7 +45,7 @@ class stockIssueDao:
         stock_issue_orm = self.fromStockIssue(journal_id, stock_issue)
         self.dao_access.user_session.add(stock_issue_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -59,7 +59,7 @@ class stockIssueDao:
         # commit at same time
         try:
             self.dao_access.user_session.exec(sql) # type: ignore
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(str(e))
@@ -108,7 +108,7 @@ class stockIssueDao:
         
         try:
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNotExistError(
@@ -163,6 +163,18 @@ class stockIssueDao:
             
         return total_reissue or 0 # type: ignore
     
+    def get_total_new_issue(self, rep_dt: date) -> float:
+        # shares newly issued on and before rep_dt, reissue of treasury stock excluded
+        sql = select(
+            f.sum(StockIssueORM.num_shares).label('total_issue')
+        ).where(
+            StockIssueORM.is_reissue == False,
+            StockIssueORM.issue_dt <= rep_dt,
+        )
+        total_issue = self.dao_access.user_session.exec(sql).one()
+        
+        return total_issue or 0 # type: ignore
+    
     
 class stockRepurchaseDao:
     
@@ -196,7 +208,7 @@ class stockRepurchaseDao:
         stock_repur_orm = self.fromStockRepur(journal_id, stock_repur)
         self.dao_access.user_session.add(stock_repur_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -210,7 +222,7 @@ class stockRepurchaseDao:
         # commit at same time
         try:
             self.dao_access.user_session.exec(sql) # type: ignore
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(str(e))
@@ -257,7 +269,7 @@ class stockRepurchaseDao:
         
         try:
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNotExistError(
@@ -280,6 +292,72 @@ class stockRepurchaseDao:
             
         return stock_repurs
     
+    def _batch_sql(self, rep_dt: date, exclu_issue_id: str | None = None):
+        # repurchase batches with shares reissued from each on and before rep_dt
+        reissue_cond = [
+            StockIssueORM.is_reissue == True,
+            StockIssueORM.issue_dt <= rep_dt,
+        ]
+        if exclu_issue_id is not None:
+            reissue_cond.append(StockIssueORM.issue_id != exclu_issue_id)
+        reissues = (
+            select(
+                StockIssueORM.reissue_repur_id,
+                f.sum(StockIssueORM.num_shares).label('reissued_shares')
+            )
+            .where(*reissue_cond)
+            .group_by(StockIssueORM.reissue_repur_id)
+            .subquery()
+        )
+        return (
+            select(
+                StockRepurchaseORM.repur_id,
+                StockRepurchaseORM.repur_dt,
+                StockRepurchaseORM.num_shares,
+                f.coalesce(reissues.c.reissued_shares, 0).label('reissued_shares')
+            )
+            .join(
+                reissues,
+                onclause=StockRepurchaseORM.repur_id == reissues.c.reissue_repur_id,
+                isouter=True
+            )
+        )
+        
+    def get_batch(self, repur_id: str, rep_dt: date, exclu_issue_id: str | None = None) -> _TreasuryBatchBrief:
+        # remaining treasury stock of one batch, without loading the repurchase journal
+        # need to exclude self issue id in counting
+        sql = self._batch_sql(rep_dt, exclu_issue_id).where(
+            StockRepurchaseORM.repur_id == repur_id
+        )
+        try:
+            r = self.dao_access.user_session.exec(sql).one()
+        except NoResultFound as e:
+            raise NotExistError(details=str(e))
+        
+        return _TreasuryBatchBrief(
+            repur_id=r.repur_id,
+            repur_dt=r.repur_dt,
+            num_shares=r.num_shares,
+            reissued_shares=r.reissued_shares
+        )
+        
+    def list_batches(self, rep_dt: date) -> list[_TreasuryBatchBrief]:
+        # all batches repurchased on and before rep_dt
+        sql = (
+            self._batch_sql(rep_dt)
+            .where(StockRepurchaseORM.repur_dt <= rep_dt)
+            .order_by(StockRepurchaseORM.repur_dt, StockRepurchaseORM.repur_id)
+        )
+        return [
+            _TreasuryBatchBrief(
+                repur_id=r.repur_id,
+                repur_dt=r.repur_dt,
+                num_shares=r.num_shares,
+                reissued_shares=r.reissued_shares
+            )
+            for r in self.dao_access.user_session.exec(sql).all()
+        ]
+    
 class dividendDao:
     
     def __init__(self, dao_access: UserDaoAccess):
@@ -308,7 +386,7 @@ class dividendDao:
         div_orm = self.fromDiv(journal_id, dividend)
         self.dao_access.user_session.add(div_orm)
         try:
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise infer_integrity_error(e, during_creation=True)
@@ -322,7 +400,7 @@ class dividendDao:
         # commit at same time
         try:
             self.dao_access.user_session.exec(sql) # type: ignore
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNoDeleteUpdateError(str(e))
@@ -367,7 +445,7 @@ class dividendDao:
         
         try:
             self.dao_access.user_session.add(p)
-            self.dao_access.user_session.commit()
+            self.dao_access.commit()
         except IntegrityError as e:
             self.dao_access.user_session.rollback()
             raise FKNotExistError(
@@ -388,4 +466,26 @@ class dividendDao:
             div_orm=div_orm,
         ) for div_orm in div_orms]
             
-        return divs
\ No newline at end of file
+        return divs
+    
+    def get_div_agg(self, rep_dt: date) -> list[_DividendAGG]:
+        # dividends on and before rep_dt, summed by currency of credit account
+        sql = (
+            select(
+                AcctORM.currency,
+                f.count(DividendORM.div_id).label('num_divs'),
+                f.sum(DividendORM.div_amt).label('div_amt')
+            )
+            .join(AcctORM, onclause=DividendORM.credit_acct_id == AcctORM.acct_id)
+            .where(DividendORM.div_dt <= rep_dt)
+            .group_by(AcctORM.currency)
+            .order_by(AcctORM.currency)
+        )
+        return [
+            _DividendAGG(
+                currency=r.currency,
+                num_divs=r.num_divs,
+                div_amt=r.div_amt
+            )
+            for r in self.dao_access.user_session.exec(sql).all()
+        ]
@@ -0,0 +1,50 @@
+"""add jobs
+
+Revision ID: 6e2f4a9c1d37
+Revises: 1b8d7b582101
+Create Date: 2026-10-19 14:05:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Integer
+from sqlalchemy_utils import ChoiceType
+from src.app.model.enums import JobStatus, JobType
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2f4a9c1d37'
+down_revision: Union[str, Sequence[str], None] = '1b8d7b582101'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobs',
+    sa.Column('job_id', sa.String(length=17), nullable=False),
+    sa.Column('user_id', sa.String(length=15), nullable=False),
+    sa.Column('job_type', ChoiceType(JobType, impl = Integer()), nullable=False),
+    sa.Column('status', ChoiceType(JobStatus, impl = Integer()), nullable=False),
+    sa.Column('params', sa.JSON(), nullable=False),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('cancel_requested', sa.Boolean(create_constraint=True), nullable=False),
+    sa.Column('created', sa.DateTime(), nullable=False),
+    sa.Column('started', sa.DateTime(), nullable=True),
+    sa.Column('finished', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index(op.f('ix_jobs_user_id'), 'jobs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_jobs_status'), 'jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_jobs_status'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_user_id'), table_name='jobs')
+    op.drop_table('jobs')
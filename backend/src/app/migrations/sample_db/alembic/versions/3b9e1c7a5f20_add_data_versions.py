@@ -0,0 +1,32 @@
+"""add data versions
+
+Revision ID: 3b9e1c7a5f20
+Revises: d7fbe28b4d87
+Create Date: 2026-10-19 09:12:41.305112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e1c7a5f20'
+down_revision: Union[str, Sequence[str], None] = 'd7fbe28b4d87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('data_versions',
+    sa.Column('domain', sa.String(length=20), nullable=False),
+    sa.Column('version', sa.String(length=13), nullable=False),
+    sa.PrimaryKeyConstraint('domain')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('data_versions')
@@ -0,0 +1,60 @@
+"""content addressed files
+
+Revision ID: 8c41d2e7b9a3
+Revises: 3b9e1c7a5f20
+Create Date: 2026-10-19 15:21:47.093611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41d2e7b9a3'
+down_revision: Union[str, Sequence[str], None] = '3b9e1c7a5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('file_blob',
+    sa.Column('filehash', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('filehash')
+    )
+    # filehash was md5 of filename and unique, now sha256 of content shared by files
+    # existing files stay where they are (stored by filename), marked by null filehash
+    op.create_table('file_new',
+    sa.Column('file_id', sa.String(length=18), nullable=False),
+    sa.Column('filename', sa.String(length=200), nullable=False),
+    sa.Column('filehash', sa.String(length=64), nullable=True),
+    sa.ForeignKeyConstraint(['filehash'], ['file_blob.filehash'], onupdate='CASCADE', ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('file_id'),
+    sa.UniqueConstraint('filename')
+    )
+    op.execute('INSERT INTO file_new (file_id, filename, filehash) SELECT file_id, filename, NULL FROM file')
+    op.drop_table('file')
+    op.rename_table('file_new', 'file')
+    op.create_index(op.f('ix_file_filehash'), 'file', ['filehash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_file_filehash'), table_name='file')
+    op.create_table('file_old',
+    sa.Column('file_id', sa.String(length=18), nullable=False),
+    sa.Column('filename', sa.String(length=200), nullable=False),
+    sa.Column('filehash', sa.String(length=64), nullable=False),
+    sa.PrimaryKeyConstraint('file_id'),
+    sa.UniqueConstraint('filehash'),
+    sa.UniqueConstraint('filename')
+    )
+    # file_id as placeholder hash, content addressed files need to be copied back to filename location separately
+    op.execute('INSERT INTO file_old (file_id, filename, filehash) SELECT file_id, filename, file_id FROM file')
+    op.drop_table('file')
+    op.rename_table('file_old', 'file')
+    op.drop_table('file_blob')
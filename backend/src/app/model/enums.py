@@ -78,4 +78,21 @@ class PropertyType(IntEnum):
 class PropertyTransactionType(IntEnum):
     DEPRECIATION = 1
     IMPAIRMENT = 2
-    APPRECIATION = 3
\ No newline at end of file
+    APPRECIATION = 3    
+@unique
+class JobType(IntEnum):
+    BACKUP = 1
+    RESTORE = 2
+    ADMIN_BACKUP = 3
+    ADMIN_RESTORE = 4
+    EXPENSE_IMPORT = 5
+    FX_BACKFILL = 6
+    FILE_GC = 7
+    
+@unique
+class JobStatus(IntEnum):
+    PENDING = 1
+    RUNNING = 2
+    SUCCEEDED = 3
+    FAILED = 4
+    CANCELLED = 5
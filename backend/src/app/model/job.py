@@ -0,0 +1,35 @@
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable
+from pydantic import Field
+from src.app.model.enums import JobStatus, JobType
+from src.app.utils.tools import id_generator
+from src.app.utils.base import EnhancedBaseModel
+
+# (fraction done 0-1, status message), long operations call it between steps
+ProgressCallback = Callable[[float, str], None]
+
+class Job(EnhancedBaseModel):
+    job_id: str = Field(
+        default_factory=partial( # type: ignore
+            id_generator,
+            prefix='job-',
+            length=13,
+        ),
+        frozen=True,
+    )
+    user_id: str # tenant who submitted, concurrency limit applies per tenant
+    job_type: JobType
+    status: JobStatus = JobStatus.PENDING
+    params: dict[str, Any] = Field(default_factory=dict)
+    progress: float = Field(default=0, ge=0, le=1)
+    message: str | None = None
+    result: dict[str, Any] | None = None
+    cancel_requested: bool = False
+    created: datetime = Field(default_factory=datetime.now)
+    started: datetime | None = None
+    finished: datetime | None = None
+    
+    @property
+    def is_done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
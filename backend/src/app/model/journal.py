@@ -65,6 +65,15 @@ class _AcctFlowAGG(EnhancedBaseModel):
             return self.credit_amount_base - self.debit_amount_base
     
 
+class _AcctPeriodFlowAGG(_AcctFlowAGG):
+    # flow of one account within one period (day or month), with running balance at period end
+    period_start: date
+    closing_raw: float = Field(
+        0,
+        description='Running balance at period end in account currency, only meaningful for balance sheet account'
+    )
+    closing_base: float = Field(0, description='Running balance at period end in base currency')
+
 class _JournalBrief(EnhancedBaseModel):
     journal_id: str
     jrn_date: date
@@ -95,6 +104,24 @@ class _EntryBrief(EnhancedBaseModel):
     )
     description: str | None = Field(None)
     
+class _EntryExport(EnhancedBaseModel):
+    # flat GL detail row, one per entry with journal, account and chart info
+    journal_id: str
+    jrn_date: date
+    jrn_src: JournalSrc
+    note: str | None = Field(None)
+    entry_id: str
+    entry_type: EntryType
+    acct_id: str
+    acct_name: str
+    acct_type: AcctType
+    chart_id: str
+    chart_name: str
+    cur_incexp: CurType | None = Field(None)
+    amount: float
+    amount_base: float
+    description: str | None = Field(None)
+    
 class Journal(EnhancedBaseModel):
     model_config = ConfigDict(validate_assignment=True)
     
@@ -1,5 +1,6 @@
+from datetime import datetime
 from functools import partial
-import hashlib
+from typing import Any, Literal
 from pydantic import BaseModel, ConfigDict, Field, model_validator, computed_field
 from src.app.utils.tools import id_generator
 
@@ -14,10 +15,15 @@ class FileWrapper(BaseModel):
     )
     filename: str
     content: str
+    filehash: str | None = Field(None, description='sha256 of content, set once stored')
     
-    @computed_field()
-    def filehash(self) -> str:
-        return hashlib.md5(self.filename.encode()).hexdigest() # TODO: find efficient way to hash content
+class _FileInfo(BaseModel):
+    # metadata to serve a stored file as binary stream, without reading it
+    file_id: str
+    filename: str
+    filehash: str | None = Field(description='sha256 of content, None for legacy file stored by name')
+    size: int = Field(description='Size in bytes')
+    etag: str = Field(description='Changes whenever stored content changes')
     
 
 class _CountryBrief(BaseModel):
@@ -26,4 +32,40 @@ class _CountryBrief(BaseModel):
     
 class _StateBrief(BaseModel):
     state: str
-    iso2: str
\ No newline at end of file
+    iso2: str
+    
+class BatchRequest(BaseModel):
+    # one sub-request of a batch call
+    method: Literal['GET', 'POST', 'PUT', 'DELETE'] = 'GET'
+    path: str = Field(description='endpoint path under api root, e.g., /sales/invoice/list')
+    params: dict[str, Any] | None = Field(None, description='query parameters')
+    body: Any = Field(None, description='json body')
+    
+class BatchResponse(BaseModel):
+    status_code: int
+    body: Any = Field(None)
+    
+class ProfileRecord(BaseModel):
+    # one profiled request, stacks kept separately in profile store
+    profile_id: str = Field(
+        default_factory=partial( # type: ignore
+            id_generator,
+            prefix='prof-',
+            length=12,
+        ),
+        frozen=True,
+    )
+    user_id: str
+    username: str
+    method: str
+    path: str
+    status_code: int
+    started: datetime
+    duration_ms: float
+    interval_ms: float = Field(description='Sampling interval')
+    num_samples: int
+    
+class _ProfileFuncStat(BaseModel):
+    function: str
+    self_samples: int = Field(description='Samples where function is on top of stack')
+    total_samples: int = Field(description='Samples where function is anywhere on stack')
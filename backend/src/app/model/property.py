@@ -4,7 +4,7 @@ from typing import Any, Literal
 from pydantic import BaseModel, ConfigDict, Field, model_validator, computed_field
 
 from src.app.utils.base import EnhancedBaseModel
-from src.app.model.enums import PropertyType, PropertyTransactionType
+from src.app.model.enums import CurType, PropertyType, PropertyTransactionType
 from src.app.utils.tools import id_generator
 
 class Property(EnhancedBaseModel):
@@ -53,6 +53,24 @@ class PropertyTransaction(EnhancedBaseModel):
         description="Depreciation/Impairment/Appreciation amount, expressed in purchase curreny"
     )
 
+class DepreciationSchedule(EnhancedBaseModel):
+    method: Literal['straight_line', 'declining_balance'] = 'straight_line'
+    useful_life: float = Field(
+        gt=0,
+        description="Useful life in years"
+    )
+    freq: Literal['month', 'quarter', 'year'] = 'month'
+    salvage_value: float = Field(
+        default=0.0,
+        ge=0,
+        description="Residual value at end of useful life, expressed in purchase currency"
+    )
+    db_factor: float = Field(
+        default=2.0,
+        gt=0,
+        description="Declining balance rate as multiple of straight line rate, 2 is double declining"
+    )
+
 class _PropertyPriceBrief(EnhancedBaseModel):
     pur_cost: float = 0.0 # purchase cost, net of sales tax
     acc_depreciation: float = 0.0
@@ -61,5 +79,23 @@ class _PropertyPriceBrief(EnhancedBaseModel):
     
     @computed_field
     def value(self) -> float:
-        return self.pur_cost + self.acc_depreciation - self.acc_appreciation - self.acc_impairment
+        return self.pur_cost - self.acc_depreciation + self.acc_appreciation - self.acc_impairment
+    
+class _PropertyValuation(_PropertyPriceBrief):
+    property_id: str
+    property_name: str
+    property_type: PropertyType
+    pur_dt: date
+    currency: CurType | None = Field(
+        None,
+        description="Currency of purchase account, all amounts are expressed in it"
+    )
+    
+class _PropertyTypeValuation(_PropertyPriceBrief):
+    property_type: PropertyType
+    currency: CurType | None = Field(
+        None,
+        description="Currency of purchase account, properties bought in different currencies are not summed together"
+    )
+    num_properties: int = 0
     
\ No newline at end of file
@@ -4,6 +4,7 @@ from typing import Any, Literal
 from pydantic import BaseModel, ConfigDict, Field, model_validator, computed_field
 
 from src.app.utils.base import EnhancedBaseModel
+from src.app.model.enums import CurType
 from src.app.utils.tools import finround, id_generator
 
 class StockIssue(EnhancedBaseModel):
@@ -99,4 +100,48 @@ class Dividend(EnhancedBaseModel):
     credit_acct_id: str = Field(
         description='Which account pays the dividend, typically asset'
     )
-    note: str | None = Field(None)
\ No newline at end of file
+    note: str | None = Field(None)
+    
+    
+class _TreasuryBatchBrief(EnhancedBaseModel):
+    repur_id: str
+    repur_dt: date
+    num_shares: float = 0.0 # repurchased in this batch
+    reissued_shares: float = 0.0 # reissued from this batch so far
+    
+    @computed_field()
+    def remaining_shares(self) -> float:
+        # treasury stock still available for reissue
+        return self.num_shares - self.reissued_shares
+    
+
+class _DividendAGG(EnhancedBaseModel):
+    currency: CurType | None = Field(
+        None,
+        description='Currency of credit account, dividends paid in different currencies are not summed together'
+    )
+    num_divs: int = 0
+    div_amt: float = 0.0
+    
+
+class _CapTable(EnhancedBaseModel):
+    rep_dt: date
+    issued_shares: float = 0.0 # new issues only, excluding reissue
+    batches: list[_TreasuryBatchBrief] = []
+    dividends: list[_DividendAGG] = []
+    
+    @computed_field()
+    def repurchased_shares(self) -> float:
+        return sum(b.num_shares for b in self.batches)
+    
+    @computed_field()
+    def reissued_shares(self) -> float:
+        return sum(b.reissued_shares for b in self.batches)
+    
+    @computed_field()
+    def treasury_shares(self) -> float:
+        return self.repurchased_shares - self.reissued_shares # type: ignore
+    
+    @computed_field()
+    def outstanding_shares(self) -> float:
+        return self.issued_shares - self.treasury_shares # type: ignore
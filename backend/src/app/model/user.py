@@ -1,6 +1,6 @@
 from functools import partial
 from pydantic import Field, computed_field
-from src.app.utils.tools import id_generator, pwd_context
+from src.app.utils.tools import id_generator, get_pwd_context
 from src.app.utils.base import EnhancedBaseModel
 
 class Token(EnhancedBaseModel):
@@ -25,14 +25,14 @@ class UserInternalRead(User):
     hashed_password: str
     
     def verify_password(self, password: str) -> bool:
-        return pwd_context.verify(password, self.hashed_password) # type: ignore
+        return get_pwd_context().verify(password, self.hashed_password) # type: ignore
     
 class UserCreate(User):
     password: str = Field(min_length=8, max_length=20)
     
     @computed_field
     def hashed_password(self) -> str:
-        return pwd_context.hash(self.password)
+        return get_pwd_context().hash(self.password)
 
 class UserRegister(EnhancedBaseModel):
     username: str = Field(max_length=20)
@@ -547,12 +547,25 @@ class AcctService:
             )
         return acct
     
+    def get_accounts(self, acct_ids: list[str]) -> dict[str, Account]:
+        # many accounts in one query, keyed by acct id
+        accts = self.acct_dao.get_accts_by_ids(acct_ids)
+        missing = set(acct_ids).difference(accts.keys())
+        if len(missing) > 0:
+            raise NotExistError(
+                f'Acct Id: {sorted(missing)} not exist'
+            )
+        return accts
+    
     def get_accounts_by_chart(self, chart: Chart) -> list[Account]:
         try:
             accts = self.acct_dao.get_accts_by_chart(chart)
         except NotExistError as e:
             accts = []
         return accts
+    
+    def get_accounts_by_charts(self, charts: list[Chart]) -> list[Account]:
+        return self.acct_dao.get_accts_by_charts(charts)
             
     
     def add_account(self, acct: Account, ignore_exist: bool = False):
@@ -0,0 +1,263 @@
+from functools import cached_property
+from src.app.dao.connection import CommonDaoAccess, UserDaoAccess
+from src.app.dao.accounts import acctDao, chartOfAcctDao
+from src.app.dao.backup import adminBackupDao, backupDao
+from src.app.dao.config import configDao
+from src.app.dao.entity import contactDao, customerDao, supplierDao
+from src.app.dao.expense import expenseDao
+from src.app.dao.files import fileDao
+from src.app.dao.fx import fxDao
+from src.app.dao.invoice import invoiceDao, itemDao
+from src.app.dao.job import jobDao
+from src.app.dao.journal import journalDao
+from src.app.dao.payment import paymentDao
+from src.app.dao.property import propertyDao, propertyTransactionDao
+from src.app.dao.shares import dividendDao, stockIssueDao, stockRepurchaseDao
+from src.app.service.acct import AcctService
+from src.app.service.entity import EntityService
+from src.app.service.expense import ExpenseService
+from src.app.service.files import FileService
+from src.app.service.fx import FxService
+from src.app.service.item import ItemService
+from src.app.service.job import JobService
+from src.app.service.journal import JournalService
+from src.app.service.management import AdminBackupService
+from src.app.service.property import PropertyService
+from src.app.service.purchase import PurchaseService
+from src.app.service.reporting import ReportingService
+from src.app.service.sales import SalesService
+from src.app.service.settings import BackupService, ConfigService
+from src.app.service.shares import SharesService
+
+# daos and services of one scope (e.g., one request), each built on first use and then shared,
+# so asking for sales service does not build the whole graph again for every sub service
+
+
+class CommonContainer:
+
+    def __init__(self, dao_access: CommonDaoAccess):
+        self.dao_access = dao_access
+
+    # dao
+    @cached_property
+    def admin_backup_dao(self) -> adminBackupDao:
+        return adminBackupDao(dao_access=self.dao_access)
+
+    @cached_property
+    def fx_dao(self) -> fxDao:
+        return fxDao(dao_access=self.dao_access)
+
+    @cached_property
+    def job_dao(self) -> jobDao:
+        return jobDao(dao_access=self.dao_access)
+
+    # service
+    @cached_property
+    def admin_backup_service(self) -> AdminBackupService:
+        return AdminBackupService(backup_dao=self.admin_backup_dao)
+
+    @cached_property
+    def job_service(self) -> JobService:
+        return JobService(job_dao=self.job_dao)
+
+
+class UserContainer(CommonContainer):
+
+    dao_access: UserDaoAccess
+
+    def __init__(self, dao_access: UserDaoAccess):
+        super().__init__(dao_access)
+
+    # dao
+    @cached_property
+    def acct_dao(self) -> acctDao:
+        return acctDao(dao_access=self.dao_access)
+
+    @cached_property
+    def chart_of_acct_dao(self) -> chartOfAcctDao:
+        return chartOfAcctDao(dao_access=self.dao_access)
+
+    @cached_property
+    def backup_dao(self) -> backupDao:
+        return backupDao(dao_access=self.dao_access)
+
+    @cached_property
+    def config_dao(self) -> configDao:
+        return configDao(dao_access=self.dao_access)
+
+    @cached_property
+    def contact_dao(self) -> contactDao:
+        return contactDao(dao_access=self.dao_access)
+
+    @cached_property
+    def customer_dao(self) -> customerDao:
+        return customerDao(dao_access=self.dao_access)
+
+    @cached_property
+    def supplier_dao(self) -> supplierDao:
+        return supplierDao(dao_access=self.dao_access)
+
+    @cached_property
+    def expense_dao(self) -> expenseDao:
+        return expenseDao(dao_access=self.dao_access)
+
+    @cached_property
+    def file_dao(self) -> fileDao:
+        return fileDao(dao_access=self.dao_access)
+
+    @cached_property
+    def item_dao(self) -> itemDao:
+        return itemDao(dao_access=self.dao_access)
+
+    @cached_property
+    def invoice_dao(self) -> invoiceDao:
+        return invoiceDao(dao_access=self.dao_access)
+
+    @cached_property
+    def journal_dao(self) -> journalDao:
+        return journalDao(dao_access=self.dao_access)
+
+    @cached_property
+    def payment_dao(self) -> paymentDao:
+        return paymentDao(dao_access=self.dao_access)
+
+    @cached_property
+    def property_dao(self) -> propertyDao:
+        return propertyDao(dao_access=self.dao_access)
+
+    @cached_property
+    def property_transaction_dao(self) -> propertyTransactionDao:
+        return propertyTransactionDao(dao_access=self.dao_access)
+
+    @cached_property
+    def stock_issue_dao(self) -> stockIssueDao:
+        return stockIssueDao(dao_access=self.dao_access)
+
+    @cached_property
+    def stock_repurchase_dao(self) -> stockRepurchaseDao:
+        return stockRepurchaseDao(dao_access=self.dao_access)
+
+    @cached_property
+    def dividend_dao(self) -> dividendDao:
+        return dividendDao(dao_access=self.dao_access)
+
+    # service
+    @cached_property
+    def backup_service(self) -> BackupService:
+        return BackupService(backup_dao=self.backup_dao)
+
+    @cached_property
+    def file_service(self) -> FileService:
+        return FileService(file_dao=self.file_dao)
+
+    @cached_property
+    def setting_service(self) -> ConfigService:
+        return ConfigService(
+            file_service=self.file_service,
+            config_dao=self.config_dao
+        )
+
+    @cached_property
+    def fx_service(self) -> FxService:
+        # FX dao is common, but service is user specific
+        return FxService(
+            fx_dao=self.fx_dao,
+            setting_service=self.setting_service
+        )
+
+    @cached_property
+    def acct_service(self) -> AcctService:
+        return AcctService(
+            acct_dao=self.acct_dao,
+            chart_of_acct_dao=self.chart_of_acct_dao,
+            setting_service=self.setting_service
+        )
+
+    @cached_property
+    def journal_service(self) -> JournalService:
+        return JournalService(
+            journal_dao=self.journal_dao,
+            acct_service=self.acct_service,
+            setting_service=self.setting_service
+        )
+
+    @cached_property
+    def entity_service(self) -> EntityService:
+        return EntityService(
+            contact_dao=self.contact_dao,
+            customer_dao=self.customer_dao,
+            supplier_dao=self.supplier_dao
+        )
+
+    @cached_property
+    def item_service(self) -> ItemService:
+        return ItemService(
+            item_dao=self.item_dao,
+            acct_service=self.acct_service
+        )
+
+    @cached_property
+    def expense_service(self) -> ExpenseService:
+        return ExpenseService(
+            expense_dao=self.expense_dao,
+            acct_service=self.acct_service,
+            journal_service=self.journal_service,
+            fx_service=self.fx_service,
+            setting_service=self.setting_service
+        )
+
+    @cached_property
+    def property_service(self) -> PropertyService:
+        return PropertyService(
+            property_dao=self.property_dao,
+            property_transaction_dao=self.property_transaction_dao,
+            fx_service=self.fx_service,
+            acct_service=self.acct_service,
+            journal_service=self.journal_service
+        )
+
+    @cached_property
+    def purchase_service(self) -> PurchaseService:
+        return PurchaseService(
+            invoice_dao=self.invoice_dao,
+            payment_dao=self.payment_dao,
+            item_service=self.item_service,
+            entity_service=self.entity_service,
+            acct_service=self.acct_service,
+            journal_service=self.journal_service,
+            fx_service=self.fx_service,
+            setting_service=self.setting_service
+        )
+
+    @cached_property
+    def sales_service(self) -> SalesService:
+        return SalesService(
+            invoice_dao=self.invoice_dao,
+            payment_dao=self.payment_dao,
+            item_service=self.item_service,
+            entity_service=self.entity_service,
+            acct_service=self.acct_service,
+            journal_service=self.journal_service,
+            fx_service=self.fx_service,
+            setting_service=self.setting_service
+        )
+
+    @cached_property
+    def shares_service(self) -> SharesService:
+        return SharesService(
+            stock_issue_dao=self.stock_issue_dao,
+            stock_repurchase_dao=self.stock_repurchase_dao,
+            dividend_dao=self.dividend_dao,
+            acct_service=self.acct_service,
+            journal_service=self.journal_service,
+            fx_service=self.fx_service,
+            setting_service=self.setting_service
+        )
+
+    @cached_property
+    def reporting_service(self) -> ReportingService:
+        return ReportingService(
+            journal_service=self.journal_service,
+            acct_service=self.acct_service,
+            setting_service=self.setting_service
+        )
@@ -140,22 +140,11 @@ class EntityService:
             raise e # contact does not exist
             
     def get_customer(self, cust_id: str) -> Customer:
-        try:
-            bill_contact_id, ship_contact_id = self.customer_dao.get_bill_ship_contact_ids(
-                cust_id
-            )
-        except NotExistError as e:
-            # customer not even exist
-            raise e
-        
-        # get contacts
-        bill_contact = self.get_contact(bill_contact_id)
-        if ship_contact_id:
-            ship_contact = self.get_contact(ship_contact_id)
-            
-        # get customer
-        customer = self.customer_dao.get(cust_id, bill_contact, ship_contact)
-        return customer
+        # customer and contacts are loaded together
+        return self.customer_dao.get(cust_id)
+    
+    def get_customers(self, cust_ids: list[str]) -> list[Customer]:
+        return self.customer_dao.get_many(cust_ids)
     
     def list_customer(self) -> list[_CustomerBrief]:
         customers = self.customer_dao.list_customer()
@@ -213,22 +202,11 @@ class EntityService:
             raise e # contact does not exist
             
     def get_supplier(self, supplier_id: str) -> Supplier:
-        try:
-            bill_contact_id, ship_contact_id = self.supplier_dao.get_bill_ship_contact_ids(
-                supplier_id
-            )
-        except NotExistError as e:
-            # supplier not even exist
-            raise e
-        
-        # get contacts
-        bill_contact = self.get_contact(bill_contact_id)
-        if ship_contact_id:
-            ship_contact = self.get_contact(ship_contact_id)
-            
-        # get supplier
-        supplier = self.supplier_dao.get(supplier_id, bill_contact, ship_contact)
-        return supplier
+        # supplier and contacts are loaded together
+        return self.supplier_dao.get(supplier_id)
+    
+    def get_suppliers(self, supplier_ids: list[str]) -> list[Supplier]:
+        return self.supplier_dao.get_many(supplier_ids)
     
     def list_supplier(self) -> list[_SupplierBrief]:
         suppliers = self.supplier_dao.list_supplier()
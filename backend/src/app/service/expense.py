@@ -11,6 +11,7 @@ from src.app.service.fx import FxService
 from src.app.model.accounts import Account
 from src.app.model.enums import AcctType, CurType, EntryType, JournalSrc
 from src.app.model.expense import _ExpenseBrief, _ExpenseSummaryBrief, ExpenseItem, Expense, ExpInfo, Merchant
+from src.app.model.job import ProgressCallback
 from src.app.model.journal import Journal, Entry
 from src.app.service.settings import ConfigService
 
@@ -266,22 +267,24 @@ class ExpenseService:
             self._validate_expense(expense)
             # add journal first
             journal = self.create_journal_from_expense(expense)
-            try:
-                self.journal_service.add_journal(journal)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of journal does not exist: {journal}',
-                    details=e.details
-                )
+            # add journal and expense in one transaction
+            with self.expense_dao.dao_access.unit_of_work():
+                try:
+                    self.journal_service.add_journal(journal)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of journal does not exist: {journal}',
+                        details=e.details
+                    )
             
-            # add expense
-            try:
-                self.expense_dao.add(journal_id = journal.journal_id, expense = expense)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of expense does not exist: {expense}',
-                    details=e.details
-                )
+                # add expense
+                try:
+                    self.expense_dao.add(journal_id = journal.journal_id, expense = expense)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of expense does not exist: {expense}',
+                        details=e.details
+                    )
             
         else:
             raise AlreadyExistError(
@@ -289,7 +292,7 @@ class ExpenseService:
                 details=f"Expense: {_expense}, journal_id: {_jrn_id}"
             )
             
-    def add_expenses(self, expenses: list[Expense]):
+    def add_expenses(self, expenses: list[Expense], progress: ProgressCallback | None = None):
         errs = []
         err_exps = []
         dup_exps = []
@@ -301,6 +304,9 @@ class ExpenseService:
                 err_exps.append(expense)
             except AlreadyExistError as e:
                 dup_exps.append(expense)
+            
+            if progress is not None and ((i + 1) % 10 == 0 or i + 1 == len(expenses)):
+                progress((i + 1) / len(expenses), f"{i + 1}/{len(expenses)} expenses processed")
                 
             # not to pressure db # TODO optimize
             # if i % 10:
@@ -324,23 +330,25 @@ class ExpenseService:
                 details=e.details
             )
             
-        # remove expense first
-        try:
-            self.expense_dao.remove(expense_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Expense {expense_id} have dependency cannot be deleted",
-                details=e.details
-            )
+        # remove expense and journal in one transaction
+        with self.expense_dao.dao_access.unit_of_work():
+            # remove expense first
+            try:
+                self.expense_dao.remove(expense_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Expense {expense_id} have dependency cannot be deleted",
+                    details=e.details
+                )
         
-        # then remove journal
-        try:
-            self.journal_service.delete_journal(jrn_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Delete journal failed, some component depends on the journal id {jrn_id}",
-                details=e.details
-            )
+            # then remove journal
+            try:
+                self.journal_service.delete_journal(jrn_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Delete journal failed, some component depends on the journal id {jrn_id}",
+                    details=e.details
+                )
             
     def update_expense(self, expense: Expense):
         self._validate_expense(expense)
@@ -357,32 +365,33 @@ class ExpenseService:
                 details=e.details
             )
         
-        # add new journal first
-        journal = self.create_journal_from_expense(expense)
-        try:
-            self.journal_service.add_journal(journal)
-        except FKNotExistError as e:
-            raise FKNotExistError(
-                f'Some component of journal does not exist: {journal}',
-                details=e.details
-            )
+        # regenerate journal, reuse existing journal id
+        journal = self.create_journal_from_expense(expense).model_copy(
+            update={'journal_id': jrn_id}
+        )
         
-        # update expense
-        try:
-            self.expense_dao.update(
-                journal_id=journal.journal_id, # use new journal id
-                expense=expense
-            ) # TODO
-        except FKNotExistError as e:
-            # need to remove the new journal
-            self.journal_service.delete_journal(journal.journal_id)
-            raise FKNotExistError(
-                f"Invoice element does not exist",
-                details=e.details
-            )
+        # update journal and expense in one transaction
+        with self.expense_dao.dao_access.unit_of_work():
+            # update existing journal in place
+            try:
+                self.journal_service.update_journal(journal)
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f'Some component of journal does not exist: {journal}',
+                    details=e.details
+                )
             
-        # remove old journal
-        self.journal_service.delete_journal(jrn_id)
+            # update expense (journal id unchanged)
+            try:
+                self.expense_dao.update(
+                    journal_id=jrn_id,
+                    expense=expense
+                ) # TODO
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f"Expense element does not exist",
+                    details=e.details
+                )
         
         
     def get_expense_journal(self, expense_id: str) -> Tuple[Expense, Journal]:
@@ -1,6 +1,8 @@
+from typing import BinaryIO, Generator
 from src.app.model.exceptions import AlreadyExistError, FKNoDeleteUpdateError, FKNotExistError, NotExistError, NotMatchWithSystemError, OpNotPermittedError
-from src.app.model.misc import FileWrapper
+from src.app.model.misc import FileWrapper, _FileInfo
 from src.app.dao.files import fileDao
+from src.app.utils.tools import id_generator
 
 class FileService:
     
@@ -25,32 +27,21 @@ class FileService:
         return file_id
         
     def register_files(self, filenames: list[str]) -> dict[str, str]:
-        # return {filename: file_id}
-        errs = []
-        err_files = []
-        dup_files = []
-        maps = {}
-        for i, filename in enumerate(filenames):
-            try:
-                file_id = self.register_file(filename)
-            except (NotExistError, FKNotExistError, NotMatchWithSystemError, FKNoDeleteUpdateError, OpNotPermittedError) as e:
-                errs.append(e)
-                err_files.append(filename)
-            except AlreadyExistError as e:
-                dup_files.append(filename)
-                maps[filename] = self.file_dao.get_file_id_by_name(filename) # must record as well
-                
-            else:
-                
-                # not to pressure db # TODO optimize
-                # if i % 10:
-                #     sleep(1)
-                maps[filename] = file_id
+        # return {filename: file_id}, already registered ones are included as well
+        # files found on storage are registered even if some others are missing
+        try:
+            maps, missing = self.file_dao.register_many(filenames)
+        except AlreadyExistError as e:
+            # registered concurrently by another request
+            raise AlreadyExistError(
+                message="Some files already registered, please retry",
+                details=e.details
+            )
         
-        if len(err_files) > 0:
+        if len(missing) > 0:
             raise OpNotPermittedError(
                 message="Several files not registered due to error",
-                details="\n".join(f"Error ({er}), Expense {exp}" for er, exp in zip(errs, err_files))
+                details="\n".join(f"File not exist: {filename}" for filename in missing)
             )
         
         return maps
@@ -69,6 +60,57 @@ class FileService:
                 details=e.details
             )
             
+    def add_file_stream(self, filename: str, stream: BinaryIO, file_id: str | None = None) -> str:
+        # binary upload without decoding, return file id
+        # same name uploaded again keeps its file id and points to the new content
+        try:
+            existing_id = self.get_file_id_by_name(filename)
+        except NotExistError:
+            pass
+        else:
+            self.replace_file_stream(existing_id, stream)
+            return existing_id
+        
+        file_id = file_id or id_generator(prefix='file-', length=12)
+        try:
+            self.file_dao.add_stream(
+                file_id=file_id,
+                filename=filename,
+                stream=stream
+            )
+        except AlreadyExistError as e:
+            raise AlreadyExistError(
+                message='File already exist',
+                details=e.details
+            )
+        except FKNotExistError as e:
+            raise FKNotExistError(
+                message='Some component of file does not exist',
+                details=e.details
+            )
+        return file_id
+            
+    def replace_file_stream(self, file_id: str, stream: BinaryIO):
+        try:
+            self.file_dao.replace_stream(
+                file_id=file_id,
+                stream=stream
+            )
+        except NotExistError as e:
+            raise NotExistError(
+                message=f"File not exist: {file_id}",
+                details=e.details
+            )
+        except FKNotExistError as e:
+            raise FKNotExistError(
+                message='Some component of file does not exist',
+                details=e.details
+            )
+            
+    def collect_garbage(self) -> int:
+        # remove content of deleted/replaced files from storage, return number of blobs removed
+        return self.file_dao.collect_garbage()
+            
     def delete_file(self, file_id: str):
         try:
             self.file_dao.remove(file_id)
@@ -93,6 +135,22 @@ class FileService:
             )
         return file
     
+    def get_file_info(self, file_id: str) -> _FileInfo:
+        try:
+            return self.file_dao.get_info(file_id)
+        except NotExistError as e:
+            raise NotExistError(
+                message=f"File not exist: {file_id}",
+                details=e.details
+            )
+            
+    def iter_file(self, info: _FileInfo, start: int = 0, end: int | None = None) -> Generator[bytes, None, None]:
+        return self.file_dao.iter_content(
+            file=info,
+            start=start,
+            end=end
+        )
+    
     def get_file_id_by_name(self, filename: str) -> str:
         try:
             return self.file_dao.get_file_id_by_name(filename)
@@ -1,9 +1,9 @@
 from datetime import date
-from currency_converter import CurrencyConverter, ECB_URL
 from src.app.service.settings import ConfigService
 from src.app.model.exceptions import NotExistError
 from src.app.dao.fx import fxDao
 from src.app.model.enums import CurType
+from src.app.utils.metrics import FX_PULLS, FX_PULLED_RATES
 
 
 class FxService:
@@ -60,6 +60,11 @@ class FxService:
             
     def _pull(self, curs: list[CurType], cur_dt: date) -> list[float]:
         # pull fx rates at given date
+        # currency_converter loads ECB history on use, import it only when really pulling
+        from currency_converter import CurrencyConverter, ECB_URL
+        
+        FX_PULLS.inc()
+        FX_PULLED_RATES.inc(len(curs))
         c = CurrencyConverter(
             currency_file = ECB_URL,
             fallback_on_missing_rate = True,
@@ -0,0 +1,339 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from datetime import date, datetime, timedelta
+import logging
+import os
+import threading
+from typing import Any, Callable
+from src.app.dao.accounts import acctDao, chartOfAcctDao
+from src.app.dao.backup import adminBackupDao, backupDao
+from src.app.dao.config import configDao
+from src.app.dao.connection import CommonDaoAccess, UserDaoAccess, open_common_dao_access, open_user_dao_access
+from src.app.dao.expense import expenseDao
+from src.app.dao.files import fileDao
+from src.app.dao.fx import fxDao
+from src.app.dao.job import jobDao
+from src.app.dao.journal import journalDao
+from src.app.dao.user import userDao
+from src.app.model.enums import JobStatus, JobType
+from src.app.model.exceptions import NotExistError, OpNotPermittedError, PermissionDeniedError
+from src.app.model.expense import Expense
+from src.app.model.job import Job
+from src.app.model.user import User
+from src.app.service.acct import AcctService
+from src.app.service.expense import ExpenseService
+from src.app.service.files import FileService
+from src.app.service.fx import FxService
+from src.app.service.journal import JournalService
+from src.app.service.management import AdminBackupService
+from src.app.service.settings import BackupService, ConfigService
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2)) # threads executing jobs in this process, 0 disables the runner
+JOB_MAX_PER_TENANT = int(os.environ.get('JOB_MAX_PER_TENANT', 1)) # running jobs per tenant across all processes
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 5)) # seconds, also picks up jobs submitted by other processes
+JOB_TIMEOUT = float(os.environ.get('JOB_TIMEOUT', 6 * 3600)) # seconds, running jobs older than this are failed (worker lost)
+FX_BACKFILL_MAX_DAYS = 3660
+
+ADMIN_JOB_TYPES = (JobType.ADMIN_BACKUP, JobType.ADMIN_RESTORE)
+# stopping halfway would leave files and database out of sync
+NON_CANCELLABLE_JOB_TYPES = (JobType.RESTORE, JobType.ADMIN_RESTORE)
+
+class JobCancelledError(Exception):
+    pass
+
+class JobContext:
+    # handed to job handler, report() persists progress and is the cancellation checkpoint
+
+    def __init__(self, job: Job, job_dao: jobDao, dao_access: CommonDaoAccess):
+        self.job = job
+        self.job_dao = job_dao
+        self.dao_access = dao_access
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return self.job.params
+
+    def report(self, progress: float, message: str):
+        cancel_requested = self.job_dao.update_progress(self.job.job_id, progress, message)
+        if cancel_requested and self.job.job_type not in NON_CANCELLABLE_JOB_TYPES:
+            raise JobCancelledError()
+
+def _get_setting_service(dao_access: UserDaoAccess) -> ConfigService:
+    return ConfigService(
+        file_service=FileService(file_dao=fileDao(dao_access=dao_access)),
+        config_dao=configDao(dao_access=dao_access)
+    )
+
+def _get_fx_service(dao_access: UserDaoAccess) -> FxService:
+    return FxService(fx_dao=fxDao(dao_access=dao_access), setting_service=_get_setting_service(dao_access))
+
+def _get_expense_service(dao_access: UserDaoAccess) -> ExpenseService:
+    setting_service = _get_setting_service(dao_access)
+    acct_service = AcctService(
+        acct_dao=acctDao(dao_access=dao_access),
+        chart_of_acct_dao=chartOfAcctDao(dao_access=dao_access),
+        setting_service=setting_service
+    )
+    return ExpenseService(
+        expense_dao=expenseDao(dao_access=dao_access),
+        acct_service=acct_service,
+        journal_service=JournalService(
+            journal_dao=journalDao(dao_access=dao_access),
+            acct_service=acct_service,
+            setting_service=setting_service
+        ),
+        fx_service=_get_fx_service(dao_access),
+        setting_service=setting_service
+    )
+
+def _run_backup(ctx: JobContext) -> dict[str, Any]:
+    backup_service = BackupService(backup_dao=backupDao(dao_access=ctx.dao_access)) # type: ignore
+    backup_id = backup_service.backup(ctx.params.get('backup_id'), progress=ctx.report)
+    return {'backup_id': backup_id}
+
+def _run_restore(ctx: JobContext) -> dict[str, Any]:
+    backup_service = BackupService(backup_dao=backupDao(dao_access=ctx.dao_access)) # type: ignore
+    backup_service.restore(ctx.params['backup_id'], progress=ctx.report)
+    return {'backup_id': ctx.params['backup_id']}
+
+def _run_admin_backup(ctx: JobContext) -> dict[str, Any]:
+    backup_service = AdminBackupService(backup_dao=adminBackupDao(dao_access=ctx.dao_access))
+    backup_id = backup_service.backup(ctx.params.get('backup_id'), progress=ctx.report)
+    return {'backup_id': backup_id}
+
+def _run_admin_restore(ctx: JobContext) -> dict[str, Any]:
+    backup_service = AdminBackupService(backup_dao=adminBackupDao(dao_access=ctx.dao_access))
+    backup_service.restore(ctx.params['backup_id'], progress=ctx.report)
+    return {'backup_id': ctx.params['backup_id']}
+
+def _run_expense_import(ctx: JobContext) -> dict[str, Any]:
+    expense_service = _get_expense_service(ctx.dao_access) # type: ignore
+    expenses = [Expense.model_validate(e) for e in ctx.params['expenses']]
+    expense_service.add_expenses(expenses, progress=ctx.report)
+    return {'num_expenses': len(expenses)}
+
+def _run_fx_backfill(ctx: JobContext) -> dict[str, Any]:
+    fx_service = _get_fx_service(ctx.dao_access) # type: ignore
+    start_dt = date.fromisoformat(ctx.params['start_dt'])
+    num_days = (date.fromisoformat(ctx.params['end_dt']) - start_dt).days + 1
+    for i in range(num_days):
+        fx_service.pull(start_dt + timedelta(days=i), overwrite=ctx.params.get('overwrite', False))
+        ctx.report((i + 1) / num_days, f"{i + 1}/{num_days} days pulled")
+    return {'num_days': num_days}
+
+def _run_file_gc(ctx: JobContext) -> dict[str, Any]:
+    file_service = FileService(file_dao=fileDao(dao_access=ctx.dao_access)) # type: ignore
+    return {'num_removed': file_service.collect_garbage()}
+
+JOB_HANDLERS: dict[JobType, Callable[[JobContext], dict[str, Any] | None]] = {
+    JobType.BACKUP: _run_backup,
+    JobType.RESTORE: _run_restore,
+    JobType.ADMIN_BACKUP: _run_admin_backup,
+    JobType.ADMIN_RESTORE: _run_admin_restore,
+    JobType.EXPENSE_IMPORT: _run_expense_import,
+    JobType.FX_BACKFILL: _run_fx_backfill,
+    JobType.FILE_GC: _run_file_gc,
+}
+
+class JobRunner:
+    # in-process worker pool, the job table is the queue so several api processes can share it
+
+    def __init__(
+        self,
+        common_access_factory: Callable[[], AbstractContextManager[CommonDaoAccess]] = open_common_dao_access,
+        user_access_factory: Callable[[User], AbstractContextManager[UserDaoAccess]] = open_user_dao_access,
+        max_workers: int = JOB_WORKERS,
+        max_per_tenant: int = JOB_MAX_PER_TENANT,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        timeout: float = JOB_TIMEOUT
+    ):
+        self.common_access_factory = common_access_factory
+        self.user_access_factory = user_access_factory
+        self.max_workers = max_workers
+        self.max_per_tenant = max_per_tenant
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.max_workers <= 0 or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job-worker')
+        self._thread = threading.Thread(target=self._run, name='job-dispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        # running jobs are finished before returning
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def notify(self):
+        # new job submitted or a worker slot freed up
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wakeup.clear()
+            try:
+                self.dispatch()
+            except Exception:
+                logging.exception("Job dispatch failed")
+            self._wakeup.wait(self.poll_interval)
+
+    def dispatch(self) -> list[Job]:
+        # claim pending jobs that fit in free worker slots and per tenant limit, oldest first
+        # run them inline if runner is not started (e.g., cli or tests)
+        free_slots = self.max_workers - self._active if self._executor is not None else 1
+        claimed: list[Job] = []
+        with self.common_access_factory() as dao_access:
+            job_dao = jobDao(dao_access=dao_access)
+            job_dao.fail_stale(started_before=datetime.now() - timedelta(seconds=self.timeout))
+            running = job_dao.count_running_by_user()
+            for job in job_dao.list_pending():
+                if len(claimed) >= free_slots:
+                    break
+                if running.get(job.user_id, 0) >= self.max_per_tenant:
+                    continue
+                if job_dao.claim(job.job_id):
+                    running[job.user_id] = running.get(job.user_id, 0) + 1
+                    claimed.append(job)
+
+        for job in claimed:
+            with self._lock:
+                self._active += 1
+            if self._executor is not None:
+                self._executor.submit(self.execute, job)
+            else:
+                self.execute(job)
+        return claimed
+
+    def execute(self, job: Job):
+        # job bookkeeping uses its own session, so a failed handler cannot break the status update
+        try:
+            with self.common_access_factory() as tracking_access:
+                job_dao = jobDao(dao_access=tracking_access)
+                try:
+                    result = self._run_handler(job, job_dao)
+                except JobCancelledError:
+                    job_dao.finish(job.job_id, JobStatus.CANCELLED, message='Cancelled')
+                except Exception as e:
+                    logging.exception(f"Job {job.job_id} ({job.job_type.name}) failed")
+                    job_dao.finish(job.job_id, JobStatus.FAILED, message=str(e))
+                else:
+                    job_dao.finish(job.job_id, JobStatus.SUCCEEDED, result=result)
+        except Exception:
+            # e.g., job row gone after common database got restored
+            logging.exception(f"Job {job.job_id} status not recorded")
+        finally:
+            with self._lock:
+                self._active -= 1
+            self.notify()
+
+    def _run_handler(self, job: Job, job_dao: jobDao) -> dict[str, Any] | None:
+        handler = JOB_HANDLERS[job.job_type]
+        if job.job_type in ADMIN_JOB_TYPES:
+            access_cm = self.common_access_factory()
+        else:
+            user = userDao(session=job_dao.dao_access.common_session).get(job.user_id)
+            access_cm = self.user_access_factory(user)
+        with access_cm as dao_access:
+            ctx = JobContext(job=job, job_dao=job_dao, dao_access=dao_access)
+            ctx.report(0, 'Started') # cancel may have been requested right after claim
+            return handler(ctx)
+
+job_runner = JobRunner()
+
+class JobService:
+
+    def __init__(self, job_dao: jobDao, runner: JobRunner = job_runner):
+        self.job_dao = job_dao
+        self.runner = runner
+
+    def submit(self, user: User, job_type: JobType, params: dict[str, Any] | None = None) -> Job:
+        # only persist the job, worker picks it up
+        if job_type in ADMIN_JOB_TYPES and not user.is_admin:
+            raise PermissionDeniedError("Admin user required")
+        job = Job(user_id=user.user_id, job_type=job_type, params=params or {})
+        self.job_dao.add(job)
+        self.runner.notify()
+        return job
+
+    def submit_backup(self, user: User, backup_id: str | None = None) -> Job:
+        return self.submit(user, JobType.BACKUP, {'backup_id': backup_id})
+
+    def submit_restore(self, user: User, backup_id: str) -> Job:
+        return self.submit(user, JobType.RESTORE, {'backup_id': backup_id})
+
+    def submit_admin_backup(self, user: User, backup_id: str | None = None) -> Job:
+        return self.submit(user, JobType.ADMIN_BACKUP, {'backup_id': backup_id})
+
+    def submit_admin_restore(self, user: User, backup_id: str) -> Job:
+        return self.submit(user, JobType.ADMIN_RESTORE, {'backup_id': backup_id})
+
+    def submit_expense_import(self, user: User, expenses: list[Expense]) -> Job:
+        if len(expenses) == 0:
+            raise OpNotPermittedError("No expense to import")
+        return self.submit(
+            user,
+            JobType.EXPENSE_IMPORT,
+            {'expenses': [e.model_dump(mode='json') for e in expenses]}
+        )
+
+    def submit_fx_backfill(self, user: User, start_dt: date, end_dt: date, overwrite: bool = False) -> Job:
+        if start_dt > end_dt:
+            raise OpNotPermittedError(f"Start date {start_dt} is after end date {end_dt}")
+        if (end_dt - start_dt).days >= FX_BACKFILL_MAX_DAYS:
+            raise OpNotPermittedError(f"Backfill at most {FX_BACKFILL_MAX_DAYS} days per job")
+        return self.submit(
+            user,
+            JobType.FX_BACKFILL,
+            {'start_dt': start_dt.isoformat(), 'end_dt': end_dt.isoformat(), 'overwrite': overwrite}
+        )
+
+    def submit_file_gc(self, user: User) -> Job:
+        return self.submit(user, JobType.FILE_GC)
+
+    def get_job(self, user: User, job_id: str) -> Job:
+        job = self.job_dao.get(job_id)
+        if job.user_id != user.user_id and not user.is_admin:
+            # do not reveal jobs of other tenants
+            raise NotExistError(f"Job {job_id} not found")
+        return job
+
+    def list_jobs(
+        self,
+        user: User,
+        job_type: JobType | None = None,
+        status: JobStatus | None = None,
+        limit: int = 50,
+        all_users: bool = False
+    ) -> list[Job]:
+        if all_users and not user.is_admin:
+            raise PermissionDeniedError("Admin user required")
+        return self.job_dao.list_job(
+            user_id=None if all_users else user.user_id,
+            job_type=job_type,
+            status=status,
+            limit=limit
+        )
+
+    def cancel_job(self, user: User, job_id: str) -> Job:
+        job = self.get_job(user, job_id)
+        if job.is_done:
+            raise OpNotPermittedError(f"Job {job_id} already {job.status.name.lower()}")
+        if job.status == JobStatus.RUNNING and job.job_type in NON_CANCELLABLE_JOB_TYPES:
+            raise OpNotPermittedError(f"Job {job_id} cannot be cancelled once started")
+        self.job_dao.request_cancel(job_id)
+        return self.job_dao.get(job_id)
@@ -1,11 +1,13 @@
 
+import csv
 from datetime import date
-from typing import Tuple
+import io
+from typing import Generator, Literal, Tuple
 from src.app.model.const import SystemAcctNumber
 from src.app.model.enums import AcctType, CurType, EntryType, JournalSrc
 from src.app.model.exceptions import FKNoDeleteUpdateError, NotExistError, AlreadyExistError, FKNotExistError, OpNotPermittedError
 from src.app.dao.journal import journalDao
-from src.app.model.journal import _AcctFlowAGG, _EntryBrief, _JournalBrief, Entry, Journal
+from src.app.model.journal import _AcctFlowAGG, _AcctPeriodFlowAGG, _EntryBrief, _EntryExport, _JournalBrief, Entry, Journal
 from src.app.service.acct import AcctService
 from src.app.service.settings import ConfigService
 
@@ -145,8 +147,9 @@ class JournalService:
         self.delete_journal('jrn-2')
         self.delete_journal('jrn-3')
         
-    def validate_journal(self, journal: Journal):
-        base_cur = self.setting_service.get_base_currency()
+    def validate_journal(self, journal: Journal, base_cur: CurType | None = None):
+        if base_cur is None:
+            base_cur = self.setting_service.get_base_currency()
         # validate journal and entries
         for entry in journal.entries:
             if not entry.acct.is_balance_sheet:
@@ -167,6 +170,13 @@ class JournalService:
         except FKNotExistError as e:
             raise e
         
+    def add_journals(self, journals: list[Journal]):
+        # bulk add, base currency is looked up once for all
+        base_cur = self.setting_service.get_base_currency()
+        for journal in journals:
+            self.validate_journal(journal, base_cur=base_cur)
+        self.journal_dao.adds(journals)
+        
     def get_journal(self, journal_id: str) -> Journal:
         
         try:
@@ -193,8 +203,16 @@ class JournalService:
         
     def update_journal(self, journal: Journal):
         self.validate_journal(journal)
-        self.delete_journal(journal_id = journal.journal_id)
-        self.add_journal(journal)
+        # update journal and entries in place
+        try:
+            self.journal_dao.update(journal)
+        except NotExistError as e:
+            raise NotExistError(
+                message=f'Journal {journal.journal_id} not exist, cannot update',
+                details=e.details
+            )
+        except FKNotExistError as e:
+            raise e
         
     def list_journal(
         self,
@@ -226,14 +244,75 @@ class JournalService:
             num_entries = num_entries
         )
         
+    def export_entries(
+        self,
+        fmt: Literal['ndjson', 'csv'] = 'ndjson',
+        min_dt: date = date(1970, 1, 1), 
+        max_dt: date = date(2099, 12, 31),
+        acct_ids: list[str] | None = None,
+        jrn_src: JournalSrc | None = None,
+        chunk_size: int = 500
+    ) -> Generator[str, None, None]:
+        # stream GL detail (one row per entry) as text chunks of chunk_size rows
+        rows = self.journal_dao.export_entries(
+            min_dt=min_dt,
+            max_dt=max_dt,
+            acct_ids=acct_ids,
+            jrn_src=jrn_src
+        )
+        buffer = io.StringIO()
+        if fmt == 'csv':
+            writer = csv.DictWriter(buffer, fieldnames=list(_EntryExport.model_fields.keys()))
+            writer.writeheader()
+        for i, row in enumerate(rows, start=1):
+            if fmt == 'csv':
+                writer.writerow(row.model_dump(mode='json'))
+            else:
+                buffer.write(row.model_dump_json())
+                buffer.write('\n')
+            if i % chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell() > 0:
+            yield buffer.getvalue()
+        
     def stat_journal_by_src(self) -> list[Tuple[JournalSrc, int, float]]:
         return self.journal_dao.stat_journal_by_src()
         
-    def list_entry_by_acct(self, acct_id: str) -> list[_EntryBrief]:
+    def list_entry_by_acct(
+        self, 
+        acct_id: str,
+        min_dt: date | None = None,
+        max_dt: date | None = None
+    ) -> list[_EntryBrief]:
         return self.journal_dao.list_entry_by_acct(
-            acct_id = acct_id
+            acct_id = acct_id,
+            min_dt = min_dt,
+            max_dt = max_dt
         )
         
+    def get_acct_flows_by_period(
+        self, 
+        acct_id: str, 
+        start_dt: date, 
+        end_dt: date, 
+        freq: Literal['day', 'month'] = 'month'
+    ) -> list[_AcctPeriodFlowAGG]:
+        # per day/month flow and closing balance of one account, aggregated in db
+        try:
+            flows = self.journal_dao.agg_acct_flow_by_period(
+                acct_id = acct_id,
+                start_dt = start_dt,
+                end_dt = end_dt,
+                freq = freq
+            )
+        except NotExistError as e:
+            raise NotExistError(
+                f'Account {acct_id} does not exist'
+            )
+        return flows
+        
     def get_incexp_flow(self, acct_id: str, start_dt: date, end_dt: date) -> _AcctFlowAGG:
         # get total flow amount for income statement accounts
         try:
@@ -275,6 +354,13 @@ class JournalService:
             acct_type = AcctType.EXP
         )
         return inc | exp
+    
+    def get_incexp_flows_by_period(self, periods: list[Tuple[date, date]]) -> dict[str, list[_AcctFlowAGG]]:
+        # income statement accounts, one flow per period, in a single query
+        return self.journal_dao.agg_accts_flow_by_period(
+            periods = periods,
+            acct_types = [AcctType.INC, AcctType.EXP]
+        )
         
         
     def get_blsh_balances(self, report_dt: date) -> dict[str, _AcctFlowAGG]:
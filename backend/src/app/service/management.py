@@ -3,7 +3,9 @@ from src.app.model.exceptions import AlreadyExistError, FKNoDeleteUpdateError, N
 from src.app.dao.init import initDao
 from src.app.dao.user import userDao
 from src.app.dao.backup import adminBackupDao
+from src.app.model.job import ProgressCallback
 from src.app.model.user import UserCreate, User
+from src.app.utils.metrics import BACKUP_DURATION, time_histogram
 
 ### Operations that only admin should do ###
 
@@ -108,22 +110,34 @@ class AdminBackupService:
     def list_backup_ids(self) -> list[str]:
         return self.backup_dao.list_backup_ids()
     
-    def backup(self, backup_id: str | None) -> str:
+    def backup(self, backup_id: str | None, progress: ProgressCallback | None = None) -> str:
         # use current timestamp if not given backup id
         backup_id = backup_id or datetime.now().strftime('%Y%m%dT%H%M%S')
         
         # backup database
-        self.backup_dao.backup_database(backup_id)
+        if progress is not None:
+            progress(0, 'Backing up database')
+        with time_histogram(BACKUP_DURATION, scope='common', job='backup_database'):
+            self.backup_dao.backup_database(backup_id)
         # backup files
-        self.backup_dao.backup_files(backup_id)
+        if progress is not None:
+            progress(0.5, 'Backing up files')
+        with time_histogram(BACKUP_DURATION, scope='common', job='backup_files'):
+            self.backup_dao.backup_files(backup_id)
         
         return backup_id
     
-    def restore(self, backup_id: str):
+    def restore(self, backup_id: str, progress: ProgressCallback | None = None):
         # need to restore database first, otherwise user specific database will not be created
         # restore database
-        self.backup_dao.restore_database(backup_id)
+        if progress is not None:
+            progress(0, 'Restoring database')
+        with time_histogram(BACKUP_DURATION, scope='common', job='restore_database'):
+            self.backup_dao.restore_database(backup_id)
         
         # restore files
-        self.backup_dao.restore_files(backup_id)
+        if progress is not None:
+            progress(0.5, 'Restoring files')
+        with time_histogram(BACKUP_DURATION, scope='common', job='restore_files'):
+            self.backup_dao.restore_files(backup_id)
         
\ No newline at end of file
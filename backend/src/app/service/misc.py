@@ -1,45 +1,89 @@
-from functools import lru_cache
-import requests
+import logging
+import threading
+from src.app.utils.geo_cache import GeoCache
+from src.app.utils.metrics import record_cache
 from src.app.utils.tools import get_secret
 from src.app.model.misc import _CountryBrief, _StateBrief
 
 
 class GeoService:
+    # served from local geo cache (seeded by bundled snapshot), api is only called on miss
+    # stale lists are returned right away and refreshed in a background thread
+    cache = GeoCache()
+    _refreshing: set[str] = set()
+    _refresh_lock = threading.Lock()
     
     @classmethod
-    def req(cls, path: str) -> dict: # type: ignore
-        secret = get_secret()['stateapi']
-        headers = {
-            'X-CSCAPI-KEY': secret['apikey']
-        }
-        url = f"{secret['endpoint']}/v1/{path}"
-        response = requests.request("GET", url, headers=headers)
+    def req(cls, path: str) -> list[dict] | None:
+        import requests # only needed on cache miss
+        
+        try:
+            secret = get_secret()['stateapi']
+            headers = {
+                'X-CSCAPI-KEY': secret['apikey']
+            }
+            url = f"{secret['endpoint']}/v1/{path}"
+            response = requests.request("GET", url, headers=headers, timeout=10)
+        except Exception as e:
+            logging.warning(f"Geo api request failed ({path}): {e}")
+            return None
         if response.status_code == 200:
             return response.json()
     
     @classmethod
-    @lru_cache(maxsize=32)
+    def _fetch(cls, key: str, path: str) -> list[dict] | None:
+        results = cls.req(path)
+        if results is None:
+            return None
+        cls.cache.put(key, results)
+        return results
+    
+    @classmethod
+    def _refresh(cls, key: str, path: str):
+        try:
+            cls._fetch(key, path)
+        finally:
+            with cls._refresh_lock:
+                cls._refreshing.discard(key)
+    
+    @classmethod
+    def _lookup(cls, key: str, path: str) -> list[dict]:
+        results, stale = cls.cache.get(key)
+        record_cache('geo', hit=results is not None)
+        if results is None:
+            # nothing to serve, have to wait for api (not cached if it fails)
+            return cls._fetch(key, path) or []
+        if stale:
+            with cls._refresh_lock:
+                start = key not in cls._refreshing
+                cls._refreshing.add(key)
+            if start:
+                threading.Thread(target=cls._refresh, args=(key, path), name='geo-refresh', daemon=True).start()
+        return results
+    
+    @classmethod
     def list_countries(cls) -> list[_CountryBrief]:
-        results = cls.req('countries')
+        results = cls._lookup('countries', 'countries')
         return [
             _CountryBrief(country=r['name'], iso2=r['iso2'])
             for r in results
         ]
     
     @classmethod
-    @lru_cache(maxsize=32)
     def list_states(cls, country_iso2: str) -> list[_StateBrief]:
-        results = cls.req(f'countries/{country_iso2}/states')
+        results = cls._lookup(f'states/{country_iso2}', f'countries/{country_iso2}/states')
         return [
             _StateBrief(state=r['name'], iso2=r['iso2'])
             for r in results
         ]
     
     @classmethod
-    @lru_cache(maxsize=32)
     def list_cities(cls, country_iso2: str, state_iso2: str) -> list[str]:
-        results = cls.req(f'countries/{country_iso2}/states/{state_iso2}/cities')
+        results = cls._lookup(
+            f'cities/{country_iso2}/{state_iso2}', 
+            f'countries/{country_iso2}/states/{state_iso2}/cities'
+        )
         return [
             r['name']
             for r in results
-        ]
\ No newline at end of file
+        ]
@@ -1,6 +1,7 @@
-from datetime import date
+import calendar
+from datetime import date, timedelta
 import math
-from typing import Tuple
+from typing import Literal, Tuple
 from src.app.service.journal import JournalService
 from src.app.dao.property import propertyDao, propertyTransactionDao
 from src.app.service.fx import FxService
@@ -10,10 +11,22 @@ from src.app.model.enums import AcctType, EntryType, JournalSrc, PropertyTransac
 from src.app.model.exceptions import AlreadyExistError, FKNoDeleteUpdateError, NotExistError, FKNotExistError, NotMatchWithSystemError
 from src.app.service.acct import AcctService
 from src.app.model.accounts import Account
-from src.app.model.property import _PropertyPriceBrief, Property, PropertyTransaction
+from src.app.model.property import _PropertyPriceBrief, _PropertyTypeValuation, _PropertyValuation, DepreciationSchedule, Property, PropertyTransaction
+from src.app.utils.tools import finround, period_grid
 
 
 class PropertyService:
+    GAINLOSS_ACCTS = {
+        PropertyTransactionType.DEPRECIATION: SystemAcctNumber.DEPRECIATION,
+        PropertyTransactionType.IMPAIRMENT: SystemAcctNumber.IMPAIRMENT,
+        PropertyTransactionType.APPRECIATION: SystemAcctNumber.APPRECIATION,
+    }
+    PERIODS_PER_YEAR = {'month': 12, 'quarter': 4, 'year': 1}
+    DEFAULT_USEFUL_LIVES = {
+        PropertyType.EQUIP: 5,
+        PropertyType.VEHICLE: 8,
+        PropertyType.OFFICE: 25,
+    } # years, used by month end run
     
     def __init__(self, property_dao: propertyDao, property_transaction_dao: propertyTransactionDao, 
                  fx_service: FxService, acct_service: AcctService, journal_service: JournalService):
@@ -154,36 +167,43 @@ class PropertyService:
     def create_journal_from_property_trans(self, property_trans: PropertyTransaction) -> Journal:
         self._validate_propertytrans(property_trans)
         
-        entries = []
         property, _ = self.get_property_journal(property_trans.property_id)
-        pur_acct: Account = self.acct_service.get_account(
-            property.pur_acct_id
+        accts = self.acct_service.get_accounts(
+            [property.pur_acct_id, SystemAcctNumber.ACC_ADJ, *self.GAINLOSS_ACCTS.values()]
         )
+        pur_acct = accts[property.pur_acct_id]
         amount_base=self.fx_service.convert_to_base(
             amount=property_trans.trans_amount,
             src_currency=pur_acct.currency, # type: ignore # purchase currency
             cur_dt=property_trans.trans_dt, # convert fx at transaction date
         )
-        if property_trans.trans_type == PropertyTransactionType.DEPRECIATION:
+        return self._journal_from_property_trans(
+            property_trans=property_trans,
+            property=property,
+            amount_base=amount_base,
+            accts=accts
+        )
+    
+    def _journal_from_property_trans(self, property_trans: PropertyTransaction, property: Property, 
+                                     amount_base: float, accts: dict[str, Account]) -> Journal:
+        # accts is preloaded purchase and system accounts, keyed by acct id
+        pur_acct = accts[property.pur_acct_id]
+        if property_trans.trans_type in (PropertyTransactionType.DEPRECIATION, PropertyTransactionType.IMPAIRMENT):
             # accumulate depreciation/impairment of pp&e is credit
             property_entry_type = EntryType.CREDIT
             gainloss_entry_type = EntryType.DEBIT
-            gainloss_acct = self.acct_service.get_account(SystemAcctNumber.DEPRECIATION)
-        elif property_trans.trans_type == PropertyTransactionType.IMPAIRMENT:
-            property_entry_type = EntryType.CREDIT
-            gainloss_entry_type = EntryType.DEBIT
-            gainloss_acct = self.acct_service.get_account(SystemAcctNumber.IMPAIRMENT)
         elif property_trans.trans_type == PropertyTransactionType.APPRECIATION:
             # accumulate appreciation of pp&e is debit
             property_entry_type = EntryType.DEBIT
             gainloss_entry_type = EntryType.CREDIT
-            gainloss_acct = self.acct_service.get_account(SystemAcctNumber.APPRECIATION)
         else:
             raise NotMatchWithSystemError(f"Property transaction type not supported: {property_trans.trans_type}")
+        # depending on type of transaction, record in different loss/gain account
+        gainloss_acct = accts[self.GAINLOSS_ACCTS[property_trans.trans_type]]
         
         property_entry = Entry(
             entry_type=property_entry_type , 
-            acct=self.acct_service.get_account(SystemAcctNumber.ACC_ADJ), # accumulative adjustment
+            acct=accts[SystemAcctNumber.ACC_ADJ], # accumulative adjustment
             cur_incexp=None, # balance sheet item should not have currency
             amount=amount_base, # amount in raw currency
             # amount in base currency
@@ -192,58 +212,244 @@ class PropertyService:
         )
         gainloss_entry = Entry(
             entry_type=gainloss_entry_type , 
-            acct=gainloss_acct, # depending on type of transaction, record in different loss/gain account
+            acct=gainloss_acct,
             cur_incexp=pur_acct.currency, # use raw currency
             amount=property_trans.trans_amount, # amount in raw currency
             # amount in base currency
             amount_base=amount_base,
             description=f"Property value {property_trans.trans_type.name}"
         )
-        entries.append(property_entry)
-        entries.append(gainloss_entry)
         
         # create journal
         journal = Journal(
             jrn_date=property_trans.trans_dt,
-            entries=entries,
+            entries=[property_entry, gainloss_entry],
             jrn_src=JournalSrc.PPNE,
             note=f"Property value adjustment: {property_trans.trans_type.name} of property {property.property_name}"
         )
         journal.reduce_entries()
         return journal
     
-    def add_property(self, property: Property):
-        # see if property already exist
-        try:
-            _property, _jrn_id  = self.property_dao.get(property.property_id)
-        except NotExistError as e:
-            # if not exist, can safely create it
-            # validate it first
-            self._validate_property(property)
-            
-            # add journal first
-            journal = self.create_journal_from_property(property)
+    @classmethod
+    def _num_periods(cls, schedule: DepreciationSchedule) -> int:
+        return max(round(schedule.useful_life * cls.PERIODS_PER_YEAR[schedule.freq]), 1)
+    
+    @classmethod
+    def _depreciation_charge(cls, book: float, schedule: DepreciationSchedule, periods_left: int) -> float:
+        # charge of next period from book value net of everything written down so far, never goes below salvage value
+        remaining = max(book - schedule.salvage_value, 0.0)
+        if periods_left <= 1:
+            return finround(remaining) # last period takes the rounding residual
+        if schedule.method == 'straight_line':
+            amount = remaining / periods_left
+        else:
+            # switch to straight line once it charges more, so the last period lands on salvage value
+            amount = max(book * schedule.db_factor / cls._num_periods(schedule), remaining / periods_left)
+        return min(finround(amount), finround(remaining))
+    
+    @classmethod
+    def _depreciation_amounts(cls, cost: float, schedule: DepreciationSchedule) -> list[float]:
+        # amount of each period over the whole useful life, book value ends at salvage value
+        num_periods = cls._num_periods(schedule)
+        amounts = []
+        book = cost
+        for i in range(num_periods):
+            amount = cls._depreciation_charge(book, schedule, num_periods - i)
+            amounts.append(amount)
+            book -= amount
+        return amounts
+    
+    def generate_depreciation_schedule(self, property: Property, schedule: DepreciationSchedule, until: date | None = None, 
+                                       posted: list[Tuple[date, PropertyTransactionType, float]] | None = None,
+                                       since: date | None = None) -> list[PropertyTransaction]:
+        # depreciation transactions in memory, one at end of each period ending on or before until
+        # posted: depreciation/impairment already booked, each charge is based on book value net of those
+        # periods starting on or before since or the last posted depreciation are considered covered,
+        # so a schedule of other frequency never charges the same time span twice
+        num_periods = self._num_periods(schedule)
+        periods = period_grid(
+            start_dt=property.pur_dt,
+            end_dt=date(property.pur_dt.year + math.ceil(schedule.useful_life) + 1, 12, 31),
+            freq=schedule.freq
+        )[:num_periods]
+        posted = posted or []
+        last_depreciated = max(
+            (dt for dt, trans_type, _ in posted if trans_type == PropertyTransactionType.DEPRECIATION), 
+            default=None
+        )
+        since = max((dt for dt in (since, last_depreciated) if dt is not None), default=None)
+        
+        book = property.pur_cost
+        num_applied = 0 # posted ones already deducted from book
+        property_trans = []
+        for i, (start_dt, end_dt) in enumerate(periods):
+            if until is not None and end_dt > until:
+                break
+            while num_applied < len(posted) and posted[num_applied][0] <= end_dt:
+                book -= posted[num_applied][2]
+                num_applied += 1
+            if since is not None and start_dt <= since:
+                continue
+            amount = self._depreciation_charge(book, schedule, num_periods - i) # type: ignore
+            if amount <= 0:
+                continue
+            book -= amount
+            property_trans.append(
+                PropertyTransaction(
+                    property_id=property.property_id,
+                    trans_dt=end_dt,
+                    trans_type=PropertyTransactionType.DEPRECIATION,
+                    trans_amount=amount
+                )
+            )
+        return property_trans
+    
+    def _add_property_trans_bulk(self, properties: dict[str, Property], property_trans: list[PropertyTransaction]):
+        # accounts and fx rates resolved once, all journals and transactions written in one transaction
+        if len(property_trans) == 0:
+            return
+        accts = self.acct_service.get_accounts(
+            [p.pur_acct_id for p in properties.values()] + [SystemAcctNumber.ACC_ADJ, *self.GAINLOSS_ACCTS.values()]
+        )
+        fxs = {}
+        journals = []
+        for trans in property_trans:
+            property = properties[trans.property_id]
+            currency = accts[property.pur_acct_id].currency
+            if (currency, trans.trans_dt) not in fxs:
+                fxs[(currency, trans.trans_dt)] = self.fx_service.get(currency, trans.trans_dt) # type: ignore
+            journals.append(
+                self._journal_from_property_trans(
+                    property_trans=trans,
+                    property=property,
+                    amount_base=fxs[(currency, trans.trans_dt)] * trans.trans_amount,
+                    accts=accts
+                )
+            )
+        
+        with self.property_transaction_dao.dao_access.unit_of_work():
             try:
-                self.journal_service.add_journal(journal)
+                self.journal_service.add_journals(journals)
             except FKNotExistError as e:
                 raise FKNotExistError(
-                    f'Some component of journal does not exist: {journal}',
+                    f'Some component of journals does not exist',
                     details=e.details
                 )
-                
-            # add property
+            
             try:
-                self.property_dao.add(journal_id = journal.journal_id, property = property)
+                self.property_transaction_dao.adds(
+                    journal_ids=[journal.journal_id for journal in journals],
+                    property_trans=property_trans
+                )
             except FKNotExistError as e:
                 raise FKNotExistError(
-                    f'Some component of property does not exist: {property}',
+                    f'Some component of property transactions does not exist',
                     details=e.details
                 )
             except AlreadyExistError as e:
                 raise AlreadyExistError(
-                    f'Property already exist, change one please',
-                    details=f"{property}"
+                    f'Property transaction already exist',
+                    details=e.details
+                )
+    
+    def _pending_depreciation(self, property_id: str, schedule: DepreciationSchedule, 
+                              until: date | None = None) -> Tuple[Property, list[PropertyTransaction]]:
+        try:
+            property, _ = self.property_dao.get(property_id)
+        except NotExistError as e:
+            raise NotExistError(
+                f'Property id {property_id} does not exist',
+                details=e.details
+            )
+        posted = self.property_transaction_dao.list_write_downs([property_id])
+        property_trans = self.generate_depreciation_schedule(
+            property=property,
+            schedule=schedule,
+            until=until,
+            posted=posted.get(property_id)
+        )
+        return property, property_trans
+    
+    def trial_depreciation_schedule(self, property_id: str, schedule: DepreciationSchedule, 
+                                    until: date | None = None) -> list[PropertyTransaction]:
+        # what add_depreciation_schedule would post, nothing is saved
+        _, property_trans = self._pending_depreciation(property_id, schedule, until)
+        return property_trans
+    
+    def add_depreciation_schedule(self, property_id: str, schedule: DepreciationSchedule, 
+                                  until: date | None = None) -> list[PropertyTransaction]:
+        property, property_trans = self._pending_depreciation(property_id, schedule, until)
+        self._add_property_trans_bulk({property_id: property}, property_trans)
+        return property_trans
+    
+    def run_month_end_depreciation(self, rep_dt: date, method: Literal['straight_line', 'declining_balance'] = 'straight_line',
+                                   useful_lives: dict[PropertyType, float] | None = None) -> list[PropertyTransaction]:
+        # monthly depreciation of every property up to month end of rep_dt
+        # months after last posted depreciation are caught up, never depreciated property starts from current month
+        # (no backfill since purchase, remaining base is spread over remaining life instead)
+        month_end = rep_dt.replace(day=calendar.monthrange(rep_dt.year, rep_dt.month)[1])
+        useful_lives = {**self.DEFAULT_USEFUL_LIVES, **(useful_lives or {})}
+        properties = {
+            p.property_id: p 
+            for p in self.property_dao.list_properties()
+            if p.pur_dt <= month_end
+        }
+        posted = self.property_transaction_dao.list_write_downs(list(properties.keys()))
+        prev_month_end = month_end.replace(day=1) - timedelta(days=1)
+        property_trans = []
+        for property_id, property in properties.items():
+            write_downs = posted.get(property_id, [])
+            depreciated = any(trans_type == PropertyTransactionType.DEPRECIATION for _, trans_type, _ in write_downs)
+            property_trans.extend(
+                self.generate_depreciation_schedule(
+                    property=property,
+                    schedule=DepreciationSchedule(
+                        method=method,
+                        useful_life=useful_lives[property.property_type],
+                        freq='month'
+                    ),
+                    until=month_end,
+                    posted=write_downs,
+                    since=None if depreciated else prev_month_end
                 )
+            )
+        self._add_property_trans_bulk(properties, property_trans)
+        return property_trans
+    
+    def add_property(self, property: Property):
+        # see if property already exist
+        try:
+            _property, _jrn_id  = self.property_dao.get(property.property_id)
+        except NotExistError as e:
+            # if not exist, can safely create it
+            # validate it first
+            self._validate_property(property)
+            
+            # add journal first
+            journal = self.create_journal_from_property(property)
+            # add journal and property in one transaction
+            with self.property_dao.dao_access.unit_of_work():
+                try:
+                    self.journal_service.add_journal(journal)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of journal does not exist: {journal}',
+                        details=e.details
+                    )
+                
+                # add property
+                try:
+                    self.property_dao.add(journal_id = journal.journal_id, property = property)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of property does not exist: {property}',
+                        details=e.details
+                    )
+                except AlreadyExistError as e:
+                    raise AlreadyExistError(
+                        f'Property already exist, change one please',
+                        details=f"{property}"
+                    )
             
         else:
             raise AlreadyExistError(
@@ -262,30 +468,32 @@ class PropertyService:
             
             # add journal first
             journal = self.create_journal_from_property_trans(property_trans)
-            try:
-                self.journal_service.add_journal(journal)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of journal does not exist: {journal}',
-                    details=e.details
-                )
+            # add journal and property in one transaction
+            with self.property_transaction_dao.dao_access.unit_of_work():
+                try:
+                    self.journal_service.add_journal(journal)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of journal does not exist: {journal}',
+                        details=e.details
+                    )
                 
-            # add property
-            try:
-                self.property_transaction_dao.add(
-                    journal_id = journal.journal_id, 
-                    property_trans = property_trans
-                )
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of property transaction does not exist: {property_trans}',
-                    details=e.details
-                )
-            except AlreadyExistError as e:
-                raise AlreadyExistError(
-                    f'Property transaction already exist, change one please',
-                    details=f"{property_trans}"
-                )
+                # add property
+                try:
+                    self.property_transaction_dao.add(
+                        journal_id = journal.journal_id, 
+                        property_trans = property_trans
+                    )
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of property transaction does not exist: {property_trans}',
+                        details=e.details
+                    )
+                except AlreadyExistError as e:
+                    raise AlreadyExistError(
+                        f'Property transaction already exist, change one please',
+                        details=f"{property_trans}"
+                    )
             
         else:
             raise AlreadyExistError(
@@ -356,23 +564,25 @@ class PropertyService:
                 details=e.details
             )
             
-        # remove property first
-        try:
-            self.property_dao.remove(property_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"property {property_id} have dependency cannot be deleted",
-                details=e.details
-            )
+        # remove property and journal in one transaction
+        with self.property_dao.dao_access.unit_of_work():
+            # remove property first
+            try:
+                self.property_dao.remove(property_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"property {property_id} have dependency cannot be deleted",
+                    details=e.details
+                )
         
-        # then remove journal
-        try:
-            self.journal_service.delete_journal(jrn_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Delete journal failed, some component depends on the journal id {jrn_id}",
-                details=e.details
-            )
+            # then remove journal
+            try:
+                self.journal_service.delete_journal(jrn_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Delete journal failed, some component depends on the journal id {jrn_id}",
+                    details=e.details
+                )
             
     def delete_property_trans(self, trans_id: str):
         # remove journal first
@@ -385,23 +595,25 @@ class PropertyService:
                 details=e.details
             )
             
-        # remove property first
-        try:
-            self.property_transaction_dao.remove(trans_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Property transaction {trans_id} have dependency cannot be deleted",
-                details=e.details
-            )
+        # remove property and journal in one transaction
+        with self.property_transaction_dao.dao_access.unit_of_work():
+            # remove property first
+            try:
+                self.property_transaction_dao.remove(trans_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Property transaction {trans_id} have dependency cannot be deleted",
+                    details=e.details
+                )
             
-        # then remove journal
-        try:
-            self.journal_service.delete_journal(jrn_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Delete journal failed, some component depends on the journal id {jrn_id}",
-                details=e.details
-            )
+            # then remove journal
+            try:
+                self.journal_service.delete_journal(jrn_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Delete journal failed, some component depends on the journal id {jrn_id}",
+                    details=e.details
+                )
             
     def update_property(self, property: Property):
         self._validate_property(property)
@@ -416,32 +628,33 @@ class PropertyService:
                 details=e.details
             )
         
-        # add new journal first
-        journal = self.create_journal_from_property(property)
-        try:
-            self.journal_service.add_journal(journal)
-        except FKNotExistError as e:
-            raise FKNotExistError(
-                f'Some component of journal does not exist: {journal}',
-                details=e.details
-            )
-        
-        # update property
-        try:
-            self.property_dao.update(
-                journal_id=journal.journal_id, # use new journal id
-                property=property
-            )
-        except FKNotExistError as e:
-            # need to remove the new journal
-            self.journal_service.delete_journal(journal.journal_id)
-            raise FKNotExistError(
-                f"Property element does not exist",
-                details=e.details
-            )
+        # regenerate journal, reuse existing journal id
+        journal = self.create_journal_from_property(property).model_copy(
+            update={'journal_id': jrn_id}
+        )
         
-        # remove old journal
-        self.journal_service.delete_journal(jrn_id)
+        # update journal and property in one transaction
+        with self.property_dao.dao_access.unit_of_work():
+            # update existing journal in place
+            try:
+                self.journal_service.update_journal(journal)
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f'Some component of journal does not exist: {journal}',
+                    details=e.details
+                )
+            
+            # update property (journal id unchanged)
+            try:
+                self.property_dao.update(
+                    journal_id=jrn_id,
+                    property=property
+                )
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f"Property element does not exist",
+                    details=e.details
+                )
         
     def update_property_trans(self, property_trans: PropertyTransaction):
         self._validate_propertytrans(property_trans)
@@ -456,32 +669,33 @@ class PropertyService:
                 details=e.details
             )
         
-        # add new journal first
-        journal = self.create_journal_from_property_trans(property_trans)
-        try:
-            self.journal_service.add_journal(journal)
-        except FKNotExistError as e:
-            raise FKNotExistError(
-                f'Some component of journal does not exist: {journal}',
-                details=e.details
-            )
-        
-        # update property
-        try:
-            self.property_transaction_dao.update(
-                journal_id=journal.journal_id, # use new journal id
-                property_trans=property_trans
-            )
-        except FKNotExistError as e:
-            # need to remove the new journal
-            self.journal_service.delete_journal(journal.journal_id)
-            raise FKNotExistError(
-                f"Property element does not exist",
-                details=e.details
-            )
+        # regenerate journal, reuse existing journal id
+        journal = self.create_journal_from_property_trans(property_trans).model_copy(
+            update={'journal_id': jrn_id}
+        )
         
-        # remove old journal
-        self.journal_service.delete_journal(jrn_id)
+        # update journal and property in one transaction
+        with self.property_transaction_dao.dao_access.unit_of_work():
+            # update existing journal in place
+            try:
+                self.journal_service.update_journal(journal)
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f'Some component of journal does not exist: {journal}',
+                    details=e.details
+                )
+            
+            # update property (journal id unchanged)
+            try:
+                self.property_transaction_dao.update(
+                    journal_id=jrn_id,
+                    property_trans=property_trans
+                )
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f"Property element does not exist",
+                    details=e.details
+                )
         
     def list_properties(self) -> list[Property]:
         return self.property_dao.list_properties()
@@ -499,6 +713,12 @@ class PropertyService:
             )
         return stat
     
+    def get_acc_stats(self, rep_dt: date) -> list[_PropertyValuation]:
+        return self.property_transaction_dao.get_acc_stats(rep_dt)
+    
+    def get_acc_stats_by_type(self, rep_dt: date) -> list[_PropertyTypeValuation]:
+        return self.property_transaction_dao.get_acc_stats_by_type(rep_dt)
+    
     def list_transactions(self, property_id: str) -> list[PropertyTransaction]:
         return self.property_transaction_dao.list_transactions(property_id)
     
\ No newline at end of file
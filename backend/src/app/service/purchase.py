@@ -227,7 +227,11 @@ class PurchaseService:
     
     def create_journal_from_payment(self, payment: Payment) -> Journal:
         base_cur = self.setting_service.get_base_currency()
-        self._validate_payment(payment)
+        # load all invoices once, shared by validation and journal construction
+        invoices = self.invoice_dao.get_many(
+            [payment_item.invoice_id for payment_item in payment.payment_items]
+        )
+        self._validate_payment(payment, invoices=invoices)
         
         payment_acct = self.acct_service.get_account(payment.payment_acct_id)
         entries = []
@@ -235,7 +239,7 @@ class PurchaseService:
         # AR/AP offset amount, expressed in base currency
         ap_offset_raw_base = 0
         for payment_item in payment.payment_items:
-            _invoice, _jrn_id  = self.invoice_dao.get(payment_item.invoice_id)
+            _invoice, _jrn_id  = invoices[payment_item.invoice_id]
             amount_base = self.fx_service.convert_to_base(
                 amount=payment_item.payment_amount_raw, # amount deducted in invoice currency
                 src_currency=_invoice.currency, # invoice currency
@@ -390,7 +394,12 @@ class PurchaseService:
                     
         return invoice
                 
-    def _validate_payment(self, payment: Payment) -> Payment:
+    def _validate_payment(
+        self, 
+        payment: Payment, 
+        invoices: dict[str, Tuple[Invoice, str]] | None = None
+    ) -> Payment:
+        # invoices is optional preloaded invoices (from invoice_dao.get_many) keyed by invoice id
         # validate direction
         if not payment.entity_type == EntityType.SUPPLIER:
             raise OpNotPermittedError('Purchase payment should only be created for supplier')
@@ -408,16 +417,21 @@ class PurchaseService:
         if payment_acct.acct_type not in (AcctType.AST, AcctType.LIB, AcctType.EQU):
             raise OpNotPermittedError(f'Payment account can only be of balance sheet item')
         
+        # load all invoices at once
+        if invoices is None:
+            invoices = self.invoice_dao.get_many(
+                [payment_item.invoice_id for payment_item in payment.payment_items]
+            )
+        
         # validate payment items
         for payment_item in payment.payment_items:
             # validate invoice exist or not
-            try:
-                _invoice, _jrn_id  = self.invoice_dao.get(payment_item.invoice_id)
-            except NotExistError as e:
+            if payment_item.invoice_id not in invoices:
                 raise FKNotExistError(
                     f"Invoice Id {payment_item.invoice_id} of payment item {payment_item} does not exist",
-                    details=e.details
+                    details=f"Invoice Id {payment_item.invoice_id} not found"
                 )
+            _invoice, _jrn_id = invoices[payment_item.invoice_id]
             
             # validate invoice direction
             if not _invoice.entity_type == EntityType.SUPPLIER:
@@ -445,27 +459,29 @@ class PurchaseService:
             self._validate_invoice(invoice)
             # add journal first
             journal = self.create_journal_from_invoice(invoice)
-            try:
-                self.journal_service.add_journal(journal)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of journal does not exist: {journal}',
-                    details=e.details
-                )
+            # add journal and invoice in one transaction
+            with self.invoice_dao.dao_access.unit_of_work():
+                try:
+                    self.journal_service.add_journal(journal)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of journal does not exist: {journal}',
+                        details=e.details
+                    )
             
-            # add invoice
-            try:
-                self.invoice_dao.add(journal_id = journal.journal_id, invoice = invoice)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of invoice does not exist: {invoice}',
-                    details=e.details
-                )
-            except AlreadyExistError as e:
-                raise AlreadyExistError(
-                    f'Invoice Number already exist: , change one please',
-                    details=f"payment number: {invoice.invoice_num}"
-                )
+                # add invoice
+                try:
+                    self.invoice_dao.add(journal_id = journal.journal_id, invoice = invoice)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of invoice does not exist: {invoice}',
+                        details=e.details
+                    )
+                except AlreadyExistError as e:
+                    raise AlreadyExistError(
+                        f'Invoice Number already exist: , change one please',
+                        details=f"payment number: {invoice.invoice_num}"
+                    )
             
         else:
             raise AlreadyExistError(
@@ -483,28 +499,30 @@ class PurchaseService:
             self._validate_payment(payment)
             # add journal first
             journal = self.create_journal_from_payment(payment)
-            try:
-                self.journal_service.add_journal(journal)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of journal does not exist: {journal}',
-                    details=e.details
-                )
+            # add journal and payment in one transaction
+            with self.payment_dao.dao_access.unit_of_work():
+                try:
+                    self.journal_service.add_journal(journal)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of journal does not exist: {journal}',
+                        details=e.details
+                    )
+            
+                # add payment
+                try:
+                    self.payment_dao.add(journal_id = journal.journal_id, payment = payment)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of payment does not exist: {payment}',
+                        details=e.details
+                    )
+                except AlreadyExistError as e:
+                    raise AlreadyExistError(
+                        f'Payment Number already exist: , change one please',
+                        details=f"payment number: {payment.payment_num}"
+                    )
             
-            # add payment
-            try:
-                self.payment_dao.add(journal_id = journal.journal_id, payment = payment)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of payment does not exist: {payment}',
-                    details=e.details
-                )
-            except AlreadyExistError as e:
-                raise AlreadyExistError(
-                    f'Payment Number already exist: , change one please',
-                    details=f"payment number: {payment.payment_num}"
-                )
-                
         else:
             raise AlreadyExistError(
                 f"Payment id {payment.payment_id} already exist",
@@ -574,23 +592,25 @@ class PurchaseService:
                 details=e.details
             )
             
-        # remove invoice first
-        try:
-            self.invoice_dao.remove(invoice_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Invoice {invoice_id} have dependency cannot be deleted",
-                details=e.details
-            )
+        # remove invoice and journal in one transaction
+        with self.invoice_dao.dao_access.unit_of_work():
+            # remove invoice first
+            try:
+                self.invoice_dao.remove(invoice_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Invoice {invoice_id} have dependency cannot be deleted",
+                    details=e.details
+                )
         
-        # then remove journal
-        try:
-            self.journal_service.delete_journal(jrn_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Delete journal failed, some component depends on the journal id {jrn_id}",
-                details=e.details
-            )
+            # then remove journal
+            try:
+                self.journal_service.delete_journal(jrn_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Delete journal failed, some component depends on the journal id {jrn_id}",
+                    details=e.details
+                )
             
     def delete_payment(self, payment_id: str):
         # remove journal first
@@ -603,23 +623,25 @@ class PurchaseService:
                 details=e.details
             )
             
-        # remove payment first
-        try:
-            self.payment_dao.remove(payment_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Payment {payment_id} have dependency cannot be deleted",
-                details=e.details
-            )
+        # remove payment and journal in one transaction
+        with self.payment_dao.dao_access.unit_of_work():
+            # remove payment first
+            try:
+                self.payment_dao.remove(payment_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Payment {payment_id} have dependency cannot be deleted",
+                    details=e.details
+                )
         
-        # then remove journal
-        try:
-            self.journal_service.delete_journal(jrn_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Delete journal failed, some component depends on the journal id {jrn_id}",
-                details=e.details
-            )
+            # then remove journal
+            try:
+                self.journal_service.delete_journal(jrn_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Delete journal failed, some component depends on the journal id {jrn_id}",
+                    details=e.details
+                )
         
     def update_invoice(self, invoice: Invoice):
         self._validate_invoice(invoice)
@@ -636,32 +658,33 @@ class PurchaseService:
                 details=e.details
             )
         
-        # add new journal first
-        journal = self.create_journal_from_invoice(invoice)
-        try:
-            self.journal_service.add_journal(journal)
-        except FKNotExistError as e:
-            raise FKNotExistError(
-                f'Some component of journal does not exist: {journal}',
-                details=e.details
-            )
-        
-        # update invoice
-        try:
-            self.invoice_dao.update(
-                journal_id=journal.journal_id, # use new journal id
-                invoice=invoice
-            )
-        except FKNotExistError as e:
-            # need to remove the new journal
-            self.journal_service.delete_journal(journal.journal_id)
-            raise FKNotExistError(
-                f"Invoice element does not exist",
-                details=e.details
-            )
+        # regenerate journal, reuse existing journal id
+        journal = self.create_journal_from_invoice(invoice).model_copy(
+            update={'journal_id': jrn_id}
+        )
         
-        # remove old journal
-        self.journal_service.delete_journal(jrn_id)
+        # update journal and invoice in one transaction
+        with self.invoice_dao.dao_access.unit_of_work():
+            # update existing journal in place
+            try:
+                self.journal_service.update_journal(journal)
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f'Some component of journal does not exist: {journal}',
+                    details=e.details
+                )
+            
+            # update invoice (journal id unchanged)
+            try:
+                self.invoice_dao.update(
+                    journal_id=jrn_id,
+                    invoice=invoice
+                )
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f"Invoice element does not exist",
+                    details=e.details
+                )
         
     def update_payment(self, payment: Payment):
         self._validate_payment(payment)
@@ -678,32 +701,33 @@ class PurchaseService:
                 details=e.details
             )
         
-        # add new journal first
-        journal = self.create_journal_from_payment(payment)
-        try:
-            self.journal_service.add_journal(journal)
-        except FKNotExistError as e:
-            raise FKNotExistError(
-                f'Some component of journal does not exist: {journal}',
-                details=e.details
-            )
-        
-        # update payment
-        try:
-            self.payment_dao.update(
-                journal_id=journal.journal_id, # use new journal id
-                payment=payment
-            )
-        except FKNotExistError as e:
-            # need to remove the new journal
-            self.journal_service.delete_journal(journal.journal_id)
-            raise FKNotExistError(
-                f"Payment element does not exist",
-                details=e.details
-            )
+        # regenerate journal, reuse existing journal id
+        journal = self.create_journal_from_payment(payment).model_copy(
+            update={'journal_id': jrn_id}
+        )
         
-        # remove old journal
-        self.journal_service.delete_journal(jrn_id)
+        # update journal and payment in one transaction
+        with self.payment_dao.dao_access.unit_of_work():
+            # update existing journal in place
+            try:
+                self.journal_service.update_journal(journal)
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f'Some component of journal does not exist: {journal}',
+                    details=e.details
+                )
+            
+            # update payment (journal id unchanged)
+            try:
+                self.payment_dao.update(
+                    journal_id=jrn_id,
+                    payment=payment
+                )
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f"Payment element does not exist",
+                    details=e.details
+                )
         
         
     def list_invoice(
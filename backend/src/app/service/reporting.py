@@ -1,11 +1,18 @@
 
+from collections import defaultdict
 from datetime import date
+from typing import Any, Literal
+from src.app.model.accounts import Account
 from src.app.model.const import SystemAcctNumber
+from src.app.model.exceptions import OpNotPermittedError
 from src.app.model.journal import _AcctFlowAGG
 from src.app.service.journal import JournalService
 from src.app.service.acct import AcctService
 from src.app.model.enums import AcctType
 from src.app.service.settings import ConfigService
+from src.app.utils.tools import period_grid
+
+MAX_REPORT_PERIODS = 120
 
 
 class ReportingService:
@@ -64,6 +71,44 @@ class ReportingService:
         
         return tree
     
+    def get_acct_details_by_period(
+        self, 
+        tree: dict, 
+        balances: dict[str, list[_AcctFlowAGG]], 
+        accts_by_chart: dict[str, list[Account]],
+        num_periods: int
+    ) -> dict:
+        # same as get_acct_details, but net_base is a vector (one per period)
+        # accounts are prefetched so rolling up the tree does not hit db
+        acct_enriched = []
+        for a in accts_by_chart.get(tree['chart_id'], []):
+            flows = balances.get(a.acct_id)
+            acct_enriched.append({
+                'acct_id': a.acct_id,
+                'acct_name': a.acct_name,
+                'net_base': [fl.net_base for fl in flows] if flows else [0.0] * num_periods # type: ignore
+            })
+        tree['acct_summary'] = acct_enriched
+        
+        net_base = [0.0] * num_periods
+        for a in acct_enriched:
+            net_base = [n + v for n, v in zip(net_base, a['net_base'])]
+        
+        if 'children' in tree:
+            enriched_children = []
+            for child in tree['children']:
+                child_details = self.get_acct_details_by_period(child, balances, accts_by_chart, num_periods)
+                enriched_children.append(child_details)
+                net_base = [n + v for n, v in zip(net_base, child_details['chart_summary']['net_base'])]
+            
+            tree['children'] = enriched_children
+        
+        tree['chart_summary'] = {
+            'net_base': net_base
+        }
+        
+        return tree
+    
     def get_balance_sheet_tree(self, rep_dt: date) -> dict[AcctType, dict]:
         base_cur =  self.setting_service.get_base_currency()
         # get balances per acct id
@@ -108,4 +153,47 @@ class ReportingService:
             acct_details = self.get_acct_details(tree=coa, balances=balances, bal_type=False)
             inc_stat_tree[acct_type] = acct_details
             
-        return inc_stat_tree
\ No newline at end of file
+        return inc_stat_tree
+    
+    def get_income_statement_matrix(
+        self, 
+        start_dt: date, 
+        end_dt: date, 
+        freq: Literal['month', 'quarter', 'year']
+    ) -> dict[str, Any]:
+        # income statement tree for consecutive periods, each node carries a value per period
+        periods = period_grid(start_dt, end_dt, freq)
+        if len(periods) == 0:
+            raise OpNotPermittedError(f"Start date {start_dt} is after end date {end_dt}")
+        if len(periods) > MAX_REPORT_PERIODS:
+            raise OpNotPermittedError(
+                f"Too many periods ({len(periods)}), at most {MAX_REPORT_PERIODS} allowed",
+                details=f"start_dt = {start_dt}, end_dt = {end_dt}, freq = {freq}"
+            )
+        
+        balances = self.journal_service.get_incexp_flows_by_period(periods)
+        
+        inc_stat_tree = dict()
+        for acct_type in (AcctType.INC, AcctType.EXP):
+            coa = self.acct_service.export_coa(acct_type=acct_type, simple=True)
+            accts_by_chart = defaultdict(list)
+            for acct in self.acct_service.get_accounts_by_charts(self.acct_service.get_charts(acct_type)):
+                accts_by_chart[acct.chart.chart_id].append(acct)
+            inc_stat_tree[acct_type] = self.get_acct_details_by_period(
+                tree=coa, 
+                balances=balances, 
+                accts_by_chart=accts_by_chart, 
+                num_periods=len(periods)
+            )
+        
+        net_income = [
+            inc - exp for inc, exp in zip(
+                inc_stat_tree[AcctType.INC]['chart_summary']['net_base'],
+                inc_stat_tree[AcctType.EXP]['chart_summary']['net_base']
+            )
+        ]
+        return {
+            'periods': [{'start_dt': s, 'end_dt': e} for s, e in periods],
+            'tree': inc_stat_tree,
+            'net_income': net_income
+        }
@@ -1,16 +1,20 @@
-from typing import Any, Tuple
+import io
+from typing import Any, BinaryIO, Tuple
 from datetime import datetime
 from src.app.model.enums import CurType
 from src.app.model.entity import Address, Contact
 from src.app.dao.config import configDao
 from src.app.dao.backup import backupDao
 from src.app.model.exceptions import NotExistError, OpNotPermittedError
+from src.app.model.job import ProgressCallback
 from src.app.service.files import FileService
+from src.app.utils.metrics import BACKUP_DURATION, time_histogram
 from src.app.utils.tools import get_secret
-from src.app.model.misc import FileWrapper
+from src.app.model.misc import FileWrapper, _FileInfo
 
 class ConfigService:
     LOGO_FILE_ID = 'settings-logo'
+    LOGO_FILENAME = 'SETTINGS_LOGO.PNG'
     
     def __init__(self, file_service: FileService, config_dao: configDao):
         self.file_service = file_service
@@ -41,19 +45,22 @@ class ConfigService:
         )
     
     def set_logo(self, content: str):
-        logo = FileWrapper(
-            file_id=self.LOGO_FILE_ID,
-            filename='SETTINGS_LOGO.PNG', 
-            content=content
-        )
+        # compatibility for string content (latin-1 encoded bytes)
+        self.set_logo_stream(io.BytesIO(content.encode('latin-1')))
+        
+    def set_logo_stream(self, stream: BinaryIO):
         try:
-            self.file_service.get_file(self.LOGO_FILE_ID)
+            self.file_service.get_file_info(self.LOGO_FILE_ID)
         except NotExistError:
-            self.file_service.add_file(logo)
+            pass
         else:
             # if exist, remove current one and replace with new one
             self.file_service.delete_file(self.LOGO_FILE_ID)
-            self.file_service.add_file(logo)
+        self.file_service.add_file_stream(
+            filename=self.LOGO_FILENAME,
+            stream=stream,
+            file_id=self.LOGO_FILE_ID
+        )
         
     def get_logo(self) -> FileWrapper:
         try:
@@ -62,6 +69,13 @@ class ConfigService:
             raise NotExistError(message="Logo not set yet! " + e.message, details=e.details)
         return logo
     
+    def get_logo_info(self) -> _FileInfo:
+        try:
+            info = self.file_service.get_file_info(self.LOGO_FILE_ID)
+        except NotExistError as e:
+            raise NotExistError(message="Logo not set yet! " + e.message, details=e.details)
+        return info
+    
     def get_config(self) -> dict[str, Any]:
         return self.config_dao.get_config()
     
@@ -95,6 +109,11 @@ class ConfigService:
     
     def confirm_setup(self):
         self.set_config_value('is_setup', True)
+        
+    def get_data_versions(self) -> dict[str, str]:
+        # version token per data domain (accounts/journals/items/entities)
+        # changes whenever a write in that domain is committed, used as client cache key
+        return self.config_dao.get_data_versions()
     
     def get_base_currency(self) -> CurType:
         base_currency = self.get_config_value('base_currency')
@@ -154,20 +173,32 @@ class BackupService:
     def list_backup_ids(self) -> list[str]:
         return self.backup_dao.list_backup_ids()
     
-    def backup(self, backup_id: str | None) -> str:
+    def backup(self, backup_id: str | None, progress: ProgressCallback | None = None) -> str:
         # use current timestamp if not given backup id
         backup_id = backup_id or datetime.now().strftime('%Y%m%dT%H%M%S')
         
         # backup database
-        self.backup_dao.backup_database(backup_id)
+        if progress is not None:
+            progress(0, 'Backing up database')
+        with time_histogram(BACKUP_DURATION, scope='user', job='backup_database'):
+            self.backup_dao.backup_database(backup_id)
         # backup files
-        self.backup_dao.backup_files(backup_id)
+        if progress is not None:
+            progress(0.5, 'Backing up files')
+        with time_histogram(BACKUP_DURATION, scope='user', job='backup_files'):
+            self.backup_dao.backup_files(backup_id)
         
         return backup_id
     
-    def restore(self, backup_id: str):
+    def restore(self, backup_id: str, progress: ProgressCallback | None = None):
         
         # restore files
-        self.backup_dao.restore_files(backup_id)
+        if progress is not None:
+            progress(0, 'Restoring files')
+        with time_histogram(BACKUP_DURATION, scope='user', job='restore_files'):
+            self.backup_dao.restore_files(backup_id)
         # restore database
-        self.backup_dao.restore_database(backup_id)
\ No newline at end of file
+        if progress is not None:
+            progress(0.5, 'Restoring database')
+        with time_histogram(BACKUP_DURATION, scope='user', job='restore_database'):
+            self.backup_dao.restore_database(backup_id)
\ No newline at end of file
@@ -15,7 +15,7 @@ from src.app.model.exceptions import AlreadyExistError, FKNoDeleteUpdateError, F
     NotExistError, NotMatchWithSystemError, OpNotPermittedError
 from src.app.service.acct import AcctService
 from src.app.model.accounts import Account
-from src.app.model.shares import Dividend, StockIssue, StockRepurchase
+from src.app.model.shares import _CapTable, Dividend, StockIssue, StockRepurchase
 from src.app.service.settings import ConfigService
 
 
@@ -79,11 +79,15 @@ class SharesService:
         
     def _validate_issue(self, issue: StockIssue) -> StockIssue:
         base_cur = self.setting_service.get_base_currency()
-        # TODO: if reissue, need to check if num_shares <= total repurchased shares
         if issue.is_reissue:
             # check if reissue id exist
+            # reissued shares counted on and before this date, exclude itself to avoid recursive counting
             try:
-                repur, jrn = self.get_repur_journal(issue.reissue_repur_id) # type: ignore
+                batch = self.stock_repurchase_dao.get_batch(
+                    repur_id=issue.reissue_repur_id, # type: ignore
+                    rep_dt=issue.issue_dt,
+                    exclu_issue_id=issue.issue_id
+                )
             except NotExistError as e:
                 raise NotExistError(
                     message=f'Repurchase id {issue.reissue_repur_id} not found for reissue',
@@ -91,26 +95,18 @@ class SharesService:
                 )
             else:
                 # verify if reissue is after repurchase
-                if issue.issue_dt < repur.repur_dt:
+                if issue.issue_dt < batch.repur_dt:
                     raise OpNotPermittedError(
                         message="Cannot reissue stock before that batch of stock being repurchased",
-                        details=f"issue date: {issue.issue_dt} while repurchased at {repur.repur_dt}"
+                        details=f"issue date: {issue.issue_dt} while repurchased at {batch.repur_dt}"
                     )
                 
                 # verify if issue # of stock is less than remaining repurchased shares
-                total_reissued_excl_self = self.stock_issue_dao.get_total_reissue_from_repur(
-                    repur_id=issue.reissue_repur_id, # type: ignore
-                    rep_dt=issue.issue_dt, # reissue on and before this date
-                    exclu_issue_id=issue.issue_id  # exclude itself to avoid recursive counting
-                ) # already reissued before given date
-                # remaining treasury stock available for that batch of repurchase
-                remaining_for_reissue = repur.num_shares - total_reissued_excl_self
-                
-                if issue.num_shares > remaining_for_reissue:
+                if issue.num_shares > batch.remaining_shares: # type: ignore
                     raise OpNotPermittedError(
                         message=f"You can only reissue remaining repurchased stock for batch {issue.reissue_repur_id}",
-                        details=f"total repurchased={repur.num_shares}, already issued={total_reissued_excl_self}, " \
-                        f"remaining={remaining_for_reissue} while you ask for {issue.num_shares}"
+                        details=f"total repurchased={batch.num_shares}, already issued={batch.reissued_shares}, " \
+                        f"remaining={batch.remaining_shares} while you ask for {issue.num_shares}"
                     )
         
         # check if debit_acct_id exists
@@ -418,27 +414,29 @@ class SharesService:
             
             # add journal first
             journal = self.create_journal_from_issue(issue)
-            try:
-                self.journal_service.add_journal(journal)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of journal does not exist: {journal}',
-                    details=e.details
-                )
+            # add journal and issue in one transaction
+            with self.stock_issue_dao.dao_access.unit_of_work():
+                try:
+                    self.journal_service.add_journal(journal)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of journal does not exist: {journal}',
+                        details=e.details
+                    )
                 
-            # add issue
-            try:
-                self.stock_issue_dao.add(journal_id = journal.journal_id, stock_issue = issue)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of issue does not exist: {issue}',
-                    details=e.details
-                )
-            except AlreadyExistError as e:
-                raise AlreadyExistError(
-                    f'StockIssue already exist, change one please',
-                    details=f"{issue}"
-                )
+                # add issue
+                try:
+                    self.stock_issue_dao.add(journal_id = journal.journal_id, stock_issue = issue)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of issue does not exist: {issue}',
+                        details=e.details
+                    )
+                except AlreadyExistError as e:
+                    raise AlreadyExistError(
+                        f'StockIssue already exist, change one please',
+                        details=f"{issue}"
+                    )
             
         else:
             raise AlreadyExistError(
@@ -457,27 +455,29 @@ class SharesService:
             
             # add journal first
             journal = self.create_journal_from_repur(repur)
-            try:
-                self.journal_service.add_journal(journal)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of journal does not exist: {journal}',
-                    details=e.details
-                )
+            # add journal and repur in one transaction
+            with self.stock_repurchase_dao.dao_access.unit_of_work():
+                try:
+                    self.journal_service.add_journal(journal)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of journal does not exist: {journal}',
+                        details=e.details
+                    )
                 
-            # add repur
-            try:
-                self.stock_repurchase_dao.add(journal_id = journal.journal_id, stock_repur = repur)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of repur does not exist: {repur}',
-                    details=e.details
-                )
-            except AlreadyExistError as e:
-                raise AlreadyExistError(
-                    f'StockRepurchase already exist, change one please',
-                    details=f"{repur}"
-                )
+                # add repur
+                try:
+                    self.stock_repurchase_dao.add(journal_id = journal.journal_id, stock_repur = repur)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of repur does not exist: {repur}',
+                        details=e.details
+                    )
+                except AlreadyExistError as e:
+                    raise AlreadyExistError(
+                        f'StockRepurchase already exist, change one please',
+                        details=f"{repur}"
+                    )
             
         else:
             raise AlreadyExistError(
@@ -496,27 +496,29 @@ class SharesService:
             
             # add journal first
             journal = self.create_journal_from_div(div)
-            try:
-                self.journal_service.add_journal(journal)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of journal does not exist: {journal}',
-                    details=e.details
-                )
+            # add journal and div in one transaction
+            with self.dividend_dao.dao_access.unit_of_work():
+                try:
+                    self.journal_service.add_journal(journal)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of journal does not exist: {journal}',
+                        details=e.details
+                    )
                 
-            # add div
-            try:
-                self.dividend_dao.add(journal_id = journal.journal_id, dividend = div)
-            except FKNotExistError as e:
-                raise FKNotExistError(
-                    f'Some component of div does not exist: {div}',
-                    details=e.details
-                )
-            except AlreadyExistError as e:
-                raise AlreadyExistError(
-                    f'Dividend already exist, change one please',
-                    details=f"{div}"
-                )
+                # add div
+                try:
+                    self.dividend_dao.add(journal_id = journal.journal_id, dividend = div)
+                except FKNotExistError as e:
+                    raise FKNotExistError(
+                        f'Some component of div does not exist: {div}',
+                        details=e.details
+                    )
+                except AlreadyExistError as e:
+                    raise AlreadyExistError(
+                        f'Dividend already exist, change one please',
+                        details=f"{div}"
+                    )
             
         else:
             raise AlreadyExistError(
@@ -613,23 +615,25 @@ class SharesService:
                 details=e.details
             )
             
-        # remove issue first
-        try:
-            self.stock_issue_dao.remove(issue_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Issue {issue_id} have dependency cannot be deleted",
-                details=e.details
-            )
+        # remove issue and journal in one transaction
+        with self.stock_issue_dao.dao_access.unit_of_work():
+            # remove issue first
+            try:
+                self.stock_issue_dao.remove(issue_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Issue {issue_id} have dependency cannot be deleted",
+                    details=e.details
+                )
         
-        # then remove journal
-        try:
-            self.journal_service.delete_journal(jrn_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Delete journal failed, some component depends on the journal id {jrn_id}",
-                details=e.details
-            )
+            # then remove journal
+            try:
+                self.journal_service.delete_journal(jrn_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Delete journal failed, some component depends on the journal id {jrn_id}",
+                    details=e.details
+                )
             
     def delete_repur(self, repur_id: str):
         # remove journal first
@@ -642,23 +646,25 @@ class SharesService:
                 details=e.details
             )
             
-        # remove repur first
-        try:
-            self.stock_repurchase_dao.remove(repur_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Repurchase {repur_id} have dependency cannot be deleted",
-                details=e.details
-            )
+        # remove repur and journal in one transaction
+        with self.stock_repurchase_dao.dao_access.unit_of_work():
+            # remove repur first
+            try:
+                self.stock_repurchase_dao.remove(repur_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Repurchase {repur_id} have dependency cannot be deleted",
+                    details=e.details
+                )
         
-        # then remove journal
-        try:
-            self.journal_service.delete_journal(jrn_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Delete journal failed, some component depends on the journal id {jrn_id}",
-                details=e.details
-            )
+            # then remove journal
+            try:
+                self.journal_service.delete_journal(jrn_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Delete journal failed, some component depends on the journal id {jrn_id}",
+                    details=e.details
+                )
             
     def delete_div(self, div_id: str):
         # remove journal first
@@ -671,23 +677,25 @@ class SharesService:
                 details=e.details
             )
             
-        # remove div first
-        try:
-            self.dividend_dao.remove(div_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Dividend {div_id} have dependency cannot be deleted",
-                details=e.details
-            )
+        # remove div and journal in one transaction
+        with self.dividend_dao.dao_access.unit_of_work():
+            # remove div first
+            try:
+                self.dividend_dao.remove(div_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Dividend {div_id} have dependency cannot be deleted",
+                    details=e.details
+                )
         
-        # then remove journal
-        try:
-            self.journal_service.delete_journal(jrn_id)
-        except FKNoDeleteUpdateError as e:
-            raise FKNoDeleteUpdateError(
-                f"Delete journal failed, some component depends on the journal id {jrn_id}",
-                details=e.details
-            )
+            # then remove journal
+            try:
+                self.journal_service.delete_journal(jrn_id)
+            except FKNoDeleteUpdateError as e:
+                raise FKNoDeleteUpdateError(
+                    f"Delete journal failed, some component depends on the journal id {jrn_id}",
+                    details=e.details
+                )
             
     def update_issue(self, issue: StockIssue):
         self._validate_issue(issue)
@@ -702,32 +710,33 @@ class SharesService:
                 details=e.details
             )
         
-        # add new journal first
-        journal = self.create_journal_from_issue(issue)
-        try:
-            self.journal_service.add_journal(journal)
-        except FKNotExistError as e:
-            raise FKNotExistError(
-                f'Some component of journal does not exist: {journal}',
-                details=e.details
-            )
-        
-        # update issue
-        try:
-            self.stock_issue_dao.update(
-                journal_id=journal.journal_id, # use new journal id
-                stock_issue=issue
-            )
-        except FKNotExistError as e:
-            # need to remove the new journal
-            self.journal_service.delete_journal(journal.journal_id)
-            raise FKNotExistError(
-                f"StockIssue element does not exist",
-                details=e.details
-            )
+        # regenerate journal, reuse existing journal id
+        journal = self.create_journal_from_issue(issue).model_copy(
+            update={'journal_id': jrn_id}
+        )
         
-        # remove old journal
-        self.journal_service.delete_journal(jrn_id)
+        # update journal and issue in one transaction
+        with self.stock_issue_dao.dao_access.unit_of_work():
+            # update existing journal in place
+            try:
+                self.journal_service.update_journal(journal)
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f'Some component of journal does not exist: {journal}',
+                    details=e.details
+                )
+            
+            # update issue (journal id unchanged)
+            try:
+                self.stock_issue_dao.update(
+                    journal_id=jrn_id,
+                    stock_issue=issue
+                )
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f"StockIssue element does not exist",
+                    details=e.details
+                )
         
     def update_repur(self, repur: StockRepurchase):
         self._validate_repur(repur)
@@ -742,32 +751,33 @@ class SharesService:
                 details=e.details
             )
         
-        # add new journal first
-        journal = self.create_journal_from_repur(repur)
-        try:
-            self.journal_service.add_journal(journal)
-        except FKNotExistError as e:
-            raise FKNotExistError(
-                f'Some component of journal does not exist: {journal}',
-                details=e.details
-            )
-        
-        # update repur
-        try:
-            self.stock_repurchase_dao.update(
-                journal_id=journal.journal_id, # use new journal id
-                stock_repur=repur
-            )
-        except FKNotExistError as e:
-            # need to remove the new journal
-            self.journal_service.delete_journal(journal.journal_id)
-            raise FKNotExistError(
-                f"StockRepurchase element does not exist",
-                details=e.details
-            )
+        # regenerate journal, reuse existing journal id
+        journal = self.create_journal_from_repur(repur).model_copy(
+            update={'journal_id': jrn_id}
+        )
         
-        # remove old journal
-        self.journal_service.delete_journal(jrn_id)
+        # update journal and repur in one transaction
+        with self.stock_repurchase_dao.dao_access.unit_of_work():
+            # update existing journal in place
+            try:
+                self.journal_service.update_journal(journal)
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f'Some component of journal does not exist: {journal}',
+                    details=e.details
+                )
+            
+            # update repur (journal id unchanged)
+            try:
+                self.stock_repurchase_dao.update(
+                    journal_id=jrn_id,
+                    stock_repur=repur
+                )
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f"StockRepurchase element does not exist",
+                    details=e.details
+                )
         
     def update_div(self, div: Dividend):
         self._validate_div(div)
@@ -782,32 +792,33 @@ class SharesService:
                 details=e.details
             )
         
-        # add new journal first
-        journal = self.create_journal_from_div(div)
-        try:
-            self.journal_service.add_journal(journal)
-        except FKNotExistError as e:
-            raise FKNotExistError(
-                f'Some component of journal does not exist: {journal}',
-                details=e.details
-            )
-        
-        # update div
-        try:
-            self.dividend_dao.update(
-                journal_id=journal.journal_id, # use new journal id
-                dividend=div
-            )
-        except FKNotExistError as e:
-            # need to remove the new journal
-            self.journal_service.delete_journal(journal.journal_id)
-            raise FKNotExistError(
-                f"Dividend element does not exist",
-                details=e.details
-            )
+        # regenerate journal, reuse existing journal id
+        journal = self.create_journal_from_div(div).model_copy(
+            update={'journal_id': jrn_id}
+        )
         
-        # remove old journal
-        self.journal_service.delete_journal(jrn_id)
+        # update journal and div in one transaction
+        with self.dividend_dao.dao_access.unit_of_work():
+            # update existing journal in place
+            try:
+                self.journal_service.update_journal(journal)
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f'Some component of journal does not exist: {journal}',
+                    details=e.details
+                )
+            
+            # update div (journal id unchanged)
+            try:
+                self.dividend_dao.update(
+                    journal_id=jrn_id,
+                    dividend=div
+                )
+            except FKNotExistError as e:
+                raise FKNotExistError(
+                    f"Dividend element does not exist",
+                    details=e.details
+                )
     
         
     def list_issues(self, is_reissue: bool = False) -> list[StockIssue]:
@@ -826,5 +837,14 @@ class SharesService:
     def list_repurs(self) -> list[StockRepurchase]:
         return self.stock_repurchase_dao.list_repurs()
     
+    def get_cap_table(self, rep_dt: date) -> _CapTable:
+        # share position as of rep_dt, from aggregates only (no journal is loaded)
+        return _CapTable(
+            rep_dt=rep_dt,
+            issued_shares=self.stock_issue_dao.get_total_new_issue(rep_dt),
+            batches=self.stock_repurchase_dao.list_batches(rep_dt),
+            dividends=self.dividend_dao.get_div_agg(rep_dt)
+        )
+    
     def list_divs(self) -> list[Dividend]:
         return self.dividend_dao.list_divs()
\ No newline at end of file
@@ -1,9 +1,30 @@
-from typing import Any
+import os
+from typing import Any, TypeVar
 from pydantic import BaseModel
 
+VALIDATE_DB_READS = bool(int(os.environ.get('VALIDATE_DB_READS', 0))) # fully validate models read back from db, e.g., to debug bad data
+
+_M = TypeVar('_M', bound='EnhancedBaseModel')
 
 class EnhancedBaseModel(BaseModel):
     
+    @classmethod
+    def hydrate(cls: type[_M], validate: bool = False, **data: Any) -> _M:
+        """Build from trusted data (rows written by our own dao), skip validation unless asked.
+        Nested models must be passed as model instances, computed fields still work."""
+        if validate:
+            return cls(**data)
+        if data.keys() != cls.model_fields.keys() or cls.__private_attributes__ or cls.__pydantic_post_init__:
+            # defaults to fill in or extra init work, let pydantic handle it
+            return cls.model_construct(**data)
+        # every field given, same end state as model_construct without its per-field python loop
+        m = cls.__new__(cls)
+        object.__setattr__(m, '__dict__', data)
+        object.__setattr__(m, '__pydantic_fields_set__', set(data))
+        object.__setattr__(m, '__pydantic_extra__', None)
+        object.__setattr__(m, '__pydantic_private__', None)
+        return m
+    
     def _set_skip_validation(self, name: str, value: Any) -> None:
         """Workaround to be able to set fields without validation."""
         attr = getattr(self.__class__, name, None)
@@ -11,4 +32,4 @@ class EnhancedBaseModel(BaseModel):
             attr.__set__(self, value)
         else:
             self.__dict__[name] = value
-            self.__pydantic_fields_set__.add(name)
\ No newline at end of file
+            self.__pydantic_fields_set__.add(name)
@@ -0,0 +1,169 @@
+import gzip
+import json
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Tuple
+
+# on-disk reference data for GeoService, so lookups never wait on the third-party api once cached
+# keys: 'countries', 'states/<country_iso2>', 'cities/<country_iso2>/<state_iso2>'
+
+GEO_CACHE_PATH = os.environ.get(
+    'GEO_CACHE_PATH',
+    (Path(tempfile.gettempdir()) / 'finlens_geo_cache.sqlite').as_posix()
+) # sqlite file, shared by all workers on the host
+GEO_CACHE_TTL = float(os.environ.get('GEO_CACHE_TTL', 30 * 24 * 3600)) # seconds, older lists are refreshed in background
+GEO_SNAPSHOT_PATH = (Path(__file__).resolve().parent.parent / 'data' / 'geo_snapshot.json.gz').as_posix() # bundled seed
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS countries (
+    iso2 TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS states (
+    country_iso2 TEXT NOT NULL,
+    iso2 TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (country_iso2, iso2)
+);
+CREATE TABLE IF NOT EXISTS cities (
+    country_iso2 TEXT NOT NULL,
+    state_iso2 TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (country_iso2, state_iso2, name)
+);
+CREATE TABLE IF NOT EXISTS fetched (
+    key TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL
+);
+"""
+
+class GeoCache:
+
+    def __init__(self, path: str = GEO_CACHE_PATH, ttl: float = GEO_CACHE_TTL, snapshot: str | None = GEO_SNAPSHOT_PATH):
+        self.path = path
+        self.ttl = ttl
+        self.snapshot = snapshot
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # one short lived connection per call, sqlite connections are not shared across threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                    conn.executescript(_SCHEMA)
+                    empty = conn.execute("SELECT COUNT(*) FROM fetched").fetchone()[0] == 0
+                    if empty and self.snapshot is not None and Path(self.snapshot).exists():
+                        self._load(conn, self.snapshot)
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def get(self, key: str) -> Tuple[list[dict] | None, bool]:
+        # (rows, is_stale), rows is None if never fetched
+        # fetched empty list (e.g. country without states) is a valid hit
+        conn = self._connect()
+        try:
+            r = conn.execute("SELECT fetched_at FROM fetched WHERE key = ?", (key, )).fetchone()
+            if r is None:
+                return None, False
+            kind, *iso2s = key.split('/')
+            if kind == 'countries':
+                rows = conn.execute("SELECT name, iso2 FROM countries ORDER BY name").fetchall()
+                result = [{'name': n, 'iso2': i} for n, i in rows]
+            elif kind == 'states':
+                rows = conn.execute(
+                    "SELECT name, iso2 FROM states WHERE country_iso2 = ? ORDER BY name", iso2s
+                ).fetchall()
+                result = [{'name': n, 'iso2': i} for n, i in rows]
+            else:
+                rows = conn.execute(
+                    "SELECT name FROM cities WHERE country_iso2 = ? AND state_iso2 = ? ORDER BY name", iso2s
+                ).fetchall()
+                result = [{'name': n} for n, in rows]
+        finally:
+            conn.close()
+        return result, time.time() - r[0] > self.ttl
+
+    def put(self, key: str, rows: list[dict], fetched_at: float | None = None):
+        # replace the whole list in one transaction
+        conn = self._connect()
+        try:
+            with conn:
+                self._put(conn, key, rows, time.time() if fetched_at is None else fetched_at)
+        finally:
+            conn.close()
+
+    def _put(self, conn: sqlite3.Connection, key: str, rows: list[dict], fetched_at: float):
+        kind, *iso2s = key.split('/')
+        if kind == 'countries':
+            conn.execute("DELETE FROM countries")
+            conn.executemany(
+                "INSERT OR REPLACE INTO countries (iso2, name) VALUES (?, ?)",
+                [(r['iso2'], r['name']) for r in rows]
+            )
+        elif kind == 'states':
+            conn.execute("DELETE FROM states WHERE country_iso2 = ?", iso2s)
+            conn.executemany(
+                "INSERT OR REPLACE INTO states (country_iso2, iso2, name) VALUES (?, ?, ?)",
+                [(iso2s[0], r['iso2'], r['name']) for r in rows]
+            )
+        elif kind == 'cities':
+            conn.execute("DELETE FROM cities WHERE country_iso2 = ? AND state_iso2 = ?", iso2s)
+            conn.executemany(
+                "INSERT OR REPLACE INTO cities (country_iso2, state_iso2, name) VALUES (?, ?, ?)",
+                [(iso2s[0], iso2s[1], r['name']) for r in rows]
+            )
+        else:
+            raise ValueError(f"Unknown geo cache key: {key}")
+        conn.execute(
+            "INSERT OR REPLACE INTO fetched (key, fetched_at) VALUES (?, ?)",
+            (key, fetched_at)
+        )
+
+    def _load(self, conn: sqlite3.Connection, snapshot: str):
+        # snapshot keeps its own timestamp, so an old seed still gets refreshed when api is reachable
+        with gzip.open(snapshot, 'rt', encoding='utf-8') as obj:
+            data = json.load(obj)
+        fetched_at = data['generated_at']
+        self._put(conn, 'countries', data['countries'], fetched_at)
+        for country_iso2, rows in data['states'].items():
+            self._put(conn, f'states/{country_iso2}', rows, fetched_at)
+        for state_key, rows in data['cities'].items():
+            self._put(conn, f'cities/{state_key}', [{'name': n} for n in rows], fetched_at)
+
+    def load_snapshot(self, snapshot: str):
+        conn = self._connect()
+        try:
+            with conn:
+                self._load(conn, snapshot)
+        finally:
+            conn.close()
+
+    def dump_snapshot(self, snapshot: str):
+        # write everything cached so far as a new seed file
+        conn = self._connect()
+        try:
+            fetched = dict(conn.execute("SELECT key, fetched_at FROM fetched").fetchall())
+        finally:
+            conn.close()
+        data = {
+            'generated_at': min(fetched.values(), default=time.time()),
+            'countries': self.get('countries')[0] or [],
+            'states': {},
+            'cities': {},
+        }
+        for key in sorted(fetched):
+            kind, _, rest = key.partition('/')
+            if kind == 'states':
+                data['states'][rest] = self.get(key)[0]
+            elif kind == 'cities':
+                data['cities'][rest] = [r['name'] for r in self.get(key)[0]] # type: ignore
+        with gzip.open(snapshot, 'wt', encoding='utf-8') as obj:
+            json.dump(data, obj, ensure_ascii=False)
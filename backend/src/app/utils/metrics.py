@@ -0,0 +1,238 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+from typing import Callable, Generator, Iterable, Tuple, TypeVar
+import weakref
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# in-process metrics in prometheus text exposition format (0.0.4), no client library/collector needed
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric(ABC):
+    TYPE = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.TYPE}']
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        # exposition lines of current values, header excluded
+        ...
+
+class Counter(_Metric):
+    TYPE = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[str]:
+        return [
+            f'{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}'
+            for k, v in sorted(self._values.items())
+        ]
+
+class Gauge(Counter):
+    TYPE = 'gauge'
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(_Metric):
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'), )
+        self._values: dict[Tuple[str, ...], Tuple[list[int], list[float]]] = {} # bucket counts, [sum]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            counts[bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def count(self, **labels) -> int:
+        counts, _ = self._values.get(self._key(labels), ([0], [0.0]))
+        return sum(counts)
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total[0])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}')
+        return lines
+
+M = TypeVar('M', bound=_Metric)
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[_Metric]]] = [] # build metrics at scrape time
+
+    def register(self, metric: M) -> M:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            metrics.extend(collector())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'http_requests_total', 'Total HTTP requests', ('method', 'route', 'status')
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route template', ('method', 'route')
+))
+HTTP_IN_PROGRESS = REGISTRY.register(Gauge(
+    'http_requests_in_progress', 'HTTP requests currently being served'
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'cache_requests_total', 'Cache lookups by result (hit/miss)', ('cache', 'result')
+))
+FX_PULLS = REGISTRY.register(Counter(
+    'fx_pulls_total', 'FX rate pulls from ECB source'
+))
+FX_PULLED_RATES = REGISTRY.register(Counter(
+    'fx_pulled_rates_total', 'FX rates (currency x date) pulled from ECB source'
+))
+BACKUP_DURATION = REGISTRY.register(Histogram(
+    'backup_job_duration_seconds', 'Backup/restore job duration', ('scope', 'job'),
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800)
+))
+DB_POOL_CHECKOUTS = REGISTRY.register(Counter(
+    'db_pool_checkouts_total', 'Connections checked out from pool', ('db', )
+))
+DB_POOL_CONNECTS = REGISTRY.register(Counter(
+    'db_pool_connects_total', 'New DBAPI connections opened by pool', ('db', )
+))
+DB_POOL_OVERFLOW_CHECKOUTS = REGISTRY.register(Counter(
+    'db_pool_overflow_checkouts_total', 'Checkouts beyond pool size (served from overflow), next ones may wait', ('db', )
+))
+
+_engines: weakref.WeakKeyDictionary[Engine, str] = weakref.WeakKeyDictionary() # engine -> db label
+_lru_caches: dict[str, Callable] = {}
+
+def register_engine(db: str, engine: Engine):
+    # track pool usage of one engine, db is a fixed label (e.g. common/user) shared by engines of same kind
+    # so tenant ids are not exposed and series count does not grow with number of tenants
+    _engines[engine] = db
+
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc(db=db)
+        pool = engine.pool
+        if hasattr(pool, 'size') and pool.checkedout() > pool.size(): # type: ignore
+            DB_POOL_OVERFLOW_CHECKOUTS.inc(db=db)
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTS.inc(db=db)
+
+def register_lru_cache(name: str, func: Callable):
+    # expose functools.lru_cache statistics
+    _lru_caches[name] = func
+
+@contextmanager
+def time_histogram(histogram: Histogram, **labels) -> Generator[None, None, None]:
+    # observe duration of the block, also when it fails
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+def _collect_pools() -> Iterable[_Metric]:
+    size = Gauge('db_pool_size', 'Configured pool size', ('db', ))
+    checked_out = Gauge('db_pool_checked_out', 'Connections currently checked out', ('db', ))
+    overflow = Gauge('db_pool_overflow', 'Current overflow connections (negative means unused capacity)', ('db', ))
+    totals: dict[str, Tuple[int, int, int]] = {}
+    for engine, db in list(_engines.items()):
+        pool = engine.pool
+        if not hasattr(pool, 'size'):
+            continue # e.g., NullPool/StaticPool
+        s, c, o = totals.get(db, (0, 0, 0))
+        totals[db] = (s + pool.size(), c + pool.checkedout(), o + pool.overflow()) # type: ignore
+    for db, (s, c, o) in totals.items():
+        size.set(s, db=db)
+        checked_out.set(c, db=db)
+        overflow.set(o, db=db)
+    return [size, checked_out, overflow]
+
+def _collect_caches() -> Iterable[_Metric]:
+    ratio = Gauge('cache_hit_ratio', 'Cache hit ratio since process start', ('cache', ))
+    lookups: dict[str, Tuple[float, float]] = {}
+    for (cache, result), value in list(CACHE_REQUESTS._values.items()):
+        hits, misses = lookups.get(cache, (0, 0))
+        lookups[cache] = (hits + value, misses) if result == 'hit' else (hits, misses + value)
+    for name, func in _lru_caches.items():
+        info = func.cache_info() # type: ignore
+        lookups[name] = (info.hits, info.misses)
+    for cache, (hits, misses) in lookups.items():
+        if hits + misses > 0:
+            ratio.set(hits / (hits + misses), cache=cache)
+    return [ratio]
+
+REGISTRY.add_collector(_collect_pools)
+REGISTRY.add_collector(_collect_caches)
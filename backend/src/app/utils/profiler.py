@@ -0,0 +1,176 @@
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+from pathlib import Path
+import sys
+import threading
+from typing import Generator, Tuple
+from src.app.model.exceptions import NotExistError
+from src.app.model.misc import ProfileRecord, _ProfileFuncStat
+
+PROFILE_HEADER = 'X-Profile' # admin request carrying this header gets profiled
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', 0.005)) # seconds between samples
+PROFILE_CAPACITY = int(os.environ.get('PROFILE_CAPACITY', 50)) # profiles kept in memory
+APP_ROOT = Path(__file__).resolve().parent.parent.parent.as_posix() # the src folder
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(APP_ROOT):
+        filename = 'src' + filename[len(APP_ROOT):]
+    else:
+        filename = Path(filename).name
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+_active_profiler: ContextVar['SamplingProfiler | None'] = ContextVar('active_profiler', default=None)
+
+def get_active_profiler() -> 'SamplingProfiler | None':
+    # profiler of the request being handled, visible in threadpool workers as context is copied over
+    return _active_profiler.get()
+
+class SamplingProfiler:
+    # statistical profiler, a daemon thread samples stacks of other threads
+    # sync endpoints run in threadpool so cProfile on the event loop thread would miss them,
+    # only threads registered by the profiled request are sampled, other requests share the pool
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter() # collapsed stack (root first, ; separated) -> samples
+        self.num_samples = 0
+        self._thread_ids: set[int] = set()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            
+    @contextmanager
+    def activate(self) -> Generator['SamplingProfiler', None, None]:
+        # make the profiler visible to code handling the request
+        token = _active_profiler.set(self)
+        try:
+            yield self
+        finally:
+            _active_profiler.reset(token)
+            
+    @contextmanager
+    def track_current_thread(self) -> Generator[None, None, None]:
+        # sample calling thread only while inside, the worker goes back to the shared pool afterwards
+        thread_id = threading.get_ident()
+        self._thread_ids.add(thread_id)
+        try:
+            yield
+        finally:
+            self._thread_ids.discard(thread_id)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        frames = sys._current_frames()
+        for thread_id in list(self._thread_ids):
+            frame = frames.get(thread_id)
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if len(names) > 0:
+                self.stacks[';'.join(reversed(names))] += 1
+                self.num_samples += 1
+
+    def collapsed(self) -> str:
+        return collapse_stacks(self.stacks)
+
+def collapse_stacks(stacks: Counter[str]) -> str:
+    # flamegraph.pl / speedscope compatible collapsed stack format
+    return '\n'.join(f'{stack} {count}' for stack, count in stacks.most_common())
+
+def top_functions(stacks: Counter[str], limit: int = 30) -> list[_ProfileFuncStat]:
+    self_samples: Counter[str] = Counter()
+    total_samples: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        self_samples[frames[-1]] += count
+        for func in set(frames): # recursion only counted once per stack
+            total_samples[func] += count
+    return [
+        _ProfileFuncStat(
+            function=func,
+            self_samples=self_samples[func],
+            total_samples=total
+        )
+        for func, total in sorted(
+            total_samples.items(),
+            key=lambda x: (x[1], self_samples[x[0]]),
+            reverse=True
+        )[:limit]
+    ]
+
+class ProfileStore:
+    # in-process store of recent profiles and tenants flagged for profiling
+
+    def __init__(self, capacity: int = PROFILE_CAPACITY):
+        self._capacity = capacity
+        self._profiles: OrderedDict[str, Tuple[ProfileRecord, Counter[str]]] = OrderedDict()
+        self._flagged: dict[str, int] = {} # user id -> remaining requests to profile
+        self._lock = threading.Lock()
+
+    @property
+    def has_flagged(self) -> bool:
+        return len(self._flagged) > 0
+
+    def flag_user(self, user_id: str, num_requests: int):
+        with self._lock:
+            self._flagged[user_id] = num_requests
+
+    def unflag_user(self, user_id: str):
+        with self._lock:
+            self._flagged.pop(user_id, None)
+
+    def list_flagged(self) -> dict[str, int]:
+        return dict(self._flagged)
+
+    def consume_flag(self, user_id: str) -> bool:
+        # whether request of this user should be profiled, count down remaining requests
+        with self._lock:
+            remaining = self._flagged.get(user_id, 0)
+            if remaining <= 0:
+                return False
+            if remaining == 1:
+                self._flagged.pop(user_id)
+            else:
+                self._flagged[user_id] = remaining - 1
+            return True
+
+    def add(self, record: ProfileRecord, stacks: Counter[str]):
+        with self._lock:
+            self._profiles[record.profile_id] = (record, stacks)
+            while len(self._profiles) > self._capacity:
+                self._profiles.popitem(last=False) # drop oldest
+
+    def list_profiles(self) -> list[ProfileRecord]:
+        # latest first
+        return [record for record, _ in reversed(self._profiles.values())]
+
+    def get(self, profile_id: str) -> Tuple[ProfileRecord, Counter[str]]:
+        try:
+            return self._profiles[profile_id]
+        except KeyError:
+            raise NotExistError(
+                f"Profile {profile_id} not found",
+                details="Profile may have been evicted, only latest ones are kept"
+            )
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+profile_store = ProfileStore()
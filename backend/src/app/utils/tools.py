@@ -1,15 +1,18 @@
 from functools import lru_cache
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 import math
-from typing import Any, Hashable, Literal
+from typing import TYPE_CHECKING, Any, Hashable, Literal
 from collections import OrderedDict
 import uuid
 import re
-import hvac
 import os
 import tomli
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from passlib.context import CryptContext
+
+if TYPE_CHECKING:
+    import hvac
+    from passlib.context import CryptContext
 
 
 ENV = os.environ.get("ENV", "prod")
@@ -24,7 +27,12 @@ VAULT_MOUNT_PATH = {
 }
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache()
+def get_pwd_context() -> "CryptContext":
+    # passlib (and bcrypt backend) only loaded when a password is hashed/verified
+    from passlib.context import CryptContext
+    
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def id_generator(prefix: str, length: int = 8, existing_list: list[str] | None = None, 
                  only_alpha_numeric: bool = False) -> str:
@@ -44,6 +52,19 @@ def finround(x: float) -> float:
     # banker rounding: <= 4 round down, >= 6 round up. =5 half up half down
     return round(x, get_amount_precision())
 
+def period_grid(start_dt: date, end_dt: date, freq: Literal['month', 'quarter', 'year']) -> list[tuple[date, date]]:
+    # consecutive calendar periods covering [start_dt, end_dt], first and last period clipped to the range
+    months = {'month': 1, 'quarter': 3, 'year': 12}[freq]
+    periods = []
+    cur_dt = start_dt
+    while cur_dt <= end_dt:
+        # first day of next period, counted in months since year 0
+        next_idx = (cur_dt.year * 12 + cur_dt.month - 1) // months * months + months
+        next_dt = date(next_idx // 12, next_idx % 12 + 1, 1)
+        periods.append((cur_dt, min(next_dt - timedelta(days=1), end_dt)))
+        cur_dt = next_dt
+    return periods
+
 def taxround(x: float) -> float:
     # tax rounding: <= 4 round down and >= 5 round up
     precision = get_amount_precision()
@@ -53,7 +74,11 @@ def taxround(x: float) -> float:
     return math.ceil(expoN) / 10 ** precision
 
 
-def get_vault_resp(mount_point: str, path: str) -> dict:
+@lru_cache()
+def get_vault_client() -> "hvac.Client":
+    # one client (and one read of secrets.toml) reused for all secret reads
+    import hvac # heavy, only needed when secrets are first requested
+    
     with open((Path(__file__).resolve().parent.parent.parent.parent.parent / "secrets.toml").resolve(), mode="rb") as fp:
         config = tomli.load(fp)
         
@@ -63,51 +88,36 @@ def get_vault_resp(mount_point: str, path: str) -> dict:
         url = f"{vault_config['endpoint']}:{vault_config['port']}",
         token = vault_config['token']
     )
-    if client.is_authenticated():
-        response = client.secrets.kv.read_secret_version(
-            mount_point=mount_point,
-            path=path,
-            raise_on_deleted_version=True
-        )['data']['data']
-        return response
-    else:
+    if not client.is_authenticated():
         raise PermissionError("Vault Permission Error")
+    return client
+
+def get_vault_resp(mount_point: str, path: str) -> dict:
+    client = get_vault_client()
+    response = client.secrets.kv.read_secret_version(
+        mount_point=mount_point,
+        path=path,
+        raise_on_deleted_version=True
+    )['data']['data']
+    return response
 
 @lru_cache()
 def get_secret() -> dict:
-    database = get_vault_resp(
-        mount_point = VAULT_MOUNT_POINT,
-        path = VAULT_MOUNT_PATH['database'],
-    )
-    storage_server = get_vault_resp(
-        mount_point = VAULT_MOUNT_POINT,
-        path = VAULT_MOUNT_PATH['storage_server'],
-    )
-    backup_server = get_vault_resp(
-        mount_point = VAULT_MOUNT_POINT,
-        path = VAULT_MOUNT_PATH['backup_server'],
-    )
-    stateapi = get_vault_resp(
-        mount_point = VAULT_MOUNT_POINT,
-        path = VAULT_MOUNT_PATH['stateapi'],
-    )
-    static_server = get_vault_resp(
-        mount_point = VAULT_MOUNT_POINT,
-        path = VAULT_MOUNT_PATH['static_server']
-    )
-    auth = get_vault_resp(
-        mount_point = VAULT_MOUNT_POINT,
-        path = VAULT_MOUNT_PATH['auth'],
-    )
-    
-    return {
-        'database' : database,
-        'storage_server' : storage_server,
-        'backup_server' : backup_server,
-        'stateapi' : stateapi,
-        'static_server': static_server,
-        'auth': auth
-    }
+    # read all secret paths concurrently, each is one network round trip to vault
+    get_vault_client() # create shared client once before fanning out
+    with ThreadPoolExecutor(max_workers=len(VAULT_MOUNT_PATH)) as executor:
+        futures = {
+            key: executor.submit(
+                get_vault_resp,
+                mount_point = VAULT_MOUNT_POINT,
+                path = path,
+            )
+            for key, path in VAULT_MOUNT_PATH.items()
+        }
+        return {
+            key: future.result()
+            for key, future in futures.items()
+        }
 
 def get_files_bucket() -> str:
     path_config = get_secret()['storage_server']['path']
@@ -1,9 +1,17 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+import tempfile
 from pydantic import ValidationError
 import typer
 from typer_di import TyperDI, Depends
 from src.app.model.user import UserCreate
+from src.app.service.journal import JournalService
 from src.app.service.management import AdminBackupService, InitService, UserService
-from src.cli.dependency.unauth_service import get_admin_backup_service, get_init_service, get_user_service
+from src.app.service.misc import GeoService
+from src.app.utils.geo_cache import GEO_SNAPSHOT_PATH, GeoCache
+from src.cli.dependency.unauth_service import get_admin_backup_service, get_init_service, get_user_service, \
+    get_journal_service
 
 app = TyperDI(
     name='Admin CLI',
@@ -65,5 +73,70 @@ def restore_all_data(
 ):
     backup_service.restore(backup_id)
 
+@app.command(help='Export journal entries (GL detail) of a user as ndjson or csv')
+def export_journals(
+    fmt: str = typer.Option(
+        'ndjson',
+        help='Output format, ndjson or csv',
+    ),
+    min_dt: datetime = typer.Option(
+        '1970-01-01',
+        formats=['%Y-%m-%d'],
+        help='Start journal date (inclusive)',
+    ),
+    max_dt: datetime = typer.Option(
+        '2099-12-31',
+        formats=['%Y-%m-%d'],
+        help='End journal date (inclusive)',
+    ),
+    acct_ids: list[str] | None = typer.Option(
+        None,
+        '--acct-id',
+        help='Only export entries of this account, can repeat',
+    ),
+    output: Path | None = typer.Option(
+        None,
+        help='Output file path, default to stdout',
+    ),
+    journal_service: JournalService = Depends(get_journal_service),
+):
+    if fmt not in ('ndjson', 'csv'):
+        raise typer.BadParameter(f"Unsupported format: {fmt}")
+    
+    chunks = journal_service.export_entries(
+        fmt=fmt, # type: ignore
+        min_dt=min_dt.date(),
+        max_dt=max_dt.date(),
+        acct_ids=acct_ids or None,
+    )
+    if output is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+    else:
+        with open(output, 'w', newline='') as fp:
+            for chunk in chunks:
+                fp.write(chunk)
+
+@app.command(help='Warm up geo cache from api and save it as the bundled snapshot')
+def dump_geo_snapshot(
+    country_iso2s: list[str] | None = typer.Option(
+        None,
+        '--country',
+        help='Also cache states and cities of this country, can repeat',
+    ),
+    output: Path = typer.Option(
+        GEO_SNAPSHOT_PATH,
+        help='Output snapshot path (gzipped json)',
+    ),
+):
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        # start from an empty cache so every list is fetched from api right now
+        GeoService.cache = GeoCache(path=(Path(tmpdirname) / 'geo.sqlite').as_posix(), snapshot=None)
+        GeoService.list_countries()
+        for country_iso2 in country_iso2s or []:
+            for state in GeoService.list_states(country_iso2):
+                GeoService.list_cities(country_iso2, state.iso2)
+        GeoService.cache.dump_snapshot(output.as_posix())
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
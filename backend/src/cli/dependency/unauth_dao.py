@@ -1,7 +1,12 @@
+import typer
 from typer_di import Depends
 from sqlalchemy.engine import Engine
 from sqlmodel import Session
-from src.app.dao.connection import CommonDaoAccess, get_engine, get_storage_fs
+from src.app.dao.connection import CommonDaoAccess, UserDaoAccess, get_engine, get_storage_fs
+from src.app.dao.accounts import acctDao, chartOfAcctDao
+from src.app.dao.config import configDao
+from src.app.dao.files import fileDao
+from src.app.dao.journal import journalDao
 from src.app.dao.user import userDao
 from src.app.dao.init import initDao
 from src.app.dao.backup import adminBackupDao
@@ -47,4 +52,51 @@ def get_common_dao_access(
 def get_admin_backup_dao(
     dao_access: CommonDaoAccess = Depends(get_common_dao_access)
 ) -> adminBackupDao:
-    return adminBackupDao(dao_access=dao_access)
\ No newline at end of file
+    return adminBackupDao(dao_access=dao_access)
+
+def get_user_dao_access(
+    username: str = typer.Option(
+        help='The username whose data to access',
+    ),
+    common_engine: Engine = Depends(get_common_engine),
+    common_session: Session = Depends(get_common_session),
+    user_dao: userDao = Depends(get_user_dao)
+) -> UserDaoAccess:
+    # act on behalf of a user, admin cli has no login
+    user = user_dao.get_by_name(username)
+    user_engine = get_engine(user.user_id)
+    with Session(user_engine) as user_session:
+        return UserDaoAccess(
+            user=user,
+            file_fs=get_storage_fs('files'),
+            backup_fs=get_storage_fs('backup'),
+            common_engine=common_engine,
+            user_engine=user_engine,
+            common_session=common_session,
+            user_session=user_session
+        )
+    
+def get_file_dao(
+    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+) -> fileDao:
+    return fileDao(dao_access=dao_access)
+
+def get_config_dao(
+    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+) -> configDao:
+    return configDao(dao_access=dao_access)
+
+def get_acct_dao(
+    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+) -> acctDao:
+    return acctDao(dao_access=dao_access)
+
+def get_chart_of_acct_dao(
+    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+) -> chartOfAcctDao:
+    return chartOfAcctDao(dao_access=dao_access)
+
+def get_journal_dao(
+    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+) -> journalDao:
+    return journalDao(dao_access=dao_access)
@@ -1,11 +1,20 @@
 
 
 from typer_di import Depends
+from src.app.dao.accounts import acctDao, chartOfAcctDao
 from src.app.dao.backup import adminBackupDao
+from src.app.dao.config import configDao
+from src.app.dao.files import fileDao
+from src.app.dao.journal import journalDao
 from src.app.dao.user import userDao
+from src.app.service.acct import AcctService
+from src.app.service.files import FileService
+from src.app.service.journal import JournalService
 from src.app.service.management import AdminBackupService, InitService, UserService
+from src.app.service.settings import ConfigService
 from src.app.dao.init import initDao
-from src.cli.dependency.unauth_dao import get_admin_backup_dao, get_init_dao, get_user_dao
+from src.cli.dependency.unauth_dao import get_acct_dao, get_admin_backup_dao, get_chart_of_acct_dao, \
+    get_config_dao, get_file_dao, get_init_dao, get_journal_dao, get_user_dao
 
 def get_init_service(
     init_dao: initDao = Depends(get_init_dao)
@@ -21,4 +30,37 @@ def get_user_service(
 def get_admin_backup_service(
     backup_dao: adminBackupDao = Depends(get_admin_backup_dao)
 ) -> AdminBackupService:
-    return AdminBackupService(backup_dao=backup_dao)
\ No newline at end of file
+    return AdminBackupService(backup_dao=backup_dao)
+
+def get_file_service(
+    file_dao: fileDao = Depends(get_file_dao)
+) -> FileService:
+    return FileService(file_dao=file_dao)
+
+def get_setting_service(
+    file_service: FileService = Depends(get_file_service),
+    config_dao: configDao = Depends(get_config_dao)
+) -> ConfigService:
+    return ConfigService(file_service=file_service, config_dao=config_dao)
+
+def get_acct_service(
+    acct_dao: acctDao = Depends(get_acct_dao),
+    chart_of_acct_dao: chartOfAcctDao = Depends(get_chart_of_acct_dao),
+    setting_service: ConfigService = Depends(get_setting_service)
+) -> AcctService:
+    return AcctService(
+        acct_dao=acct_dao, 
+        chart_of_acct_dao=chart_of_acct_dao,
+        setting_service=setting_service
+    )
+
+def get_journal_service(
+    journal_dao: journalDao = Depends(get_journal_dao),
+    acct_service: AcctService = Depends(get_acct_service),
+    setting_service: ConfigService = Depends(get_setting_service)
+) -> JournalService:
+    return JournalService(
+        journal_dao=journal_dao, 
+        acct_service=acct_service,
+        setting_service=setting_service
+    )
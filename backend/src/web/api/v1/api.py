@@ -13,7 +13,9 @@ from src.web.api.v1.endpoints import (
     shares,
     reporting,
     management,
-    settings
+    settings,
+    batch,
+    jobs
 )
 
 api_router = APIRouter()
@@ -30,4 +32,6 @@ api_router.include_router(purchase.router)
 api_router.include_router(expense.router)
 api_router.include_router(property.router)
 api_router.include_router(reporting.router)
-api_router.include_router(shares.router)
\ No newline at end of file
+api_router.include_router(shares.router)
+api_router.include_router(batch.router)
+api_router.include_router(jobs.router)
\ No newline at end of file
@@ -4,8 +4,9 @@ from src.app.model.enums import AcctType
 from src.app.service.acct import AcctService
 from src.app.model.accounts import Account, Chart
 from src.web.dependency.service import get_acct_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/accounts", tags=["accounts"])
+router = APIRouter(prefix="/accounts", tags=["accounts"], route_class=ProfiledRoute)
 
 @router.post("/chart/add")
 def add_chart(
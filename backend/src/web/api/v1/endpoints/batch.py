@@ -0,0 +1,164 @@
+from asyncio import iscoroutinefunction
+from contextlib import AsyncExitStack
+import json
+import logging
+from typing import Any, Tuple
+from urllib.parse import urlencode
+from fastapi import APIRouter, Request, Response
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute, run_endpoint_function, serialize_response
+from starlette.routing import Match
+from src.app.model.exceptions import OpNotPermittedError
+from src.app.model.misc import BatchRequest, BatchResponse
+from src.web.routing import ProfiledRoute
+
+router = APIRouter(tags=["batch"], route_class=ProfiledRoute)
+
+BATCH_MAX_REQUESTS = 50
+
+def _decode_body(body: bytes) -> Any:
+    # json body as object, anything else (e.g., html preview) as text
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode(errors='replace')
+
+async def _handle_exception(request: Request, exc: Exception) -> BatchResponse:
+    # reuse app exception handlers, so each sub response looks the same as a standalone call
+    for cls in type(exc).__mro__:
+        handler = request.app.exception_handlers.get(cls)
+        if handler is not None:
+            resp = await handler(request, exc)
+            return BatchResponse(
+                status_code=resp.status_code,
+                body=_decode_body(bytes(resp.body))
+            )
+    # unexpected error only fails this sub request
+    logging.exception(f"Batch sub request failed: {request.method} {request.url.path}")
+    return BatchResponse(
+        status_code=500,
+        body={
+            "message": "Internal Server Error",
+            "details": None
+        }
+    )
+
+def _match_route(request: Request, sub: BatchRequest, api_root: str) -> Tuple[APIRoute | None, dict[str, Any]]:
+    # build a scope for the sub request and find the route serving it
+    params = {k: v for k, v in (sub.params or {}).items() if v is not None}
+    scope = {
+        **request.scope,
+        'method': sub.method,
+        'path': api_root + '/' + sub.path.lstrip('/'),
+        'query_string': urlencode(params, doseq=True).encode(),
+    }
+    for route in request.app.router.routes:
+        if not isinstance(route, APIRoute) or route.endpoint is batch:
+            continue
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return route, {**scope, **child_scope}
+    return None, scope
+
+def _not_batchable(sub: BatchRequest) -> BatchResponse:
+    return BatchResponse(
+        status_code=501,
+        body={
+            "message": "Streaming endpoint not supported in batch, call it directly",
+            "details": f"{sub.method} {sub.path}"
+        }
+    )
+
+async def _dispatch(
+    request: Request,
+    sub: BatchRequest,
+    api_root: str,
+    dependency_cache: dict,
+    async_exit_stack: AsyncExitStack
+) -> BatchResponse:
+    route, scope = _match_route(request, sub, api_root)
+    if route is None:
+        return BatchResponse(
+            status_code=404,
+            body={
+                "message": "Not Found",
+                "details": f"{sub.method} {sub.path}"
+            }
+        )
+    if isinstance(route.response_class, type) and issubclass(route.response_class, StreamingResponse):
+        return _not_batchable(sub)
+
+    sub_request = Request(scope)
+    is_coroutine = iscoroutinefunction(route.dependant.call)
+    try:
+        # shared dependency cache: auth, dao access/session and services are only built once
+        solved = await solve_dependencies(
+            request=sub_request,
+            dependant=route.dependant,
+            body=sub.body,
+            response=Response(),
+            dependency_overrides_provider=route.dependency_overrides_provider,
+            dependency_cache=dependency_cache,
+            async_exit_stack=async_exit_stack,
+            embed_body_fields=route._embed_body_fields,
+        )
+        dependency_cache.update(solved.dependency_cache)
+        if solved.errors:
+            raise RequestValidationError(solved.errors, body=sub.body)
+        raw = await run_endpoint_function(
+            dependant=route.dependant,
+            values=solved.values,
+            is_coroutine=is_coroutine
+        )
+        if isinstance(raw, Response):
+            if not hasattr(raw, 'body'):
+                return _not_batchable(sub) # streaming response, body is never buffered
+            # non-json response (e.g., html preview) returned as text
+            return BatchResponse(
+                status_code=raw.status_code,
+                body=bytes(raw.body).decode(errors='replace')
+            )
+        content = await serialize_response(
+            field=route.response_field,
+            response_content=raw,
+            is_coroutine=is_coroutine
+        )
+    except Exception as e:
+        return await _handle_exception(sub_request, e)
+
+    return BatchResponse(
+        status_code=route.status_code or 200,
+        body=content
+    )
+
+@router.post("/batch")
+async def batch(
+    requests: list[BatchRequest],
+    request: Request
+) -> list[BatchResponse]:
+    # run multiple api calls in one round trip, sharing one request context
+    # sub requests run in order, failure of one does not stop the others
+    if len(requests) > BATCH_MAX_REQUESTS:
+        raise OpNotPermittedError(
+            message=f"Too many requests in one batch",
+            details=f"Max {BATCH_MAX_REQUESTS}, got {len(requests)}"
+        )
+
+    api_root = request.scope['route'].path.removesuffix('/batch')
+    dependency_cache: dict = {}
+    results = []
+    async with AsyncExitStack() as async_exit_stack:
+        for sub in requests:
+            result = await _dispatch(
+                request=request,
+                sub=sub,
+                api_root=api_root,
+                dependency_cache=dependency_cache,
+                async_exit_stack=async_exit_stack
+            )
+            results.append(result)
+    return results
@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends
 from src.app.service.entity import EntityService
 from src.app.model.entity import _ContactBrief, _CustomerBrief, _SupplierBrief, Contact, Customer, Supplier
 from src.web.dependency.service import get_entity_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/entity", tags=["entity"])
+router = APIRouter(prefix="/entity", tags=["entity"], route_class=ProfiledRoute)
 
 @router.post("/contact/add")
 def add_contact(
@@ -84,6 +85,16 @@ def get_customer(
 ) -> Customer:
     return entity_service.get_customer(cust_id=cust_id)
 
+@router.post(
+    "/customer/get_many",
+    description='full customers with contacts for given ids (e.g., one page), non-existing ids are skipped'
+)
+def get_customers(
+    cust_ids: list[str], 
+    entity_service: EntityService = Depends(get_entity_service)
+) -> list[Customer]:
+    return entity_service.get_customers(cust_ids=cust_ids)
+
 @router.get("/customer/list")
 def list_customer(
     entity_service: EntityService = Depends(get_entity_service)
@@ -125,6 +136,16 @@ def get_supplier(
 ) -> Supplier:
     return entity_service.get_supplier(supplier_id=supplier_id)
 
+@router.post(
+    "/supplier/get_many",
+    description='full suppliers with contacts for given ids (e.g., one page), non-existing ids are skipped'
+)
+def get_suppliers(
+    supplier_ids: list[str], 
+    entity_service: EntityService = Depends(get_entity_service)
+) -> list[Supplier]:
+    return entity_service.get_suppliers(supplier_ids=supplier_ids)
+
 @router.get("/supplier/list")
 def list_supplier(
     entity_service: EntityService = Depends(get_entity_service)
@@ -7,8 +7,9 @@ from src.app.model.journal import Journal
 from src.app.model.expense import _ExpenseBrief, _ExpenseSummaryBrief, Expense
 from src.app.service.expense import ExpenseService
 from src.web.dependency.service import get_expense_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/expense", tags=["expense"])
+router = APIRouter(prefix="/expense", tags=["expense"], route_class=ProfiledRoute)
 
 @router.post("/validate")
 def validate_expense(
@@ -3,8 +3,9 @@ from src.app.model.enums import EntityType
 from src.app.model.invoice import Item
 from src.app.service.item import ItemService
 from src.web.dependency.service import get_item_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/item", tags=["item"])
+router = APIRouter(prefix="/item", tags=["item"], route_class=ProfiledRoute)
 
 @router.post("/add")
 def add_item(
@@ -0,0 +1,81 @@
+from datetime import date
+from fastapi import APIRouter, Depends
+from src.app.model.enums import JobStatus, JobType
+from src.app.model.expense import Expense
+from src.app.model.job import Job
+from src.app.model.user import User
+from src.app.service.job import JobService
+from src.web.dependency.auth import get_current_user
+from src.web.dependency.service import get_job_service
+from src.web.routing import ProfiledRoute
+
+# long running operations, submit returns the job right away, poll /jobs/get for progress
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=ProfiledRoute)
+
+@router.post("/submit/backup")
+def submit_backup(
+    backup_id: str | None = None,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user)
+) -> Job:
+    return job_service.submit_backup(user, backup_id)
+
+@router.post("/submit/restore")
+def submit_restore(
+    backup_id: str,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user)
+) -> Job:
+    return job_service.submit_restore(user, backup_id)
+
+@router.post("/submit/expense_import")
+def submit_expense_import(
+    expenses: list[Expense],
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user)
+) -> Job:
+    return job_service.submit_expense_import(user, expenses)
+
+@router.post("/submit/fx_backfill")
+def submit_fx_backfill(
+    start_dt: date,
+    end_dt: date,
+    overwrite: bool = False,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user)
+) -> Job:
+    return job_service.submit_fx_backfill(user, start_dt, end_dt, overwrite)
+
+@router.post("/submit/file_gc")
+def submit_file_gc(
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user)
+) -> Job:
+    # remove content of deleted/replaced files, meant to be scheduled periodically
+    return job_service.submit_file_gc(user)
+
+@router.get("/get")
+def get_job(
+    job_id: str,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user)
+) -> Job:
+    return job_service.get_job(user, job_id)
+
+@router.get("/list")
+def list_jobs(
+    job_type: JobType | None = None,
+    status: JobStatus | None = None,
+    limit: int = 50,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user)
+) -> list[Job]:
+    return job_service.list_jobs(user, job_type=job_type, status=status, limit=limit)
+
+@router.post("/cancel")
+def cancel_job(
+    job_id: str,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user)
+) -> Job:
+    return job_service.cancel_job(user, job_id)
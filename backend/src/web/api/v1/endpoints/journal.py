@@ -1,12 +1,14 @@
 from datetime import date
-from typing import Any, Tuple
-from fastapi import APIRouter, Depends
+from typing import Any, Literal, Tuple
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from src.app.model.enums import JournalSrc
-from src.app.model.journal import _AcctFlowAGG, _EntryBrief, _JournalBrief, Journal
+from src.app.model.journal import _AcctFlowAGG, _AcctPeriodFlowAGG, _EntryBrief, _JournalBrief, Journal
 from src.app.service.journal import JournalService
 from src.web.dependency.service import get_journal_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/journal", tags=["journal"])
+router = APIRouter(prefix="/journal", tags=["journal"], route_class=ProfiledRoute)
 
 @router.post("/add")
 def add_journal(
@@ -119,9 +121,55 @@ def get_incexp_flows(
         end_dt=end_dt
     )
 
+@router.get("/summary/acct_flow/by_period/{acct_id}")
+def get_acct_flows_by_period(
+    acct_id: str,
+    start_dt: date = date(1970, 1, 1), 
+    end_dt: date = date(2099, 12, 31),
+    freq: Literal['day', 'month'] = 'month',
+    journal_service: JournalService = Depends(get_journal_service)
+) -> list[_AcctPeriodFlowAGG]:
+    return journal_service.get_acct_flows_by_period(
+        acct_id=acct_id,
+        start_dt=start_dt,
+        end_dt=end_dt,
+        freq=freq
+    )
+
 @router.get("/entry/list/{acct_id}")
 def list_entry_by_acct(
     acct_id: str,
+    min_dt: date | None = None,
+    max_dt: date | None = None,
     journal_service: JournalService = Depends(get_journal_service)
 ) -> list[_EntryBrief]:
-    return journal_service.list_entry_by_acct(acct_id)
\ No newline at end of file
+    return journal_service.list_entry_by_acct(
+        acct_id=acct_id,
+        min_dt=min_dt,
+        max_dt=max_dt
+    )
+    
+@router.get("/export", response_class=StreamingResponse)
+def export_entries(
+    fmt: Literal['ndjson', 'csv'] = 'ndjson',
+    min_dt: date = date(1970, 1, 1), 
+    max_dt: date = date(2099, 12, 31),
+    acct_ids: list[str] | None = Query(None),
+    jrn_src: JournalSrc | None = None,
+    journal_service: JournalService = Depends(get_journal_service)
+) -> StreamingResponse:
+    # stream GL detail, one row per entry
+    media_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return StreamingResponse(
+        journal_service.export_entries(
+            fmt=fmt,
+            min_dt=min_dt,
+            max_dt=max_dt,
+            acct_ids=acct_ids,
+            jrn_src=jrn_src
+        ),
+        media_type=media_type,
+        headers={
+            'Content-Disposition': f'attachment; filename="journal_entries_{min_dt}_{max_dt}.{fmt}"'
+        }
+    )
@@ -1,12 +1,19 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from fastapi.security import OAuth2PasswordRequestForm
+from src.app.model.enums import JobStatus, JobType
+from src.app.model.job import Job
+from src.app.model.misc import ProfileRecord, _ProfileFuncStat
 from src.app.model.user import Token, UserCreate, User, UserRegister
 from src.app.service.management import AdminBackupService, UserService, InitService
 from src.app.service.auth import AuthService
-from src.web.dependency.service import get_init_service, get_admin_backup_service
+from src.app.service.job import JobService
+from src.web.dependency.service import get_init_service, get_admin_backup_service, get_job_service
+from src.app.utils.profiler import collapse_stacks, profile_store, top_functions
 from src.web.dependency.auth import get_auth_service, get_user_service, get_admin_user
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/management", tags=["management"])
+router = APIRouter(prefix="/management", tags=["management"], route_class=ProfiledRoute)
 
 @router.post("/init_db")
 def init_db(
@@ -127,3 +134,84 @@ def restore_all_data(
     admin_user: User = Depends(get_admin_user)
 ):
     return backup_service.restore(backup_id)
+
+@router.post("/jobs/submit/backup_all_data")
+def submit_backup_all_data(
+    backup_id: str | None = None,
+    job_service: JobService = Depends(get_job_service),
+    admin_user: User = Depends(get_admin_user)
+) -> Job:
+    return job_service.submit_admin_backup(admin_user, backup_id)
+
+@router.post("/jobs/submit/restore_all_data")
+def submit_restore_all_data(
+    backup_id: str,
+    job_service: JobService = Depends(get_job_service),
+    admin_user: User = Depends(get_admin_user)
+) -> Job:
+    return job_service.submit_admin_restore(admin_user, backup_id)
+
+@router.get("/jobs/list")
+def list_all_jobs(
+    job_type: JobType | None = None,
+    status: JobStatus | None = None,
+    limit: int = 50,
+    job_service: JobService = Depends(get_job_service),
+    admin_user: User = Depends(get_admin_user)
+) -> list[Job]:
+    # jobs of all tenants
+    return job_service.list_jobs(admin_user, job_type=job_type, status=status, limit=limit, all_users=True)
+    
+@router.post("/profiling/flag_user")
+def flag_user_profiling(
+    user_id: str,
+    num_requests: int = 10,
+    admin_user: User = Depends(get_admin_user)
+):
+    # profile next num_requests requests of given tenant
+    profile_store.flag_user(user_id, num_requests)
+    
+@router.post("/profiling/unflag_user")
+def unflag_user_profiling(
+    user_id: str,
+    admin_user: User = Depends(get_admin_user)
+):
+    profile_store.unflag_user(user_id)
+    
+@router.get("/profiling/list_flagged")
+def list_flagged_profiling(
+    admin_user: User = Depends(get_admin_user)
+) -> dict[str, int]:
+    return profile_store.list_flagged()
+    
+@router.get("/profiling/list")
+def list_profiles(
+    admin_user: User = Depends(get_admin_user)
+) -> list[ProfileRecord]:
+    return profile_store.list_profiles()
+
+@router.get("/profiling/get")
+def get_profile(
+    profile_id: str,
+    admin_user: User = Depends(get_admin_user)
+) -> ProfileRecord:
+    record, _ = profile_store.get(profile_id)
+    return record
+
+@router.get("/profiling/top")
+def get_profile_top(
+    profile_id: str,
+    limit: int = 30,
+    admin_user: User = Depends(get_admin_user)
+) -> list[_ProfileFuncStat]:
+    _, stacks = profile_store.get(profile_id)
+    return top_functions(stacks, limit=limit)
+
+@router.get("/profiling/collapsed", response_class=PlainTextResponse)
+def get_profile_collapsed(
+    profile_id: str,
+    admin_user: User = Depends(get_admin_user)
+) -> str:
+    # collapsed stacks, feed to flamegraph.pl or speedscope
+    _, stacks = profile_store.get(profile_id)
+    return collapse_stacks(stacks)
@@ -1,14 +1,16 @@
 from datetime import date
-from fastapi import APIRouter, Depends, File, UploadFile
-from src.app.model.exceptions import AlreadyExistError
+from fastapi import APIRouter, Depends, File, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 from src.app.model.enums import CurType
 from src.app.service.fx import FxService
 from src.app.service.misc import GeoService
 from src.app.service.files import FileService
 from src.app.model.misc import _CountryBrief, _StateBrief, FileWrapper
 from src.web.dependency.service import get_fx_service, get_file_service
+from src.web.streaming import file_response
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/misc", tags=["misc"])
+router = APIRouter(prefix="/misc", tags=["misc"], route_class=ProfiledRoute)
 
 @router.get("/geo/countries/list")
 def list_countries() -> list[_CountryBrief]:
@@ -70,28 +72,17 @@ def upload_file(
     files: list[UploadFile] = File(...),
     file_service: FileService = Depends(get_file_service)
 ) -> list[str]:
-    
+    # uploads are spooled to disk by starlette, copied to storage chunk by chunk
     file_ids = []
     for file in files:
         try:
-            contents = file.file.read().decode(encoding='latin-1')
-            f = FileWrapper(
+            file_id = file_service.add_file_stream(
                 filename=file.filename or 'noname',
-                content=contents
+                stream=file.file
             )
-        except Exception as e:
-            raise e
-        else:
-            try:
-                file_service.add_file(f)
-                file_id = f.file_id
-            except AlreadyExistError as e:
-                file_id = file_service.get_file_id_by_name(
-                    filename = file.filename or 'noname'
-                )
         finally:
-            file_ids.append(file_id)
             file.file.close()
+        file_ids.append(file_id)
             
     return file_ids
 
@@ -107,4 +98,18 @@ def get_file(
     file_id: str,
     file_service: FileService = Depends(get_file_service)
 ) -> FileWrapper:
-    return file_service.get_file(file_id)
\ No newline at end of file
+    return file_service.get_file(file_id)
+
+@router.get("/download_file/{file_id}", response_class=StreamingResponse)
+def download_file(
+    file_id: str,
+    request: Request,
+    file_service: FileService = Depends(get_file_service)
+) -> Response:
+    # binary stream, supports Range and If-None-Match
+    info = file_service.get_file_info(file_id)
+    return file_response(
+        request,
+        info,
+        iter_content=lambda start, end: file_service.iter_file(info, start, end)
+    )
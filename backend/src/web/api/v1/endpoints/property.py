@@ -1,12 +1,13 @@
 from datetime import date
-from typing import Tuple
+from typing import Literal, Tuple
 from fastapi import APIRouter, Depends
 from src.app.model.journal import Journal
 from src.app.service.property import PropertyService
-from src.app.model.property import Property, PropertyTransaction, _PropertyPriceBrief
+from src.app.model.property import DepreciationSchedule, Property, PropertyTransaction, _PropertyPriceBrief, _PropertyTypeValuation, _PropertyValuation
 from src.web.dependency.service import get_property_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/property", tags=["property"])
+router = APIRouter(prefix="/property", tags=["property"], route_class=ProfiledRoute)
 
 @router.post("/property/validate_property")
 def validate_property(
@@ -52,6 +53,19 @@ def get_acc_stat(
         rep_dt=rep_dt
     )
 
+@router.get(
+    "/property/get_stats",
+    description='value of all properties as of rep_dt, optionally summed by property type and currency'
+)
+def get_acc_stats(
+    rep_dt: date,
+    by_type: bool = False,
+    property_service: PropertyService = Depends(get_property_service)
+) -> list[_PropertyValuation] | list[_PropertyTypeValuation]:
+    if by_type:
+        return property_service.get_acc_stats_by_type(rep_dt=rep_dt)
+    return property_service.get_acc_stats(rep_dt=rep_dt)
+
 @router.post("/property/add")
 def add_property(
     property: Property,
@@ -128,4 +142,50 @@ def delete_property_trans(
     property_service: PropertyService = Depends(get_property_service)
 ):
     property_service.delete_property_trans(trans_id=trans_id)
-    
\ No newline at end of file
+
+
+@router.post(
+    "/depreciation/trial_schedule",
+    description='preview depreciation transactions to be generated by schedule, nothing is saved'
+)
+def trial_depreciation_schedule(
+    property_id: str,
+    schedule: DepreciationSchedule,
+    until: date | None = None,
+    property_service: PropertyService = Depends(get_property_service)
+) -> list[PropertyTransaction]:
+    return property_service.trial_depreciation_schedule(
+        property_id=property_id,
+        schedule=schedule,
+        until=until
+    )
+
+@router.post(
+    "/depreciation/add_schedule",
+    description='generate and save depreciation transactions by schedule in one go'
+)
+def add_depreciation_schedule(
+    property_id: str,
+    schedule: DepreciationSchedule,
+    until: date | None = None,
+    property_service: PropertyService = Depends(get_property_service)
+) -> list[PropertyTransaction]:
+    return property_service.add_depreciation_schedule(
+        property_id=property_id,
+        schedule=schedule,
+        until=until
+    )
+
+@router.post(
+    "/depreciation/month_end",
+    description='post monthly depreciation of all properties up to month end of rep_dt'
+)
+def run_month_end_depreciation(
+    rep_dt: date,
+    method: Literal['straight_line', 'declining_balance'] = 'straight_line',
+    property_service: PropertyService = Depends(get_property_service)
+) -> list[PropertyTransaction]:
+    return property_service.run_month_end_depreciation(
+        rep_dt=rep_dt,
+        method=method
+    )
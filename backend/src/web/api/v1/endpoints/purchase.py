@@ -15,8 +15,9 @@ from src.app.model.invoice import _InvoiceBalance, InvoiceItem, Item, Invoice, _
 from src.app.service.purchase import PurchaseService
 from src.app.service.entity import EntityService
 from src.web.dependency.service import get_purchase_service, get_setting_service, get_entity_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/purchase", tags=["purchase"])
+router = APIRouter(prefix="/purchase", tags=["purchase"], route_class=ProfiledRoute)
 
 @router.post("/invoice/validate")
 def validate_purchase(
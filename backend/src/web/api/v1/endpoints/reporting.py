@@ -1,11 +1,12 @@
 from datetime import date
-from typing import Any
+from typing import Any, Literal
 from fastapi import APIRouter, Depends
 from src.app.model.enums import AcctType
 from src.app.service.reporting import ReportingService
 from src.web.dependency.service import get_reporting_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/reporting", tags=["reporting"])
+router = APIRouter(prefix="/reporting", tags=["reporting"], route_class=ProfiledRoute)
     
 @router.get("/balance_sheet_tree")
 def get_balance_sheet_tree(
@@ -20,4 +21,14 @@ def get_income_statment_tree(
     end_dt: date,
     reporting_service: ReportingService = Depends(get_reporting_service)
 ) -> dict[AcctType, dict]:
-    return reporting_service.get_income_statment_tree(start_dt, end_dt)
\ No newline at end of file
+    return reporting_service.get_income_statment_tree(start_dt, end_dt)
+
+@router.get("/income_statement_matrix")
+def get_income_statement_matrix(
+    start_dt: date,
+    end_dt: date,
+    freq: Literal['month', 'quarter', 'year'] = 'month',
+    reporting_service: ReportingService = Depends(get_reporting_service)
+) -> dict[str, Any]:
+    # multi-period income statement, all periods from one grouped query
+    return reporting_service.get_income_statement_matrix(start_dt, end_dt, freq)
@@ -15,8 +15,9 @@ from src.app.model.invoice import _InvoiceBalance, InvoiceItem, Item, Invoice, _
 from src.app.service.sales import SalesService
 from src.app.service.entity import EntityService
 from src.web.dependency.service import get_sales_service, get_setting_service, get_entity_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/sales", tags=["sales"])
+router = APIRouter(prefix="/sales", tags=["sales"], route_class=ProfiledRoute)
 
 @router.post("/invoice/validate")
 def validate_sales(
@@ -12,8 +12,9 @@ from src.app.service.shares import SharesService
 from src.web.dependency.service import get_acct_service, get_journal_service, \
     get_entity_service, get_item_service, get_sales_service, get_purchase_service, \
     get_expense_service, get_property_service, get_setting_service, get_shares_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/sample", tags=["sample"])
+router = APIRouter(prefix="/sample", tags=["sample"], route_class=ProfiledRoute)
 
 @router.post("/create_sample")
 def create_sample(
@@ -1,6 +1,6 @@
 from typing import Any, Tuple
-from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status, Body
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status, Body
+from fastapi.responses import Response, StreamingResponse
 from src.app.service.acct import AcctService
 from src.app.model.exceptions import AlreadyExistError
 from src.app.model.enums import CurType
@@ -9,8 +9,10 @@ from src.app.model.misc import FileWrapper
 from src.app.service.settings import ConfigService
 from src.app.service.settings import BackupService
 from src.web.dependency.service import get_setting_service, get_acct_service, get_backup_service
+from src.web.streaming import file_response
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/settings", tags=["settings"])
+router = APIRouter(prefix="/settings", tags=["settings"], route_class=ProfiledRoute)
 
 @router.get("/is_setup")
 def is_setup(
@@ -24,6 +26,12 @@ def confirm_setup(
 ):
     setting_service.confirm_setup()
     
+@router.get("/data_versions")
+def get_data_versions(
+    setting_service: ConfigService = Depends(get_setting_service)
+) -> dict[str, str]:
+    return setting_service.get_data_versions()
+    
 @router.post("/init_coa")
 def init_coa(
     setting_service: ConfigService = Depends(get_setting_service),
@@ -85,11 +93,7 @@ def set_logo(
     setting_service: ConfigService = Depends(get_setting_service)
 ):
     try:
-        content = logo.file.read().decode(encoding='latin-1')
-    except Exception as e:
-        raise e
-    else:
-        setting_service.set_logo(content)
+        setting_service.set_logo_stream(logo.file)
     finally:
         logo.file.close()
         
@@ -99,6 +103,18 @@ def get_logo(
 ) -> FileWrapper:
     return setting_service.get_logo()
 
+@router.get("/download_logo", response_class=StreamingResponse)
+def download_logo(
+    request: Request,
+    setting_service: ConfigService = Depends(get_setting_service)
+) -> Response:
+    info = setting_service.get_logo_info()
+    return file_response(
+        request,
+        info,
+        iter_content=lambda start, end: setting_service.file_service.iter_file(info, start, end)
+    )
+
 @router.get("/get_config")
 def get_config(
     setting_service: ConfigService = Depends(get_setting_service)
@@ -3,10 +3,21 @@ from typing import Tuple
 from fastapi import APIRouter, Depends
 from src.app.model.journal import Journal
 from src.app.service.shares import SharesService
-from src.app.model.shares import StockIssue, StockRepurchase, Dividend
+from src.app.model.shares import _CapTable, StockIssue, StockRepurchase, Dividend
 from src.web.dependency.service import get_shares_service
+from src.web.routing import ProfiledRoute
 
-router = APIRouter(prefix="/shares", tags=["shares"])
+router = APIRouter(prefix="/shares", tags=["shares"], route_class=ProfiledRoute)
+
+@router.get(
+    "/cap_table",
+    description='outstanding and treasury shares (per repurchase batch) and dividends as of rep_dt'
+)
+def get_cap_table(
+    rep_dt: date,
+    shares_service: SharesService = Depends(get_shares_service)
+) -> _CapTable:
+    return shares_service.get_cap_table(rep_dt=rep_dt)
 
 @router.post("/issue/validate_issue")
 def validate_issue(
@@ -11,10 +11,12 @@ from src.app.dao.backup import adminBackupDao, backupDao
 from src.app.dao.init import initDao
 from src.app.dao.connection import CommonDaoAccess, get_storage_fs, \
     session_factory, engine_factory, UserDaoAccess
+from src.app.service.container import CommonContainer, UserContainer
 from src.app.dao.accounts import chartOfAcctDao, acctDao
 from src.app.dao.files import fileDao
 from src.app.dao.config import configDao
 from src.app.dao.fx import fxDao
+from src.app.dao.job import jobDao
 from src.app.dao.invoice import invoiceDao, itemDao
 from src.app.dao.journal import journalDao
 from src.app.dao.payment import paymentDao
@@ -69,103 +71,121 @@ def get_user_dao_access(
         user_session=user_session
     )
 
-def get_admin_backup_dao(
+# daos/services come from one container per request, each getter below is a single node in fastapi
+# dependency tree (instead of a sub tree re-walked for every service needing it)
+# they only build plain python objects, async so they run inline instead of a threadpool hop each
+
+async def get_common_container(
     dao_access: CommonDaoAccess = Depends(get_common_dao_access)
-) -> adminBackupDao:
-    return adminBackupDao(dao_access=dao_access)
+) -> CommonContainer:
+    return CommonContainer(dao_access=dao_access)
 
-def get_config_dao(
+async def get_user_container(
     dao_access: UserDaoAccess = Depends(get_user_dao_access)
+) -> UserContainer:
+    return UserContainer(dao_access=dao_access)
+
+async def get_admin_backup_dao(
+    container: CommonContainer = Depends(get_common_container)
+) -> adminBackupDao:
+    return container.admin_backup_dao
+
+async def get_config_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> configDao:
-    return configDao(dao_access=dao_access)
+    return container.config_dao
 
-def get_file_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_file_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> fileDao:
-    return fileDao(dao_access=dao_access)
+    return container.file_dao
 
-def get_backup_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_backup_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> backupDao:
-    return backupDao(dao_access=dao_access)
+    return container.backup_dao
 
-def get_fx_dao(
-    dao_access: CommonDaoAccess = Depends(get_common_dao_access)
+async def get_fx_dao(
+    container: CommonContainer = Depends(get_common_container)
 ) -> fxDao:
-    return fxDao(dao_access=dao_access)
+    return container.fx_dao
 
-def get_acct_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
-) -> acctDao:    
-    return acctDao(dao_access=dao_access)
+async def get_job_dao(
+    container: CommonContainer = Depends(get_common_container)
+) -> jobDao:
+    return container.job_dao
 
-def get_chart_of_acct_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_acct_dao(
+    container: UserContainer = Depends(get_user_container)
+) -> acctDao:
+    return container.acct_dao
+
+async def get_chart_of_acct_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> chartOfAcctDao:
-    return chartOfAcctDao(dao_access=dao_access)
+    return container.chart_of_acct_dao
 
-def get_contact_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_contact_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> contactDao:
-    return contactDao(dao_access=dao_access)
+    return container.contact_dao
 
-def get_customer_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_customer_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> customerDao:
-    return customerDao(dao_access=dao_access)
+    return container.customer_dao
 
-def get_supplier_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_supplier_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> supplierDao:
-    return supplierDao(dao_access=dao_access)
+    return container.supplier_dao
 
-def get_expense_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_expense_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> expenseDao:
-    return expenseDao(dao_access=dao_access)
+    return container.expense_dao
 
-def get_item_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_item_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> itemDao:
-    return itemDao(dao_access=dao_access)
+    return container.item_dao
 
-def get_invoice_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_invoice_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> invoiceDao:
-    return invoiceDao(dao_access=dao_access)
+    return container.invoice_dao
 
-def get_journal_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_journal_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> journalDao:
-    return journalDao(dao_access=dao_access)
+    return container.journal_dao
 
-def get_payment_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_payment_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> paymentDao:
-    return paymentDao(dao_access=dao_access)
+    return container.payment_dao
 
-def get_property_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_property_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> propertyDao:
-    return propertyDao(dao_access=dao_access)
-
+    return container.property_dao
 
-def get_property_transaction_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_property_transaction_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> propertyTransactionDao:
-    return propertyTransactionDao(dao_access=dao_access)
+    return container.property_transaction_dao
 
-def get_stock_issue_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_stock_issue_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> stockIssueDao:
-    return stockIssueDao(dao_access=dao_access)
+    return container.stock_issue_dao
 
-def get_stock_repurchase_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_stock_repurchase_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> stockRepurchaseDao:
-    return stockRepurchaseDao(dao_access=dao_access) 
+    return container.stock_repurchase_dao
 
-def get_dividend_dao(
-    dao_access: UserDaoAccess = Depends(get_user_dao_access)
+async def get_dividend_dao(
+    container: UserContainer = Depends(get_user_container)
 ) -> dividendDao:
-    return dividendDao(dao_access=dao_access)
\ No newline at end of file
+    return container.dividend_dao
@@ -1,17 +1,40 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+import json
+import logging
 from pathlib import Path
+import time
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from starlette.responses import HTMLResponse, JSONResponse
+from starlette.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from src.app.model.exceptions import AlreadyExistError, NotExistError, FKNotExistError, \
     FKNoDeleteUpdateError, NotMatchWithSystemError, OpNotPermittedError, PermissionDeniedError
+from src.app.model.misc import ProfileRecord
+from src.app.model.user import User
+from src.app.dao.instrument import QueryStats, track_queries
+from src.app.service.auth import decode_token
+from src.app.service.job import job_runner
+from src.app.utils.metrics import HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS, REGISTRY
+from src.app.utils.profiler import PROFILE_HEADER, SamplingProfiler, profile_store
+from src.app.utils.tools import get_secret
 from src.web.api.v1.api import api_router
+from src.web.dependency.auth import get_admin_user
 
 BASE_PATH = Path(__file__).resolve().parent
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # background job workers live as long as the api process
+    job_runner.start()
+    yield
+    job_runner.stop()
+
 app = FastAPI(
     title="FastAPI", 
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -24,7 +47,125 @@ app.add_middleware(
     allow_methods = ["*"],
     allow_headers = ["*"],
 )
+# compress larger responses for clients accepting gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 app.include_router(api_router, prefix="/api/v1")
+
+def _log_sql_stats(request: Request, status_code: int, total_ms: float, stats: QueryStats):
+    summary = {
+        'method': request.method,
+        'path': request.url.path,
+        'status_code': status_code,
+        'total_ms': round(total_ms, 1),
+        **stats.summary()
+    }
+    logging.info(f"sql_stats {json.dumps(summary)}")
+    repeated = stats.repeated()
+    if repeated:
+        # same statement template run many times, likely N+1 pattern
+        flagged = {
+            'method': request.method,
+            'path': request.url.path,
+            'statements': [{'statement': t, 'count': c} for t, c in repeated]
+        }
+        logging.warning(f"sql_n_plus_one {json.dumps(flagged)}")
+
+@app.middleware("http")
+async def sql_stats_middleware(request: Request, call_next):
+    # count queries and db time per request, exposed as Server-Timing header and one log line
+    # header is sent before the body, so it only covers queries until the endpoint returns,
+    # the log line is written once the body is sent and also covers queries of a streamed body (e.g., export)
+    with track_queries() as stats:
+        start = time.perf_counter()
+        response = await call_next(request)
+        total_ms = (time.perf_counter() - start) * 1000
+    
+    response.headers.append('Server-Timing', stats.server_timing())
+    response.headers.append('Server-Timing', f'app;dur={total_ms:.1f}')
+    
+    body_iterator = response.body_iterator
+    async def _log_when_sent():
+        # endpoint runs in its own task with a copy of the context, so streamed queries land in same stats
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            _log_sql_stats(request, response.status_code, (time.perf_counter() - start) * 1000, stats)
+    
+    response.body_iterator = _log_when_sent()
+    return response
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    # latency per route template (not raw path) to keep label cardinality bounded
+    HTTP_IN_PROGRESS.inc()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get('route')
+        route_path = getattr(route, 'path', 'unmatched')
+        HTTP_LATENCY.observe(time.perf_counter() - start, method=request.method, route=route_path)
+        HTTP_REQUESTS.inc(method=request.method, route=route_path, status=status_code)
+        HTTP_IN_PROGRESS.dec()
+
+def _get_request_user(request: Request) -> User | None:
+    # decode bearer token if any, None if not logged in or token invalid
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    auth_config = get_secret()['auth']
+    try:
+        return decode_token(
+            token=token,
+            secret_key=auth_config['secret_key'],
+            algorithm=auth_config['algorithm']
+        )
+    except PermissionError:
+        return None
+
+@app.middleware("http")
+async def profiling_middleware(request: Request, call_next):
+    # profile request of admin sending profile header, or of tenant flagged via admin api
+    # only a header lookup and dict size check when nothing is requested
+    if PROFILE_HEADER not in request.headers and not profile_store.has_flagged:
+        return await call_next(request)
+    
+    user = _get_request_user(request)
+    if user is None or not (
+        (user.is_admin and PROFILE_HEADER in request.headers)
+        or profile_store.consume_flag(user.user_id)
+    ):
+        return await call_next(request)
+    
+    profiler = SamplingProfiler()
+    started = datetime.now()
+    start = time.perf_counter()
+    profiler.start()
+    try:
+        with profiler.activate():
+            response = await call_next(request)
+    finally:
+        profiler.stop()
+    
+    record = ProfileRecord(
+        user_id=user.user_id,
+        username=user.username,
+        method=request.method,
+        path=request.url.path,
+        status_code=response.status_code,
+        started=started,
+        duration_ms=(time.perf_counter() - start) * 1000,
+        interval_ms=profiler.interval * 1000,
+        num_samples=profiler.num_samples
+    )
+    profile_store.add(record, profiler.stacks)
+    response.headers['X-Profile-Id'] = record.profile_id
+    return response
+
 # app.mount(
 #     "/static",
 #     StaticFiles(directory=BASE_PATH / "static"),
@@ -123,6 +264,14 @@ async def not_match_system_error_handler(_: Request, exc: NotMatchWithSystemErro
 def health_check() -> str:
     return "OK"
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(admin_user: User = Depends(get_admin_user)) -> PlainTextResponse:
+    # prometheus text exposition format, admin only as it exposes app internals
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
 
 @app.get("/")
 def root() -> str:
@@ -0,0 +1,25 @@
+import functools
+from typing import Any, Callable, Coroutine
+from fastapi import Request, Response
+from fastapi.dependencies.utils import is_coroutine_callable
+from fastapi.routing import APIRoute
+from src.app.utils.profiler import get_active_profiler
+
+def _profiled_call(call: Callable[..., Any]) -> Callable[..., Any]:
+    # sync endpoint runs in a threadpool worker, register that worker with the request profiler
+    @functools.wraps(call)
+    def wrapper(*args, **kwargs):
+        profiler = get_active_profiler()
+        if profiler is None:
+            return call(*args, **kwargs)
+        with profiler.track_current_thread():
+            return call(*args, **kwargs)
+    return wrapper
+
+class ProfiledRoute(APIRoute):
+    # only endpoint call is wrapped, dependencies stay as is so dependency_overrides keep matching
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        call = self.dependant.call
+        if call is not None and not is_coroutine_callable(call):
+            self.dependant.call = _profiled_call(call)
+        return super().get_route_handler()
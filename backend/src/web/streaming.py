@@ -0,0 +1,84 @@
+import mimetypes
+import re
+from typing import Callable, Generator, Tuple
+from urllib.parse import quote
+from fastapi import Request, status
+from fastapi.responses import Response, StreamingResponse
+from src.app.model.misc import _FileInfo
+
+_RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+def parse_range(range_header: str | None, size: int) -> Tuple[int, int] | None:
+    # single byte range -> (start, end) inclusive, None means whole file
+    # multiple ranges are not supported, whole file is served instead (allowed by RFC 9110)
+    if not range_header:
+        return None
+    m = _RANGE_PATTERN.match(range_header.strip())
+    if m is None:
+        return None
+    start, end = m.groups()
+    if start == '' and end == '':
+        return None
+    if start == '':
+        # suffix range, last n bytes
+        length = int(end)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    if end and int(end) < int(start):
+        return None # invalid range-spec, ignored so whole file is served
+    if int(start) >= size:
+        raise RangeNotSatisfiable()
+    return int(start), min(int(end), size - 1) if end else size - 1
+
+def file_response(
+    request: Request,
+    info: _FileInfo,
+    iter_content: Callable[[int, int | None], Generator[bytes, None, None]],
+    disposition: str = 'inline'
+) -> Response:
+    # binary download with ETag/If-None-Match and single Range support
+    etag = f'"{info.etag}"'
+    headers = {
+        'ETag': etag,
+        'Accept-Ranges': 'bytes',
+        'X-File-Hash': info.filehash,
+        'Content-Disposition': f"{disposition}; filename*=UTF-8''{quote(info.filename)}",
+        'Content-Encoding': 'identity', # already compressed formats mostly, also keeps gzip middleware off
+    }
+    if etag in [t.strip() for t in request.headers.get('if-none-match', '').split(',')]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    if if_range is not None and if_range != etag:
+        range_header = None # file changed since client got the first part, send whole file
+    try:
+        byte_range = parse_range(range_header, info.size)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, 'Content-Range': f'bytes */{info.size}'}
+        )
+
+    media_type = mimetypes.guess_type(info.filename)[0] or 'application/octet-stream'
+    if byte_range is None:
+        return StreamingResponse(
+            iter_content(0, None),
+            media_type=media_type,
+            headers={**headers, 'Content-Length': str(info.size)}
+        )
+    start, end = byte_range
+    return StreamingResponse(
+        iter_content(start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers={
+            **headers,
+            'Content-Length': str(end - start + 1),
+            'Content-Range': f'bytes {start}-{end}/{info.size}'
+        }
+    )
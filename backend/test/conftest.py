@@ -161,6 +161,11 @@ def test_backup_dao(test_dao_access):
     from src.app.dao.backup import backupDao
     return backupDao(test_dao_access)
 
+@pytest.fixture(scope='module')
+def test_file_dao(test_dao_access):
+    from src.app.dao.files import fileDao
+    return fileDao(test_dao_access)
+
 @pytest.fixture(scope='module')
 def test_contact_dao(test_dao_access):
     from src.app.dao.entity import contactDao
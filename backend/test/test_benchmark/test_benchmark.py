@@ -0,0 +1,60 @@
+from benchmark.cases import compare_reports, get_cases, time_case, BenchReport
+from benchmark.context import bench_context
+from benchmark.generator import SCALES, LedgerGenerator
+from benchmark.hydration import measure_hydration
+from benchmark.importtime import measure_import, parse_importtime
+
+
+def test_generate_and_run(tmp_path):
+    scale = SCALES['tiny']
+    with bench_context(workdir=tmp_path) as ctx:
+        counts = LedgerGenerator(ctx, scale).generate()
+        assert counts['invoice'] == 2 * scale.num_invoices
+        assert counts['expense'] == scale.num_expenses
+        # manual journals + sample + invoice/payment/expense journals
+        assert counts['journals'] >= scale.num_journals + counts['invoice'] + counts['expense']
+        
+        results = [
+            time_case(name, func, repeat=1, warmup=0, setup=setup)
+            for name, (func, setup) in get_cases(ctx, scale).items()
+        ]
+        assert len(results) > 0
+        assert all(r.min_ms <= r.median_ms <= r.max_ms for r in results)
+        
+    report = BenchReport(
+        timestamp='2024-01-01T00:00:00',
+        python='3',
+        dialect='sqlite',
+        scale_name='tiny',
+        scale=scale,
+        counts=counts,
+        generate_s=0,
+        results=results
+    )
+    assert compare_reports(report, report) == []
+    slower = report.model_copy(deep=True)
+    slower.results[0].median_ms = report.results[0].median_ms * 2 + 1
+    assert len(compare_reports(report, slower)) == 1
+
+
+def test_import_time():
+    stderr = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     b.inner
+import time:       200 |        300 |   b
+import time:       400 |        700 | a
+"""
+    stats = parse_importtime(stderr)
+    assert [s.module for s in stats] == ['b', 'a']
+    assert stats[1].cumulative_ms == 0.7
+    
+    # heavy optional deps must not load just by importing the services using them
+    report = measure_import('src.app.service.fx', repeat=1, budget_s=60)
+    assert report.eager_modules == []
+    assert not report.over_budget
+
+
+def test_hydration():
+    report = measure_hydration(num_entries=200, entries_per_journal=4, repeat=1)
+    assert report.num_journals == 50
+    assert report.num_entries == 200
+    assert report.trusted.objects_per_s > 0 and report.validated.objects_per_s > 0
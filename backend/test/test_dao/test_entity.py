@@ -34,11 +34,7 @@ def test_customer(test_customer_dao, test_contact_dao, customer1):
 
     # assert customer not found, and have correct error type
     with pytest.raises(NotExistError):
-        test_customer_dao.get(
-            cust_id=customer1.cust_id,
-            bill_contact=customer1.bill_contact,
-            ship_contact=customer1.ship_contact,
-        )
+        test_customer_dao.get(cust_id=customer1.cust_id)
     
     # add customer
     # should raise error because contact does not exist:
@@ -50,12 +46,10 @@ def test_customer(test_customer_dao, test_contact_dao, customer1):
     # add customer
     test_customer_dao.add(customer = customer1)
     
-    _customer = test_customer_dao.get(
-        cust_id=customer1.cust_id,
-        bill_contact=customer1.bill_contact,
-        ship_contact=customer1.ship_contact,
-    )
+    _customer = test_customer_dao.get(cust_id=customer1.cust_id)
     assert _customer == customer1
+    assert test_customer_dao.get_many([customer1.cust_id, 'random-cust', customer1.cust_id]) == [customer1]
+    assert test_customer_dao.get_many([]) == []
     
     # test no duplicate add
     with pytest.raises(AlreadyExistError):
@@ -64,22 +58,14 @@ def test_customer(test_customer_dao, test_contact_dao, customer1):
     # update contact
     customer1.customer_name = 'mynewname'
     test_customer_dao.update(customer1)
-    _customer = test_customer_dao.get(
-        cust_id=customer1.cust_id,
-        bill_contact=customer1.bill_contact,
-        ship_contact=customer1.ship_contact,
-    )
+    _customer = test_customer_dao.get(cust_id=customer1.cust_id)
     assert _customer.customer_name == 'mynewname'
     assert _customer == customer1
     
     # delete customer
     test_customer_dao.remove(customer1.cust_id)
     with pytest.raises(NotExistError):
-        test_customer_dao.get(
-            cust_id=customer1.cust_id,
-            bill_contact=customer1.bill_contact,
-            ship_contact=customer1.ship_contact,
-        )
+        test_customer_dao.get(cust_id=customer1.cust_id)
     
     # delete contact
     test_contact_dao.remove(customer1.bill_contact.contact_id)
\ No newline at end of file
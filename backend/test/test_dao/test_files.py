@@ -0,0 +1,183 @@
+import hashlib
+import io
+from pathlib import Path
+from unittest import mock
+import pytest
+from src.app.model.misc import FileWrapper
+from src.app.model.exceptions import AlreadyExistError, NotExistError
+
+def test_file(test_file_dao, testing_bucket_path):
+    content = bytes(range(256)) * 10
+
+    with mock.patch("src.app.dao.files.get_files_bucket", return_value=testing_bucket_path):
+        # binary stream, written in several chunks
+        filehash = test_file_dao.add_stream('file-stream', 'receipt.png', io.BytesIO(content), chunk_size=1000)
+        assert filehash == hashlib.sha256(content).hexdigest()
+        with pytest.raises(AlreadyExistError):
+            test_file_dao.add_stream('file-stream2', 'receipt.png', io.BytesIO(content))
+
+        info = test_file_dao.get_info('file-stream')
+        assert info.filename == 'receipt.png'
+        assert info.size == len(content)
+        assert info.etag == filehash
+        assert b''.join(test_file_dao.iter_content(info, chunk_size=1000)) == content
+        assert b''.join(test_file_dao.iter_content(info, start=10, end=1009, chunk_size=300)) == content[10:1010]
+
+        # compatible with latin-1 string content
+        _file = test_file_dao.get('file-stream')
+        assert _file.content.encode('latin-1') == content
+        assert _file.filehash == filehash
+
+        legacy = FileWrapper(filename='legacy.png', content=content.decode('latin-1'))
+        test_file_dao.add(legacy)
+        assert b''.join(test_file_dao.iter_content(test_file_dao.get_info(legacy.file_id))) == content
+
+        for file_id in ('file-stream', legacy.file_id):
+            test_file_dao.remove(file_id)
+        with pytest.raises(NotExistError):
+            test_file_dao.get_info('file-stream')
+
+def test_file_dedup(test_file_dao, testing_bucket_path, test_dao_access):
+    content = b'same receipt'
+
+    with mock.patch("src.app.dao.files.get_files_bucket", return_value=testing_bucket_path):
+        fs = test_dao_access.file_fs
+        test_file_dao.collect_garbage(grace=0) # leftover of other tests
+        # same content under two names is stored once
+        filehash = test_file_dao.add_stream('file-a', 'a.png', io.BytesIO(content))
+        assert test_file_dao.add_stream('file-b', 'b.png', io.BytesIO(content)) == filehash
+        blobpath = test_file_dao.getBlobPath(filehash)
+        assert fs.cat_file(blobpath) == content
+        # no leftover from upload
+        assert not fs.exists(test_file_dao.getFilePath('tmp')) or fs.ls(test_file_dao.getFilePath('tmp')) == []
+
+        # blob kept while still referenced
+        test_file_dao.remove('file-a')
+        assert fs.exists(blobpath)
+        assert b''.join(test_file_dao.iter_content(test_file_dao.get_info('file-b'))) == content
+        test_file_dao.remove('file-b')
+        # unreferenced blob is left to garbage collection, young ones are kept for uploads in flight
+        assert fs.exists(blobpath)
+        assert test_file_dao.collect_garbage() == 0
+        assert test_file_dao.collect_garbage(grace=0) == 1
+        assert not fs.exists(blobpath)
+
+        # failed registration does not leave blob behind
+        test_file_dao.add_stream('file-c', 'c.png', io.BytesIO(content))
+        with pytest.raises(AlreadyExistError):
+            test_file_dao.add_stream('file-d', 'c.png', io.BytesIO(b'other content'))
+        assert test_file_dao.collect_garbage(grace=0) == 1
+        assert not fs.exists(test_file_dao.getBlobPath(hashlib.sha256(b'other content').hexdigest()))
+        assert fs.exists(blobpath)
+        test_file_dao.remove('file-c')
+        test_file_dao.collect_garbage(grace=0)
+
+        # file put on storage directly is registered in place
+        with fs.open(test_file_dao.getFilePath('external.png'), 'wb') as obj:
+            obj.write(content)
+        file_id = test_file_dao.register('external.png')
+        info = test_file_dao.get_info(file_id)
+        assert info.filehash is None
+        assert b''.join(test_file_dao.iter_content(info)) == content
+        test_file_dao.remove(file_id)
+        assert not fs.exists(test_file_dao.getFilePath('external.png'))
+        
+def test_register_many(test_file_dao, testing_bucket_path, test_dao_access):
+    
+    with mock.patch("src.app.dao.files.get_files_bucket", return_value=testing_bucket_path):
+        fs = test_dao_access.file_fs
+        # pre-uploaded files, one in sub folder
+        filenames = [f'receipt-{i}.png' for i in range(20)] + ['2024/receipt-sub.png']
+        for filename in filenames:
+            fs.makedirs(Path(test_file_dao.getFilePath(filename)).parent.as_posix(), exist_ok=True)
+            with fs.open(test_file_dao.getFilePath(filename), 'wb') as obj:
+                obj.write(filename.encode())
+        file_id = test_file_dao.register('receipt-0.png')
+        
+        maps, missing = test_file_dao.register_many(filenames + ['receipt-missing.png', 'receipt-1.png'])
+        assert missing == ['receipt-missing.png']
+        assert set(maps.keys()) == set(filenames)
+        assert maps['receipt-0.png'] == file_id # already registered
+        assert test_file_dao.get_file_ids_by_names(filenames) == maps
+        info = test_file_dao.get_info(maps['2024/receipt-sub.png'])
+        assert b''.join(test_file_dao.iter_content(info)) == b'2024/receipt-sub.png'
+        
+        # second run registers nothing new
+        _maps, _ = test_file_dao.register_many(filenames)
+        assert _maps == maps
+        
+        for file_id in maps.values():
+            test_file_dao.remove(file_id)
+            
+def test_file_replace(test_file_dao, testing_bucket_path, test_dao_access):
+    from sqlmodel import select
+    from src.app.dao.orm import FileBlobORM
+    
+    def _ref_count(filehash: str) -> int | None:
+        return test_dao_access.user_session.exec(
+            select(FileBlobORM.ref_count).where(FileBlobORM.filehash == filehash)
+        ).one_or_none()
+    
+    with mock.patch("src.app.dao.files.get_files_bucket", return_value=testing_bucket_path):
+        fs = test_dao_access.file_fs
+        old_hash = test_file_dao.add_stream('file-a', 'a.png', io.BytesIO(b'version 1'))
+        test_file_dao.add_stream('file-b', 'b.png', io.BytesIO(b'version 1'))
+        assert _ref_count(old_hash) == 2
+        
+        # new content, old blob still used by the other file
+        new_hash = test_file_dao.replace_stream('file-a', io.BytesIO(b'version 2'))
+        assert _ref_count(old_hash) == 1
+        assert _ref_count(new_hash) == 1
+        assert b''.join(test_file_dao.iter_content(test_file_dao.get_info('file-a'))) == b'version 2'
+        assert fs.exists(test_file_dao.getBlobPath(old_hash))
+        
+        # last reference gone, old blob collected
+        assert test_file_dao.replace_stream('file-b', io.BytesIO(b'version 2')) == new_hash
+        assert _ref_count(old_hash) is None
+        assert _ref_count(new_hash) == 2
+        assert test_file_dao.collect_garbage(grace=0) == 1
+        assert not fs.exists(test_file_dao.getBlobPath(old_hash))
+        assert fs.exists(test_file_dao.getBlobPath(new_hash))
+        with pytest.raises(NotExistError):
+            test_file_dao.replace_stream('file-random', io.BytesIO(b'version 3'))
+        
+        # blob row inserted concurrently by identical upload -> reference added instead
+        incr_blob_ref = test_file_dao._incr_blob_ref
+        calls = []
+        def _lost_race(filehash: str) -> bool:
+            # first lookup misses as the other upload was not committed yet
+            calls.append(filehash)
+            return len(calls) > 1 and incr_blob_ref(filehash)
+        with mock.patch.object(test_file_dao, '_incr_blob_ref', side_effect=_lost_race):
+            assert test_file_dao.add_stream('file-c', 'c.png', io.BytesIO(b'version 2')) == new_hash
+        assert len(calls) == 2
+        assert _ref_count(new_hash) == 3
+        test_file_dao.remove('file-c')
+        
+        # rolled back removal keeps blob referenced
+        blobpath = test_file_dao.getBlobPath(new_hash)
+        with pytest.raises(ValueError):
+            with test_dao_access.unit_of_work():
+                test_file_dao.remove('file-a')
+                test_file_dao.remove('file-b')
+                raise ValueError()
+        assert _ref_count(new_hash) == 2
+        assert test_file_dao.collect_garbage(grace=0) == 0
+        assert fs.exists(blobpath)
+        test_file_dao.remove('file-a')
+        test_file_dao.remove('file-b')
+        
+        # file registered in place is only deleted from storage once the unit of work commits
+        with fs.open(test_file_dao.getFilePath('external.png'), 'wb') as obj:
+            obj.write(b'version 1')
+        file_id = test_file_dao.register('external.png')
+        with pytest.raises(ValueError):
+            with test_dao_access.unit_of_work():
+                test_file_dao.remove(file_id)
+                raise ValueError()
+        assert fs.exists(test_file_dao.getFilePath('external.png'))
+        with test_dao_access.unit_of_work():
+            test_file_dao.remove(file_id)
+            assert fs.exists(test_file_dao.getFilePath('external.png'))
+        assert not fs.exists(test_file_dao.getFilePath('external.png'))
+        test_file_dao.collect_garbage(grace=0)
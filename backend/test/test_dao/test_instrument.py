@@ -0,0 +1,54 @@
+import pytest
+from src.app.dao.instrument import get_query_stats, normalize_statement, track_queries
+
+
+def test_normalize_statement():
+    assert normalize_statement("SELECT a\n  FROM t WHERE id IN (?, ?, ?)") \
+        == normalize_statement("SELECT a FROM t WHERE id IN (?)") \
+        == "SELECT a FROM t WHERE id IN (?)"
+    assert normalize_statement("SELECT a FROM t WHERE id IN (%(id_1)s, %(id_2)s)") \
+        == "SELECT a FROM t WHERE id IN (?)"
+
+def test_track_queries(session_with_sample_choa, sample_journal_meal, test_journal_dao):
+    test_journal_dao.add(sample_journal_meal)
+    
+    assert get_query_stats() is None
+    with track_queries() as stats:
+        for _ in range(3):
+            test_journal_dao.get(sample_journal_meal.journal_id)
+    assert get_query_stats() is None
+    
+    assert stats.count > 3
+    assert stats.duration > 0
+    # each get issue the same statements
+    assert all(c % 3 == 0 for c in stats.templates.values())
+    assert stats.repeated(threshold=2) == [(t, c) for t, c in stats.templates.most_common() if c > 2]
+    assert stats.repeated(threshold=0) == []
+    assert stats.summary()['query_count'] == stats.count
+    assert stats.server_timing().startswith('db;dur=')
+    
+    test_journal_dao.remove(sample_journal_meal.journal_id)
+    
+def test_pool_metrics(engine):
+    from sqlalchemy import text
+    from src.app.utils.metrics import REGISTRY, DB_POOL_CHECKOUTS, register_engine
+    
+    register_engine('test-pool', engine)
+    before = DB_POOL_CHECKOUTS.get(db='test-pool')
+    with engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+    assert DB_POOL_CHECKOUTS.get(db='test-pool') == before + 1
+    
+    rendered = REGISTRY.render()
+    assert 'db_pool_checkouts_total{db="test-pool"}' in rendered
+    assert 'db_pool_checked_out{db="test-pool"} 0' in rendered
+    
+def test_incomplete_metric():
+    from src.app.utils.metrics import REGISTRY, _Metric
+    
+    class NoSamples(_Metric):
+        TYPE = 'gauge'
+    
+    # fails when built for registration, not when scraped
+    with pytest.raises(TypeError):
+        REGISTRY.register(NoSamples('no_samples', 'metric without samples'))
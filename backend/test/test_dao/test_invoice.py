@@ -60,6 +60,14 @@ def test_invoice(session_with_sample_choa, sample_invoice, sample_journal_meal,
     assert len(_invoice.ginvoice_items) == 1
     assert len(_invoice.invoice_items) == 2
     
+    # test get many invoices
+    _invoices = test_invoice_dao.get_many([sample_invoice.invoice_id, 'random-invoice-id'])
+    assert list(_invoices.keys()) == [sample_invoice.invoice_id]
+    _invoice, _jrn_id = _invoices[sample_invoice.invoice_id]
+    assert _jrn_id == sample_journal_meal.journal_id
+    assert _invoice == sample_invoice
+    assert test_invoice_dao.get_many([]) == {}
+    
     # test list and filter
     _invoices = test_invoice_dao.list_invoice()
     assert len(_invoices) == 1
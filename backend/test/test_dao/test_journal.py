@@ -3,6 +3,7 @@ from unittest import mock
 import pytest
 from src.app.model.accounts import Account, Chart
 from src.app.model.enums import AcctType, JournalSrc
+from src.app.model.journal import Entry, Journal
 from src.app.model.exceptions import NotExistError, AlreadyExistError, FKNotExistError
 
 def test_journal(session_with_sample_choa, sample_journal_meal, test_journal_dao):
@@ -78,10 +79,176 @@ def test_journal(session_with_sample_choa, sample_journal_meal, test_journal_dao
     ))[0]
     assert _entry.description == 'Unhappy Tip'
     
+    # test update with regenerated entries (new entry ids), tip merged into meal
+    meal, tip, tax, bank = sample_journal_meal.entries
+    regenerated = Journal(
+        journal_id=sample_journal_meal.journal_id,
+        jrn_date=sample_journal_meal.jrn_date,
+        entries=[
+            Entry(
+                entry_type=meal.entry_type,
+                acct=meal.acct,
+                cur_incexp=meal.cur_incexp,
+                amount=meal.amount + tip.amount,
+                amount_base=meal.amount_base + tip.amount_base,
+                description='Have KFC with client, including tip'
+            ),
+            Entry(**tax.model_dump(exclude={'entry_id'})),
+            Entry(**bank.model_dump(exclude={'entry_id'})),
+        ],
+        jrn_src=sample_journal_meal.jrn_src,
+        note=sample_journal_meal.note
+    )
+    test_journal_dao.update(regenerated)
+    _sample_jrn = test_journal_dao.get(sample_journal_meal.journal_id)
+    # existing entry ids are kept, tip entry is deleted
+    assert sorted(e.entry_id for e in _sample_jrn.entries) == sorted([meal.entry_id, tax.entry_id, bank.entry_id])
+    _entry = list(filter(lambda e: e.entry_id == meal.entry_id, _sample_jrn.entries))[0]
+    assert _entry.description == 'Have KFC with client, including tip'
+    
+    # update journal not exist
+    with pytest.raises(NotExistError):
+        test_journal_dao.update(
+            regenerated.model_copy(update={'journal_id': 'jrn-random'})
+        )
+    
     
     # remove journal
     test_journal_dao.remove(sample_journal_meal.journal_id)
     with pytest.raises(NotExistError):
         test_journal_dao.get(sample_journal_meal.journal_id)
     
-    
\ No newline at end of file
+def test_unit_of_work(session_with_sample_choa, sample_journal_meal, test_journal_dao, test_dao_access):
+    
+    # error within unit of work will rollback all writes in the scope
+    with pytest.raises(RuntimeError):
+        with test_dao_access.unit_of_work():
+            test_journal_dao.add(sample_journal_meal)
+            # journal visible within same transaction
+            assert test_journal_dao.get(sample_journal_meal.journal_id) == sample_journal_meal
+            raise RuntimeError('abort')
+    with pytest.raises(NotExistError):
+        test_journal_dao.get(sample_journal_meal.journal_id)
+    
+    # dao error within unit of work will rollback earlier writes as well
+    _copy_journal = sample_journal_meal.model_copy(deep=True)
+    with pytest.raises(AlreadyExistError):
+        with test_dao_access.unit_of_work():
+            test_journal_dao.add(sample_journal_meal)
+            test_journal_dao.add(_copy_journal)
+    with pytest.raises(NotExistError):
+        test_journal_dao.get(sample_journal_meal.journal_id)
+    
+    # commit once on exit, nested scope joins outer one
+    with test_dao_access.unit_of_work():
+        with test_dao_access.unit_of_work():
+            test_journal_dao.add(sample_journal_meal)
+        assert test_dao_access.in_unit_of_work
+    assert not test_dao_access.in_unit_of_work
+    assert test_journal_dao.get(sample_journal_meal.journal_id) == sample_journal_meal
+    
+    test_journal_dao.remove(sample_journal_meal.journal_id)
+    
+def test_data_versions(session_with_sample_choa, sample_journal_meal, test_journal_dao, test_dao_access):
+    from src.app.dao.config import configDao
+    
+    config_dao = configDao(test_dao_access)
+    versions = config_dao.get_data_versions()
+    assert set(versions.keys()) == {'accounts', 'journals', 'items', 'entities'}
+    
+    # journal write bumps journal domain only
+    test_journal_dao.add(sample_journal_meal)
+    _versions = config_dao.get_data_versions()
+    assert _versions['journals'] != versions['journals']
+    assert _versions['accounts'] == versions['accounts']
+    assert _versions['items'] == versions['items']
+    
+    # rolled back write does not bump version
+    with pytest.raises(AlreadyExistError):
+        test_journal_dao.add(sample_journal_meal)
+    assert config_dao.get_data_versions() == _versions
+    
+    # bulk delete of entries also bumps version
+    test_journal_dao.remove(sample_journal_meal.journal_id)
+    assert config_dao.get_data_versions()['journals'] != _versions['journals']
+    
+def test_export_entries(session_with_sample_choa, sample_journal_meal, test_journal_dao):
+    test_journal_dao.add(sample_journal_meal)
+    
+    rows = list(test_journal_dao.export_entries(batch_size=2))
+    assert len(rows) == len(sample_journal_meal.entries)
+    assert {r.entry_id for r in rows} == {e.entry_id for e in sample_journal_meal.entries}
+    for r in rows:
+        entry = next(e for e in sample_journal_meal.entries if e.entry_id == r.entry_id)
+        assert r.journal_id == sample_journal_meal.journal_id
+        assert r.acct_name == entry.acct.acct_name
+        assert r.chart_id == entry.acct.chart.chart_id
+        assert r.amount_base == entry.amount_base
+    
+    # filters
+    rows = list(test_journal_dao.export_entries(acct_ids=['acct-meal']))
+    assert len(rows) == 1 and rows[0].acct_id == 'acct-meal'
+    rows = list(test_journal_dao.export_entries(max_dt=date(1999, 12, 31)))
+    assert len(rows) == 0
+    
+    test_journal_dao.remove(sample_journal_meal.journal_id)
+    
+def test_acct_flow_by_period(session_with_sample_choa, sample_journal_meal, test_journal_dao):
+    # same meal on 2023-12-31 (before range), 2024-01-01, 2024-01-15 and 2024-03-01
+    journals = []
+    for jrn_date in (date(2023, 12, 31), date(2024, 1, 1), date(2024, 1, 15), date(2024, 3, 1)):
+        _journal = Journal(
+            journal_id=f'jrn-{jrn_date.isoformat()}',
+            jrn_date=jrn_date,
+            entries=[Entry(**e.model_dump(exclude={'entry_id'})) for e in sample_journal_meal.entries],
+            jrn_src=sample_journal_meal.jrn_src,
+            note=sample_journal_meal.note
+        )
+        test_journal_dao.add(_journal)
+        journals.append(_journal)
+    
+    flows = test_journal_dao.agg_acct_flow_by_period(
+        'acct-bank',
+        start_dt=date(2024, 1, 1),
+        end_dt=date(2024, 12, 31),
+        freq='month'
+    )
+    # months without entries are left out
+    assert [f.period_start for f in flows] == [date(2024, 1, 1), date(2024, 3, 1)]
+    assert flows[0].num_journal == 2
+    assert flows[0].num_credit_entry == 2
+    assert flows[0].credit_amount_base == pytest.approx(133.11 * 2)
+    assert flows[0].net_base == pytest.approx(-133.11 * 2)
+    # running balance includes the opening balance before start_dt
+    assert flows[0].closing_base == pytest.approx(-133.11 * 3)
+    assert flows[1].closing_base == pytest.approx(-133.11 * 4)
+    
+    # daily, income statement account
+    flows = test_journal_dao.agg_acct_flow_by_period(
+        'acct-meal',
+        start_dt=date(2024, 1, 1),
+        end_dt=date(2024, 1, 31),
+        freq='day'
+    )
+    assert [f.period_start for f in flows] == [date(2024, 1, 1), date(2024, 1, 15)]
+    assert flows[1].net_base == pytest.approx(105.83)
+    assert flows[1].closing_base == pytest.approx(105.83 * 3)
+    
+    # matches entry level running balance
+    entries = test_journal_dao.list_entry_by_acct(
+        'acct-bank',
+        min_dt=date(2024, 1, 1),
+        max_dt=date(2024, 1, 31)
+    )
+    assert len(entries) == 2
+    assert entries[0].cum_account_base == pytest.approx(-133.11 * 3)
+    
+    with pytest.raises(NotExistError):
+        test_journal_dao.agg_acct_flow_by_period(
+            'acct-random',
+            start_dt=date(2024, 1, 1),
+            end_dt=date(2024, 12, 31)
+        )
+    
+    for _journal in journals:
+        test_journal_dao.remove(_journal.journal_id)
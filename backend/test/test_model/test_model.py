@@ -254,4 +254,38 @@ def test_journal_entry_multi_currency(sample_chart_of_accounts: dict[AcctType, C
             amount_base=57.5,
             description='Meal'
         )
-        
\ No newline at end of file
+            
+def test_hydrate(sample_chart_of_accounts: dict[AcctType, ChartNode]):
+    chart = sample_chart_of_accounts[AcctType.INC].find_node_by_name('4100 - General Income').chart
+    data = dict(
+        acct_id='acct-rev',
+        acct_name="Revenue",
+        acct_type=AcctType.INC,
+        currency=None,
+        chart=chart
+    )
+    # trusted path builds the same model, computed fields included
+    acct = Account.hydrate(**data)
+    assert acct == Account(**data)
+    assert acct.model_dump() == Account(**data).model_dump()
+    assert acct.model_fields_set == Account(**data).model_fields_set
+    # assignment validation still applies afterwards
+    with pytest.raises(ValidationError):
+        acct.acct_name = None
+    
+    # missing fields get defaults
+    entry = Entry.hydrate(
+        entry_type=EntryType.CREDIT,
+        acct=acct,
+        cur_incexp=CurType.CAD,
+        amount=10,
+        amount_base=10
+    )
+    assert entry.entry_id.startswith('entr-')
+    assert entry.description is None
+    
+    # bad data only caught when asked
+    data['currency'] = CurType.CAD
+    Account.hydrate(**data)
+    with pytest.raises(ValidationError):
+        Account.hydrate(validate=True, **data)
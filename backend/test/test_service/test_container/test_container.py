@@ -0,0 +1,31 @@
+import pytest
+from src.app.service.container import CommonContainer, UserContainer
+
+
+def test_user_container(test_dao_access):
+    container = UserContainer(dao_access=test_dao_access)
+    # nothing built until asked
+    assert 'sales_service' not in vars(container)
+    assert 'acct_dao' not in vars(container)
+    
+    sales_service = container.sales_service
+    assert container.sales_service is sales_service
+    # sub services/daos are shared across the graph
+    assert sales_service.acct_service is container.acct_service
+    assert sales_service.journal_service.acct_service is container.acct_service
+    assert sales_service.item_service.acct_service is container.acct_service
+    assert container.acct_service.setting_service is container.setting_service
+    assert container.fx_service.setting_service is container.setting_service
+    assert sales_service.invoice_dao.dao_access is test_dao_access
+    # only what sales service needs
+    assert 'shares_service' not in vars(container)
+    assert 'property_dao' not in vars(container)
+    
+def test_dao_access_slots(test_dao_access, test_common_dao_access):
+    with pytest.raises(AttributeError):
+        test_dao_access.random_attr = 1 # type: ignore
+    assert not hasattr(test_dao_access, '__dict__')
+    
+    container = CommonContainer(dao_access=test_common_dao_access)
+    assert container.job_service.job_dao is container.job_dao
+    assert container.admin_backup_service.backup_dao.dao_access is test_common_dao_access
@@ -190,6 +190,9 @@ def test_crud_two_customer(test_entity_service, customer1, customer2):
     _contact2 = test_entity_service.get_contact(customer2.ship_contact.contact_id)
     assert _contact2 == customer2.ship_contact
     
+    # both loaded in one go, in given order
+    assert test_entity_service.get_customers([customer2.cust_id, customer1.cust_id]) == [customer2, customer1]
+    
     # test foreinkey work
     with pytest.raises(FKNoDeleteUpdateError):
         test_entity_service.remove_contact(_contact2.contact_id)
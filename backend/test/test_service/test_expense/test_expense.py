@@ -186,9 +186,8 @@ def test_expense(session_with_sample_choa, sample_expense_meal, sample_expense_r
     assert _expense == sample_expense_meal
     _journal_ = test_journal_service.get_journal(_journal.journal_id)
     assert _journal_ == _journal
-    with pytest.raises(NotExistError):
-        # original journal should be deleted
-        test_journal_service.get_journal(_jrn_id)
+    # original journal should be updated in place
+    assert _journal.journal_id == _jrn_id
         
     # test delete expense
     with pytest.raises(NotExistError):
@@ -0,0 +1,73 @@
+import threading
+import time
+from unittest import mock
+import pytest
+from src.app.service.misc import GeoService
+from src.app.utils.geo_cache import GeoCache
+
+
+@pytest.fixture
+def geo_cache(tmp_path):
+    cache = GeoCache(path=(tmp_path / 'geo.sqlite').as_posix())
+    with mock.patch.object(GeoService, 'cache', cache):
+        yield cache
+
+def test_offline_from_snapshot(geo_cache):
+    # seeded from bundled snapshot, api never reached
+    with mock.patch.object(GeoService, 'req', return_value=None) as mock_req:
+        geo_cache.ttl = float('inf')
+        countries = GeoService.list_countries()
+        assert {'CA', 'US', 'CN'}.issubset(c.iso2 for c in countries)
+        assert 'Ontario' in [s.state for s in GeoService.list_states('CA')]
+        assert 'Toronto' in GeoService.list_cities('CA', 'ON')
+        mock_req.assert_not_called()
+        
+        # not in snapshot and api down -> empty, not cached
+        assert GeoService.list_states('ZW') == []
+        assert geo_cache.get('states/ZW') == (None, False)
+
+def test_miss_persist(geo_cache, tmp_path):
+    states = [{'id': 1, 'name': 'Harare', 'iso2': 'HA'}, {'id': 2, 'name': 'Bulawayo', 'iso2': 'BU'}]
+    with mock.patch.object(GeoService, 'req', return_value=states) as mock_req:
+        result = GeoService.list_states('ZW')
+        assert [s.iso2 for s in result] == ['HA', 'BU']
+        mock_req.assert_called_once_with('countries/ZW/states')
+    
+    # another process (new cache object on same file) reads it offline, sorted by name
+    cache2 = GeoCache(path=geo_cache.path)
+    with mock.patch.object(GeoService, 'cache', cache2), \
+        mock.patch.object(GeoService, 'req', return_value=None) as mock_req:
+        assert [s.state for s in GeoService.list_states('ZW')] == ['Bulawayo', 'Harare']
+        mock_req.assert_not_called()
+    
+    # snapshot roundtrip
+    snapshot = (tmp_path / 'snapshot.json.gz').as_posix()
+    geo_cache.dump_snapshot(snapshot)
+    cache3 = GeoCache(path=(tmp_path / 'geo3.sqlite').as_posix(), snapshot=snapshot)
+    assert cache3.get('states/ZW')[0] == [{'name': 'Bulawayo', 'iso2': 'BU'}, {'name': 'Harare', 'iso2': 'HA'}]
+    assert cache3.get('states/CA')[0] == geo_cache.get('states/CA')[0]
+
+def test_stale_refresh(geo_cache):
+    cities = [{'id': 1, 'name': 'Toronto'}, {'id': 2, 'name': 'Waterloo'}]
+    called = threading.Event()
+    release = threading.Event()
+    
+    def slow_req(path):
+        called.set()
+        release.wait(5)
+        return cities
+    
+    # snapshot is older than ttl, stale data served immediately
+    with mock.patch.object(GeoService, 'req', side_effect=slow_req) as mock_req:
+        result = GeoService.list_cities('CA', 'ON')
+        assert 'Mississauga' in result
+        assert called.wait(5)
+        # refresh in flight is not started twice
+        GeoService.list_cities('CA', 'ON')
+        release.set()
+        for _ in range(50):
+            if geo_cache.get('cities/CA/ON') == ([{'name': 'Toronto'}, {'name': 'Waterloo'}], False):
+                break
+            time.sleep(0.1)
+        assert GeoService.list_cities('CA', 'ON') == ['Toronto', 'Waterloo']
+        assert mock_req.call_count == 1
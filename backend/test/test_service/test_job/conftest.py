@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+import pytest
+from sqlmodel import Session
+
+
+@pytest.fixture(scope='module')
+def registered_user(test_dao_access, test_user):
+    # job table references users table in common db
+    from src.app.dao.orm import UserORM
+    
+    test_dao_access.common_session.add(
+        UserORM(
+            user_id=test_user.user_id,
+            username=test_user.username,
+            hashed_password='N/A',
+            is_admin=test_user.is_admin
+        )
+    )
+    test_dao_access.common_session.commit()
+    return test_user
+
+@pytest.fixture
+def test_job_runner(engine, common_engine, storage_fs, registered_user):
+    from src.app.dao.connection import CommonDaoAccess, UserDaoAccess
+    from src.app.service.job import JobRunner
+    
+    @contextmanager
+    def common_access_factory():
+        with Session(common_engine) as common_session:
+            yield CommonDaoAccess(
+                common_engine=common_engine,
+                common_session=common_session,
+                file_fs=storage_fs,
+                backup_fs=storage_fs
+            )
+    
+    @contextmanager
+    def user_access_factory(user):
+        with (
+            Session(common_engine) as common_session, 
+            Session(engine) as user_session
+        ):
+            yield UserDaoAccess(
+                user_engine=engine,
+                common_engine=common_engine,
+                common_session=common_session,
+                user_session=user_session,
+                file_fs=storage_fs,
+                backup_fs=storage_fs,
+                user=user
+            )
+    
+    # not started, so dispatch runs claimed job inline
+    return JobRunner(
+        common_access_factory=common_access_factory,
+        user_access_factory=user_access_factory,
+        max_per_tenant=1
+    )
+    
+@pytest.fixture
+def test_job_service(test_dao_access, test_job_runner):
+    from src.app.dao.job import jobDao
+    from src.app.service.job import JobService
+    
+    return JobService(job_dao=jobDao(test_dao_access), runner=test_job_runner)
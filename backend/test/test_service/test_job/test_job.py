@@ -0,0 +1,98 @@
+from unittest import mock
+import pytest
+from src.app.model.enums import JobStatus, JobType
+from src.app.model.exceptions import NotExistError, OpNotPermittedError, PermissionDeniedError
+from src.app.model.user import User
+
+
+@pytest.fixture
+def mock_buckets(testing_bucket_path):
+    with (
+        mock.patch("src.app.dao.backup.get_files_bucket", return_value=testing_bucket_path),
+        mock.patch("src.app.dao.backup.get_backup_bucket", return_value=testing_bucket_path)
+    ):
+        yield
+
+def test_backup_job(mock_buckets, test_job_service, test_job_runner, test_backup_dao, registered_user):
+    job = test_job_service.submit_backup(registered_user, backup_id='job-backup')
+    assert job.status == JobStatus.PENDING
+    
+    claimed = test_job_runner.dispatch()
+    assert [j.job_id for j in claimed] == [job.job_id]
+    
+    job = test_job_service.get_job(registered_user, job.job_id)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.progress == 1
+    assert job.result == {'backup_id': 'job-backup'}
+    assert job.started is not None and job.finished is not None
+    assert 'job-backup' in test_backup_dao.list_backup_ids()
+    
+    # nothing left to run
+    assert test_job_runner.dispatch() == []
+    
+def test_file_gc_job(test_job_service, test_job_runner, test_file_dao, testing_bucket_path, registered_user):
+    import io
+    
+    with (
+        mock.patch("src.app.dao.files.get_files_bucket", return_value=testing_bucket_path),
+        mock.patch("src.app.dao.files.FILE_GC_GRACE", 0)
+    ):
+        test_file_dao.add_stream('file-gc', 'gc.png', io.BytesIO(b'to be collected'))
+        test_file_dao.remove('file-gc')
+        
+        job = test_job_service.submit_file_gc(registered_user)
+        test_job_runner.dispatch()
+        
+    job = test_job_service.get_job(registered_user, job.job_id)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result['num_removed'] >= 1
+    
+def test_failed_job(mock_buckets, test_job_service, test_job_runner, registered_user):
+    job = test_job_service.submit_restore(registered_user, backup_id='not-exist')
+    test_job_runner.dispatch()
+    
+    job = test_job_service.get_job(registered_user, job.job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.message
+    
+    with pytest.raises(OpNotPermittedError):
+        test_job_service.cancel_job(registered_user, job.job_id)
+    
+def test_tenant_limit_and_cancel(test_job_service, test_job_runner, registered_user):
+    job_dao = test_job_service.job_dao
+    running = test_job_service.submit_backup(registered_user)
+    pending = test_job_service.submit_backup(registered_user)
+    assert job_dao.claim(running.job_id)
+    assert not job_dao.claim(running.job_id) # already claimed
+    
+    # tenant already has one running job
+    assert test_job_runner.dispatch() == []
+    
+    # pending job is cancelled right away
+    pending = test_job_service.cancel_job(registered_user, pending.job_id)
+    assert pending.status == JobStatus.CANCELLED
+    
+    # running job is only flagged, handler stops at next progress report
+    running = test_job_service.cancel_job(registered_user, running.job_id)
+    assert running.status == JobStatus.RUNNING
+    assert running.cancel_requested
+    assert job_dao.update_progress(running.job_id, 0.5, 'halfway')
+    job_dao.finish(running.job_id, JobStatus.CANCELLED)
+    
+    jobs = test_job_service.list_jobs(registered_user, status=JobStatus.CANCELLED)
+    assert {running.job_id, pending.job_id}.issubset(j.job_id for j in jobs)
+    
+def test_job_access(test_job_service, registered_user):
+    other = User(username='other', is_admin=False)
+    job = test_job_service.submit_backup(registered_user)
+    
+    with pytest.raises(NotExistError):
+        test_job_service.get_job(other, job.job_id)
+    with pytest.raises(PermissionDeniedError):
+        test_job_service.submit_admin_backup(other)
+    with pytest.raises(PermissionDeniedError):
+        test_job_service.list_jobs(other, all_users=True)
+    with pytest.raises(OpNotPermittedError):
+        test_job_service.submit_expense_import(registered_user, [])
+        
+    test_job_service.cancel_job(registered_user, job.job_id)
@@ -0,0 +1,129 @@
+from datetime import date
+import math
+import pytest
+from src.app.model.exceptions import NotExistError
+from src.app.model.enums import PropertyTransactionType
+from src.app.model.property import DepreciationSchedule, PropertyTransaction
+
+
+@pytest.fixture
+def test_sample_property_session(session_with_sample_choa, sample_property, test_property_service):
+
+    test_property_service.add_property(sample_property)
+
+    yield session_with_sample_choa
+
+    for trans in test_property_service.list_transactions(sample_property.property_id):
+        test_property_service.delete_property_trans(trans.trans_id)
+    test_property_service.delete_property(sample_property.property_id)
+
+
+def test_depreciation_amounts(test_property_service):
+    straight = DepreciationSchedule(useful_life=1, freq='month', salvage_value=100)
+    amounts = test_property_service._depreciation_amounts(1000, straight)
+    assert len(amounts) == 12
+    assert math.isclose(sum(amounts), 900)
+    assert amounts[0] == 75
+
+    # declining balance front loads, still ends at salvage value
+    declining = DepreciationSchedule(method='declining_balance', useful_life=5, freq='year', salvage_value=100)
+    amounts = test_property_service._depreciation_amounts(1000, declining)
+    assert len(amounts) == 5
+    assert amounts[0] == 400
+    assert all(a >= b for a, b in zip(amounts, amounts[1:]))
+    assert math.isclose(sum(amounts), 900)
+
+def test_depreciation_schedule(test_sample_property_session, sample_property, test_property_service, 
+                               test_fx_service, test_acct_service):
+    schedule = DepreciationSchedule(useful_life=2, freq='quarter')
+
+    # full life, nothing saved
+    trial = test_property_service.trial_depreciation_schedule('test-prop', schedule)
+    assert len(trial) == 8
+    assert trial[0].trans_dt == date(2024, 3, 31)
+    assert math.isclose(sum(t.trans_amount for t in trial), sample_property.pur_cost)
+    assert test_property_service.list_transactions('test-prop') == []
+    with pytest.raises(NotExistError):
+        test_property_service.trial_depreciation_schedule('prop-random', schedule)
+
+    # save up to given date
+    added = test_property_service.add_depreciation_schedule('test-prop', schedule, until=date(2024, 12, 31))
+    assert [t.trans_dt for t in added] == [date(2024, 3, 31), date(2024, 6, 30), date(2024, 9, 30), date(2024, 12, 31)]
+    assert sorted(test_property_service.list_transactions('test-prop'), key=lambda t: t.trans_dt) == added
+    _trans, journal = test_property_service.get_property_trans_journal(added[0].trans_id)
+    amount_base = test_fx_service.convert_to_base(
+        amount=added[0].trans_amount,
+        src_currency=test_acct_service.get_account(sample_property.pur_acct_id).currency,
+        cur_dt=added[0].trans_dt
+    )
+    assert math.isclose(journal.total_debits, amount_base)
+
+    # posted periods are skipped
+    assert test_property_service.add_depreciation_schedule('test-prop', schedule, until=date(2024, 12, 31)) == []
+    stat = test_property_service.get_acc_stat('test-prop', date(2024, 12, 31))
+    assert math.isclose(stat.value, sample_property.pur_cost / 2)
+
+def test_month_end_depreciation(test_sample_property_session, sample_depreciation, test_property_service):
+    # one depreciation already posted in Feb, caught up from there
+    test_property_service.add_property_trans(sample_depreciation)
+    added = test_property_service.run_month_end_depreciation(date(2024, 3, 15))
+    assert [t.trans_dt for t in added] == [date(2024, 3, 31)]
+    assert all(t.trans_type == PropertyTransactionType.DEPRECIATION for t in added)
+    # remaining base spread over remaining 58 months
+    assert math.isclose(added[0].trans_amount, round((9300 - 500) / 58, 2))
+
+    # already caught up
+    assert test_property_service.run_month_end_depreciation(date(2024, 3, 31)) == []
+    assert len(test_property_service.run_month_end_depreciation(date(2024, 5, 1))) == 2
+    
+def test_month_end_depreciation_no_backfill(test_sample_property_session, test_property_service):
+    # never depreciated, only current month is posted, remaining 46 months share the base
+    added = test_property_service.run_month_end_depreciation(date(2025, 3, 15))
+    assert [t.trans_dt for t in added] == [date(2025, 3, 31)]
+    assert math.isclose(added[0].trans_amount, round(9300 / 46, 2))
+    
+def test_depreciation_across_schedules(test_sample_property_session, sample_property, test_property_service):
+    # full life posted yearly, month end run must not depreciate again
+    yearly = test_property_service.add_depreciation_schedule('test-prop', DepreciationSchedule(useful_life=5, freq='year'))
+    assert len(yearly) == 5
+    total = sum(t.trans_amount for t in test_property_service.list_transactions('test-prop'))
+    assert math.isclose(total, sample_property.pur_cost)
+    
+    assert test_property_service.run_month_end_depreciation(date(2025, 3, 15)) == []
+    assert test_property_service.add_depreciation_schedule('test-prop', DepreciationSchedule(useful_life=5, freq='quarter')) == []
+    assert math.isclose(sum(t.trans_amount for t in test_property_service.list_transactions('test-prop')), total)
+    
+def test_depreciation_after_impairment(test_sample_property_session, test_property_service):
+    schedule = DepreciationSchedule(useful_life=2, freq='quarter', salvage_value=300)
+    # first year posted yearly, then continue quarterly
+    test_property_service.add_depreciation_schedule(
+        'test-prop', 
+        DepreciationSchedule(useful_life=2, freq='year', salvage_value=300), 
+        until=date(2024, 12, 31)
+    )
+    test_property_service.add_property_trans(
+        PropertyTransaction(
+            property_id='test-prop',
+            trans_dt=date(2025, 2, 1),
+            trans_type=PropertyTransactionType.IMPAIRMENT,
+            trans_amount=1000
+        )
+    )
+    trial = test_property_service.trial_depreciation_schedule('test-prop', schedule)
+    # 2024 not charged again, impairment in Q1 reduces the base
+    assert [t.trans_dt for t in trial] == [date(2025, 3, 31), date(2025, 6, 30), date(2025, 9, 30), date(2025, 12, 31)]
+    assert math.isclose(trial[0].trans_amount, (9300 - 300 - 4500 - 1000) / 4)
+    # depreciation + impairment never go beyond cost - salvage
+    written_down = sum(t.trans_amount for t in test_property_service.list_transactions('test-prop'))
+    assert math.isclose(written_down + sum(t.trans_amount for t in trial), 9300 - 300)
+    
+    # rest of the base impaired after Q1, nothing left to depreciate
+    test_property_service.add_property_trans(
+        PropertyTransaction(
+            property_id='test-prop',
+            trans_dt=date(2025, 4, 1),
+            trans_type=PropertyTransactionType.IMPAIRMENT,
+            trans_amount=3500 - trial[0].trans_amount
+        )
+    )
+    assert [t.trans_dt for t in test_property_service.trial_depreciation_schedule('test-prop', schedule)] == [date(2025, 3, 31)]
@@ -78,9 +78,8 @@ def test_property(session_with_sample_choa, sample_property, test_property_servi
     assert _property == sample_property
     _journal_ = test_journal_service.get_journal(_journal.journal_id)
     assert _journal_ == _journal
-    with pytest.raises(NotExistError):
-        # original journal should be deleted
-        test_journal_service.get_journal(_jrn_id)
+    # original journal should be updated in place
+    assert _journal.journal_id == _jrn_id
     
     # test delete property
     with pytest.raises(NotExistError):
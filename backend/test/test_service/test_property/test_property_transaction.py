@@ -86,13 +86,48 @@ def test_property_trans(test_sample_property_session, sample_depreciation, test_
     assert _property_tans == sample_depreciation
     _journal_ = test_journal_service.get_journal(_journal.journal_id)
     assert _journal_ == _journal
-    with pytest.raises(NotExistError):
-        # original journal should be deleted
-        test_journal_service.get_journal(_jrn_id)
+    # original journal should be updated in place
+    assert _journal.journal_id == _jrn_id
     
     # test delete property_trans
     with pytest.raises(NotExistError):
         test_property_service.delete_property_trans('random-property_trans')
     test_property_service.delete_property_trans(sample_depreciation.trans_id)
     with pytest.raises(NotExistError):
-        test_property_service.get_property_trans_journal(sample_depreciation.trans_id)
\ No newline at end of file
+        test_property_service.get_property_trans_journal(sample_depreciation.trans_id)
+
+def test_acc_stats(test_sample_property_session, sample_property, sample_depreciation, sample_appreciation, test_property_service):
+    test_property_service.add_property_trans(sample_depreciation)
+    appreciation = sample_appreciation.model_copy(update={'trans_dt': date(2024, 3, 1), 'trans_amount': 200})
+    test_property_service.add_property_trans(appreciation)
+    other = sample_property.model_copy(update={'property_id': 'test-prop2', 'pur_price': 5000, 'tax': 0})
+    test_property_service.add_property(other)
+    
+    stat = test_property_service.get_acc_stat('test-prop', date(2024, 2, 15))
+    assert stat.acc_depreciation == 500
+    assert stat.acc_appreciation == 0
+    assert stat.value == 8800
+    
+    # all properties in one go, same as one by one
+    stats = test_property_service.get_acc_stats(date(2024, 3, 15))
+    assert [s.property_id for s in stats] == ['test-prop', 'test-prop2']
+    for s in stats:
+        single = test_property_service.get_acc_stat(s.property_id, date(2024, 3, 15))
+        assert s.value == single.value
+        assert s.acc_depreciation == single.acc_depreciation
+        assert s.acc_appreciation == single.acc_appreciation
+    assert stats[0].value == 9000
+    assert stats[1].value == 5000
+    assert test_property_service.get_acc_stats(date(2023, 12, 31)) == []
+    
+    # bucketed by type, cost not inflated by transactions
+    buckets = test_property_service.get_acc_stats_by_type(date(2024, 3, 15))
+    assert len(buckets) == 1
+    assert buckets[0].property_type == PropertyType.EQUIP
+    assert buckets[0].num_properties == 2
+    assert buckets[0].pur_cost == 14300
+    assert buckets[0].value == 14000
+    
+    test_property_service.delete_property_trans(sample_depreciation.trans_id)
+    test_property_service.delete_property_trans(appreciation.trans_id)
+    test_property_service.delete_property('test-prop2')
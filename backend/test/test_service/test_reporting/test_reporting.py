@@ -0,0 +1,98 @@
+from datetime import date
+import pytest
+from src.app.model.enums import AcctType, EntryType, JournalSrc
+from src.app.model.exceptions import OpNotPermittedError
+from src.app.model.journal import Entry, Journal
+
+
+@pytest.fixture
+def test_reporting_service(test_journal_service, test_acct_service, test_setting_service):
+    from src.app.service.reporting import ReportingService
+    
+    return ReportingService(
+        journal_service=test_journal_service,
+        acct_service=test_acct_service,
+        setting_service=test_setting_service
+    )
+    
+@pytest.fixture
+def session_with_journals(session_with_sample_choa, test_journal_service, test_acct_service, test_setting_service):
+    base_cur = test_setting_service.get_base_currency()
+    bank = test_acct_service.get_account('acct-bank')
+    journals = []
+    for i, (jrn_date, amount) in enumerate([
+        (date(2024, 1, 15), 100), (date(2024, 2, 10), 250), 
+        (date(2024, 2, 28), 40), (date(2024, 5, 1), 75)
+    ]):
+        journal = Journal(
+            journal_id=f'jrn-report-{i}',
+            jrn_date=jrn_date,
+            entries=[
+                Entry(
+                    entry_type=EntryType.DEBIT,
+                    acct=bank,
+                    cur_incexp=None,
+                    amount=amount * 2,
+                    amount_base=amount * 2,
+                    description=None
+                ),
+                Entry(
+                    entry_type=EntryType.CREDIT,
+                    acct=test_acct_service.get_account('acct-consul'),
+                    cur_incexp=base_cur,
+                    amount=amount * 3,
+                    amount_base=amount * 3,
+                    description=None
+                ),
+                Entry(
+                    entry_type=EntryType.DEBIT,
+                    acct=test_acct_service.get_account('acct-meal'),
+                    cur_incexp=base_cur,
+                    amount=amount,
+                    amount_base=amount,
+                    description=None
+                ),
+            ],
+            jrn_src=JournalSrc.MANUAL,
+            note='report journal'
+        )
+        test_journal_service.add_journal(journal)
+        journals.append(journal)
+        
+    yield journals
+    
+    for journal in journals:
+        test_journal_service.delete_journal(journal.journal_id)
+
+def test_income_statement_matrix(session_with_journals, test_reporting_service):
+    matrix = test_reporting_service.get_income_statement_matrix(
+        date(2024, 1, 10), date(2024, 6, 30), freq='month'
+    )
+    periods = matrix['periods']
+    assert len(periods) == 6
+    assert periods[0]['start_dt'] == date(2024, 1, 10)
+    assert periods[-1]['end_dt'] == date(2024, 6, 30)
+    
+    # every period matches the single period statement
+    for i, period in enumerate(periods):
+        single = test_reporting_service.get_income_statment_tree(period['start_dt'], period['end_dt'])
+        for acct_type in (AcctType.INC, AcctType.EXP):
+            assert matrix['tree'][acct_type]['chart_summary']['net_base'][i] == pytest.approx(
+                single[acct_type]['chart_summary']['net_base']
+            )
+    
+    inc = matrix['tree'][AcctType.INC]['chart_summary']['net_base']
+    exp = matrix['tree'][AcctType.EXP]['chart_summary']['net_base']
+    assert inc == pytest.approx([300, 870, 0, 0, 225, 0])
+    assert exp == pytest.approx([100, 290, 0, 0, 75, 0])
+    assert matrix['net_income'] == pytest.approx([i - e for i, e in zip(inc, exp)])
+    
+    yearly = test_reporting_service.get_income_statement_matrix(
+        date(2024, 1, 1), date(2024, 12, 31), freq='year'
+    )
+    assert yearly['net_income'] == pytest.approx([sum(matrix['net_income'])])
+    
+    with pytest.raises(OpNotPermittedError):
+        test_reporting_service.get_income_statement_matrix(date(2024, 2, 1), date(2024, 1, 1), freq='month')
+    with pytest.raises(OpNotPermittedError):
+        test_reporting_service.get_income_statement_matrix(date(1900, 1, 1), date(2024, 1, 1), freq='month')
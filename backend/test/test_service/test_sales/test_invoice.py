@@ -268,9 +268,8 @@ def test_invoice(session_with_sample_choa, sample_invoice, test_sales_service, t
     assert _invoice == sample_invoice
     _journal_ = test_journal_service.get_journal(_journal.journal_id)
     assert _journal_ == _journal
-    with pytest.raises(NotExistError):
-        # original journal should be deleted
-        test_journal_service.get_journal(_jrn_id)
+    # original journal should be updated in place
+    assert _journal.journal_id == _jrn_id
     
     # test delete invoice
     with pytest.raises(NotExistError):
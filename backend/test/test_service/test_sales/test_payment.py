@@ -99,9 +99,8 @@ def test_payment(sample_payment, test_sales_service, test_journal_service):
     assert _payment == sample_payment
     _journal_ = test_journal_service.get_journal(_journal.journal_id)
     assert _journal_ == _journal
-    with pytest.raises(NotExistError):
-        # original journal should be deleted
-        test_journal_service.get_journal(_jrn_id)
+    # original journal should be updated in place
+    assert _journal.journal_id == _jrn_id
     
     # test delete payment
     with pytest.raises(NotExistError):
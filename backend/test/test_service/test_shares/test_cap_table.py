@@ -0,0 +1,41 @@
+from datetime import date
+import pytest
+from src.app.model.exceptions import OpNotPermittedError
+
+
+def test_cap_table(session_with_sample_choa, sample_issue, sample_repur, sample_reissue, sample_div, test_shares_service):
+    test_shares_service.add_issue(sample_issue)
+    test_shares_service.add_div(sample_div)
+    test_shares_service.add_repur(sample_repur)
+    test_shares_service.add_issue(sample_reissue)
+    
+    cap = test_shares_service.get_cap_table(date(2024, 1, 1))
+    assert cap.outstanding_shares == 0
+    assert cap.batches == []
+    assert cap.dividends == []
+    
+    cap = test_shares_service.get_cap_table(date(2024, 1, 12))
+    assert cap.issued_shares == 100
+    assert cap.repurchased_shares == 20
+    assert cap.reissued_shares == 0
+    assert cap.outstanding_shares == 80
+    assert cap.dividends[0].num_divs == 1
+    assert cap.dividends[0].div_amt == 1000
+    
+    cap = test_shares_service.get_cap_table(date(2024, 1, 31))
+    assert cap.reissued_shares == 10
+    assert cap.treasury_shares == 10
+    assert cap.outstanding_shares == 90
+    assert [(b.repur_id, b.remaining_shares) for b in cap.batches] == [('sample-repur', 10)]
+    
+    # remaining of the batch is checked without counting the reissue itself
+    test_shares_service._validate_issue(sample_reissue.model_copy(update={'num_shares': 20}))
+    another = sample_reissue.model_copy(update={'issue_id': 'sample-reissue2', 'num_shares': 11})
+    with pytest.raises(OpNotPermittedError):
+        test_shares_service._validate_issue(another)
+    test_shares_service._validate_issue(another.model_copy(update={'num_shares': 10}))
+    
+    test_shares_service.delete_issue(sample_reissue.issue_id)
+    test_shares_service.delete_repur(sample_repur.repur_id)
+    test_shares_service.delete_div(sample_div.div_id)
+    test_shares_service.delete_issue(sample_issue.issue_id)
@@ -75,9 +75,8 @@ def test_div(session_with_sample_choa, sample_div, test_shares_service, test_jou
     assert _div == sample_div
     _journal_ = test_journal_service.get_journal(_journal.journal_id)
     assert _journal_ == _journal
-    with pytest.raises(NotExistError):
-        # original journal should be deleted
-        test_journal_service.get_journal(_jrn_id)
+    # original journal should be updated in place
+    assert _journal.journal_id == _jrn_id
     
     # test delete div
     with pytest.raises(NotExistError):
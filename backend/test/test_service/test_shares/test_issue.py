@@ -178,9 +178,8 @@ def test_issue(session_with_sample_choa, sample_issue, test_shares_service, test
     assert _issue == sample_issue
     _journal_ = test_journal_service.get_journal(_journal.journal_id)
     assert _journal_ == _journal
-    with pytest.raises(NotExistError):
-        # original journal should be deleted
-        test_journal_service.get_journal(_jrn_id)
+    # original journal should be updated in place
+    assert _journal.journal_id == _jrn_id
     
     # test delete issue
     with pytest.raises(NotExistError):
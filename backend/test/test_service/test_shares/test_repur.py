@@ -90,9 +90,8 @@ def test_repur(session_with_sample_choa, sample_repur, test_shares_service, test
     assert _repur == sample_repur
     _journal_ = test_journal_service.get_journal(_journal.journal_id)
     assert _journal_ == _journal
-    with pytest.raises(NotExistError):
-        # original journal should be deleted
-        test_journal_service.get_journal(_jrn_id)
+    # original journal should be updated in place
+    assert _journal.journal_id == _jrn_id
     
     # test delete repur
     with pytest.raises(NotExistError):
@@ -24,7 +24,9 @@ def client(test_dao_access, test_common_dao_access):
     init_dao = initDao(common_engine=test_dao_access.common_engine)
     
     with (
-        mock.patch.object(init_dao, "init_user_db", return_value=NoneSchema)
+        mock.patch.object(init_dao, "init_user_db", return_value=NoneSchema),
+        # no background workers against the real database
+        mock.patch("src.web.main.job_runner")
     ):
         #app.dependency_overrides[engine_factory('common')] = lambda: common_engine
         #app.dependency_overrides[get_current_user] = lambda: test_user
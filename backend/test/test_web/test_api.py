@@ -1,3 +1,7 @@
+import json
+import logging
+from unittest import mock
+
 
 
 def test_healthz_endpoint(client):
@@ -20,4 +24,228 @@ def test_register(client):
 def test_entity_endpoint(authorized_client):
     response = authorized_client.get("/api/v1/entity/contact/list")
     assert response.status_code == 200
-    assert response.json() == []
\ No newline at end of file
+    assert response.json() == []
+    
+def test_batch_endpoint(authorized_client):
+    response = authorized_client.post(
+        "/api/v1/batch",
+        json=[
+            {"method": "GET", "path": "/entity/contact/list"},
+            {"method": "GET", "path": "/entity/contact/get/random-id"},
+            {"method": "GET", "path": "/settings/data_versions"},
+            {"method": "GET", "path": "/random/path"},
+        ]
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert len(results) == 4
+    assert results[0] == {"status_code": 200, "body": []}
+    assert results[1]["status_code"] == 521 # not exist error
+    assert results[2]["status_code"] == 200
+    assert set(results[2]["body"].keys()) == {'accounts', 'journals', 'items', 'entities'}
+    assert results[3]["status_code"] == 404
+    
+    # streaming endpoint rejected, unexpected error only fails its own item
+    with mock.patch("src.app.service.entity.EntityService.list_contact", side_effect=RuntimeError("boom")):
+        response = authorized_client.post(
+            "/api/v1/batch",
+            json=[
+                {"method": "GET", "path": "/journal/export"},
+                {"method": "GET", "path": "/entity/contact/list"},
+                {"method": "GET", "path": "/settings/data_versions"},
+            ]
+        )
+    assert response.status_code == 200
+    assert [r["status_code"] for r in response.json()] == [501, 500, 200]
+    
+def test_journal_export_endpoint(authorized_client):
+    response = authorized_client.get("/api/v1/journal/export", params={"fmt": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0].startswith("journal_id,jrn_date")
+
+    
+def test_sql_stats_streamed_body(authorized_client, engine, caplog):
+    from sqlalchemy import text
+    
+    def _export(*args, **kwargs):
+        # queries issued after headers are sent
+        yield 'header\n'
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text('SELECT 1'))
+        yield 'row\n'
+    
+    with (
+        mock.patch("src.app.service.journal.JournalService.export_entries", side_effect=_export),
+        caplog.at_level(logging.INFO)
+    ):
+        response = authorized_client.get("/api/v1/journal/export")
+    assert response.text == 'header\nrow\n'
+    
+    logged = [r.getMessage() for r in caplog.records if r.getMessage().startswith('sql_stats ')]
+    assert len(logged) == 1
+    summary = json.loads(logged[0].removeprefix('sql_stats '))
+    assert summary['path'] == "/api/v1/journal/export"
+    assert summary['query_count'] >= 3
+
+    
+def test_sql_stats_header(authorized_client):
+    response = authorized_client.get("/api/v1/entity/contact/list")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert 'db;dur=' in timing
+    assert 'app;dur=' in timing
+    
+def test_profiling(authorized_client, test_user):
+    auth_secret = {'auth': {'secret_key': 'abcdefghijklmnopqrstuvwxyz', 'algorithm': 'HS256'}}
+    with (
+        mock.patch("src.web.main.get_secret", return_value=auth_secret),
+        mock.patch("src.app.service.auth.get_secret", return_value=auth_secret),
+    ):
+        # not profiled without header
+        response = authorized_client.get("/api/v1/entity/contact/list")
+        assert "x-profile-id" not in response.headers
+        
+        # admin request with profile header
+        response = authorized_client.get("/api/v1/entity/contact/list", headers={"X-Profile": "1"})
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+        
+        response = authorized_client.get("/api/v1/management/profiling/get", params={"profile_id": profile_id})
+        assert response.status_code == 200
+        assert response.json()["path"] == "/api/v1/entity/contact/list"
+        assert response.json()["user_id"] == test_user.user_id
+        response = authorized_client.get("/api/v1/management/profiling/collapsed", params={"profile_id": profile_id})
+        assert response.status_code == 200
+        response = authorized_client.get("/api/v1/management/profiling/top", params={"profile_id": profile_id})
+        assert response.status_code == 200
+        
+        # flag tenant for next request only
+        response = authorized_client.post(
+            "/api/v1/management/profiling/flag_user", 
+            params={"user_id": test_user.user_id, "num_requests": 1}
+        )
+        assert response.status_code == 200
+        assert "x-profile-id" in authorized_client.get("/api/v1/entity/contact/list").headers
+        assert "x-profile-id" not in authorized_client.get("/api/v1/entity/contact/list").headers
+        
+        response = authorized_client.get("/api/v1/management/profiling/list")
+        assert len(response.json()) == 2
+        
+        response = authorized_client.get("/api/v1/management/profiling/get", params={"profile_id": "prof-random"})
+        assert response.status_code == 521
+        
+def test_profiler_thread_scope():
+    import threading
+    import time
+    from src.app.utils.profiler import SamplingProfiler
+    
+    def _busy_tracked(profiler, stop):
+        with profiler.track_current_thread():
+            while not stop.is_set():
+                time.sleep(0.001)
+            
+    def _busy_other(stop):
+        while not stop.is_set():
+            time.sleep(0.001)
+    
+    # another request sharing the threadpool must not show up
+    profiler = SamplingProfiler(interval=0.001)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_busy_tracked, args=(profiler, stop)),
+        threading.Thread(target=_busy_other, args=(stop,)),
+    ]
+    profiler.start()
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    stop.set()
+    for t in threads:
+        t.join()
+    profiler.stop()
+    
+    assert profiler.num_samples > 0
+    assert all('_busy_tracked' in stack for stack in profiler.stacks)
+    assert not any('_busy_other' in stack for stack in profiler.stacks)
+    
+def test_metrics_endpoint(authorized_client):
+    auth_secret = {'auth': {'secret_key': 'abcdefghijklmnopqrstuvwxyz', 'algorithm': 'HS256'}}
+    with mock.patch("src.app.service.auth.get_secret", return_value=auth_secret):
+        # admin only
+        response = authorized_client.get("/metrics", headers={"Authorization": "Bearer random"})
+        assert response.status_code == 403
+        authorized_client.get("/api/v1/entity/contact/list")
+        response = authorized_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'http_requests_total{method="GET",route="/api/v1/entity/contact/list",status="200"}' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/entity/contact/list",le="+Inf"}' in text
+    assert 'http_requests_in_progress' in text
+    assert 'cache_requests_total' in text
+    
+def test_file_stream_endpoints(authorized_client, testing_bucket_path):
+    content = bytes(range(256)) * 40
+    
+    with mock.patch("src.app.dao.files.get_files_bucket", return_value=testing_bucket_path):
+        response = authorized_client.post(
+            "/api/v1/misc/upload_file",
+            files=[('files', ('scan.png', content, 'image/png'))]
+        )
+        assert response.status_code == 200
+        file_id = response.json()[0]
+        # same name again keeps the file id and replaces the content
+        response = authorized_client.post(
+            "/api/v1/misc/upload_file",
+            files=[('files', ('scan.png', b'other', 'image/png'))]
+        )
+        assert response.json() == [file_id]
+        assert authorized_client.get(f"/api/v1/misc/download_file/{file_id}").content == b'other'
+        response = authorized_client.post(
+            "/api/v1/misc/upload_file",
+            files=[('files', ('scan.png', content, 'image/png'))]
+        )
+        assert response.json() == [file_id]
+        
+        response = authorized_client.get(f"/api/v1/misc/download_file/{file_id}")
+        assert response.status_code == 200
+        assert response.content == content
+        assert response.headers["content-length"] == str(len(content))
+        assert response.headers["content-type"] == "image/png"
+        etag = response.headers["etag"]
+        
+        response = authorized_client.get(f"/api/v1/misc/download_file/{file_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        
+        response = authorized_client.get(f"/api/v1/misc/download_file/{file_id}", headers={"Range": "bytes=100-199"})
+        assert response.status_code == 206
+        assert response.content == content[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{len(content)}"
+        response = authorized_client.get(f"/api/v1/misc/download_file/{file_id}", headers={"Range": "bytes=-10"})
+        assert response.content == content[-10:]
+        response = authorized_client.get(f"/api/v1/misc/download_file/{file_id}", headers={"Range": f"bytes={len(content)}-"})
+        assert response.status_code == 416
+        # inverted range is ignored
+        response = authorized_client.get(f"/api/v1/misc/download_file/{file_id}", headers={"Range": "bytes=500-100"})
+        assert response.status_code == 200
+        assert response.content == content
+        assert response.headers["content-length"] == str(len(content))
+        
+        # json api still works on top of binary storage
+        response = authorized_client.get(f"/api/v1/misc/get_file/{file_id}")
+        assert response.json()["content"].encode('latin-1') == content
+        
+        # logo
+        response = authorized_client.post("/api/v1/settings/set_logo", files=[('logo', ('logo.png', content, 'image/png'))])
+        assert response.status_code == 200
+        response = authorized_client.post("/api/v1/settings/set_logo", files=[('logo', ('logo.png', content[:50], 'image/png'))])
+        assert response.status_code == 200
+        response = authorized_client.get("/api/v1/settings/download_logo")
+        assert response.content == content[:50]
+        
+        authorized_client.delete(f"/api/v1/misc/delete_file/{file_id}")
+        authorized_client.delete("/api/v1/misc/delete_file/settings-logo")
+        assert authorized_client.get(f"/api/v1/misc/download_file/{file_id}").status_code == 521
@@ -5,7 +5,7 @@ import uuid
 import streamlit as st
 import streamlit_shadcn_ui as ui
 from utils.apis import get_account, get_all_accounts, get_blsh_balance, get_incexp_flow, \
-    get_base_currency, list_entry_by_acct, get_logo, get_comp_contact
+    get_base_currency, list_entry_by_acct, get_acct_flows_by_period, get_logo, get_comp_contact
 from utils.tools import DropdownSelect
 from utils.enums import CurType, EntryType, AcctType
 from utils.apis import cookie_manager
@@ -21,25 +21,102 @@ with st.sidebar:
     st.markdown(f"Hello, :rainbow[**{comp_name}**]")
     st.logo(get_logo(access_token=access_token), size='large')
 
-def group_entries_by_dates(entries: list[dict], year: int) -> dict[int, dict[int, list[dict]]]:
-    # group entries by month and day
+def month_end(dt: date) -> date:
+    return (dt.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+def group_flows_by_month(daily_flows: list[dict]) -> dict[int, list[dict]]:
+    # daily aggregates (from server) keyed by year-month, latest day first
+    grouped = OrderedDict()
+    for flow in sorted(daily_flows, key=lambda x: x['period_start'], reverse=True):
+        flow_dt = datetime.strptime(flow['period_start'], '%Y-%m-%d').date()
+        grouped.setdefault(flow_dt.year * 100 + flow_dt.month, []).append(flow)
+    return grouped
+
+def group_entries_by_day(entries: list[dict]) -> dict[int, list[dict]]:
+    # entries of a single month
     grouped = OrderedDict()
     for entry in entries:
         entry_dt = datetime.strptime(entry['jrn_date'], '%Y-%m-%d').date()
-        if entry_dt.year != year:
-            continue
+        grouped.setdefault(entry_dt.day, []).append(entry)
+    return grouped
+
+def show_entries(_ents: list[dict], amount_cur: str | None, balance: bool):
+    # amount_cur: fixed currency (balance sheet), or None to use entry currency (income/expense)
+    for i, ent in enumerate(_ents):
+        if i != 0:
+            st.divider()
         
-        yr_mnth = entry_dt.year * 100 + entry_dt.month
-        if yr_mnth not in grouped:
-            grouped[yr_mnth] = OrderedDict({
-                entry_dt.day: [entry] 
-            })
+        if ent['entry_type'] == 1:
+            direction = 'Debit'
+            mutate = (1 if debit_direction == 'Inflow' else -1)
+        
+        else:
+            direction = 'Credit'
+            mutate = (1 if credit_direction == 'Inflow' else -1)
+            
+        amount_raw = mutate * ent['amount_raw']
+        if amount_raw < 0:
+            color = "#FF033E"
+            bg_color = 'red'
         else:
-            if entry_dt.day not in grouped[yr_mnth]:
-                grouped[yr_mnth][entry_dt.day] = [entry]
+            color = '#008000'
+            bg_color = 'green'
+
+        st.markdown(
+            body=f"**:grey[Entry ID]**: :grey[{ent['entry_id']}] | **:grey[Journal ID]**: :grey[{ent['journal_id']}] | **:{bg_color}-background[{direction}]**",
+        )
+        
+        cols = st.columns([2, 1], vertical_alignment='bottom')
+        with cols[0]:
+            cur = amount_cur or CurType(ent['cur_incexp']).name
+            amount_str = r"$\text{\small  " + f"{cur} " + r"\large \textcolor{" + color + "}{" + f"{amount_raw:,.2f}" +  r" }}$"
+            st.markdown(amount_str)
+        
+        with cols[1]:
+            if balance:
+                base_amount_str = r"$\text{\small Balance: \ \ " + r"\normalsize " + f"{ent['cum_acount_raw']:,.2f}" +  r" }$"
             else:
-                grouped[yr_mnth][entry_dt.day].append(entry)
-    return grouped
+                base_amount_str = r"$\text{\small (" + f"{CurType(base_cur).name}" + ") "  + r"\normalsize " + f"{ent['amount_base']:,.2f}" +  r" }$"
+            st.markdown(base_amount_str)
+        
+        if ent['description'] is not None:
+            st.text_area(label="Note", value=ent['description'], disabled=True, height=70, key=str(uuid.uuid4()))
+
+def show_days(yr_mnth: int, day_flows: list[dict], amount_cur: str | None, balance: bool):
+    # one card per day from daily aggregates, individual entries only fetched on demand for this month
+    mnth_start_dt = date(yr_mnth // 100, yr_mnth % 100, 1)
+    grped_entries = {}
+    if st.toggle('Show entries', key=f'show_entries_{acct_id}_{yr_mnth}'):
+        entries = list_entry_by_acct(
+            acct_id, 
+            min_dt=mnth_start_dt, 
+            max_dt=month_end(mnth_start_dt), 
+            access_token=access_token
+        )
+        grped_entries = group_entries_by_day(entries)
+    
+    for day_flow in day_flows:
+        dt = datetime.strptime(day_flow['period_start'], '%Y-%m-%d')
+        with st.container(border=True):
+            col_entry = st.columns([1, 6])
+            with col_entry[0]:
+                st.metric(
+                    label=dt.strftime("%A"),
+                    value=dt.strftime("%d"),
+                    delta=None
+                )
+            
+            with col_entry[1]:
+                if balance:
+                    net, closing = day_flow['net_raw'], day_flow['closing_raw']
+                    summary = f"**:grey[Net Flow]**: {net:,.2f} | **:grey[Balance]**: {closing:,.2f}"
+                else:
+                    summary = f"**:grey[Net Flow]** ({CurType(base_cur).name}): {day_flow['net_base']:,.2f}"
+                st.markdown(f"**:grey[# of entries]**: {day_flow['num_entry']:d} | " + summary)
+                
+                if dt.day in grped_entries:
+                    st.divider()
+                    show_entries(grped_entries[dt.day], amount_cur=amount_cur, balance=balance)
 
 all_accts = get_all_accounts(access_token=access_token)
 acct_options = [
@@ -150,30 +227,37 @@ if acct['acct_type'] in (1, 2, 3):
         options=list(range(1970, date.today().year + 1)[::-1])
     )
     
-    entries = list_entry_by_acct(acct_id, access_token=access_token)
-        
-    # list entries
-    grped_entries = group_entries_by_dates(entries, year)
-    if len(grped_entries) == 0:
+    monthly_flows = get_acct_flows_by_period(
+        acct_id=acct_id,
+        start_dt=date(year, 1, 1),
+        end_dt=date(year, 12, 31),
+        freq='month',
+        access_token=access_token
+    )
+    daily_flows = get_acct_flows_by_period(
+        acct_id=acct_id,
+        start_dt=date(year, 1, 1),
+        end_dt=date(year, 12, 31),
+        freq='day',
+        access_token=access_token
+    )
+    
+    # list monthly and daily summary
+    grped_flows = group_flows_by_month(daily_flows)
+    if len(monthly_flows) == 0:
         st.warning(f"No entry found for year {year}, try another year!", icon='🥵')
     
-    for yr_mnth in grped_entries.keys():
-        yr_mnth_dt = datetime(yr_mnth // 100, yr_mnth % 100, 1)
+    for flow_stat in reversed(monthly_flows):
+        yr_mnth_dt = datetime.strptime(flow_stat['period_start'], '%Y-%m-%d').date()
+        yr_mnth = yr_mnth_dt.year * 100 + yr_mnth_dt.month
         with st.expander(label=f"**{yr_mnth_dt.strftime('%b %Y')}**", expanded=True, icon='📅'):
-            # TODO: add monthly stat here
-            mnth_end_dt = (yr_mnth_dt.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-            flow_stat = get_incexp_flow(
-                acct_id=acct_id,
-                start_dt=yr_mnth_dt,
-                end_dt=mnth_end_dt,
-                access_token=access_token
-            )
+            mnth_end_dt = month_end(yr_mnth_dt)
             flow_cols = st.columns([2, 1, 1], gap='small', border=False)
             with flow_cols[0]:
                 ui.metric_card(
                     title="Net Flow", 
                     content=f"{CurType(acct['currency']).name} {flow_stat['net_raw']:,.2f}", 
-                    description=f"As of {mnth_end_dt.date()}", 
+                    description=f"Balance {flow_stat['closing_raw']:,.2f} as of {mnth_end_dt}", 
                     key=str(uuid.uuid4())
                 )
                 
@@ -193,54 +277,12 @@ if acct['acct_type'] in (1, 2, 3):
                     key=str(uuid.uuid4())
                 )
             
-            for day, _ents in grped_entries[yr_mnth].items():
-                with st.container(border=True):
-                    col_entry = st.columns([1, 6])
-                    with col_entry[0]:
-                        dt = datetime(yr_mnth // 100, yr_mnth % 100, day)
-                        st.metric(
-                            label=dt.strftime("%A"),
-                            value=dt.strftime("%d"),
-                            delta=None
-                        )
-                    
-                    with col_entry[1]:
-                        for i, ent in enumerate(_ents):
-                            if i != 0:
-                                st.divider()
-                            
-                            if ent['entry_type'] == 1:
-                                direction = 'Debit'
-                                mutate = (1 if debit_direction == 'Inflow' else -1)
-                            
-                            else:
-                                direction = 'Credit'
-                                mutate = (1 if credit_direction == 'Inflow' else -1)
-                                
-                            amount_raw = mutate * ent['amount_raw']
-                            if amount_raw < 0:
-                                color = "#FF033E"
-                                bg_color = 'red'
-                            else:
-                                color = '#008000'
-                                bg_color = 'green'
-
-                            st.markdown(
-                                body=f"**:grey[Entry ID]**: :grey[{ent['entry_id']}] | **:grey[Journal ID]**: :grey[{ent['journal_id']}] | **:{bg_color}-background[{direction}]**",
-                            )
-                            
-                            cols = st.columns([2, 1], vertical_alignment='bottom')
-                            with cols[0]:
-                                
-                                amount_str = r"$\text{\small  " + f"{CurType(acct['currency']).name} " + r"\large \textcolor{" + color + "}{" + f"{amount_raw:,.2f}" +  r" }}$"
-                                st.markdown(amount_str)
-                            
-                            with cols[1]:
-                                base_amount_str = r"$\text{\small Balance: \ \ " + r"\normalsize " + f"{ent['cum_acount_raw']:,.2f}" +  r" }$"
-                                st.markdown(base_amount_str)
-                            
-                            if ent['description'] is not None:
-                                st.text_area(label="Note", value=ent['description'], disabled=True, height=70, key=str(uuid.uuid4()))
+            show_days(
+                yr_mnth, 
+                grped_flows.get(yr_mnth, []), 
+                amount_cur=CurType(acct['currency']).name, 
+                balance=True
+            )
     
     
 else:
@@ -284,24 +326,30 @@ else:
             key=str(uuid.uuid4())
         )
     
-    entries = list_entry_by_acct(acct_id, access_token=access_token)
-        
-    # list entries
-    grped_entries = group_entries_by_dates(entries, year)
-    if len(grped_entries) == 0:
+    monthly_flows = get_acct_flows_by_period(
+        acct_id=acct_id,
+        start_dt=date(year, 1, 1),
+        end_dt=date(year, 12, 31),
+        freq='month',
+        access_token=access_token
+    )
+    daily_flows = get_acct_flows_by_period(
+        acct_id=acct_id,
+        start_dt=date(year, 1, 1),
+        end_dt=date(year, 12, 31),
+        freq='day',
+        access_token=access_token
+    )
+    
+    # list monthly and daily summary
+    grped_flows = group_flows_by_month(daily_flows)
+    if len(monthly_flows) == 0:
         st.warning(f"No entry found for year {year}, try another year!", icon='🥵')
         
-    for yr_mnth in grped_entries.keys():
-        yr_mnth_dt = datetime(yr_mnth // 100, yr_mnth % 100, 1)
+    for flow_stat in reversed(monthly_flows):
+        yr_mnth_dt = datetime.strptime(flow_stat['period_start'], '%Y-%m-%d').date()
+        yr_mnth = yr_mnth_dt.year * 100 + yr_mnth_dt.month
         with st.expander(label=f"**{yr_mnth_dt.strftime('%b %Y')}**", expanded=True, icon='📅'):
-            # TODO: add monthly stat here
-            mnth_end_dt = (yr_mnth_dt.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-            flow_stat = get_incexp_flow(
-                acct_id=acct_id,
-                start_dt=yr_mnth_dt,
-                end_dt=mnth_end_dt,
-                access_token=access_token
-            )
             flow_cols = st.columns([2, 1, 1], gap='small', border=False)
             with flow_cols[0]:
                 ui.metric_card(
@@ -327,51 +375,9 @@ else:
                     key=str(uuid.uuid4())
                 )
             
-            for day, _ents in grped_entries[yr_mnth].items():
-                with st.container(border=True):
-                    col_entry = st.columns([1, 6])
-                    with col_entry[0]:
-                        dt = datetime(yr_mnth // 100, yr_mnth % 100, day)
-                        st.metric(
-                            label=dt.strftime("%A"),
-                            value=dt.strftime("%d"),
-                            delta=None
-                        )
-                    
-                    with col_entry[1]:
-                        for i, ent in enumerate(_ents):
-                            if i != 0:
-                                st.divider()
-                            
-                            if ent['entry_type'] == 1:
-                                direction = 'Debit'
-                                mutate = (1 if debit_direction == 'Inflow' else -1)
-                            
-                            else:
-                                direction = 'Credit'
-                                mutate = (1 if credit_direction == 'Inflow' else -1)
-                                
-                            amount_raw = mutate * ent['amount_raw']
-                            if amount_raw < 0:
-                                color = "#FF033E"
-                                bg_color = 'red'
-                            else:
-                                color = '#008000'
-                                bg_color = 'green'
-
-                            st.markdown(
-                                body=f"**:grey[Entry ID]**: :grey[{ent['entry_id']}] | **:grey[Journal ID]**: :grey[{ent['journal_id']}] | **:{bg_color}-background[{direction}]**",
-                            )
-                            
-                            cols = st.columns([2, 1], vertical_alignment='bottom')
-                            with cols[0]:
-                                
-                                amount_str = r"$\text{\small  " + f"{CurType(ent['cur_incexp']).name} " + r"\large \textcolor{" + color + "}{" + f"{amount_raw:,.2f}" +  r" }}$"
-                                st.markdown(amount_str)
-                            
-                            with cols[1]:
-                                base_amount_str = r"$\text{\small (" + f"{CurType(base_cur).name}" + ") "  + r"\normalsize " + f"{ent['amount_base']:,.2f}" +  r" }$"
-                                st.markdown(base_amount_str)
-                            
-                            if ent['description'] is not None:
-                                st.text_area(label="Note", value=ent['description'], disabled=True, height=70)
\ No newline at end of file
+            show_days(
+                yr_mnth, 
+                grped_flows.get(yr_mnth, []), 
+                amount_cur=None, 
+                balance=False
+            )
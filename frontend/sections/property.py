@@ -10,7 +10,7 @@ import streamlit.components.v1 as components
 from datetime import datetime, date, timedelta
 from utils.apis import get_file, list_property, get_account, get_property_journal, get_accounts_by_type, \
     validate_property, create_journal_from_new_property, get_all_accounts, get_base_currency, \
-    add_property, update_property, delete_property, get_property_stat, get_comp_contact, get_logo
+    add_property, update_property, delete_property, get_property_stat, get_property_stats, get_comp_contact, get_logo
 from utils.enums import PropertyType, PropertyTransactionType, CurType, AcctType, EntryType
 from utils.tools import DropdownSelect, display_number
 from utils.exceptions import NotExistError
@@ -142,9 +142,14 @@ st.subheader("Properties (Fixed Asset)")
 if len(properties) > 0:
     
     prop_stitch = []
+    # book value of all properties in one call
+    stats = {
+        s['property_id']: s 
+        for s in get_property_stats(rep_dt=datetime.now().date(), access_token=access_token)
+    }
     for p in properties:
         acct = get_account(p['pur_acct_id'], access_token=access_token)
-        stat = get_property_stat(p['property_id'], rep_dt=datetime.now().date(), access_token=access_token)    
+        stat = stats.get(p['property_id'], {'value': p['pur_cost']}) # purchased in future
         prop = {
             #'Property ID': p['property_id'],
             'Property': p['property_name'],
@@ -1,4 +1,5 @@
 import math
+from typing import Tuple
 import time
 import uuid
 import pandas as pd
@@ -9,8 +10,8 @@ import streamlit.components.v1 as components
 from datetime import datetime, date, timedelta
 from utils.tools import DropdownSelect
 from utils.enums import AcctType, CurType, EntityType, EntryType, ItemType, JournalSrc, UnitType
-from utils.apis import get_base_currency, list_supplier, list_purchase_invoice, \
-    list_purchase_payment, get_ppurchase_invoices_balance_by_entity, get_comp_contact, get_logo
+from utils.apis import get_base_currency, list_supplier, \
+    list_purchase_payment, get_purchase_invoices_and_balances, get_comp_contact, get_logo
 from utils.apis import cookie_manager
 st.set_page_config(layout="centered")
 if cookie_manager.get("authenticated") != True:
@@ -24,8 +25,13 @@ with st.sidebar:
     st.markdown(f"Hello, :rainbow[**{comp_name}**]")
     st.logo(get_logo(access_token=access_token), size='large')   
        
-def get_purchase_payment_hist() -> list[dict]:
-    invoices = list_purchase_invoice(supplier_ids=[supplier_id], access_token=access_token)
+def get_purchase_payment_hist() -> Tuple[list[dict], list[dict]]:
+    # invoices and outstanding balances come back in one batch call
+    invoices, balances = get_purchase_invoices_and_balances(
+        entity_id=supplier_id,
+        bal_dt=date.today(),
+        access_token=access_token
+    )
     payments = list_purchase_payment(invoice_ids=[i['invoice_id'] for i in invoices], access_token=access_token)
     
     chain = []
@@ -53,7 +59,7 @@ def get_purchase_payment_hist() -> list[dict]:
             'invoice_nums': payment['invoice_num_strs']
         })
         
-    return sorted(chain, key=lambda x: x['trans_dt'], reverse=True)
+    return sorted(chain, key=lambda x: x['trans_dt'], reverse=True), balances
         
 
 
@@ -75,7 +81,7 @@ if len(suppliers) > 0:
     supplier_id = dds_suppliers.get_id(edit_supplier)
     
     # display metrics
-    historys = get_purchase_payment_hist()
+    historys, balances = get_purchase_payment_hist()
 
     total_billed = sum(h['base_amount'] for h in historys if h['direction'] == 'invoice')
     num_billed = sum(1 for h in historys if h['direction'] == 'invoice')
@@ -127,12 +133,6 @@ if len(suppliers) > 0:
 
     tabs = st.tabs(['Oustanding Invoices', 'Transaction History'])
     with tabs[0]:
-        balances = get_ppurchase_invoices_balance_by_entity(
-            entity_id=supplier_id,
-            bal_dt=date.today(),
-            access_token=access_token
-        )
-
         st.subheader("Outstanding Invoices")
         if len(balances) > 0:
             balances_display = pd.DataFrame.from_records([
@@ -1,4 +1,5 @@
 import math
+from typing import Tuple
 import time
 import uuid
 import pandas as pd
@@ -9,8 +10,8 @@ import streamlit.components.v1 as components
 from datetime import datetime, date, timedelta
 from utils.tools import DropdownSelect
 from utils.enums import AcctType, CurType, EntityType, EntryType, ItemType, JournalSrc, UnitType
-from utils.apis import get_base_currency, list_customer, list_sales_invoice, list_sales_payment, \
-    get_psales_invoices_balance_by_entity, get_comp_contact, get_logo
+from utils.apis import get_base_currency, list_customer, list_sales_payment, \
+    get_sales_invoices_and_balances, get_comp_contact, get_logo
 from utils.apis import cookie_manager
 
 st.set_page_config(layout="centered")
@@ -25,8 +26,13 @@ with st.sidebar:
     st.markdown(f"Hello, :rainbow[**{comp_name}**]")
     st.logo(get_logo(access_token=access_token), size='large')
     
-def get_sales_payment_hist() -> list[dict]:
-    invoices = list_sales_invoice(customer_ids=[cust_id], access_token=access_token)
+def get_sales_payment_hist() -> Tuple[list[dict], list[dict]]:
+    # invoices and outstanding balances come back in one batch call
+    invoices, balances = get_sales_invoices_and_balances(
+        entity_id=cust_id,
+        bal_dt=date.today(),
+        access_token=access_token
+    )
     payments = list_sales_payment(invoice_ids=[i['invoice_id'] for i in invoices], access_token=access_token)
     
     chain = []
@@ -54,7 +60,7 @@ def get_sales_payment_hist() -> list[dict]:
             'invoice_nums': payment['invoice_num_strs']
         })
         
-    return sorted(chain, key=lambda x: x['trans_dt'], reverse=True)
+    return sorted(chain, key=lambda x: x['trans_dt'], reverse=True), balances
         
 
 
@@ -76,7 +82,7 @@ if len(customers) > 0:
     cust_id = dds_customers.get_id(edit_customer)
     
     # display metrics
-    historys = get_sales_payment_hist()
+    historys, balances = get_sales_payment_hist()
 
     total_billed = sum(h['base_amount'] for h in historys if h['direction'] == 'invoice')
     num_billed = sum(1 for h in historys if h['direction'] == 'invoice')
@@ -129,12 +135,6 @@ if len(customers) > 0:
     tabs = st.tabs(['Oustanding Invoices', 'Transaction History'])
     
     with tabs[0]:
-        balances = get_psales_invoices_balance_by_entity(
-            entity_id=cust_id,
-            bal_dt=date.today(),
-            access_token=access_token
-        )
-
         st.subheader("Outstanding Invoices")
         if len(balances) > 0:
             balances_display = pd.DataFrame.from_records([
@@ -1,17 +1,21 @@
 import io
+import inspect
 from typing import Any, Tuple
 from datetime import date, datetime, timezone
 from functools import wraps
+from urllib.parse import unquote
 import uuid
 from utils.exceptions import AlreadyExistError, NotExistError, FKNotExistError, \
     FKNoDeleteUpdateError, OpNotPermittedError, NotMatchWithSystemError, UnprocessableEntityError, \
     PermissionDeniedError
-from utils.base import get_req, plain_get_req, post_req, delete_req, put_req
+from utils.base import get_req, plain_get_req, binary_get_req, post_req, delete_req, put_req, batch_req, unpack_batch
 import pandas as pd
 import streamlit as st
 import streamlit_shadcn_ui as ui
 import extra_streamlit_components as stx
 
+DATA_VERSION_TTL = 5 # seconds, bounds staleness from writes made by other sessions
+
 #@st.fragment
 def get_manager():
     return stx.CookieManager(key='login_cookie')
@@ -55,6 +59,39 @@ def message_box(f):
 
     return decorated
 
+@st.cache_data(ttl=DATA_VERSION_TTL)
+@message_box
+def get_data_versions(access_token: str | None = None) -> dict[str, str]:
+    # version token per backend data domain, changes on any write within the domain
+    return get_req(
+        prefix='settings',
+        endpoint='data_versions',
+        access_token=access_token
+    )
+
+def cache_by_data_version(*domains: str):
+    # cache keyed on backend data version of the given domains
+    # stays hot until something in those domains changes, no need to clear after writes
+    def decorator(f):
+        cached = st.cache_data(f)
+        sig = inspect.signature(f)
+        
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            access_token = sig.bind_partial(*args, **kwargs).arguments.get('access_token')
+            versions = get_data_versions(access_token=access_token) or {}
+            kwargs['data_version'] = tuple(versions.get(d) for d in domains)
+            return cached(*args, **kwargs)
+        
+        decorated.clear = cached.clear # type: ignore
+        return decorated
+    
+    return decorator
+
+def batch(requests: list[dict], access_token: str | None = None) -> list:
+    # multiple api calls in one round trip, returns body of each call in order
+    return unpack_batch(batch_req(requests, access_token=access_token))
+
 @message_box
 def login(username: str, password: str) -> bool:
     token_data = post_req(
@@ -104,9 +141,9 @@ def list_city(country_iso2: str, state_iso2: str) -> list[dict]:
         endpoint=f'geo/countries/{country_iso2}/state/{state_iso2}/city/list'
     )
 
-@st.cache_data
+@cache_by_data_version('items')
 @message_box
-def list_item(entity_type: int, access_token: str | None = None) -> list[dict]:
+def list_item(entity_type: int, access_token: str | None = None, data_version: Tuple[str | None, ...] | None = None) -> list[dict]:
     return get_req(
         prefix='item',
         endpoint='list',
@@ -133,7 +170,7 @@ def delete_item(item_id: str, access_token: str | None = None):
         access_token=access_token
     )
     get_item.clear()
-    list_item.clear()
+    get_data_versions.clear()
 
 @message_box
 def add_item(name: str, item_type: int, entity_type: int, unit: int, 
@@ -154,7 +191,7 @@ def add_item(name: str, item_type: int, entity_type: int, unit: int,
         access_token=access_token
     )
     get_item.clear()
-    list_item.clear()
+    get_data_versions.clear()
     
 @message_box
 def update_item(item_id: str, name: str, item_type: int, entity_type: int, unit: int, 
@@ -176,7 +213,7 @@ def update_item(item_id: str, name: str, item_type: int, entity_type: int, unit:
         access_token=access_token
     )
     get_item.clear()
-    list_item.clear()
+    get_data_versions.clear()
 
 
 @message_box
@@ -408,9 +445,9 @@ def update_supplier(supplier_id: str, supplier_name: str, is_business: bool, bil
         access_token=access_token
     )
 
-@st.cache_data
+@cache_by_data_version('accounts')
 @message_box
-def tree_charts(acct_type: int, access_token: str | None = None) -> dict[str, Any]:
+def tree_charts(acct_type: int, access_token: str | None = None, data_version: Tuple[str | None, ...] | None = None) -> dict[str, Any]:
     return get_req(
         prefix='accounts',
         endpoint=f'chart/tree',
@@ -463,9 +500,8 @@ def add_chart(chart: dict, parent_chart_id: str, access_token: str | None = None
         },
         access_token=access_token
     )
-    tree_charts.clear()
+    get_data_versions.clear()
     list_charts.clear()
-    list_accounts_by_chart.clear()
 
 @message_box
 def update_move_chart(chart: dict, parent_chart_id: str, access_token: str | None = None):
@@ -490,9 +526,8 @@ def update_move_chart(chart: dict, parent_chart_id: str, access_token: str | Non
         },
         access_token=access_token
     )
-    tree_charts.clear()
+    get_data_versions.clear()
     list_charts.clear()
-    list_accounts_by_chart.clear()
 
 @message_box
 def delete_chart(chart_id: str, access_token: str | None = None):
@@ -501,22 +536,21 @@ def delete_chart(chart_id: str, access_token: str | None = None):
         endpoint=f'chart/delete/{chart_id}',
         access_token=access_token
     )
-    tree_charts.clear()
+    get_data_versions.clear()
     list_charts.clear()
-    list_accounts_by_chart.clear()
 
-@st.cache_data
+@cache_by_data_version('accounts')
 @message_box
-def list_accounts_by_chart(chart_id: str, access_token: str | None = None) -> list[dict]:
+def list_accounts_by_chart(chart_id: str, access_token: str | None = None, data_version: Tuple[str | None, ...] | None = None) -> list[dict]:
     return get_req(
         prefix='accounts',
         endpoint=f'account/list/{chart_id}',
         access_token=access_token
     )
 
-@st.cache_data  
+@cache_by_data_version('accounts')
 @message_box
-def get_account(acct_id: str, access_token: str | None = None) -> dict:
+def get_account(acct_id: str, access_token: str | None = None, data_version: Tuple[str | None, ...] | None = None) -> dict:
     return get_req(
         prefix='accounts',
         endpoint=f'account/get/{acct_id}',
@@ -557,12 +591,10 @@ def add_account(acct_name: str, acct_type: int, currency: int, chart_id: str, ac
         },
         access_token=access_token
     )
-    get_account.clear()
+    get_data_versions.clear()
     get_accounts_by_type.clear()
-    list_accounts_by_chart.clear()
-    list_journal.clear()
-    get_journal.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def update_account(acct_id: str, acct_name: str, acct_type: int, currency: int, chart_id: str, access_token: str | None = None):
@@ -583,14 +615,12 @@ def update_account(acct_id: str, acct_name: str, acct_type: int, currency: int,
         },
         access_token=access_token
     )
-    get_account.clear()
-    list_accounts_by_chart.clear()
+    get_data_versions.clear()
     get_accounts_by_type.clear()
-    list_journal.clear()
-    get_journal.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def delete_account(acct_id: str, access_token: str | None = None):
@@ -599,16 +629,14 @@ def delete_account(acct_id: str, access_token: str | None = None):
         endpoint=f'account/delete/{acct_id}',
         access_token=access_token
     )
-    get_account.clear()
-    list_accounts_by_chart.clear()
+    get_data_versions.clear()
     get_accounts_by_type.clear()
-    list_journal.clear()
-    get_journal.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
-@st.cache_data
+@cache_by_data_version('journals', 'accounts')
 @message_box
 def list_journal(
     limit: int = 50,
@@ -624,6 +652,7 @@ def list_journal(
     max_amount: float = 999999999,
     num_entries: int | None = None,
     access_token: str | None = None,
+    data_version: Tuple[str | None, ...] | None = None, # cache key only
 ) -> Tuple[list[dict], int]:
     return post_req(
         prefix='journal',
@@ -647,9 +676,9 @@ def list_journal(
         access_token=access_token
     )
     
-@st.cache_data
+@cache_by_data_version('journals')
 @message_box
-def stat_journal_by_src(access_token: str | None = None) -> dict[int, Tuple[int, float]]:  
+def stat_journal_by_src(access_token: str | None = None, data_version: Tuple[str | None, ...] | None = None) -> dict[int, Tuple[int, float]]:  
     # [(jrn_src, count, sum amount)]
     result = get_req(
         prefix='journal',
@@ -663,9 +692,9 @@ def stat_journal_by_src(access_token: str | None = None) -> dict[int, Tuple[int,
         )
     )
 
-@st.cache_data
+@cache_by_data_version('journals', 'accounts')
 @message_box
-def get_journal(journal_id: str, access_token: str | None = None) -> dict:
+def get_journal(journal_id: str, access_token: str | None = None, data_version: Tuple[str | None, ...] | None = None) -> dict:
     return get_req(
         prefix='journal',
         endpoint=f'get/{journal_id}',
@@ -679,12 +708,11 @@ def delete_journal(journal_id: str, access_token: str | None = None):
         endpoint=f'delete/{journal_id}',
         access_token=access_token
     )
-    stat_journal_by_src.clear()
-    list_journal.clear()
-    get_journal.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
 @message_box
 def add_journal(jrn_date: date, jrn_src: int, entries: list[dict], note: str | None, access_token: str | None = None):
@@ -717,11 +745,11 @@ def add_journal(jrn_date: date, jrn_src: int, entries: list[dict], note: str | N
         },
         access_token=access_token
     )
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def update_journal(jrn_id: str, jrn_date: date, jrn_src: int, entries: list[dict], note: str | None, access_token: str | None = None):
@@ -755,12 +783,11 @@ def update_journal(jrn_id: str, jrn_date: date, jrn_src: int, entries: list[dict
         },
         access_token=access_token
     )
-    stat_journal_by_src.clear()
-    list_journal.clear()
-    get_journal.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
 @st.cache_data
 @message_box
@@ -817,10 +844,42 @@ def get_incexp_flow(acct_id: str, start_dt: date, end_dt: date, access_token: st
     
 @st.cache_data
 @message_box
-def list_entry_by_acct(acct_id: str, access_token: str | None = None) -> list[dict]:
+def get_acct_flows_by_period(
+    acct_id: str, 
+    start_dt: date, 
+    end_dt: date, 
+    freq: str = 'month', 
+    access_token: str | None = None
+) -> list[dict]:
+    # day/month flow and closing balance, only periods having entries
+    return get_req(
+        prefix='journal',
+        endpoint=f'summary/acct_flow/by_period/{acct_id}',
+        params={
+            'start_dt': start_dt.strftime('%Y-%m-%d'),
+            'end_dt': end_dt.strftime('%Y-%m-%d'),
+            'freq': freq,
+        },
+        access_token=access_token
+    )
+    
+@st.cache_data
+@message_box
+def list_entry_by_acct(
+    acct_id: str, 
+    min_dt: date | None = None, 
+    max_dt: date | None = None, 
+    access_token: str | None = None
+) -> list[dict]:
+    params = {}
+    if min_dt is not None:
+        params['min_dt'] = min_dt.strftime('%Y-%m-%d')
+    if max_dt is not None:
+        params['max_dt'] = max_dt.strftime('%Y-%m-%d')
     return get_req(
         prefix='journal',
         endpoint=f'entry/list/{acct_id}',
+        params=params,
         access_token=access_token
     )
 
@@ -907,12 +966,13 @@ def add_sales_invoice(invoice: dict, access_token: str | None = None):
     
 
     list_sales_invoice.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     get_psales_invoices_balance_by_entity.clear()
+    get_sales_invoices_and_balances.clear()
 
 @message_box
 def update_sales_invoice(invoice: dict, access_token: str | None = None):
@@ -925,14 +985,15 @@ def update_sales_invoice(invoice: dict, access_token: str | None = None):
 
     list_sales_invoice.clear()
     get_sales_invoice_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     preview_sales_invoice.clear()
     get_sales_invoice_balance.clear()
     get_psales_invoices_balance_by_entity.clear()
+    get_sales_invoices_and_balances.clear()
 
 @message_box
 def delete_sales_invoice(invoice_id: str, access_token: str | None = None):
@@ -943,14 +1004,15 @@ def delete_sales_invoice(invoice_id: str, access_token: str | None = None):
     )
     list_sales_invoice.clear()
     get_sales_invoice_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     preview_sales_invoice.clear()
     get_sales_invoice_balance.clear()
     get_psales_invoices_balance_by_entity.clear()
+    get_sales_invoices_and_balances.clear()
 
 @st.cache_data
 @message_box
@@ -1038,6 +1100,28 @@ def get_psales_invoices_balance_by_entity(entity_id: str, bal_dt: date, access_t
         access_token=access_token
     )
 
+@st.cache_data
+@message_box
+def get_sales_invoices_and_balances(entity_id: str, bal_dt: date, access_token: str | None = None) -> Tuple[list[dict], list[dict]]:
+    # invoices of the customer and their balances in one round trip
+    invoices, balances = batch(
+        [
+            {
+                'method': 'POST',
+                'path': '/sales/invoice/list',
+                'params': {'limit': 9999},
+                'body': {'customer_ids': [entity_id]}
+            },
+            {
+                'method': 'GET',
+                'path': f'/sales/invoice/get_balance_by_entity/{entity_id}',
+                'params': {'bal_dt': bal_dt.strftime('%Y-%m-%d')}
+            },
+        ],
+        access_token=access_token
+    )
+    return invoices, balances
+
 @message_box
 def validate_sales_payment(payment: dict, access_token: str | None = None) -> dict:
     return post_req(
@@ -1066,13 +1150,14 @@ def add_sales_payment(payment: dict, access_token: str | None = None):
     )
 
     list_sales_payment.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     get_sales_invoice_balance.clear()
     get_psales_invoices_balance_by_entity.clear()
+    get_sales_invoices_and_balances.clear()
     
 @message_box
 def update_sales_payment(payment: dict, access_token: str | None = None):
@@ -1085,13 +1170,14 @@ def update_sales_payment(payment: dict, access_token: str | None = None):
 
     list_sales_payment.clear()
     get_sales_payment_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     get_sales_invoice_balance.clear()
     get_psales_invoices_balance_by_entity.clear()
+    get_sales_invoices_and_balances.clear()
 
 @message_box
 def delete_sales_payment(payment_id: str, access_token: str | None = None):
@@ -1102,13 +1188,14 @@ def delete_sales_payment(payment_id: str, access_token: str | None = None):
     )
     list_sales_payment.clear()
     get_sales_payment_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     get_sales_invoice_balance.clear()
     get_psales_invoices_balance_by_entity.clear()
+    get_sales_invoices_and_balances.clear()
 
 
 @st.cache_data
@@ -1193,12 +1280,13 @@ def add_purchase_invoice(invoice: dict, access_token: str | None = None):
     
 
     list_purchase_invoice.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     get_ppurchase_invoices_balance_by_entity.clear()
+    get_purchase_invoices_and_balances.clear()
 
 @message_box
 def update_purchase_invoice(invoice: dict, access_token: str | None = None):
@@ -1211,14 +1299,15 @@ def update_purchase_invoice(invoice: dict, access_token: str | None = None):
 
     list_purchase_invoice.clear()
     get_purchase_invoice_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     preview_purchase_invoice.clear()
     get_purchase_invoice_balance.clear()
     get_ppurchase_invoices_balance_by_entity.clear()
+    get_purchase_invoices_and_balances.clear()
 
 @message_box
 def delete_purchase_invoice(invoice_id: str, access_token: str | None = None):
@@ -1229,14 +1318,15 @@ def delete_purchase_invoice(invoice_id: str, access_token: str | None = None):
     )
     list_purchase_invoice.clear()
     get_purchase_invoice_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     preview_purchase_invoice.clear()
     get_purchase_invoice_balance.clear()
     get_ppurchase_invoices_balance_by_entity.clear()
+    get_purchase_invoices_and_balances.clear()
 
 @st.cache_data
 @message_box
@@ -1324,6 +1414,28 @@ def get_ppurchase_invoices_balance_by_entity(entity_id: str, bal_dt: date, acces
         access_token=access_token
     )
 
+@st.cache_data
+@message_box
+def get_purchase_invoices_and_balances(entity_id: str, bal_dt: date, access_token: str | None = None) -> Tuple[list[dict], list[dict]]:
+    # invoices of the supplier and their balances in one round trip
+    invoices, balances = batch(
+        [
+            {
+                'method': 'POST',
+                'path': '/purchase/invoice/list',
+                'params': {'limit': 9999},
+                'body': {'supplier_ids': [entity_id]}
+            },
+            {
+                'method': 'GET',
+                'path': f'/purchase/invoice/get_balance_by_entity/{entity_id}',
+                'params': {'bal_dt': bal_dt.strftime('%Y-%m-%d')}
+            },
+        ],
+        access_token=access_token
+    )
+    return invoices, balances
+
 @message_box
 def validate_purchase_payment(payment: dict, access_token: str | None = None) -> dict:
     return post_req(
@@ -1352,13 +1464,14 @@ def add_purchase_payment(payment: dict, access_token: str | None = None):
     )
 
     list_purchase_payment.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     get_purchase_invoice_balance.clear()
     get_ppurchase_invoices_balance_by_entity.clear()
+    get_purchase_invoices_and_balances.clear()
     
 @message_box
 def update_purchase_payment(payment: dict, access_token: str | None = None):
@@ -1371,13 +1484,14 @@ def update_purchase_payment(payment: dict, access_token: str | None = None):
 
     list_purchase_payment.clear()
     get_purchase_payment_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     get_purchase_invoice_balance.clear()
     get_ppurchase_invoices_balance_by_entity.clear()
+    get_purchase_invoices_and_balances.clear()
 
 @message_box
 def delete_purchase_payment(payment_id: str, access_token: str | None = None):
@@ -1388,13 +1502,14 @@ def delete_purchase_payment(payment_id: str, access_token: str | None = None):
     )
     list_purchase_payment.clear()
     get_purchase_payment_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     get_purchase_invoice_balance.clear()
     get_ppurchase_invoices_balance_by_entity.clear()
+    get_purchase_invoices_and_balances.clear()
     
     
 @message_box
@@ -1479,11 +1594,11 @@ def add_expense(expense: dict, files: list[Tuple[str, bytes]], access_token: str
         access_token=access_token
     )
     list_expense.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     summary_expense.clear()
     
 @message_box
@@ -1497,11 +1612,11 @@ def add_expenses(expenses: list[dict], access_token: str | None = None):
         access_token=access_token
     )
     list_expense.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     summary_expense.clear()
 
 @message_box
@@ -1523,11 +1638,11 @@ def update_expense(expense: dict, files: list[str], access_token: str | None = N
     )
     get_expense_journal.clear()
     list_expense.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     summary_expense.clear()
     
     
@@ -1540,11 +1655,11 @@ def delete_expense(expense_id: str, access_token: str | None = None):
     )
     get_expense_journal.clear()
     list_expense.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     summary_expense.clear()
 
 @st.cache_data
@@ -1599,17 +1714,17 @@ def delete_file(file_id: str, access_token: str | None = None):
 
 #@message_box
 def get_file(file_id: str, access_token: str | None = None) -> dict:
-    f = get_req(
+    content, headers = binary_get_req(
         prefix='misc',
-        endpoint=f"get_file/{file_id}",
+        endpoint=f"download_file/{file_id}",
         access_token=access_token
     )
-    # convert file from string to bytes
+    disposition = headers.get('content-disposition', '')
     return {
-        'file_id': f['file_id'],
-        'filename': f['filename'],
-        'content': f['content'].encode('latin-1'),
-        'filehash': f['filehash']
+        'file_id': file_id,
+        'filename': unquote(disposition.split("filename*=UTF-8''")[-1]) if "filename*=" in disposition else file_id,
+        'content': content,
+        'filehash': headers.get('x-file-hash')
     }
     
 @st.cache_data
@@ -1643,6 +1758,18 @@ def get_property_stat(property_id: str, rep_dt: date, access_token: str | None =
         access_token=access_token
     )
     
+@st.cache_data
+@message_box
+def get_property_stats(rep_dt: date, access_token: str | None = None) -> list[dict]:
+    return get_req(
+        prefix='property',
+        endpoint=f"property/get_stats",
+        params={
+            'rep_dt': rep_dt.strftime('%Y-%m-%d')
+        },
+        access_token=access_token
+    )
+    
 @message_box
 def create_journal_from_new_property(property: dict, access_token: str | None = None) -> dict:
     return get_req(
@@ -1675,11 +1802,11 @@ def add_property(property: dict,  files: list[Tuple[str, bytes]], access_token:
         access_token=access_token
     )
     list_property.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def update_property(property: dict, files: list[str], access_token: str | None = None):
@@ -1701,11 +1828,12 @@ def update_property(property: dict, files: list[str], access_token: str | None =
     list_property.clear()
     get_property_journal.clear()
     get_property_stat.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_property_stats.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
 @message_box
 def delete_property(property_id: str, access_token: str | None = None):
@@ -1717,13 +1845,14 @@ def delete_property(property_id: str, access_token: str | None = None):
     list_property.clear()
     get_property_journal.clear()
     get_property_stat.clear()
+    get_property_stats.clear()
     list_property_trans.clear()
     get_propertytrans_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @st.cache_data
 @message_box
@@ -1775,11 +1904,12 @@ def add_property_trans(property_trans: dict, access_token: str | None = None):
     list_property_trans.clear()
     get_propertytrans_journal.clear()
     get_property_stat.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_property_stats.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def update_property_trans(property_trans: dict, access_token: str | None = None):
@@ -1792,11 +1922,12 @@ def update_property_trans(property_trans: dict, access_token: str | None = None)
     list_property_trans.clear()
     get_propertytrans_journal.clear()
     get_property_stat.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_property_stats.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def delete_property_trans(trans_id: str, access_token: str | None = None):
@@ -1808,11 +1939,12 @@ def delete_property_trans(trans_id: str, access_token: str | None = None):
     list_property_trans.clear()
     get_propertytrans_journal.clear()
     get_property_stat.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_property_stats.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
 
 @st.cache_data
@@ -1889,11 +2021,11 @@ def add_issue(issue: dict, access_token: str | None = None):
     )
     list_issue.clear()
     list_reissue_from_repur.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def update_issue(issue: dict, access_token: str | None = None):
@@ -1907,11 +2039,11 @@ def update_issue(issue: dict, access_token: str | None = None):
     list_issue.clear()
     list_reissue_from_repur.clear()
     get_issue_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
 @message_box
 def delete_issue(issue_id: str, access_token: str | None = None):
@@ -1923,11 +2055,11 @@ def delete_issue(issue_id: str, access_token: str | None = None):
     list_issue.clear()
     list_reissue_from_repur.clear()
     get_issue_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 
 @st.cache_data
@@ -1975,11 +2107,11 @@ def add_repur(repur: dict, access_token: str | None = None):
         access_token=access_token
     )
     list_repur.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def update_repur(repur: dict, access_token: str | None = None):
@@ -1992,11 +2124,11 @@ def update_repur(repur: dict, access_token: str | None = None):
 
     list_repur.clear()
     get_repur_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
 @message_box
 def delete_repur(repur_id: str, access_token: str | None = None):
@@ -2007,11 +2139,11 @@ def delete_repur(repur_id: str, access_token: str | None = None):
     )
     list_repur.clear()
     get_repur_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
 
 @st.cache_data
@@ -2059,11 +2191,11 @@ def add_div(div: dict, access_token: str | None = None):
         access_token=access_token
     )
     list_div.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
 @message_box
 def update_div(div: dict, access_token: str | None = None):
@@ -2076,11 +2208,11 @@ def update_div(div: dict, access_token: str | None = None):
 
     list_div.clear()
     get_div_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
 
 @message_box
 def delete_div(div_id: str, access_token: str | None = None):
@@ -2091,11 +2223,11 @@ def delete_div(div_id: str, access_token: str | None = None):
     )
     list_div.clear()
     get_div_journal.clear()
-    list_journal.clear()
-    stat_journal_by_src.clear()
+    get_data_versions.clear()
     get_blsh_balance.clear()
     get_incexp_flow.clear()
     list_entry_by_acct.clear()
+    get_acct_flows_by_period.clear()
     
     
 @message_box
@@ -2138,15 +2270,14 @@ def set_logo(logo: bytes, access_token: str | None = None):
 def get_logo(access_token: str | None = None) -> bytes | str:
     try:
         print("get_logo", access_token)
-        f = get_req(
+        content, _ = binary_get_req(
             prefix='settings',
-            endpoint=f"get_logo",
+            endpoint=f"download_logo",
             access_token=access_token
         )
     except NotExistError:
         return 'https://static.vecteezy.com/system/resources/previews/036/744/532/non_2x/user-profile-icon-symbol-template-free-vector.jpg'
-    # convert file from string to bytes
-    return f['content'].encode('latin-1')
+    return content
 
 @message_box
 def upsert_comp_contact(
@@ -1,7 +1,9 @@
-from functools import wraps
+from functools import lru_cache, wraps
 import os
 from typing import Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from utils.exceptions import AlreadyExistError, FKNoDeleteUpdateError, FKNotExistError, NotExistError, \
     NotMatchWithSystemError, OpNotPermittedError, UnprocessableEntityError, PermissionDeniedError
@@ -9,6 +11,60 @@ from utils.exceptions import AlreadyExistError, FKNoDeleteUpdateError, FKNotExis
 SERVE_APP_HOST = os.environ.get('SERVE_APP_HOST', 'localhost')
 SERVE_APP_PORT = os.environ.get('SERVE_APP_PORT', 8181)
 BASE_URL = f"http://{SERVE_APP_HOST}:{SERVE_APP_PORT}/api/v1"
+# http client settings
+SERVE_APP_CONNECT_TIMEOUT = float(os.environ.get('SERVE_APP_CONNECT_TIMEOUT', 5))
+SERVE_APP_READ_TIMEOUT = float(os.environ.get('SERVE_APP_READ_TIMEOUT', 60))
+SERVE_APP_RETRIES = int(os.environ.get('SERVE_APP_RETRIES', 3))
+SERVE_APP_BACKOFF = float(os.environ.get('SERVE_APP_BACKOFF', 0.3))
+SERVE_APP_POOL_SIZE = int(os.environ.get('SERVE_APP_POOL_SIZE', 20))
+SERVE_APP_GZIP = os.environ.get('SERVE_APP_GZIP', 'true').lower() in ('1', 'true', 'yes')
+TIMEOUT = (SERVE_APP_CONNECT_TIMEOUT, SERVE_APP_READ_TIMEOUT)
+
+@lru_cache
+def get_session() -> requests.Session:
+    # shared session, reuse keep-alive connections across all api calls
+    retry = Retry(
+        total=SERVE_APP_RETRIES,
+        backoff_factor=SERVE_APP_BACKOFF,
+        status_forcelist=(502, 503, 504), # only gateway errors, app errors (5xx custom) are not retried
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS, # idempotent methods only, no POST
+        raise_on_status=False, # let handle_error deal with the response
+    )
+    adapter = HTTPAdapter(
+        pool_connections=SERVE_APP_POOL_SIZE,
+        pool_maxsize=SERVE_APP_POOL_SIZE,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # requests accept gzip by default, use identity if disabled
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate' if SERVE_APP_GZIP else 'identity'
+    })
+    return session
+
+def raise_for_status(status_code: int, js: dict):
+    # map api error status code back to exception
+    if status_code == 520:
+        raise AlreadyExistError(**js)
+    elif status_code == 521:
+        raise NotExistError(**js)
+    elif status_code == 530:
+        raise FKNotExistError(**js)
+    elif status_code == 531:
+        raise FKNoDeleteUpdateError(**js)
+    elif status_code == 540:
+        raise OpNotPermittedError(**js)
+    elif status_code == 550:
+        raise NotMatchWithSystemError(**js)
+    elif status_code == 422:
+        # unprocess entity
+        raise UnprocessableEntityError()
+    elif status_code == 403:
+        raise PermissionDeniedError(**js)
+    else:
+        raise
 
 def handle_error(f):
     @wraps(f)
@@ -21,25 +77,7 @@ def handle_error(f):
             js = r.json()
             if r.status_code == 200:
                 return js
-            elif r.status_code == 520:
-                raise AlreadyExistError(**js)
-            elif r.status_code == 521:
-                raise NotExistError(**js)
-            elif r.status_code == 530:
-                raise FKNotExistError(**js)
-            elif r.status_code == 531:
-                raise FKNoDeleteUpdateError(**js)
-            elif r.status_code == 540:
-                raise OpNotPermittedError(**js)
-            elif r.status_code == 550:
-                raise NotMatchWithSystemError(**js)
-            elif r.status_code == 422:
-                # unprocess entity
-                raise UnprocessableEntityError()
-            elif r.status_code == 403:
-                raise PermissionDeniedError(**js)
-            else:
-                raise
+            raise_for_status(r.status_code, js)
 
     return decorated
 
@@ -69,12 +107,13 @@ def plain_get_req(
         base_headers.update(
             **headers
         )
-    resp = requests.get(
+    resp = get_session().get(
         url = assemble_url(prefix, endpoint),
         params = params,
         json = json_,
         data = data,
-        headers = base_headers
+        headers = base_headers,
+        timeout = TIMEOUT
     )
     if resp.status_code == 200:
         return resp.text
@@ -103,12 +142,37 @@ def get_req(
         base_headers.update(
             **headers
         )
-    return requests.get(
+    return get_session().get(
         url = assemble_url(prefix, endpoint),
         params = params,
         json = json_,
-        headers = base_headers
+        headers = base_headers,
+        timeout = TIMEOUT
+    )
+
+def binary_get_req(
+    prefix:str, 
+    endpoint: str, 
+    params:dict=None, 
+    access_token: str | None = None,
+) -> Tuple[bytes, dict]:
+    # raw file download, return content and response headers
+    base_headers = {}
+    if access_token:
+        base_headers.update(
+            {
+                "Authorization" : f"Bearer {access_token}"
+            }
+        )
+    resp = get_session().get(
+        url = assemble_url(prefix, endpoint),
+        params = params,
+        headers = base_headers,
+        timeout = TIMEOUT
     )
+    if resp.status_code == 200:
+        return resp.content, resp.headers
+    raise_for_status(resp.status_code, resp.json())
 
 @handle_error
 def post_req(
@@ -137,13 +201,14 @@ def post_req(
         base_headers.update(
             **headers
         )
-    return requests.post(
+    return get_session().post(
             url = assemble_url(prefix, endpoint),
             params = params,
             data = data,
             json = json_,
             headers = base_headers,
-            files = files
+            files = files,
+            timeout = TIMEOUT
         )
 
 @handle_error
@@ -168,11 +233,12 @@ def put_req(
         base_headers.update(
             **headers
         )
-    return requests.put(
+    return get_session().put(
         url = assemble_url(prefix, endpoint),
         params = params,
         json = json_,
-        headers = base_headers
+        headers = base_headers,
+        timeout = TIMEOUT
     )
 
 @handle_error
@@ -197,9 +263,41 @@ def delete_req(
         base_headers.update(
             **headers
         )
-    return requests.delete(
+    return get_session().delete(
         url = assemble_url(prefix, endpoint),
         params = params,
         json = json_,
-        headers = base_headers
-    )
\ No newline at end of file
+        headers = base_headers,
+        timeout = TIMEOUT
+    )
+    
+@handle_error
+def batch_req(
+    requests: list[dict],
+    access_token: str | None = None,
+) -> list[dict]:
+    # requests: [{method, path, params, body}], path relative to api root
+    base_headers = {
+        "Content-Type" : "application/json"
+    }
+    if access_token:
+        base_headers.update(
+            {
+                "Authorization" : f"Bearer {access_token}"
+            }
+        )
+    return get_session().post(
+        url = f"{BASE_URL}/batch",
+        json = requests,
+        headers = base_headers,
+        timeout = TIMEOUT
+    )
+    
+def unpack_batch(results: list[dict]) -> list:
+    # body of each sub response, raise on the first failed one
+    bodies = []
+    for r in results:
+        if r['status_code'] != 200:
+            raise_for_status(r['status_code'], r['body'])
+        bodies.append(r['body'])
+    return bodies